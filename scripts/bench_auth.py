@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Microbenchmark of the authentication overhead per MCP request.
+
+Signs tokens with a locally generated RSA key set and validates them with
+EntraValidator, as get_current_user does for every request, once with the
+token and signing key caches disabled and once with them enabled. The key
+set is served by an in-process JWKS client that simulates the latency of
+fetching it from Microsoft Entra ID.
+
+Usage:
+    python scripts/bench_auth.py --requests 2000 --distinct-tokens 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWK
+from jwt.algorithms import RSAAlgorithm
+
+from codestory_mcp.auth.cache import JWKSCache, TokenCache
+from codestory_mcp.auth.entra_validator import EntraValidator
+
+AUDIENCE = "api://code-story"
+
+
+class LocalJWKSClient:
+    """JWKS client serving a locally generated key set."""
+
+    def __init__(self, key_count: int, fetch_latency: float) -> None:
+        self.private_keys = {
+            f"key-{i}": rsa.generate_private_key(65537, 2048) for i in range(key_count)
+        }
+        self.fetch_latency = fetch_latency
+        self.fetches = 0
+
+    def get_signing_keys(self, refresh: bool = False) -> list[PyJWK]:
+        """Get the public keys, after the simulated fetch latency."""
+        self.fetches += 1
+        time.sleep(self.fetch_latency)
+        return [
+            PyJWK(
+                {
+                    **json.loads(RSAAlgorithm.to_jwk(key.public_key())),
+                    "kid": kid,
+                    "alg": "RS256",
+                }
+            )
+            for kid, key in self.private_keys.items()
+        ]
+
+    def get_signing_key_from_jwt(self, token: str) -> PyJWK:
+        """Get the key of a token by fetching the key set, as PyJWKClient does uncached."""
+        kid = jwt.get_unverified_header(token)["kid"]
+        return next(key for key in self.get_signing_keys() if key.key_id == kid)
+
+    def token(self, index: int) -> str:
+        """Sign a token with one of the keys."""
+        kid = f"key-{index % len(self.private_keys)}"
+        claims = {
+            "sub": f"agent-{index}",
+            "aud": AUDIENCE,
+            "scp": "code-story.read code-story.query",
+            "exp": int(time.time()) + 3600,
+        }
+        return jwt.encode(claims, self.private_keys[kid], algorithm="RS256", headers={"kid": kid})
+
+
+class UncachedJWKSCache(JWKSCache):
+    """Signing key lookup fetching the key set for every token."""
+
+    async def get_signing_key(self, token: str) -> Any:
+        """Get the key of a token from a fresh key set."""
+        return self.jwks_client.get_signing_key_from_jwt(token)
+
+
+async def run(validator: EntraValidator, tokens: list[str], requests: int) -> float:
+    """Validate tokens round robin and return the mean microseconds per request."""
+    start = time.perf_counter()
+    for i in range(requests):
+        await validator.validate_token(tokens[i % len(tokens)])
+    duration = time.perf_counter() - start
+    await validator.jwks_cache.stop()
+    return duration / requests * 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct-tokens", type=int, default=20)
+    parser.add_argument("--keys", type=int, default=2, help="Keys in the key set")
+    parser.add_argument(
+        "--fetch-latency", type=float, default=0.0, help="Seconds per key set fetch"
+    )
+    args = parser.parse_args()
+
+    client = LocalJWKSClient(args.keys, args.fetch_latency)
+    tokens = [client.token(i) for i in range(args.distinct_tokens)]
+
+    results = {}
+    for name, cached in (("uncached", False), ("cached", True)):
+        client.fetches = 0
+        validator = EntraValidator(
+            "bench-tenant",
+            AUDIENCE,
+            jwks_client=client,
+            token_cache=TokenCache() if cached else TokenCache(max_size=0),
+            jwks_cache=JWKSCache(client) if cached else UncachedJWKSCache(client),
+        )
+        results[name] = asyncio.run(run(validator, tokens, args.requests))
+        print(f"{name:>8}: {results[name]:9.1f} us/request, {client.fetches} key set fetches")
+
+    print(f" speedup: {results['uncached'] / results['cached']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Benchmark of the per-request overhead of embedding responses.
+
+Serves 2048-item embedding responses from an in-process HTTP transport and
+measures the CPU time and peak memory of turning them into vectors through:
+
+- legacy: the SDK decoding floats into lists, then model_dump() and
+  EmbeddingResponse.model_validate(), as OpenAIClient.embed() used to
+- embed: OpenAIClient.embed(), building an EmbeddingResponse from the
+  float32 buffer without validation
+- embed_vectors: OpenAIClient.embed_vectors(), returning the float32 buffer
+
+Usage:
+    python scripts/bench_embeddings.py --items 2048 --dimensions 1536 --requests 5
+"""
+
+import argparse
+import base64
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import httpx
+from openai import AzureOpenAI
+
+from codestory.llm.client import OpenAIClient
+from codestory.llm.models import EmbeddingResponse
+
+
+def response_body(items: int, dimensions: int) -> bytes:
+    """Create an embedding response with base64 encoded vectors."""
+    vector = array("f", (random.uniform(-1, 1) for _ in range(dimensions))).tobytes()
+    encoded = base64.b64encode(vector).decode()
+    return json.dumps(
+        {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": index, "embedding": encoded}
+                for index in range(items)
+            ],
+            "model": "text-embedding-3-small",
+            "usage": {"prompt_tokens": items * 8, "total_tokens": items * 8},
+        }
+    ).encode()
+
+
+def create_client(body: bytes) -> OpenAIClient:
+    """Create a client whose requests are answered from memory."""
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    with patch("codestory.llm.client.get_token_provider", return_value=lambda: "token"):
+        client = OpenAIClient(endpoint="https://bench.openai.azure.com")
+    client._sync_client = AzureOpenAI(
+        azure_endpoint="https://bench.openai.azure.com",
+        api_version=client.api_version,
+        api_key="bench",
+        http_client=httpx.Client(transport=transport),
+    )
+    return client
+
+
+def measure(func: Callable[[], Any], requests: int) -> tuple[float, float]:
+    """Get the mean CPU milliseconds and the peak MiB allocated per request."""
+    func()  # Warm up
+    gc.collect()
+    start = time.process_time()
+    for _ in range(requests):
+        func()
+    cpu = (time.process_time() - start) / requests * 1000
+
+    # Trace memory in a separate run, as tracing slows allocation down
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return cpu, peak / 2**20
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2048)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    client = create_client(response_body(args.items, args.dimensions))
+    texts = ["text"] * args.items
+
+    def legacy() -> EmbeddingResponse:
+        response = client._sync_client.embeddings.create(model=client.embedding_model, input=texts)
+        return EmbeddingResponse.model_validate(response.model_dump())
+
+    paths = {
+        "legacy": legacy,
+        "embed": lambda: client.embed(texts),
+        "embed_vectors": lambda: client.embed_vectors(texts),
+    }
+
+    print(f"{args.items} items x {args.dimensions} dimensions, {args.requests} requests")
+    for name, func in paths.items():
+        cpu, peak = measure(func, args.requests)
+        print(f"{name:>14}: {cpu:8.1f} ms CPU/request, {peak:8.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""Benchmark of the filesystem scanner against the os.walk traversal.
+
+Builds a synthetic repository tree (reused on later runs) and traverses it
+twice: once the way the filesystem step used to, with a counting os.walk,
+a second os.walk, pathspec matching of every path and two stat calls per
+file, and once with FilesystemScanner, which lists each directory once with
+os.scandir from a thread pool and matches entries with the compiled
+IgnoreMatcher. Both traversals only collect the rows; no graph is written.
+
+``--latency`` adds a delay to every directory listing of both traversals, to
+approximate a network filesystem.
+
+Usage:
+    python scripts/bench_fs_scan.py --files 1000000 --root /tmp/fs-bench
+    python scripts/bench_fs_scan.py --files 100000 --workers 1 8 32 --latency 2
+"""
+
+import argparse
+import os
+import pathlib
+import sys
+import time
+from typing import Any
+from unittest import mock
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import pathspec
+
+from codestory_filesystem.ignore import BUILTIN_IGNORE_PATTERNS, IgnoreMatcher
+from codestory_filesystem.scanner import FilesystemScanner
+
+IGNORE_PATTERNS = [".git/", "__pycache__/", "*.pyc", "node_modules/", "build/"]
+
+
+def build_tree(root: str, files: int, files_per_dir: int, dirs_per_dir: int) -> None:
+    """Create the synthetic tree, unless it already exists.
+
+    Args:
+        root: Directory to create the tree in
+        files: Number of files
+        files_per_dir: Number of files per directory
+        dirs_per_dir: Number of subdirectories per directory
+    """
+    marker = os.path.join(root, f".bench-{files}-{files_per_dir}-{dirs_per_dir}")
+    if os.path.exists(marker):
+        return
+
+    print(f"Creating {files} files in {root}...")
+    start = time.perf_counter()
+    directories = max(files // files_per_dir, 1)
+    for index in range(directories):
+        # Spread the directories over a tree with dirs_per_dir children each
+        parts = []
+        n = index
+        while True:
+            parts.append(f"d{n % dirs_per_dir}")
+            n //= dirs_per_dir
+            if n == 0:
+                break
+        directory = os.path.join(root, "src", *reversed(parts))
+        os.makedirs(directory, exist_ok=True)
+        for number in range(files_per_dir):
+            extension = ".pyc" if number % 10 == 0 else ".py"
+            with open(os.path.join(directory, f"module_{number}{extension}"), "w") as f:
+                f.write("x = 1\n")
+
+        # A few ignored directories, as found in real repositories
+        if index % 100 == 0:
+            ignored = os.path.join(directory, "node_modules", "lib")
+            os.makedirs(ignored, exist_ok=True)
+            for number in range(files_per_dir):
+                with open(os.path.join(ignored, f"index_{number}.js"), "w") as f:
+                    f.write("module.exports = 1\n")
+
+    pathlib.Path(marker).touch()
+    print(f"Created the tree in {time.perf_counter() - start:.1f}s")
+
+
+def walk_traversal(root: str, spec: pathspec.PathSpec) -> tuple[int, int]:
+    """Traverse the tree the way the filesystem step did before the scanner.
+
+    Returns:
+        Number of directories and files found
+    """
+    # The directory count was estimated with a first, full walk
+    sum(len(dirs) for _, dirs, _ in os.walk(root, topdown=True))
+
+    dir_count, file_count = 0, 0
+    rows: list[dict[str, Any]] = []
+    for current_dir, dirs, files in os.walk(root):
+        rel_path = os.path.relpath(current_dir, root)
+        rel_path_posix = pathlib.Path(rel_path).as_posix() if rel_path != "." else ""
+        for d in list(dirs):
+            dir_rel = os.path.normpath(os.path.join(rel_path_posix, d)).replace("\\", "/")
+            if spec.match_file(dir_rel + "/"):
+                dirs.remove(d)
+        if rel_path != ".":
+            dir_count += 1
+        for file in files:
+            file_rel = os.path.normpath(os.path.join(rel_path_posix, file)).replace("\\", "/")
+            if spec.match_file(file_rel):
+                continue
+            abs_file_path = os.path.join(current_dir, file)
+            rows.append(
+                {
+                    "path": file_rel,
+                    "size": os.path.getsize(abs_file_path),
+                    "modified": os.path.getmtime(abs_file_path),
+                }
+            )
+            file_count += 1
+    return dir_count, file_count
+
+
+def scanner_traversal(root: str, workers: int) -> tuple[int, int]:
+    """Traverse the tree with the scanner.
+
+    Returns:
+        Number of directories and files found
+    """
+    dir_count, file_count = 0, 0
+    matcher = IgnoreMatcher(root, IGNORE_PATTERNS)
+    for batch in FilesystemScanner(root, matcher, workers=workers).scan():
+        dir_count += len(batch.directories)
+        file_count += len(batch.files)
+    return dir_count, file_count
+
+
+def bench_matching(spec: pathspec.PathSpec, matcher: IgnoreMatcher) -> None:
+    """Compare the cost of matching one path with pathspec and the matcher."""
+    entries = [
+        (f"src/d{i % 20}/d{i % 7}", name, name.endswith("/"))
+        for i, name in enumerate(["module.py", "module.pyc", "node_modules/", "lib/"] * 25000)
+    ]
+    start = time.perf_counter()
+    for rel_dir, name, _ in entries:
+        spec.match_file(f"{rel_dir}/{name}")
+    baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for rel_dir, name, is_dir in entries:
+        matcher.match_entry(rel_dir, name.rstrip("/"), is_dir)
+    duration = time.perf_counter() - start
+    print(
+        f"Matching: pathspec {baseline / len(entries) * 1e6:.2f} us, "
+        f"IgnoreMatcher {duration / len(entries) * 1e6:.2f} us per path "
+        f"({baseline / duration:.1f}x)"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default="/tmp/codestory-fs-bench")
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--files-per-dir", type=int, default=50)
+    parser.add_argument("--dirs-per-dir", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Milliseconds added to each directory listing"
+    )
+    args = parser.parse_args()
+
+    build_tree(args.root, args.files, args.files_per_dir, args.dirs_per_dir)
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", BUILTIN_IGNORE_PATTERNS + IGNORE_PATTERNS)
+    bench_matching(spec, IgnoreMatcher(args.root, IGNORE_PATTERNS))
+
+    scandir = os.scandir
+
+    def slow_scandir(path: Any = ".") -> Any:
+        time.sleep(args.latency / 1000)
+        return scandir(path)
+
+    with mock.patch("os.scandir", slow_scandir if args.latency else scandir):
+        start = time.perf_counter()
+        counts = walk_traversal(args.root, spec)
+        baseline = time.perf_counter() - start
+        print(f"  {'os.walk':<16} {baseline:8.2f}s  {counts[0]} dirs, {counts[1]} files")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            counts = scanner_traversal(args.root, workers)
+            duration = time.perf_counter() - start
+            print(
+                f"  {f'scanner x{workers}':<16} {duration:8.2f}s  {counts[0]} dirs, "
+                f"{counts[1]} files  ({baseline / duration:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
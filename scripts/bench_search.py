@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+"""Benchmark the latency of the graph search behind POST /v1/query/search.
+
+Seeds Neo4j with synthetic code nodes under a dedicated label, each with a
+summary node holding a random embedding, builds a full-text index over the
+code nodes and a vector index over the summaries and times
+GraphService.search in fulltext, vector and hybrid mode at several graph
+sizes. The query embedding
+is a random vector returned after ``--embedding-latency`` milliseconds, to
+stand in for the embedding API. The time of reciprocal rank fusion alone is
+reported separately. The benchmark nodes and indexes are removed afterwards.
+
+Usage:
+    python scripts/bench_search.py --sizes 10000 100000 --queries 50
+    python scripts/bench_search.py --sizes 10000 --embedding-latency 150 --limit 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+from codestory.config.settings import get_settings
+from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory_service.application.graph_service import GraphService, reciprocal_rank_fusion
+from codestory_service.domain.graph import SearchMode, SearchQuery
+from codestory_service.infrastructure.neo4j_adapter import Neo4jAdapter
+
+LABEL = "BenchSearch"
+SUMMARY_LABEL = f"{LABEL}Summary"
+FULLTEXT_INDEX = f"{LABEL.lower()}_text"
+VECTOR_INDEX = f"{SUMMARY_LABEL.lower()}_embedding_vector_idx"
+WORDS = ["parse", "config", "load", "render", "user", "session", "cache", "http", "token", "graph"]
+
+
+class RandomEmbeddings:
+    """Stand-in for the OpenAI adapter returning random embeddings after a delay."""
+
+    def __init__(self, dimensions: int, latency: float):
+        """Initialize the stand-in.
+
+        Args:
+            dimensions: Embedding dimensions
+            latency: Delay of each call in seconds
+        """
+        self.dimensions = dimensions
+        self.latency = latency
+
+    async def create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Return one random embedding per text."""
+        await asyncio.sleep(self.latency)
+        return [random_vector(self.dimensions) for _ in texts]
+
+
+def random_vector(dimensions: int) -> list[float]:
+    """Generate a random embedding."""
+    return [random.uniform(-1.0, 1.0) for _ in range(dimensions)]
+
+
+def random_name() -> str:
+    """Generate a random snake_case function name."""
+    return "_".join(random.sample(WORDS, 3))
+
+
+def seed(connector: Neo4jConnector, size: int, dimensions: int, batch_size: int = 1000) -> None:
+    """Create benchmark nodes with names and content, and summaries with random embeddings."""
+    for offset in range(0, size, batch_size):
+        rows = []
+        for i in range(offset, min(size, offset + batch_size)):
+            name = random_name()
+            rows.append(
+                {
+                    "name": name,
+                    "path": f"pkg/mod{i % 500}.py",
+                    "content": f"def {name}(value):\n    # {' '.join(random.sample(WORDS, 4))}",
+                    "embedding": random_vector(dimensions),
+                }
+            )
+        connector.execute_query(
+            f"UNWIND $rows AS row "
+            f"CREATE (n:{LABEL} {{name: row.name, path: row.path, content: row.content}}) "
+            f"CREATE (n)-[:HAS_SUMMARY]->(:{SUMMARY_LABEL} {{embedding: row.embedding}})",
+            params={"rows": rows},
+            write=True,
+        )
+
+
+def cleanup(connector: Neo4jConnector) -> None:
+    """Remove the benchmark nodes and indexes."""
+    for index in (FULLTEXT_INDEX, VECTOR_INDEX):
+        connector.execute_query(f"DROP INDEX {index} IF EXISTS", write=True)
+    for label in (LABEL, SUMMARY_LABEL):
+        connector.execute_query(
+            f"MATCH (n:{label}) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF 10000 ROWS",
+            write=True,
+        )
+
+
+def wait_for_indexes(connector: Neo4jConnector, timeout: float = 600.0) -> None:
+    """Wait until the benchmark indexes are online."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        rows = connector.execute_query(
+            "SHOW INDEXES YIELD name, state WHERE name IN $names RETURN state",
+            params={"names": [FULLTEXT_INDEX, VECTOR_INDEX]},
+        )
+        if len(rows) == 2 and all(row["state"] == "ONLINE" for row in rows):
+            return
+        time.sleep(1.0)
+    raise TimeoutError("Benchmark indexes did not come online")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Get a percentile of latency samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(name: str, samples: list[float]) -> None:
+    """Print the p50 and p95 of latency samples in seconds."""
+    print(
+        f"  {name:<16} p50 {statistics.median(samples) * 1000:8.2f} ms  "
+        f"p95 {percentile(samples, 0.95) * 1000:8.2f} ms"
+    )
+
+
+async def bench_size(connector: Neo4jConnector, size: int, args: argparse.Namespace) -> None:
+    """Benchmark search over a graph of the given size."""
+    cleanup(connector)
+    start = time.perf_counter()
+    seed(connector, size, args.dimensions)
+    connector.execute_query(
+        f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} IF NOT EXISTS "
+        f"FOR (n:{LABEL}) ON EACH [n.name, n.content]",
+        write=True,
+    )
+    connector.create_vector_index(SUMMARY_LABEL, "embedding", dimensions=args.dimensions)
+    wait_for_indexes(connector)
+    print(f"\n{size} nodes seeded and indexed in {time.perf_counter() - start:.1f}s")
+
+    adapter = Neo4jAdapter(connector=connector)
+    adapter.fulltext_indexes = {FULLTEXT_INDEX: (LABEL,)}
+    adapter.vector_indexes = {VECTOR_INDEX: (LABEL,)}
+    service = GraphService(
+        adapter,
+        RandomEmbeddings(args.dimensions, args.embedding_latency / 1000),  # type: ignore[arg-type]
+    )
+
+    timings: dict[str, list[float]] = {mode.value: [] for mode in SearchMode}
+    components: dict[str, list[float]] = {"fulltext": [], "vector": []}
+    for _ in range(args.queries):
+        text = " ".join(random.sample(WORDS, 2))
+        for mode in SearchMode:
+            query = SearchQuery(query=text, mode=mode, limit=args.limit)
+            start = time.perf_counter()
+            response = await service.search(query)
+            timings[mode.value].append(time.perf_counter() - start)
+            if mode == SearchMode.HYBRID:
+                components["fulltext"].append((response.fulltext_time_ms or 0) / 1000)
+                components["vector"].append((response.vector_time_ms or 0) / 1000)
+
+    for name, samples in timings.items():
+        report(name, samples)
+    sequential = [f + v for f, v in zip(components["fulltext"], components["vector"], strict=True)]
+    report("hybrid, serial", sequential)
+
+    if not args.keep:
+        cleanup(connector)
+
+
+def bench_fusion(args: argparse.Namespace) -> None:
+    """Benchmark reciprocal rank fusion of full candidate lists."""
+    k = args.limit * 2
+    ids = [f"n{i}" for i in range(k * 4)]
+    rankings = {name: random.sample(ids, k) for name in ("code_name", "file_content", "vector")}
+
+    start = time.perf_counter()
+    runs = 1000
+    for _ in range(runs):
+        reciprocal_rank_fusion(rankings)
+    duration = time.perf_counter() - start
+    print(f"Fusion of 3 rankings of {k}: {duration / runs * 1e6:.1f} us")
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmark at each size."""
+    settings = get_settings()
+    connector = Neo4jConnector(
+        uri=settings.neo4j.uri,
+        username=settings.neo4j.username,
+        password=settings.neo4j.password.get_secret_value(),
+        database=settings.neo4j.database,
+    )
+    try:
+        for size in args.sizes:
+            await bench_size(connector, size, args)
+    finally:
+        connector.close()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument(
+        "--embedding-latency",
+        type=float,
+        default=100.0,
+        help="Milliseconds taken by each query embedding",
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the last benchmark graph")
+    args = parser.parse_args()
+
+    random.seed(42)
+    bench_fusion(args)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
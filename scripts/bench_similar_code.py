@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+"""Benchmark the similar code search used by the MCP similarCode tool.
+
+Seeds Neo4j with synthetic code nodes under a dedicated label, each with a
+summary node carrying a random embedding, builds a vector index over the
+summaries and times the vector query, the lexical rerank and the embedding
+cache at several graph sizes. The benchmark nodes and index are removed
+afterwards.
+
+Usage:
+    python scripts/bench_similar_code.py --sizes 10000 100000 --queries 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+from codestory.config.settings import get_settings
+from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory_mcp.utils.similarity import (
+    SIMILAR_CODE_QUERY,
+    EmbeddingCache,
+    identifier_tokens,
+    rerank,
+)
+
+LABEL = "BenchSimilarCode"
+SUMMARY_LABEL = f"{LABEL}Summary"
+INDEX = f"{SUMMARY_LABEL.lower()}_embedding_vector_idx"
+WORDS = ["parse", "config", "load", "render", "user", "session", "cache", "http", "token", "graph"]
+
+
+def random_vector(dimensions: int) -> list[float]:
+    """Generate a random embedding."""
+    return [random.uniform(-1.0, 1.0) for _ in range(dimensions)]
+
+
+def random_name() -> str:
+    """Generate a random snake_case function name."""
+    return "_".join(random.sample(WORDS, 3))
+
+
+def seed(connector: Neo4jConnector, size: int, dimensions: int, batch_size: int = 1000) -> None:
+    """Create benchmark nodes with summaries carrying random embeddings."""
+    for offset in range(0, size, batch_size):
+        rows = []
+        for i in range(offset, min(size, offset + batch_size)):
+            name = random_name()
+            rows.append(
+                {
+                    "name": name,
+                    "path": f"pkg/mod{i % 500}.py",
+                    "code": f"def {name}(value):\n    return value",
+                    "embedding": random_vector(dimensions),
+                }
+            )
+        connector.execute_query(
+            f"UNWIND $rows AS row "
+            f"CREATE (n:{LABEL} {{name: row.name, path: row.path, code: row.code}}) "
+            f"CREATE (n)-[:HAS_SUMMARY]->(:{SUMMARY_LABEL} {{embedding: row.embedding}})",
+            params={"rows": rows},
+            write=True,
+        )
+
+
+def cleanup(connector: Neo4jConnector) -> None:
+    """Remove the benchmark nodes and index."""
+    connector.execute_query(f"DROP INDEX {INDEX} IF EXISTS", write=True)
+    for label in (LABEL, SUMMARY_LABEL):
+        connector.execute_query(
+            f"MATCH (n:{label}) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF 10000 ROWS",
+            write=True,
+        )
+
+
+def wait_for_index(connector: Neo4jConnector, timeout: float = 600.0) -> None:
+    """Wait until the vector index is online."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        rows = connector.execute_query(
+            "SHOW INDEXES YIELD name, state WHERE name = $name RETURN state",
+            params={"name": INDEX},
+        )
+        if rows and rows[0]["state"] == "ONLINE":
+            return
+        time.sleep(1.0)
+    raise TimeoutError(f"Vector index {INDEX} did not come online")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Get a percentile of latency samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_size(connector: Neo4jConnector, size: int, args: argparse.Namespace) -> None:
+    """Benchmark search over a graph of the given size."""
+    cleanup(connector)
+    start = time.perf_counter()
+    seed(connector, size, args.dimensions)
+    connector.create_vector_index(SUMMARY_LABEL, "embedding", dimensions=args.dimensions)
+    wait_for_index(connector)
+    print(f"\n{size} nodes seeded and indexed in {time.perf_counter() - start:.1f}s")
+
+    query_times = []
+    rerank_times = []
+    for _ in range(args.queries):
+        snippet = f"def {random_name()}(value): pass"
+        start = time.perf_counter()
+        rows = connector.execute_query(
+            SIMILAR_CODE_QUERY,
+            params={
+                "index": INDEX,
+                "labels": [LABEL],
+                "k": args.limit * args.candidate_factor,
+                "embedding": random_vector(args.dimensions),
+            },
+        )
+        query_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        candidates = [{**row, "vector_score": row["score"]} for row in rows]
+        rerank(candidates, identifier_tokens(snippet), args.limit)
+        rerank_times.append(time.perf_counter() - start)
+
+    for name, samples in (("vector query", query_times), ("rerank", rerank_times)):
+        print(
+            f"  {name:<12} p50 {statistics.median(samples) * 1000:8.2f} ms  "
+            f"p95 {percentile(samples, 0.95) * 1000:8.2f} ms"
+        )
+
+    if not args.keep:
+        cleanup(connector)
+
+
+def bench_cache(args: argparse.Namespace) -> None:
+    """Benchmark the embedding cache with a skewed snippet workload."""
+    cache = EmbeddingCache(args.cache_size)
+    snippets = [f"def {random_name()}_{i}(value): pass" for i in range(args.cache_size * 4)]
+    weights = [1.0 / (rank + 1) for rank in range(len(snippets))]
+    workload = random.choices(snippets, weights=weights, k=10000)
+
+    start = time.perf_counter()
+    for snippet in workload:
+        if cache.get(snippet) is None:
+            cache.put(snippet, [0.0] * 8)
+    duration = time.perf_counter() - start
+    print(
+        f"\nEmbedding cache: {cache.hits / len(workload):.1%} hit rate over {len(workload)} "
+        f"lookups, {duration / len(workload) * 1e6:.1f} us per lookup"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--candidate-factor", type=int, default=4)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--keep", action="store_true", help="Keep the last benchmark graph")
+    args = parser.parse_args()
+
+    random.seed(42)
+    bench_cache(args)
+
+    settings = get_settings()
+    connector = Neo4jConnector(
+        uri=settings.neo4j.uri,
+        username=settings.neo4j.username,
+        password=settings.neo4j.password.get_secret_value(),
+        database=settings.neo4j.database,
+    )
+    try:
+        for size in args.sizes:
+            bench_size(connector, size, args)
+    finally:
+        connector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+"""Load test of MCP tool calls against a simulated Code Story service.
+
+Starts a stub Code Story service that answers /v1/query/search after a fixed
+latency, and the MCP server (authentication disabled) pointed at it, each
+under uvicorn in its own process. It then fires concurrent searchGraph tool calls
+the way a fleet of agents would and reports the latency distribution, the
+number of requests that reached the service and the number of connections
+the MCP server opened to it.
+
+With --http2 the stub service runs under hypercorn over TLS with a
+self-signed certificate, so that the MCP server negotiates HTTP/2 with it
+(requires the ``http2`` extra and hypercorn).
+
+Usage:
+    python scripts/load_test_mcp.py --concurrency 500 --distinct-queries 50
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import httpx
+import structlog
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+def free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def create_stub_service(latency: float) -> FastAPI:
+    """Create a stub of the Code Story service search endpoint."""
+    app = FastAPI()
+    stats: dict[str, Any] = {"requests": 0, "connections": set(), "http_versions": set()}
+
+    @app.get("/stats")
+    async def get_stats() -> dict[str, Any]:
+        return {
+            "requests": stats["requests"],
+            "connections": len(stats["connections"]),
+            "http_versions": sorted(stats["http_versions"]),
+        }
+
+    @app.post("/v1/query/search")
+    async def search(request: Request) -> dict[str, Any]:
+        payload = await request.json()
+        stats["requests"] += 1
+        stats["connections"].add((request.client.host, request.client.port))  # type: ignore[union-attr]
+        stats["http_versions"].add(request.scope["http_version"])
+        await asyncio.sleep(latency)
+        return {
+            "data": [
+                {
+                    "id": f"node-{i}",
+                    "type": "Function",
+                    "properties": {"name": f"{payload['query']}_{i}", "path": f"src/m{i}.py"},
+                    "score": 1.0 - i * 0.1,
+                }
+                for i in range(min(payload.get("limit", 10), 10))
+            ]
+        }
+
+    return app
+
+
+def create_certificate(directory: str) -> tuple[str, str]:
+    """Create a self-signed certificate for 127.0.0.1.
+
+    Returns:
+        Paths of the certificate and its key
+    """
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    command = (
+        "openssl req -x509 -newkey rsa:2048 -nodes -days 1"
+        " -subj /CN=127.0.0.1 -addext subjectAltName=IP:127.0.0.1"
+    )
+    subprocess.run(
+        [*command.split(), "-keyout", keyfile, "-out", certfile],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def run_stub_service(
+    port: int, latency: float, certfile: str | None = None, keyfile: str | None = None
+) -> None:
+    """Run the stub service (in a child process).
+
+    Over TLS the service runs under hypercorn, which negotiates HTTP/2;
+    uvicorn only speaks HTTP/1.1.
+    """
+    app = create_stub_service(latency)
+    if not certfile:
+        uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+        return
+
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile = certfile
+    config.keyfile = keyfile
+    config.loglevel = "WARNING"
+    asyncio.run(serve(app, config))  # type: ignore[arg-type]
+
+
+def run_mcp_server(port: int, service_url: str, certfile: str | None = None) -> None:
+    """Run the MCP server (in a child process)."""
+    # Per-request console logging would dominate the measured latency
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+
+    # Configure the MCP server before its settings are first read
+    os.environ["MCP_AUTH_ENABLED"] = "false"
+    os.environ["MCP_CODE_STORY_SERVICE_URL"] = service_url
+    if certfile:
+        # Trust the stub service's self-signed certificate
+        os.environ["SSL_CERT_FILE"] = certfile
+
+    from codestory_mcp.server import create_app
+
+    uvicorn.run(create_app(), host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_process(target: Any, *args: Any) -> multiprocessing.Process:
+    """Start a server process and wait until it accepts connections."""
+    process = multiprocessing.Process(target=target, args=args, daemon=True)
+    process.start()
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", args[0]), timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise TimeoutError(f"Server on port {args[0]} did not start")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Get a percentile of latency samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(url: str, args: argparse.Namespace) -> tuple[list[float], int, float]:
+    """Fire concurrent tool calls.
+
+    Every simulated agent has its own client and keep-alive connection, as
+    separate agent processes would.
+
+    Returns:
+        Latencies, number of failed calls and duration of the calls
+    """
+    queries = [f"query_{i}" for i in range(args.distinct_queries)]
+    latencies: list[float] = []
+    failures = 0
+    agents = [httpx.AsyncClient(base_url=url, timeout=120.0) for _ in range(args.concurrency)]
+
+    async def call(client: httpx.AsyncClient) -> None:
+        nonlocal failures
+        start = time.perf_counter()
+        response = await client.post(
+            "/v1/tools/searchGraph", json={"query": random.choice(queries), "limit": 5}
+        )
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            failures += 1
+
+    try:
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(call(client) for client in agents))
+        duration = time.perf_counter() - start
+    finally:
+        await asyncio.gather(*(client.aclose() for client in agents))
+
+    return latencies, failures, duration
+
+
+def main() -> None:
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=500, help="Concurrent tool calls")
+    parser.add_argument("--rounds", type=int, default=5, help="Bursts of concurrent calls")
+    parser.add_argument("--distinct-queries", type=int, default=50)
+    parser.add_argument("--service-latency", type=float, default=0.05, help="Seconds")
+    parser.add_argument(
+        "--http2", action="store_true", help="Serve the stub service over TLS and HTTP/2"
+    )
+    args = parser.parse_args()
+
+    random.seed(42)
+    service_port = free_port()
+    mcp_port = free_port()
+
+    with tempfile.TemporaryDirectory() as cert_dir:
+        certfile = keyfile = None
+        if args.http2:
+            certfile, keyfile = create_certificate(cert_dir)
+        service_url = f"{'https' if args.http2 else 'http'}://127.0.0.1:{service_port}"
+
+        processes = [
+            start_process(run_stub_service, service_port, args.service_latency, certfile, keyfile),
+            start_process(run_mcp_server, mcp_port, service_url, certfile),
+        ]
+        try:
+            latencies, failures, duration = asyncio.run(
+                run_load(f"http://127.0.0.1:{mcp_port}", args)
+            )
+            stats = httpx.get(f"{service_url}/stats", verify=certfile or True).json()
+        finally:
+            for process in processes:
+                process.terminate()
+
+    calls = len(latencies)
+    print(f"{calls} tool calls in {duration:.1f}s ({calls / duration:.0f}/s), {failures} failed")
+    print(
+        f"latency p50 {statistics.median(latencies) * 1000:.1f} ms, "
+        f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, "
+        f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms"
+    )
+    print(
+        f"service requests: {stats['requests']}, "
+        f"connections from the MCP server: {stats['connections']}, "
+        f"HTTP versions: {', '.join(stats['http_versions'])}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 """Progress client for tracking ingestion job progress."""
 
-import json
 import threading
 import time
 from collections.abc import Callable
@@ -188,53 +187,57 @@ class ProgressClient:
             self._thread.join(timeout=2.0)
 
     def _subscribe_redis(self) -> None:
-        """Subscribe to Redis channel for progress updates."""
-        pubsub = self.redis.pubsub()
-        pubsub.subscribe(self.channel)
+        """Read the job's progress stream from Redis.
 
-        # Also look for pre-existing job information
-        try:
-            # Check if there's existing data in Redis for this job
-            latest_key = f"codestory:ingestion:latest:{self.job_id}"
-            latest_data = self.redis.get(latest_key)
-            if latest_data:
-                try:
-                    data = json.loads(latest_data)
-                    self.callback(data)
-                except (json.JSONDecodeError, TypeError) as e:
-                    self.console.print(f"[yellow]Warning: Could not parse latest job data: {e}[/]")
-        except Exception as e:
-            self.console.print(f"[yellow]Warning: Could not get latest job data: {e}[/]")
+        The stream is read from its start, so the events published before the
+        client connected are replayed first.
+        """
+        # Import here to keep the pipeline package out of CLI startup
+        from codestory.ingestion_pipeline.progress import TERMINAL_JOB_STATUSES, decode_event
 
-        try:
-            for message in pubsub.listen():
-                if self._stop_event.is_set():
-                    break
+        last_id: Any = "0-0"
+        while not self._stop_event.is_set():
+            try:
+                response = self.redis.xread({self.channel: last_id}, block=1000, count=100)
+            except redis.RedisError as e:
+                self.console.print(f"[yellow]Warning: Could not read job updates: {e}[/]")
+                time.sleep(self.poll_interval)
+                continue
+
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    data = decode_event(fields)
+                    if data is None:
+                        self.console.print("[yellow]Warning: Could not parse job update[/]")
+                        continue
+                    self.callback(data)
 
-                if message["type"] == "message":
-                    try:
-                        data = json.loads(message["data"])
-                        self.callback(data)
-
-                        # Check if this is a terminal status and break
-                        if data.get("status") in ("completed", "failed", "cancelled"):
-                            break
-                    except (json.JSONDecodeError, TypeError) as e:
-                        self.console.print(f"[yellow]Warning: Could not parse job update: {e}[/]")
-                elif message["type"] == "heartbeat":
-                    # Handle heartbeat messages
-                    pass
-        finally:
-            pubsub.unsubscribe()
-            pubsub.close()
+                    # Stop once the job has finished
+                    if data.get("job_status") in TERMINAL_JOB_STATUSES:
+                        return
 
     def _poll_http(self) -> None:
-        """Poll service API for progress updates when Redis is unavailable."""
+        """Follow progress through the service API when Redis is unavailable."""
         # Import here to avoid circular imports
         from codestory.cli.client.service_client import ServiceClient, ServiceError
+        from codestory.ingestion_pipeline.progress import TERMINAL_JOB_STATUSES
 
         client = ServiceClient(console=self.console, settings=self.settings)
 
+        # Follow the service's event stream, and poll if it is not available
+        try:
+            for data in client.stream_ingestion_events(self.job_id):
+                if self._stop_event.is_set():
+                    return
+                if data.get("type") == "heartbeat":
+                    continue
+                self.callback(data)
+                if data.get("job_status") in TERMINAL_JOB_STATUSES:
+                    return
+        except ServiceError as e:
+            self.console.print(f"[dim]Event stream not available, polling instead: {e}[/]")
+
         while not self._stop_event.is_set():
             try:
                 # Get job status from service API
@@ -5,6 +5,7 @@ import os
 import sys
 import time
 import webbrowser
+from collections.abc import Iterator
 from typing import Any
 
 import httpx
@@ -442,6 +443,30 @@ class ServiceClient:
         except httpx.HTTPError as e:
             raise ServiceError(f"Failed to get ingestion status: {e!s}") from e
 
+    def stream_ingestion_events(self, job_id: str) -> Iterator[dict[str, Any]]:
+        """
+        Stream the progress events of an ingestion job.
+
+        Events recorded before the call are replayed first, and the stream
+        ends when the job finishes.
+
+        Args:
+            job_id: ID of the ingestion job.
+
+        Yields:
+            Progress events and heartbeats.
+        """
+        try:
+            with self.client.stream(
+                "GET", f"/ingest/{job_id}/events", timeout=httpx.Timeout(30.0, read=None)
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line.strip():
+                        yield json.loads(line)
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            raise ServiceError(f"Failed to stream ingestion events: {e!s}") from e
+
     def stop_ingestion(self, job_id: str) -> dict[str, Any]:
         """
         Stop an ingestion job.
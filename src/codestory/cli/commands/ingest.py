@@ -993,21 +993,23 @@ def _show_progress(ctx: click.Context, job_id: str) -> None:
     def update_progress(data: dict[str, Any]) -> None:
         nonlocal step_tasks
 
-        # Handle different response formats (service API vs Celery/Redis format)
-        # Format conversion for Redis PubSub messages
+        # Handle different response formats (service API vs progress events)
         if "job_id" in data and "step" in data:
+            from codestory.ingestion_pipeline.progress import PIPELINE_STEP
             from codestory.ingestion_pipeline.step import StepStatus
 
-            # This is a JobProgressEvent from Redis
-            overall_status = data.get("status", StepStatus.RUNNING).lower()
+            # This is a progress event; its status is the step's status and
+            # job_status the status of the job as a whole
+            step_status = (data.get("status") or StepStatus.RUNNING).lower()
+            overall_status = (data.get("job_status") or step_status).lower()
             overall_progress = data.get("overall_progress", 0)
 
-            # Convert to steps format
-            if "steps" not in data:
+            # Convert to steps format; job events only update the overall bar
+            if "steps" not in data and data["step"] != PIPELINE_STEP:
                 data["steps"] = [
                     {
                         "name": data.get("step", "Processing"),
-                        "status": overall_status,
+                        "status": step_status,
                         "progress": data.get("progress", 0),
                         "message": data.get("message", ""),
                     }
@@ -49,6 +49,14 @@ class OpenAISettings(BaseModel):
     temperature: float = Field(0.1, description="Temperature for generation")
     max_tokens: int = Field(4096, description="Maximum tokens per request")
     timeout: float = Field(60.0, description="Timeout in seconds for API requests")
+    batch_chat_model: str | None = Field(
+        None, description="Deployment for Batch API chat requests (default: chat_model)"
+    )
+    batch_embedding_model: str | None = Field(
+        None, description="Deployment for Batch API embedding requests (default: embedding_model)"
+    )
+    batch_poll_interval: float = Field(60.0, description="Seconds between batch status checks")
+    batch_completion_window: str = Field("24h", description="Completion window of batches")
 
 
 class AzureOpenAISettings(BaseModel):
@@ -101,6 +109,10 @@ class IngestionSettings(BaseModel):
     resource_max_tokens: int = Field(
         4, description="Maximum number of concurrent ingestion resource tokens (for throttling)"
     )
+    resource_step_weights: dict[str, int] = Field(
+        default_factory=lambda: {"filesystem": 1, "blarify": 2, "ast": 2},
+        description="Resource tokens held by each step while it runs (other steps hold 1)",
+    )
     steps: dict[str, dict[str, Any]] = Field(
         default_factory=dict, description="Step-specific configuration"
     )
@@ -49,6 +49,9 @@ PROPERTY_INDEXES = [
     """
     CREATE INDEX node_created_at_idx FOR (n) ON (n.created_at)
     """,
+    """
+    CREATE INDEX summary_id_idx FOR (s:Summary) ON (s.id)
+    """,
 ]
 
 
@@ -78,7 +81,8 @@ def get_vector_index_query(
     """
 
 
-# Standard vector indexes
+# Standard vector indexes. Only summaries and documentation are embedded;
+# code nodes are found through the Summary nodes that describe them.
 VECTOR_INDEXES = [
     get_vector_index_query("Summary", "embedding"),
     get_vector_index_query("Documentation", "embedding"),
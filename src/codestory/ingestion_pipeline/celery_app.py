@@ -65,6 +65,7 @@ def create_celery_app() -> Celery:
     app.autodiscover_tasks(
         [
             "codestory_blarify",
+            "codestory_ast",
             "codestory_filesystem",
             "codestory_summarizer",
             "codestory_docgrapher",
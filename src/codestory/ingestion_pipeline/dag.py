@@ -0,0 +1,108 @@
+"""Dependency graph handling for ingestion pipeline steps.
+
+This module resolves the ``depends_on`` declarations of pipeline steps into a
+dependency graph and groups the steps into levels that can run concurrently.
+"""
+
+import logging
+from typing import Any
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Dependencies used for built-in steps that do not declare ``depends_on``.
+# The documentation grapher only needs the filesystem and AST structure, so it
+# can run alongside the summarizer. Either AST step (blarify or ast) may be
+# configured; dependencies on steps that are not configured are dropped.
+DEFAULT_STEP_DEPENDENCIES: dict[str, list[str]] = {
+    "filesystem": [],
+    "blarify": ["filesystem"],
+    "ast": ["filesystem"],
+    "summarizer": ["filesystem", "blarify", "ast"],
+    "documentation_grapher": ["filesystem", "blarify", "ast"],
+    "docgrapher": ["filesystem", "blarify", "ast"],
+}
+
+
+def resolve_step_dependencies(step_configs: list[dict[str, Any]]) -> dict[str, list[str]]:
+    """Resolve the dependencies of each configured step.
+
+    Explicit ``depends_on`` lists take precedence. Built-in steps without one
+    use DEFAULT_STEP_DEPENDENCIES, and unknown steps depend on the step
+    configured before them so that legacy sequential configs keep their order.
+    Dependencies on steps that are not part of the pipeline are dropped.
+
+    Args:
+        step_configs: Step configurations, each with a ``name`` key
+
+    Returns:
+        Dict mapping each step name to the names of the steps it depends on
+
+    Raises:
+        ValueError: If a step is configured twice or depends_on is malformed
+    """
+    names = [step["name"] for step in step_configs]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate pipeline steps: {', '.join(sorted(duplicates))}")
+
+    configured = set(names)
+    dependencies: dict[str, list[str]] = {}
+
+    for index, step in enumerate(step_configs):
+        name = step["name"]
+
+        if "depends_on" in step:
+            declared = step["depends_on"] or []
+            if isinstance(declared, str):
+                declared = [declared]
+            if not isinstance(declared, list) or not all(isinstance(d, str) for d in declared):
+                raise ValueError(f"Step '{name}' depends_on must be a list of step names")
+        elif name in DEFAULT_STEP_DEPENDENCIES:
+            declared = DEFAULT_STEP_DEPENDENCIES[name]
+        else:
+            declared = names[index - 1 : index] if index > 0 else []
+
+        missing = [d for d in declared if d not in configured]
+        if missing and "depends_on" in step:
+            logger.warning(
+                f"Step '{name}' depends on steps not in the pipeline: {', '.join(missing)}"
+            )
+
+        dependencies[name] = [d for d in declared if d in configured and d != name]
+
+    return dependencies
+
+
+def topological_levels(step_configs: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Group steps into levels of mutually independent steps.
+
+    Every step in a level only depends on steps in earlier levels, so all
+    steps of a level can run concurrently. Steps keep their configured order
+    within a level.
+
+    Args:
+        step_configs: Step configurations, each with a ``name`` key
+
+    Returns:
+        List of levels, each a list of step configurations
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    dependencies = resolve_step_dependencies(step_configs)
+    remaining = list(step_configs)
+    done: set[str] = set()
+    levels: list[list[dict[str, Any]]] = []
+
+    while remaining:
+        level = [s for s in remaining if all(d in done for d in dependencies[s["name"]])]
+        if not level:
+            cycle = ", ".join(s["name"] for s in remaining)
+            raise ValueError(f"Pipeline step dependencies contain a cycle among: {cycle}")
+
+        levels.append(level)
+        done.update(s["name"] for s in level)
+        remaining = [s for s in remaining if s["name"] not in done]
+
+    return levels
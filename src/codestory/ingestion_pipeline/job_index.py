@@ -0,0 +1,476 @@
+"""Persistent index of ingestion jobs backed by Redis.
+
+Celery only knows about individual task results, so listing jobs or finding
+the jobs that wait on another one used to mean scanning the keyspace. The
+index keeps one hash per job plus sorted sets keyed by creation time, so
+listing a page of jobs by status and/or repository costs O(log n + page size)
+however many historical jobs there are. Job dependencies are stored as
+reverse-adjacency sets: a completing job only touches its own dependents, and
+a job that fails or is cancelled fails or cancels the jobs waiting on it.
+"""
+
+import heapq
+import json
+import logging
+import time
+from typing import Any
+
+import redis
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Status of a submitted job that waits for other jobs to complete
+WAITING = "waiting"
+
+# Status that releases a job's dependents
+COMPLETED = "completed"
+
+
+class DependencyFailedError(Exception):
+    """Raised when a job is submitted with a dependency that failed or was cancelled."""
+
+    def __init__(self, dependency: str, status: str):
+        """Initialize the error.
+
+        Args:
+            dependency: ID of the dependency
+            status: Terminal status of the dependency
+        """
+        super().__init__(f"Dependency {dependency} is {status}")
+        self.dependency = dependency
+        self.status = status
+
+# Shared by the scripts: record a job's status and keep the sorted-set
+# indexes in step with it. Keys are derived from the prefix ``p`` (see
+# JobIndex), not passed in KEYS. Status changes only move forward, so a late
+# "running" update cannot resurrect a job that has already finished.
+_SET_STATUS = """
+local ranks = {waiting = 0, pending = 1, running = 2, cancelling = 3,
+               completed = 4, failed = 4, cancelled = 4}
+
+local function set_status(p, id, status, now, created_at, repository, fields)
+  local key = p .. ':job:' .. id
+  local old = redis.call('HGET', key, 'status')
+  if old and (ranks[old] or 0) >= 4 and old ~= status then
+    return old
+  end
+  if old and (ranks[status] or 0) < (ranks[old] or 0) then
+    return old
+  end
+
+  local created = redis.call('HGET', key, 'created_at') or created_at
+  local repo = redis.call('HGET', key, 'repository')
+  if not repo or repo == '' then
+    repo = repository
+  end
+
+  for i = 1, #fields, 2 do
+    redis.call('HSET', key, fields[i], fields[i + 1])
+  end
+  redis.call('HSET', key, 'job_id', id, 'status', status, 'created_at', created,
+             'updated_at', now, 'repository', repo)
+
+  local score = tonumber(created)
+  redis.call('ZADD', p .. ':all', score, id)
+  if old and old ~= status then
+    redis.call('ZREM', p .. ':status:' .. old, id)
+    if repo ~= '' then
+      redis.call('ZREM', p .. ':repo:' .. repo .. ':status:' .. old, id)
+    end
+  end
+  redis.call('ZADD', p .. ':status:' .. status, score, id)
+  if repo ~= '' then
+    redis.call('ZADD', p .. ':repo:' .. repo, score, id)
+    redis.call('ZADD', p .. ':repo:' .. repo .. ':status:' .. status, score, id)
+  end
+  return old
+end
+
+-- Finish the jobs still waiting on a job that failed or was cancelled, and
+-- the jobs waiting on those in turn. Dependents of a failed job fail, those
+-- of a cancelled job are cancelled.
+local function finish_dependents(p, id, status, now)
+  local finished = {}
+  local queue = {id}
+  local head = 1
+  while queue[head] do
+    local cid = queue[head]
+    head = head + 1
+    local dependents_key = p .. ':dependents:' .. cid
+    for _, dep in ipairs(redis.call('SMEMBERS', dependents_key)) do
+      if redis.call('HGET', p .. ':job:' .. dep, 'status') == 'waiting' then
+        set_status(p, dep, status, now, now, '',
+                   {'error', 'Dependency ' .. cid .. ' is ' .. status})
+        redis.call('DEL', p .. ':waiting_on:' .. dep)
+        table.insert(finished, dep)
+        table.insert(queue, dep)
+      end
+    end
+    redis.call('DEL', dependents_key)
+  end
+  return finished
+end
+"""
+
+# ARGV: prefix, job_id, status, now, created_at, repository, field, value, ...
+# A job that fails or is cancelled finishes its waiting dependents as well
+_RECORD_SCRIPT = (
+    _SET_STATUS
+    + """
+local p, id, status, now = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local fields = {}
+for i = 7, #ARGV do
+  table.insert(fields, ARGV[i])
+end
+local old = set_status(p, id, status, now, ARGV[5], ARGV[6], fields)
+if (status == 'failed' or status == 'cancelled')
+    and redis.call('HGET', p .. ':job:' .. id, 'status') == status then
+  finish_dependents(p, id, status, now)
+end
+return old
+"""
+)
+
+# ARGV: prefix, job_id, now, repository, request, dependency, ...
+# Returns the dependencies that have not completed yet. Nothing is recorded if
+# a dependency failed or was cancelled; an error naming it is returned instead.
+_ADD_WAITING_SCRIPT = (
+    _SET_STATUS
+    + """
+local p, id, now = ARGV[1], ARGV[2], ARGV[3]
+for i = 6, #ARGV do
+  local dep_status = redis.call('HGET', p .. ':job:' .. ARGV[i], 'status')
+  if dep_status == 'failed' or dep_status == 'cancelled' then
+    return redis.error_reply('DEPENDENCY_FAILED ' .. ARGV[i] .. ' ' .. dep_status)
+  end
+end
+
+local unmet = {}
+for i = 6, #ARGV do
+  local dep = ARGV[i]
+  if redis.call('HGET', p .. ':job:' .. dep, 'status') ~= 'completed' then
+    table.insert(unmet, dep)
+    redis.call('SADD', p .. ':dependents:' .. dep, id)
+    redis.call('SADD', p .. ':waiting_on:' .. id, dep)
+  end
+end
+
+local status = 'pending'
+if #unmet > 0 then
+  status = 'waiting'
+end
+set_status(p, id, status, now, now, ARGV[4], {'request', ARGV[5]})
+return unmet
+"""
+)
+
+# ARGV: prefix, job_id, now
+# Returns the dependents that no longer wait on anything; they are moved from
+# waiting to pending, so only one caller gets to start each of them
+_COMPLETE_SCRIPT = (
+    _SET_STATUS
+    + """
+local p, cid, now = ARGV[1], ARGV[2], ARGV[3]
+set_status(p, cid, 'completed', now, now, '', {})
+
+local dependents_key = p .. ':dependents:' .. cid
+local ready = {}
+for _, id in ipairs(redis.call('SMEMBERS', dependents_key)) do
+  local waiting_key = p .. ':waiting_on:' .. id
+  redis.call('SREM', waiting_key, cid)
+  if redis.call('SCARD', waiting_key) == 0
+      and redis.call('HGET', p .. ':job:' .. id, 'status') == 'waiting' then
+    set_status(p, id, 'pending', now, now, '', {})
+    table.insert(ready, id)
+  end
+end
+redis.call('DEL', dependents_key)
+return ready
+"""
+)
+
+
+class JobIndex:
+    """Indexes ingestion jobs by status, repository and creation time.
+
+    Keys written by the index:
+
+    - ``<prefix>:job:<job_id>``: job hash (status, repository, timestamps and
+      any extra fields recorded with the job)
+    - ``<prefix>:all``: sorted set of all job IDs scored by creation time
+    - ``<prefix>:status:<status>``: job IDs with the given status
+    - ``<prefix>:repo:<repository>``: job IDs for the given repository
+    - ``<prefix>:repo:<repository>:status:<status>``: both of the above
+    - ``<prefix>:dependents:<job_id>``: jobs waiting on the job
+    - ``<prefix>:waiting_on:<job_id>``: dependencies the job still waits on
+
+    The Lua scripts that update the index build these key names from the
+    prefix passed in ARGV, because the dependents a script touches are only
+    known once it reads them. Redis cannot route or check keys that a script
+    does not declare in KEYS, so the index needs a standalone (or replicated)
+    Redis rather than Redis Cluster, and an ACL user for it must be granted
+    every key under ``<prefix>:*``.
+    """
+
+    def __init__(self, redis_client: redis.Redis, key_prefix: str = "codestory:jobs"):
+        """Initialize the job index.
+
+        Args:
+            redis_client: Redis client (created with decode_responses=True)
+            key_prefix: Prefix for all keys written by the index
+        """
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+
+        self._record = self.redis.register_script(_RECORD_SCRIPT)
+        self._add_waiting = self.redis.register_script(_ADD_WAITING_SCRIPT)
+        self._complete = self.redis.register_script(_COMPLETE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, redis_url: str, **kwargs: Any) -> "JobIndex":
+        """Create a job index connected to the given Redis URL.
+
+        Args:
+            redis_url: Redis connection URL
+            **kwargs: Additional arguments for the index
+
+        Returns:
+            JobIndex instance
+        """
+        return cls(redis.from_url(redis_url, decode_responses=True), **kwargs)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}:job:{job_id}"
+
+    def _list_key(self, status: str | None, repository: str | None) -> str:
+        if repository and status:
+            return f"{self.key_prefix}:repo:{repository}:status:{status}"
+        if repository:
+            return f"{self.key_prefix}:repo:{repository}"
+        if status:
+            return f"{self.key_prefix}:status:{status}"
+        return f"{self.key_prefix}:all"
+
+    def record(
+        self,
+        job_id: str,
+        status: str,
+        repository: str | None = None,
+        created_at: float | None = None,
+        **fields: Any,
+    ) -> str | None:
+        """Record a job's status, creating the job if it is not indexed yet.
+
+        Status changes only move forward (waiting -> pending -> running ->
+        finished); an update that would move a job backwards, or out of a
+        finished status, is ignored. Recording a job as failed or cancelled
+        fails or cancels the jobs waiting on it, transitively.
+
+        Args:
+            job_id: ID of the job
+            status: New status of the job
+            repository: Repository the job ingests
+            created_at: Creation time of a new job (defaults to now)
+            **fields: Additional fields to store on the job
+
+        Returns:
+            The job's previous status, or None if it was not indexed
+        """
+        now = time.time()
+        args: list[Any] = [
+            self.key_prefix,
+            job_id,
+            status,
+            now,
+            created_at or now,
+            repository or "",
+        ]
+        for name, value in fields.items():
+            if value is not None:
+                args.extend([name, value if isinstance(value, str) else json.dumps(value)])
+        return self._record(args=args)
+
+    def add_waiting(
+        self,
+        job_id: str,
+        dependencies: list[str],
+        request: dict[str, Any],
+        repository: str | None = None,
+    ) -> list[str]:
+        """Record a job that may only start once its dependencies complete.
+
+        Dependencies that have already completed are not waited on. If none
+        are left, the job is recorded as pending and can start right away.
+        Should a dependency fail or be cancelled later, the job fails or is
+        cancelled with it.
+
+        Args:
+            job_id: ID of the job
+            dependencies: IDs of the jobs it depends on
+            request: Ingestion request to start once the job is ready
+            repository: Repository the job ingests
+
+        Returns:
+            The dependencies the job is waiting on
+
+        Raises:
+            DependencyFailedError: If a dependency has already failed or been
+                cancelled; the job is not recorded then
+        """
+        try:
+            unmet = self._add_waiting(
+                args=[
+                    self.key_prefix,
+                    job_id,
+                    time.time(),
+                    repository or "",
+                    json.dumps(request),
+                    *dependencies,
+                ]
+            )
+        except redis.ResponseError as e:
+            parts = str(e).split()
+            if len(parts) == 3 and parts[0] == "DEPENDENCY_FAILED":
+                raise DependencyFailedError(parts[1], parts[2]) from None
+            raise
+        return list(unmet)
+
+    def complete(self, job_id: str) -> list[str]:
+        """Mark a job as completed and release the jobs waiting on it.
+
+        Args:
+            job_id: ID of the completed job
+
+        Returns:
+            IDs of dependents that no longer wait on anything. Each is
+            returned to exactly one caller, which is responsible for
+            starting it.
+        """
+        return list(self._complete(args=[self.key_prefix, job_id, time.time()]))
+
+    def waiting_on(self, job_id: str) -> set[str]:
+        """Get the dependencies a job is still waiting on.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Set of job IDs
+        """
+        return set(self.redis.smembers(f"{self.key_prefix}:waiting_on:{job_id}"))
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """Get an indexed job.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Job dictionary, or None if the job is not indexed
+        """
+        return self._decode(self.redis.hgetall(self._job_key(job_id)))
+
+    def count_jobs(self, status: list[str] | None = None, repository: str | None = None) -> int:
+        """Count indexed jobs.
+
+        Args:
+            status: Statuses to include, or None for all
+            repository: Only count jobs for this repository
+
+        Returns:
+            Number of matching jobs
+        """
+        keys = [self._list_key(s, repository) for s in status] if status else [
+            self._list_key(None, repository)
+        ]
+        with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.zcard(key)
+            return sum(pipe.execute())
+
+    def list_jobs(
+        self,
+        status: list[str] | None = None,
+        repository: str | None = None,
+        limit: int = 10,
+        offset: int = 0,
+        descending: bool = True,
+    ) -> list[dict[str, Any]]:
+        """List indexed jobs ordered by creation time.
+
+        A single status (or none) is one range query on a sorted set. For
+        several statuses the first offset + limit entries of each status are
+        merged.
+
+        Args:
+            status: Statuses to include, or None for all
+            repository: Only list jobs for this repository
+            limit: Maximum number of jobs to return
+            offset: Number of jobs to skip
+            descending: Newest jobs first if True
+
+        Returns:
+            List of job dictionaries
+        """
+        if limit <= 0:
+            return []
+
+        keys = [self._list_key(s, repository) for s in status] if status else [
+            self._list_key(None, repository)
+        ]
+        zrange = self.redis.zrevrange if descending else self.redis.zrange
+
+        if len(keys) == 1:
+            job_ids = zrange(keys[0], offset, offset + limit - 1)
+        else:
+            with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    (pipe.zrevrange if descending else pipe.zrange)(
+                        key, 0, offset + limit - 1, withscores=True
+                    )
+                ranges = pipe.execute()
+            merged = heapq.merge(
+                *ranges, key=lambda entry: (-entry[1] if descending else entry[1])
+            )
+            job_ids = [job_id for job_id, _ in merged][offset : offset + limit]
+
+        if not job_ids:
+            return []
+
+        with self.redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._job_key(job_id))
+            records = pipe.execute()
+        return [job for job in map(self._decode, records) if job is not None]
+
+    @staticmethod
+    def _decode(raw: dict[str, str]) -> dict[str, Any] | None:
+        if not raw:
+            return None
+
+        job: dict[str, Any] = dict(raw)
+        for key in ("created_at", "updated_at"):
+            if job.get(key):
+                job[key] = float(job[key])
+        for key in ("request", "duration"):
+            if job.get(key):
+                job[key] = json.loads(job[key])
+        return job
+
+
+_job_index: JobIndex | None = None
+
+
+def get_job_index() -> JobIndex:
+    """Get the process-wide job index.
+
+    Returns:
+        JobIndex connected to the configured Redis
+    """
+    global _job_index
+    if _job_index is None:
+        from codestory.config.settings import get_settings
+
+        _job_index = JobIndex.from_url(get_settings().redis.uri)
+    return _job_index
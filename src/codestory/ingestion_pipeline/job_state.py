@@ -0,0 +1,371 @@
+"""Persistent pipeline job state machine backed by Redis.
+
+The orchestrator no longer waits on step tasks. Instead, every transition of
+a job or one of its steps is recorded here, and continuation tasks use the
+recorded dependency graph to decide which steps become runnable next.
+"""
+
+import json
+import logging
+import time
+from typing import Any
+
+import redis
+
+from .step import StepStatus
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Statuses from which a job or step can no longer change
+TERMINAL_STATUSES = frozenset(
+    {StepStatus.COMPLETED, StepStatus.FAILED, StepStatus.STOPPED, StepStatus.CANCELLED}
+)
+
+# Allowed status transitions for steps. RUNNING -> PENDING is a retry.
+STEP_TRANSITIONS: dict[StepStatus, frozenset[StepStatus]] = {
+    StepStatus.PENDING: frozenset({StepStatus.RUNNING, StepStatus.CANCELLED}),
+    StepStatus.RUNNING: frozenset(
+        {StepStatus.PENDING, StepStatus.COMPLETED, StepStatus.FAILED, StepStatus.CANCELLED}
+    ),
+}
+
+# Allowed status transitions for jobs
+JOB_TRANSITIONS: dict[StepStatus, frozenset[StepStatus]] = {
+    StepStatus.PENDING: frozenset({StepStatus.RUNNING, StepStatus.FAILED, StepStatus.CANCELLED}),
+    StepStatus.RUNNING: frozenset(
+        {StepStatus.COMPLETED, StepStatus.FAILED, StepStatus.CANCELLED}
+    ),
+}
+
+
+class PipelineJobStore:
+    """Stores pipeline jobs, their steps and their dependency graph in Redis.
+
+    Each job is kept in a small set of keys:
+
+    - ``<prefix>:job:<job_id>``: job hash (status, timings, step order and
+      dependency graph)
+    - ``<prefix>:job:<job_id>:steps``: step name -> JSON step record
+    - ``<prefix>:job:<job_id>:claims``: step name -> claim marker, used so that
+      exactly one continuation dispatches each step
+    - ``<prefix>:task:<task_id>``: orchestrator task ID -> job ID
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        key_prefix: str = "codestory:pipeline",
+        finished_ttl: int = 7 * 24 * 3600,
+    ):
+        """Initialize the job store.
+
+        Args:
+            redis_client: Redis client (created with decode_responses=True)
+            key_prefix: Prefix for all keys written by the store
+            finished_ttl: Seconds to keep finished jobs before they expire
+        """
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.finished_ttl = finished_ttl
+
+    @classmethod
+    def from_url(cls, redis_url: str, **kwargs: Any) -> "PipelineJobStore":
+        """Create a job store connected to the given Redis URL.
+
+        Args:
+            redis_url: Redis connection URL
+            **kwargs: Additional arguments for the store
+
+        Returns:
+            PipelineJobStore instance
+        """
+        return cls(redis.from_url(redis_url, decode_responses=True), **kwargs)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}:job:{job_id}"
+
+    def _steps_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}:job:{job_id}:steps"
+
+    def _claims_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}:job:{job_id}:claims"
+
+    def _task_key(self, task_id: str) -> str:
+        return f"{self.key_prefix}:task:{task_id}"
+
+    def create_job(
+        self,
+        job_id: str,
+        orchestrator_task_id: str | None,
+        repository_path: str,
+        step_configs: list[dict[str, Any]],
+        dependencies: dict[str, list[str]],
+    ) -> None:
+        """Record a new job with all of its steps in PENDING state.
+
+        Args:
+            job_id: ID of the pipeline job
+            orchestrator_task_id: Celery task ID of the orchestrator, if any
+            repository_path: Path to the repository being processed
+            step_configs: Step configurations, each with a ``name`` key
+            dependencies: Mapping of step names to the steps they depend on
+        """
+        now = time.time()
+        job = {
+            "job_id": job_id,
+            "orchestrator_task_id": orchestrator_task_id or "",
+            "repository_path": repository_path,
+            "status": StepStatus.RUNNING.value,
+            "start_time": now,
+            "step_order": json.dumps([s["name"] for s in step_configs]),
+            "step_configs": json.dumps({s["name"]: s for s in step_configs}),
+            "dependencies": json.dumps(dependencies),
+        }
+        steps = {
+            s["name"]: json.dumps(
+                {
+                    "step": s["name"],
+                    "status": StepStatus.PENDING.value,
+                    "job_id": job_id,
+                    "repository_path": repository_path,
+                    "retry_count": 0,
+                }
+            )
+            for s in step_configs
+        }
+
+        with self.redis.pipeline() as pipe:
+            pipe.hset(self._job_key(job_id), mapping=job)
+            if steps:
+                pipe.hset(self._steps_key(job_id), mapping=steps)
+            if orchestrator_task_id:
+                pipe.set(self._task_key(orchestrator_task_id), job_id)
+            pipe.execute()
+
+    def job_id_for_task(self, task_id: str) -> str | None:
+        """Look up the job started by an orchestrator task.
+
+        Args:
+            task_id: Celery task ID of the orchestrator
+
+        Returns:
+            Job ID, or None if the task did not start a tracked job
+        """
+        return self.redis.get(self._task_key(task_id))  # type: ignore[return-value]
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """Load a job with its steps.
+
+        Args:
+            job_id: ID of the pipeline job
+
+        Returns:
+            Job dictionary with ``steps`` (in configured order), or None if
+            the job does not exist
+        """
+        job = self.redis.hgetall(self._job_key(job_id))
+        if not job:
+            return None
+
+        raw_steps = self.redis.hgetall(self._steps_key(job_id))
+        step_order = json.loads(job.pop("step_order"))
+        job["step_configs"] = json.loads(job["step_configs"])
+        job["dependencies"] = json.loads(job["dependencies"])
+        job["steps"] = [json.loads(raw_steps[name]) for name in step_order if name in raw_steps]
+        for key in ("start_time", "end_time"):
+            if key in job:
+                job[key] = float(job[key])
+        return job
+
+    def get_step(self, job_id: str, step_name: str) -> dict[str, Any] | None:
+        """Load a single step record.
+
+        Args:
+            job_id: ID of the pipeline job
+            step_name: Name of the step
+
+        Returns:
+            Step record, or None if it does not exist
+        """
+        raw = self.redis.hget(self._steps_key(job_id), step_name)
+        return json.loads(raw) if raw else None  # type: ignore[arg-type]
+
+    def transition_step(
+        self, job_id: str, step_name: str, status: StepStatus, **fields: Any
+    ) -> dict[str, Any] | None:
+        """Atomically move a step to a new status.
+
+        Invalid transitions (for example a late completion of a step that was
+        already cancelled) are ignored.
+
+        Args:
+            job_id: ID of the pipeline job
+            step_name: Name of the step
+            status: New status of the step
+            **fields: Additional fields to merge into the step record
+
+        Returns:
+            Updated step record, or None if the transition was not allowed
+        """
+        key = self._steps_key(job_id)
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    raw = pipe.hget(key, step_name)
+                    if raw is None:
+                        pipe.unwatch()
+                        return None
+
+                    record = json.loads(raw)
+                    current = StepStatus(record["status"])
+                    if status not in STEP_TRANSITIONS.get(current, frozenset()):
+                        pipe.unwatch()
+                        logger.debug(
+                            f"Ignoring step transition {current.value} -> {status.value} "
+                            f"for {step_name} in job {job_id}"
+                        )
+                        return None
+
+                    record.update(fields)
+                    record["status"] = status.value
+                    pipe.multi()
+                    pipe.hset(key, step_name, json.dumps(record))
+                    pipe.execute()
+                    return record  # type: ignore[no-any-return]
+                except redis.WatchError:
+                    continue  # Retry on concurrent modification
+
+    def transition_job(self, job_id: str, status: StepStatus, **fields: Any) -> bool:
+        """Atomically move a job to a new status.
+
+        Args:
+            job_id: ID of the pipeline job
+            status: New status of the job
+            **fields: Additional fields to store on the job
+
+        Returns:
+            True if the transition was applied
+        """
+        key = self._job_key(job_id)
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    current_raw = pipe.hget(key, "status")
+                    if current_raw is None:
+                        pipe.unwatch()
+                        return False
+
+                    current = StepStatus(current_raw)
+                    if status not in JOB_TRANSITIONS.get(current, frozenset()):
+                        pipe.unwatch()
+                        return False
+
+                    pipe.multi()
+                    pipe.hset(key, mapping={"status": status.value, **fields})
+                    pipe.execute()
+                    return True
+                except redis.WatchError:
+                    continue  # Retry on concurrent modification
+
+    def claim(self, job_id: str, name: str) -> bool:
+        """Claim the right to act on a step (or on the job, with name "__job__").
+
+        Args:
+            job_id: ID of the pipeline job
+            name: Step name or claim name
+
+        Returns:
+            True if this caller obtained the claim
+        """
+        return bool(self.redis.hsetnx(self._claims_key(job_id), name, time.time()))
+
+    def release_claim(self, job_id: str, name: str) -> None:
+        """Release a claim so the step can be dispatched again (used for retries).
+
+        Args:
+            job_id: ID of the pipeline job
+            name: Step name or claim name
+        """
+        self.redis.hdel(self._claims_key(job_id), name)
+
+    def claim_ready_steps(self, job_id: str) -> list[str]:
+        """Claim every pending step whose dependencies have all completed.
+
+        Each step's own result is written before this is called, so whichever
+        continuation finishes last is guaranteed to see all dependencies
+        complete; the claim ensures the step is dispatched only once.
+
+        Args:
+            job_id: ID of the pipeline job
+
+        Returns:
+            Names of the steps claimed by this caller
+        """
+        job = self.get_job(job_id)
+        if not job or StepStatus(job["status"]) in TERMINAL_STATUSES:
+            return []
+
+        statuses = {s["step"]: StepStatus(s["status"]) for s in job["steps"]}
+        ready = [
+            name
+            for name, status in statuses.items()
+            if status == StepStatus.PENDING
+            and all(statuses.get(d) == StepStatus.COMPLETED for d in job["dependencies"][name])
+        ]
+        return [name for name in ready if self.claim(job_id, name)]
+
+    def dependents_of(self, job_id: str, step_name: str) -> list[str]:
+        """Find all steps that transitively depend on a step.
+
+        Args:
+            job_id: ID of the pipeline job
+            step_name: Name of the step
+
+        Returns:
+            Names of the dependent steps
+        """
+        raw = self.redis.hget(self._job_key(job_id), "dependencies")
+        dependencies: dict[str, list[str]] = json.loads(raw) if raw else {}  # type: ignore[arg-type]
+
+        dependents: list[str] = []
+        frontier = [step_name]
+        while frontier:
+            current = frontier.pop()
+            for name, deps in dependencies.items():
+                if current in deps and name not in dependents:
+                    dependents.append(name)
+                    frontier.append(name)
+        return dependents
+
+    def is_finished(self, job_id: str) -> bool:
+        """Check whether every step of a job has reached a terminal status.
+
+        Args:
+            job_id: ID of the pipeline job
+
+        Returns:
+            True if no step can change any more
+        """
+        raw_steps = self.redis.hvals(self._steps_key(job_id))
+        return all(
+            StepStatus(json.loads(raw)["status"]) in TERMINAL_STATUSES
+            for raw in raw_steps  # type: ignore[union-attr]
+        )
+
+    def expire_job(self, job_id: str, orchestrator_task_id: str | None = None) -> None:
+        """Set the retention TTL on a finished job.
+
+        Args:
+            job_id: ID of the pipeline job
+            orchestrator_task_id: Celery task ID of the orchestrator, if any
+        """
+        keys = [self._job_key(job_id), self._steps_key(job_id), self._claims_key(job_id)]
+        if orchestrator_task_id:
+            keys.append(self._task_key(orchestrator_task_id))
+        with self.redis.pipeline() as pipe:
+            for key in keys:
+                pipe.expire(key, self.finished_ttl)
+            pipe.execute()
@@ -0,0 +1,370 @@
+"""Progress events of ingestion jobs, published to one Redis Stream per job.
+
+Steps report progress through a ProgressReporter, which coalesces reports on
+the worker: only the latest report is kept, and it is published at most once
+per interval or when the status changes. A step can therefore call report()
+for every directory or file at the cost of a clock read.
+
+Events are appended to ``codestory:ingestion:progress:<job_id>``, keyed by the
+job's external ID (the orchestrator task ID). The stream is capped and
+expires, and any number of readers can replay it from the start, so a
+subscriber joining late sees the job's history before its live events.
+"""
+
+import json
+import logging
+import time
+from typing import Any
+
+import redis
+
+from .step import StepStatus
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Prefix of the per-job progress streams
+PROGRESS_KEY_PREFIX = "codestory:ingestion:progress"
+
+# Approximate number of events kept per stream
+STREAM_MAXLEN = 1000
+
+# Seconds a stream is kept after its last event
+STREAM_TTL = 7 * 24 * 3600
+
+# Step name of events describing the job as a whole
+PIPELINE_STEP = "pipeline"
+
+# Job statuses after which no more events are published
+TERMINAL_JOB_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
+def progress_key(job_id: str, key_prefix: str = PROGRESS_KEY_PREFIX) -> str:
+    """Get the stream key of a job.
+
+    Args:
+        job_id: External ID of the job
+        key_prefix: Prefix of the stream keys
+
+    Returns:
+        Redis key of the job's progress stream
+    """
+    return f"{key_prefix}:{job_id}"
+
+
+def job_status_value(status: StepStatus) -> str:
+    """Get the job status reported to subscribers for a pipeline status.
+
+    Args:
+        status: Status of the pipeline job
+
+    Returns:
+        Lower-case job status, as used by the service's JobStatus
+    """
+    return "cancelled" if status == StepStatus.STOPPED else status.value.lower()
+
+
+def encode_event(event: dict[str, Any]) -> dict[str, str]:
+    """Encode an event as the fields of a stream entry."""
+    return {"event": json.dumps(event, default=str)}
+
+
+def decode_event(fields: dict[str, Any]) -> dict[str, Any] | None:
+    """Decode the fields of a stream entry.
+
+    Args:
+        fields: Fields of the entry
+
+    Returns:
+        The event, or None if the entry is not a valid event
+    """
+    raw = fields.get("event") or fields.get(b"event")
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)  # type: ignore[no-any-return]
+    except (TypeError, ValueError):
+        return None
+
+
+class ProgressStream:
+    """Writes and reads the progress streams of jobs."""
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        key_prefix: str = PROGRESS_KEY_PREFIX,
+        maxlen: int = STREAM_MAXLEN,
+        ttl: int = STREAM_TTL,
+    ):
+        """Initialize the progress stream.
+
+        Args:
+            redis_client: Redis client (created with decode_responses=True)
+            key_prefix: Prefix of the stream keys
+            maxlen: Approximate number of events kept per stream
+            ttl: Seconds a stream is kept after its last event
+        """
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.maxlen = maxlen
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, redis_url: str, **kwargs: Any) -> "ProgressStream":
+        """Create a progress stream connected to the given Redis URL.
+
+        Args:
+            redis_url: Redis connection URL
+            **kwargs: Additional arguments for the stream
+
+        Returns:
+            ProgressStream instance
+        """
+        return cls(redis.from_url(redis_url, decode_responses=True), **kwargs)
+
+    def publish(self, job_id: str, event: dict[str, Any]) -> str:
+        """Append an event to a job's stream.
+
+        Args:
+            job_id: External ID of the job
+            event: Event to append
+
+        Returns:
+            ID of the stream entry
+        """
+        key = progress_key(job_id, self.key_prefix)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xadd(key, encode_event(event), maxlen=self.maxlen, approximate=True)
+        pipe.expire(key, self.ttl)
+        entry_id, _ = pipe.execute()
+        return entry_id  # type: ignore[no-any-return]
+
+    def read(self, job_id: str, after: str = "0-0") -> list[tuple[str, dict[str, Any]]]:
+        """Read the events of a job's stream.
+
+        Args:
+            job_id: External ID of the job
+            after: Only return entries with a greater ID
+
+        Returns:
+            List of (entry ID, event) tuples in stream order
+        """
+        entries = self.redis.xrange(progress_key(job_id, self.key_prefix), min=f"({after}")
+        events = []
+        for entry_id, fields in entries:
+            event = decode_event(fields)
+            if event is not None:
+                events.append((entry_id, event))
+        return events
+
+
+# Process-wide progress stream, created on first use
+_progress_stream: ProgressStream | None = None
+
+
+def get_progress_stream() -> ProgressStream:
+    """Get the process-wide progress stream.
+
+    Returns:
+        ProgressStream connected to the configured Redis
+    """
+    global _progress_stream
+    if _progress_stream is None:
+        from codestory.config.settings import get_settings
+
+        _progress_stream = ProgressStream.from_url(get_settings().redis.uri)
+    return _progress_stream
+
+
+class ProgressReporter:
+    """Coalescing progress reporter of one step of a job.
+
+    Reports are cheap: report() only records the latest values, and they are
+    published to the job's stream (and to the Celery task state, if a task is
+    given) at most once per ``min_interval`` seconds. A change of status is
+    published immediately. Publishing errors are logged once and never fail
+    the step.
+    """
+
+    def __init__(
+        self,
+        job_id: str | None,
+        step: str,
+        stream: ProgressStream | None = None,
+        task: Any | None = None,
+        min_interval: float = 0.5,
+        total_steps: int = 1,
+        finished_steps: int = 0,
+    ):
+        """Initialize the reporter.
+
+        Args:
+            job_id: External ID of the job, or None to only update the task
+            step: Name of the reporting step
+            stream: Stream to publish to
+            task: Optional bound Celery task whose state is updated as well
+            min_interval: Minimum seconds between published events
+            total_steps: Number of steps in the job, for the overall progress
+            finished_steps: Number of steps of the job already finished
+        """
+        self.job_id = job_id
+        self.step = step
+        self.stream = stream if job_id else None
+        self.task = task
+        self.min_interval = min_interval
+        self.total_steps = max(total_steps, 1)
+        self.finished_steps = finished_steps
+        self.published = 0
+
+        self._pending: tuple[float | None, str | None, StepStatus, dict[str, Any]] | None = None
+        self._last_status: StepStatus | None = None
+        self._last_publish = float("-inf")
+
+    def __enter__(self) -> "ProgressReporter":
+        """Use the reporter as a context manager that flushes on exit."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Publish the latest report."""
+        self.flush()
+
+    def report(
+        self,
+        progress: float | None,
+        message: str | None = None,
+        status: StepStatus = StepStatus.RUNNING,
+        **fields: Any,
+    ) -> None:
+        """Report the progress of the step.
+
+        Args:
+            progress: Progress of the step in percent, or None if unknown
+            message: Status message
+            status: Status of the step
+            **fields: Additional fields to include in the event
+        """
+        self._pending = (progress, message, status, fields)
+        now = time.monotonic()
+        if status != self._last_status or now - self._last_publish >= self.min_interval:
+            self._publish(now)
+
+    def flush(self) -> None:
+        """Publish the latest report, if it has not been published yet."""
+        if self._pending is not None:
+            self._publish(time.monotonic())
+
+    def _publish(self, now: float) -> None:
+        progress, message, status, fields = self._pending  # type: ignore[misc]
+        self._pending = None
+        self._last_status = status
+        self._last_publish = now
+        self.published += 1
+
+        step_progress = progress or 0.0
+        overall = (self.finished_steps + step_progress / 100) / self.total_steps * 100
+        event = {
+            "job_id": self.job_id,
+            "step": self.step,
+            "status": status.value,
+            "job_status": "running",
+            "progress": step_progress,
+            "overall_progress": min(overall, 100.0),
+            "message": message,
+            "timestamp": time.time(),
+            **fields,
+        }
+
+        if self.task is not None:
+            try:
+                self.task.update_state(state="PROGRESS", meta=event)
+            except Exception as e:
+                logger.warning(f"Failed to update task state of step {self.step}: {e}")
+                self.task = None
+
+        if self.stream is not None:
+            try:
+                self.stream.publish(self.job_id, event)  # type: ignore[arg-type]
+            except Exception as e:
+                # Progress is best effort; stop publishing rather than
+                # logging an error for every event
+                logger.warning(f"Failed to publish progress of job {self.job_id}: {e}")
+                self.stream = None
+
+
+def create_reporter(
+    job_id: str | None,
+    step: str,
+    task: Any | None = None,
+    min_interval: float = 0.5,
+) -> ProgressReporter:
+    """Create a reporter for a step running as part of a pipeline job.
+
+    Steps receive the ID of the pipeline job, while subscribers know the job
+    by its orchestrator task ID; the mapping and the number of steps used for
+    the overall progress are taken from the job store.
+
+    Args:
+        job_id: ID of the pipeline job, or None if the step runs on its own
+        step: Name of the reporting step
+        task: Optional bound Celery task whose state is updated as well
+        min_interval: Minimum seconds between published events
+
+    Returns:
+        ProgressReporter for the step
+    """
+    external_id = None
+    total_steps, finished_steps = 1, 0
+    stream = None
+    if job_id:
+        try:
+            from .job_state import TERMINAL_STATUSES
+            from .tasks import get_job_store
+
+            job = get_job_store().get_job(job_id)
+            if job and job.get("orchestrator_task_id"):
+                external_id = job["orchestrator_task_id"]
+                total_steps = len(job["steps"])
+                finished_steps = sum(
+                    1 for s in job["steps"] if StepStatus(s["status"]) in TERMINAL_STATUSES
+                )
+                stream = get_progress_stream()
+        except Exception as e:
+            logger.warning(f"Progress of job {job_id} will not be published: {e}")
+
+    return ProgressReporter(
+        external_id,
+        step,
+        stream=stream,
+        task=task,
+        min_interval=min_interval,
+        total_steps=total_steps,
+        finished_steps=finished_steps,
+    )
+
+
+def publish_job_progress(
+    job_id: str, status: StepStatus, progress: float, message: str | None = None
+) -> None:
+    """Publish an event describing the state of a job as a whole.
+
+    Args:
+        job_id: External ID of the job
+        status: Status of the job
+        progress: Overall progress of the job in percent
+        message: Status message
+    """
+    event = {
+        "job_id": job_id,
+        "step": PIPELINE_STEP,
+        "status": status.value,
+        "job_status": job_status_value(status),
+        "progress": progress,
+        "overall_progress": progress,
+        "message": message,
+        "timestamp": time.time(),
+    }
+    try:
+        get_progress_stream().publish(job_id, event)
+    except Exception as e:
+        logger.warning(f"Failed to publish progress of job {job_id}: {e}")
@@ -1,95 +1,390 @@
-"""ResourceTokenManager for ingestion resource throttling using Redis."""
+"""Fair, weighted resource scheduler for ingestion throttling using Redis.
+
+Capacity is handed out as leases by atomic Lua scripts. Every lease has a
+weight (heavy steps such as blarify cost more than light ones) and a TTL that
+holders extend with heartbeats, so capacity held by a crashed worker is
+recovered once its lease expires. Waiters queue in FIFO order and block on a
+per-waiter Redis list instead of polling.
+"""
 
 import logging
-import os
+import math
+import threading
 import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
 
 import redis
 
 logger = logging.getLogger(__name__)
 
-class ResourceTokenManager:
-    """
-    Implements a simple token bucket using Redis to throttle concurrent resource usage.
+# Resource weights of the built-in steps; steps not listed cost 1
+DEFAULT_STEP_WEIGHTS: dict[str, int] = {
+    "filesystem": 1,
+    "blarify": 2,
+    "ast": 2,
+}
+
+# Shared by the scripts: drop leases whose holder stopped heartbeating and
+# waiters that stopped asking, then wake whoever is at the head of the queue
+_RECLAIM = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local function reclaim(leases, weights, queue, waiting)
+  for _, lease in ipairs(redis.call('ZRANGEBYSCORE', leases, '-inf', now)) do
+    redis.call('ZREM', leases, lease)
+    redis.call('HDEL', weights, lease)
+  end
+  for _, waiter in ipairs(redis.call('ZRANGEBYSCORE', waiting, '-inf', now)) do
+    redis.call('ZREM', waiting, waiter)
+    redis.call('LREM', queue, 0, waiter)
+  end
+end
+
+local function used_capacity(weights)
+  local used = 0
+  for _, weight in ipairs(redis.call('HVALS', weights)) do
+    used = used + tonumber(weight)
+  end
+  return used
+end
+
+local function wake_head(queue, wake_prefix, wake_ttl)
+  local head = redis.call('LINDEX', queue, 0)
+  if head then
+    redis.call('RPUSH', wake_prefix .. head, 1)
+    redis.call('EXPIRE', wake_prefix .. head, wake_ttl)
+  end
+end
+"""
+
+# KEYS: leases, weights, queue, waiting
+# ARGV: id, weight, capacity, lease_ttl, waiter_ttl, wake_prefix, wake_ttl
+_ACQUIRE_SCRIPT = (
+    _RECLAIM
+    + """
+local leases, weights, queue, waiting = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local id = ARGV[1]
+local weight = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+
+reclaim(leases, weights, queue, waiting)
+
+-- A redelivered request for a lease that is already held
+if redis.call('ZSCORE', leases, id) then
+  redis.call('ZADD', leases, now + tonumber(ARGV[4]), id)
+  return 1
+end
+
+if not redis.call('ZSCORE', waiting, id) then
+  redis.call('RPUSH', queue, id)
+end
+redis.call('ZADD', waiting, now + tonumber(ARGV[5]), id)
+
+if redis.call('LINDEX', queue, 0) ~= id then
+  return 0
+end
+if used_capacity(weights) + weight > capacity then
+  return 0
+end
+
+redis.call('LPOP', queue)
+redis.call('ZREM', waiting, id)
+redis.call('ZADD', leases, now + tonumber(ARGV[4]), id)
+redis.call('HSET', weights, id, weight)
+
+-- The next waiter may fit into the remaining capacity as well
+wake_head(queue, ARGV[6], ARGV[7])
+return 1
+"""
+)
+
+# KEYS: leases, weights, queue, waiting
+# ARGV: id, wake_prefix, wake_ttl
+_RELEASE_SCRIPT = (
+    _RECLAIM
+    + """
+local removed = redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+reclaim(KEYS[1], KEYS[2], KEYS[3], KEYS[4])
+wake_head(KEYS[3], ARGV[2], ARGV[3])
+return removed
+"""
+)
+
+# KEYS: leases
+# ARGV: id, lease_ttl
+_HEARTBEAT_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local expires = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not expires or tonumber(expires) <= now then
+  return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+return 1
+"""
+
+# KEYS: leases, weights, queue, waiting
+# ARGV: id, wake_prefix, wake_ttl
+_CANCEL_SCRIPT = (
+    _RECLAIM
+    + """
+local was_head = redis.call('LINDEX', KEYS[3], 0) == ARGV[1]
+redis.call('ZREM', KEYS[4], ARGV[1])
+local removed = redis.call('LREM', KEYS[3], 0, ARGV[1])
+if was_head then
+  wake_head(KEYS[3], ARGV[2], ARGV[3])
+end
+return removed
+"""
+)
+
+# KEYS: leases, weights, queue, waiting
+_STATUS_SCRIPT = (
+    _RECLAIM
+    + """
+reclaim(KEYS[1], KEYS[2], KEYS[3], KEYS[4])
+return {used_capacity(KEYS[2]), redis.call('ZCARD', KEYS[1]), redis.call('LLEN', KEYS[3])}
+"""
+)
+
+
+def step_weight(
+    step_name: str,
+    step_config: dict[str, Any] | None = None,
+    weights: dict[str, int] | None = None,
+) -> int:
+    """Get the resource weight of a pipeline step.
+
+    Args:
+        step_name: Name of the step
+        step_config: Step configuration; a ``resource_weight`` entry wins
+        weights: Weights by step name, defaulting to DEFAULT_STEP_WEIGHTS
+
+    Returns:
+        Number of capacity units the step needs while it runs
     """
+    if step_config and step_config.get("resource_weight") is not None:
+        return max(1, int(step_config["resource_weight"]))
+    return max(1, int((weights or DEFAULT_STEP_WEIGHTS).get(step_name, 1)))
+
+
+class ResourceScheduler:
+    """Hands out weighted, expiring leases on a shared capacity in FIFO order."""
 
     def __init__(
         self,
         redis_url: str,
-        token_key: str = "codestory:ingestion:resource_tokens",
-        max_tokens: int = 4,
-        acquire_timeout: int = 30,
-        token_ttl: int = 3600,
+        key_prefix: str = "codestory:ingestion:resources",
+        capacity: int = 4,
+        lease_ttl: int = 600,
+        waiter_ttl: int = 60,
+        wake_interval: float = 5.0,
     ):
+        """Initialize the scheduler.
+
+        Args:
+            redis_url: Redis connection URL
+            key_prefix: Prefix for all keys written by the scheduler
+            capacity: Total capacity shared by all leases
+            lease_ttl: Seconds a lease is held without a heartbeat
+            waiter_ttl: Seconds a waiter keeps its place in the queue without
+                asking again
+            wake_interval: Longest time a waiter blocks before re-checking, so
+                that capacity recovered from expired leases is noticed
+        """
         self.redis_url = redis_url
-        self.token_key = token_key
-        self.max_tokens = max_tokens
-        self.acquire_timeout = acquire_timeout
-        self.token_ttl = token_ttl
+        self.key_prefix = key_prefix
+        self.capacity = capacity
+        self.lease_ttl = lease_ttl
+        self.waiter_ttl = waiter_ttl
+        self.wake_interval = wake_interval
         self.redis = redis.from_url(redis_url, decode_responses=True)
 
-    def initialize_tokens(self) -> None:
+        self._keys = [
+            f"{key_prefix}:leases",
+            f"{key_prefix}:weights",
+            f"{key_prefix}:queue",
+            f"{key_prefix}:waiting",
+        ]
+        self._wake_prefix = f"{key_prefix}:wake:"
+        self._wake_ttl = max(int(waiter_ttl), 1)
+
+        self._acquire = self.redis.register_script(_ACQUIRE_SCRIPT)
+        self._release = self.redis.register_script(_RELEASE_SCRIPT)
+        self._heartbeat = self.redis.register_script(_HEARTBEAT_SCRIPT)
+        self._cancel = self.redis.register_script(_CANCEL_SCRIPT)
+        self._status = self.redis.register_script(_STATUS_SCRIPT)
+
+    def try_acquire(
+        self, weight: int = 1, waiter_id: str | None = None, lease_ttl: int | None = None
+    ) -> str | None:
+        """Take a lease if it is this waiter's turn and the capacity fits.
+
+        A waiter that is not granted a lease joins the queue and keeps its
+        place for waiter_ttl seconds, so callers that re-queue themselves and
+        ask again with the same waiter_id are served in FIFO order.
+
+        Args:
+            weight: Capacity units to lease (capped at the total capacity)
+            waiter_id: Stable ID of the waiter; also used as the lease ID
+            lease_ttl: Seconds the lease is held without a heartbeat
+
+        Returns:
+            Lease ID if the lease was granted, otherwise None
         """
-        Initialize the token bucket in Redis if not already set.
+        lease_id = waiter_id or uuid.uuid4().hex
+        granted = self._acquire(
+            keys=self._keys,
+            args=[
+                lease_id,
+                min(max(int(weight), 1), self.capacity),
+                self.capacity,
+                lease_ttl or self.lease_ttl,
+                self.waiter_ttl,
+                self._wake_prefix,
+                self._wake_ttl,
+            ],
+        )
+        if not granted:
+            return None
+
+        logger.info(f"Acquired resource lease {lease_id} (weight {weight})")
+        return lease_id
+
+    def acquire(
+        self,
+        weight: int = 1,
+        timeout: float | None = None,
+        waiter_id: str | None = None,
+        lease_ttl: int | None = None,
+        keep_place: bool = False,
+    ) -> str | None:
+        """Wait for a lease, blocking until it is granted or the timeout passes.
+
+        Args:
+            weight: Capacity units to lease (capped at the total capacity)
+            timeout: Seconds to wait, or None to wait indefinitely
+            waiter_id: Stable ID of the waiter; also used as the lease ID
+            lease_ttl: Seconds the lease is held without a heartbeat
+            keep_place: Keep the waiter's place in the queue on timeout, for
+                callers that will ask again with the same waiter_id
+
+        Returns:
+            Lease ID if the lease was granted, otherwise None
         """
-        if not self.redis.exists(self.token_key):
-            self.redis.set(self.token_key, self.max_tokens, ex=self.token_ttl)
-            logger.info(f"Initialized resource tokens: {self.max_tokens}")
+        waiter_id = waiter_id or uuid.uuid4().hex
+        wake_key = f"{self._wake_prefix}{waiter_id}"
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            lease_id = self.try_acquire(weight, waiter_id, lease_ttl)
+            if lease_id is not None:
+                self.redis.delete(wake_key)
+                return lease_id
+
+            wait = self.wake_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = min(wait, remaining)
+
+            self.redis.blpop([wake_key], timeout=max(1, math.ceil(wait)))
+
+        if not keep_place:
+            self.cancel_wait(waiter_id)
+        logger.info(f"Timed out waiting for a resource lease (weight {weight})")
+        return None
+
+    def release(self, lease_id: str) -> bool:
+        """Return a lease's capacity and wake the next waiter.
+
+        Releasing a lease that already expired or was released is a no-op.
 
-    def acquire_token(self) -> bool:
+        Args:
+            lease_id: ID of the lease
+
+        Returns:
+            True if the lease was still held
         """
-        Attempt to acquire a token, blocking up to acquire_timeout seconds.
+        removed = bool(
+            self._release(keys=self._keys, args=[lease_id, self._wake_prefix, self._wake_ttl])
+        )
+        if removed:
+            logger.info(f"Released resource lease {lease_id}")
+        return removed
+
+    def heartbeat(self, lease_id: str, lease_ttl: int | None = None) -> bool:
+        """Extend a lease that is still held.
 
-        Returns True if a token was acquired, False otherwise.
+        Args:
+            lease_id: ID of the lease
+            lease_ttl: Seconds from now until the lease expires
+
+        Returns:
+            False if the lease has already expired or was released
         """
-        start = time.time()
-        while time.time() - start < self.acquire_timeout:
-            self.initialize_tokens()
-            with self.redis.pipeline() as pipe:
-                try:
-                    pipe.watch(self.token_key)
-                    tokens = int(pipe.get(self.token_key) or 0)
-                    if tokens > 0:
-                        pipe.multi()
-                        pipe.decr(self.token_key)
-                        pipe.execute()
-                        logger.info("Acquired resource token")
-                        return True
-                    pipe.unwatch()
-                except redis.WatchError:
-                    continue  # Retry on concurrent modification
-            time.sleep(0.5)
-        logger.warning("Failed to acquire resource token: timeout")
-        return False
-
-    def release_token(self) -> None:
+        return bool(
+            self._heartbeat(keys=self._keys[:1], args=[lease_id, lease_ttl or self.lease_ttl])
+        )
+
+    def cancel_wait(self, waiter_id: str) -> None:
+        """Give up a waiter's place in the queue.
+
+        Args:
+            waiter_id: ID of the waiter
         """
-        Release a token back to the bucket.
+        self._cancel(keys=self._keys, args=[waiter_id, self._wake_prefix, self._wake_ttl])
+        self.redis.delete(f"{self._wake_prefix}{waiter_id}")
+
+    @contextmanager
+    def lease(self, weight: int = 1, timeout: float | None = None) -> Iterator[str]:
+        """Hold a lease for the duration of a block, heartbeating in the background.
+
+        Args:
+            weight: Capacity units to lease
+            timeout: Seconds to wait for the lease, or None to wait indefinitely
+
+        Yields:
+            Lease ID
+
+        Raises:
+            TimeoutError: If the lease was not granted within the timeout
         """
-        with self.redis.pipeline() as pipe:
-            while True:
-                try:
-                    pipe.watch(self.token_key)
-                    tokens = int(pipe.get(self.token_key) or 0)
-                    if tokens < self.max_tokens:
-                        pipe.multi()
-                        pipe.incr(self.token_key)
-                        pipe.execute()
-                        logger.info("Released resource token")
-                        break
-                    else:
-                        pipe.unwatch()
-                        break
-                except redis.WatchError:
-                    continue  # Retry on concurrent modification
-
-    def get_status(self) -> dict:
+        lease_id = self.acquire(weight, timeout=timeout)
+        if lease_id is None:
+            raise TimeoutError(f"Timed out waiting for a resource lease of weight {weight}")
+
+        stop = threading.Event()
+
+        def _beat() -> None:
+            while not stop.wait(self.lease_ttl / 3):
+                if not self.heartbeat(lease_id):
+                    logger.warning(f"Resource lease {lease_id} expired while in use")
+                    return
+
+        heartbeat_thread = threading.Thread(target=_beat, daemon=True)
+        heartbeat_thread.start()
+        try:
+            yield lease_id
+        finally:
+            stop.set()
+            heartbeat_thread.join()
+            self.release(lease_id)
+
+    def get_status(self) -> dict[str, int]:
         """
-        Return current token count and max tokens.
+        Return current capacity usage, recovering expired leases first.
         """
-        self.initialize_tokens()
-        tokens = int(self.redis.get(self.token_key) or 0)
+        used, active, waiting = self._status(keys=self._keys)
         return {
-            "available_tokens": tokens,
-            "max_tokens": self.max_tokens,
-        }
\ No newline at end of file
+            "available_tokens": max(self.capacity - int(used), 0),
+            "max_tokens": self.capacity,
+            "active_leases": int(active),
+            "waiting": int(waiting),
+        }
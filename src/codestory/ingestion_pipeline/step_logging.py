@@ -0,0 +1,188 @@
+"""Low-overhead logging for the per-item loops of ingestion steps.
+
+Steps such as the filesystem step visit every directory and file of a
+repository. Logging a formatted line for each of them costs more than the
+work itself on large trees, so StepLogger:
+
+- formats lazily: messages are %-style templates with arguments, formatted
+  only if a record is actually emitted
+- samples per-item debug events: only every ``sample_every``-th event of a
+  template is emitted
+- keeps the latest events, including unsampled ones, in a ring buffer that
+  is written out when an error is logged, so failures keep their context
+- aggregates timing counters and emits them periodically instead of per item
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any
+
+# A buffered event: (wall clock time, level, template, arguments)
+_Event = tuple[float, int, str, tuple[Any, ...]]
+
+
+class StepLogger:
+    """Hot-path logger of one step run."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        job_id: str | None = None,
+        sample_every: int = 100,
+        buffer_size: int = 200,
+        stats_interval: float = 30.0,
+    ):
+        """Initialize the step logger.
+
+        Args:
+            logger: Logger records are emitted to
+            job_id: Optional job ID added to every record
+            sample_every: Emit one in this many events of each per-item
+                template
+            buffer_size: Number of recent events kept for error context
+            stats_interval: Minimum seconds between periodic timing summaries
+        """
+        self.logger = logger
+        self.prefix = f"[job_id={job_id}] " if job_id else ""
+        self.sample_every = max(sample_every, 1)
+        self.stats_interval = stats_interval
+
+        # Checked once; records below the logger's level are never formatted
+        self.debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        self._buffer: deque[_Event] = deque(maxlen=buffer_size)
+        self._item_counts: dict[str, int] = {}
+        self._timers: dict[str, list[float]] = {}
+        self._last_stats = time.monotonic()
+
+    def _emit(self, level: int, msg: str, args: tuple[Any, ...], **kwargs: Any) -> None:
+        self.logger.log(level, "%s" + msg, self.prefix, *args, **kwargs)
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log a debug message.
+
+        Args:
+            msg: Message template
+            *args: Arguments of the template
+        """
+        self._buffer.append((time.time(), logging.DEBUG, msg, args))
+        if self.debug_enabled:
+            self._emit(logging.DEBUG, msg, args)
+
+    def item(self, msg: str, *args: Any) -> None:
+        """Log a per-item debug event, sampled per message template.
+
+        Every event is kept in the ring buffer; the first and then every
+        ``sample_every``-th event of a template is emitted.
+
+        Args:
+            msg: Message template
+            *args: Arguments of the template
+        """
+        self._buffer.append((time.time(), logging.DEBUG, msg, args))
+        if self.debug_enabled:
+            count = self._item_counts.get(msg, 0)
+            self._item_counts[msg] = count + 1
+            if count % self.sample_every == 0:
+                self._emit(logging.DEBUG, msg + " (sampled 1/%d)", (*args, self.sample_every))
+
+    def info(self, msg: str, *args: Any) -> None:
+        """Log an info message.
+
+        Args:
+            msg: Message template
+            *args: Arguments of the template
+        """
+        self._buffer.append((time.time(), logging.INFO, msg, args))
+        self._emit(logging.INFO, msg, args)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        """Log a warning message.
+
+        Args:
+            msg: Message template
+            *args: Arguments of the template
+        """
+        self._buffer.append((time.time(), logging.WARNING, msg, args))
+        self._emit(logging.WARNING, msg, args)
+
+    def error(self, msg: str, *args: Any, exc_info: Any = None) -> None:
+        """Log an error, preceded by the buffered recent events.
+
+        Args:
+            msg: Message template
+            *args: Arguments of the template
+            exc_info: Optional exception (or True) to log with the error
+        """
+        self.flush_buffer()
+        self._emit(logging.ERROR, msg, args, exc_info=exc_info)
+
+    def flush_buffer(self) -> None:
+        """Write out the buffered recent events as one record and clear them."""
+        if not self._buffer:
+            return
+        lines = []
+        for timestamp, level, msg, args in self._buffer:
+            try:
+                text = msg % args if args else msg
+            except (TypeError, ValueError):
+                text = f"{msg} {args}"
+            clock = time.strftime("%H:%M:%S", time.localtime(timestamp))
+            lines.append(f"  {clock} {logging.getLevelName(level)} {text}")
+        self._buffer.clear()
+        self.logger.error(
+            "%sLast %d events before the error:\n%s", self.prefix, len(lines), "\n".join(lines)
+        )
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add the duration of one operation to a timing counter.
+
+        Args:
+            name: Name of the counter
+            seconds: Duration of the operation
+        """
+        timer = self._timers.get(name)
+        if timer is None:
+            self._timers[name] = [1, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+
+    def total(self, name: str) -> float:
+        """Get the total seconds of a timing counter."""
+        timer = self._timers.get(name)
+        return timer[1] if timer else 0.0
+
+    def count(self, name: str) -> int:
+        """Get the number of operations of a timing counter."""
+        timer = self._timers.get(name)
+        return int(timer[0]) if timer else 0
+
+    def timing_stats(self) -> dict[str, dict[str, float]]:
+        """Get the timing counters.
+
+        Returns:
+            Counter name -> count, total and average seconds
+        """
+        return {
+            name: {"count": count, "total": total, "avg": total / count if count else 0.0}
+            for name, (count, total) in self._timers.items()
+        }
+
+    def maybe_log_stats(self) -> None:
+        """Log the timing counters if the stats interval has elapsed."""
+        now = time.monotonic()
+        if now - self._last_stats >= self.stats_interval:
+            self._last_stats = now
+            self.log_stats()
+
+    def log_stats(self) -> None:
+        """Log the timing counters."""
+        if not self._timers:
+            return
+        summary = ", ".join(
+            f"{name}: {stats['count']:.0f} x {stats['avg'] * 1000:.1f}ms"
+            for name, stats in self.timing_stats().items()
+        )
+        self.logger.info("%sTiming: %s", self.prefix, summary)
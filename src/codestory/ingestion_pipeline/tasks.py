@@ -2,27 +2,316 @@
 
 This module defines the Celery tasks that handle pipeline execution,
 including step orchestration and status tracking.
+
+No task waits on another task. The orchestrator records the job in the
+PipelineJobStore and dispatches the steps that have no dependencies. Each
+step's plugin task is sent with link/link_error continuations that record
+the outcome, dispatch the dependents that became runnable and finalize the
+job once every step has finished. A job that completes starts the jobs that
+were only waiting on it.
 """
 
 import logging
+import threading
 import time
 from typing import Any
+from uuid import uuid4
 
-try:
-    import psutil
-except ImportError:
-    psutil = None
-
-from celery import chain
+from celery.exceptions import Ignore
 from celery.result import AsyncResult
+from celery.signals import task_postrun, task_prerun
 
 from .celery_app import app
+from .dag import resolve_step_dependencies, topological_levels
+from .job_index import get_job_index
+from .job_state import TERMINAL_STATUSES, PipelineJobStore
+from .progress import publish_job_progress
+from .resource_manager import ResourceScheduler, step_weight
 from .step import StepStatus
 from .utils import record_job_metrics, record_step_metrics
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Seconds run_step blocks waiting for a resource lease before re-queueing
+# itself; the step keeps its place in the scheduler's queue in between
+RESOURCE_WAIT_SECONDS = 2
+
+# Seconds to wait before re-trying a step that could not get a resource lease
+RESOURCE_RETRY_SECONDS = 5
+
+# Seconds a step's lease is held without a heartbeat. The worker running the
+# step renews it every third of this, so the capacity of a step whose worker
+# died is recovered soon after
+RESOURCE_LEASE_TTL_SECONDS = 120
+
+# Seconds a dispatched step's lease is held until its task starts. The task
+# message stays in the broker while every worker is busy, even across worker
+# restarts, so the lease is kept for as long as the step may wait in the
+# queue; this only bounds the capacity lost if a message is lost. The task's
+# worker shortens it to RESOURCE_LEASE_TTL_SECONDS once the step starts.
+RESOURCE_DISPATCH_TTL_SECONDS = 24 * 3600
+
+# Default per-step timeout in seconds, enforced through Celery time limits
+DEFAULT_STEP_TIMEOUT = 1800
+
+# Process-wide job store and resource scheduler, created on first use
+_job_store: PipelineJobStore | None = None
+_scheduler: ResourceScheduler | None = None
+
+# Stop events of the lease heartbeats of the step tasks running in this
+# process, by task ID
+_lease_heartbeats: dict[str, threading.Event] = {}
+
+
+def get_job_store() -> PipelineJobStore:
+    """Get the process-wide pipeline job store.
+
+    Returns:
+        PipelineJobStore connected to the configured Redis instance
+    """
+    global _job_store
+    if _job_store is None:
+        from codestory.config.settings import get_settings
+
+        _job_store = PipelineJobStore.from_url(get_settings().redis.uri)
+    return _job_store
+
+
+def _get_scheduler() -> ResourceScheduler:
+    """Get the process-wide resource scheduler.
+
+    Returns:
+        ResourceScheduler configured from settings
+    """
+    global _scheduler
+    if _scheduler is None:
+        from codestory.config.settings import get_settings
+
+        settings = get_settings()
+        _scheduler = ResourceScheduler(
+            redis_url=settings.redis.uri,
+            capacity=getattr(settings.ingestion, "resource_max_tokens", 4),
+            lease_ttl=RESOURCE_LEASE_TTL_SECONDS,
+        )
+    return _scheduler
+
+
+def _index_job(task_id: str, status: StepStatus, **fields: Any) -> None:
+    """Record a pipeline's status in the job index.
+
+    The index only serves job listings and dependency tracking, so failing
+    to update it is logged rather than failing the pipeline.
+
+    Args:
+        task_id: Celery task ID of the orchestrator, which is the job's ID
+            outside the pipeline
+        status: Status of the pipeline
+        **fields: Additional fields to store on the job
+    """
+    job_status = "cancelled" if status == StepStatus.STOPPED else status.value.lower()
+    try:
+        get_job_index().record(task_id, job_status, **fields)
+    except Exception as e:
+        logger.warning(f"Failed to update job index for {task_id}: {e}")
+
+
+def build_step_configs(
+    steps: list[str] | None, options: dict[str, Any] | None
+) -> list[dict[str, Any]]:
+    """Build the step configurations of an ingestion request.
+
+    Each pipeline step only receives the options it can handle, which
+    prevents "unexpected keyword argument" errors when passing configuration
+    between steps:
+
+    - blarify: all options except 'concurrency'
+    - summarizer/docgrapher: only 'job_id', 'ignore_patterns', 'timeout',
+      'incremental' and their own '<step>_specific' option
+    - filesystem and other steps: all options
+
+    Args:
+        steps: Names of the steps to run, or None for the default steps
+        options: Options of the request
+
+    Returns:
+        List of step configurations with name and parameters
+    """
+    step_configs: list[dict[str, Any]] = [
+        {"name": step_name}
+        for step_name in (steps or ["filesystem", "blarify", "summarizer", "docgrapher"])
+    ]
+    if not options:
+        return step_configs
+
+    safe_params = ["job_id", "ignore_patterns", "timeout", "incremental"]
+    for step_config in step_configs:
+        step_name = step_config["name"]
+
+        # Filter options based on step type to avoid parameter conflicts
+        if step_name == "blarify":
+            filtered_options = {k: v for k, v in options.items() if k not in ["concurrency"]}
+        elif step_name in ["summarizer", "docgrapher"]:
+            filtered_options = {
+                k: v
+                for k, v in options.items()
+                if k in safe_params or k == step_name + "_specific"
+            }
+        else:
+            filtered_options = dict(options)
+
+        step_config.update(filtered_options)
+        logger.debug(f"Applied options for {step_name} step: {filtered_options}")
+
+    return step_configs
+
+
+def priority_queue(priority: str | None) -> str:
+    """Map the priority of an ingestion request to a Celery queue.
+
+    Args:
+        priority: Priority of the request
+
+    Returns:
+        Name of the queue the orchestrator task is sent to
+    """
+    return priority if priority in {"high", "default", "low"} else "default"
+
+
+def _start_dependent_job(job_id: str) -> None:
+    """Submit a job whose dependencies have all completed.
+
+    The job's ingestion request was stored in the job index when the job was
+    submitted; the job keeps its ID as the orchestrator's task ID.
+
+    Args:
+        job_id: ID of the dependent job
+
+    Raises:
+        ValueError: If the job has no stored request
+    """
+    job = get_job_index().get_job(job_id)
+    if not job or not job.get("request"):
+        raise ValueError("Job has no stored request")
+
+    request = job["request"]
+    orchestrate_pipeline.apply_async(
+        args=[
+            request["source"],
+            build_step_configs(request.get("steps"), request.get("options")),
+            str(uuid4()),
+        ],
+        task_id=job_id,
+        queue=priority_queue(request.get("priority")),
+    )
+
+
+def _start_dependents(task_id: str) -> None:
+    """Release the jobs waiting on a completed job and start the ready ones.
+
+    The index hands each ready dependent to exactly one caller, so a job
+    whose result is stored more than once, or whose status is also polled
+    through the service, does not start its dependents twice.
+
+    Args:
+        task_id: Celery task ID of the completed job's orchestrator
+    """
+    try:
+        ready = get_job_index().complete(task_id)
+    except Exception as e:
+        logger.warning(f"Failed to release dependents of job {task_id}: {e}")
+        return
+
+    for job_id in ready:
+        try:
+            logger.info(f"All dependencies of job {job_id} complete, starting it")
+            _start_dependent_job(job_id)
+        except Exception as e:
+            logger.error(f"Error starting dependent job {job_id} of {task_id}: {e}")
+            _index_job(job_id, StepStatus.FAILED, error=str(e))
+
+
+def _get_step_weight(step_name: str, step_config: dict[str, Any]) -> int:
+    """Get the resource weight of a step from its config or the settings.
+
+    Args:
+        step_name: Name of the step
+        step_config: Configuration for the step
+
+    Returns:
+        Number of resource tokens the step holds while it runs
+    """
+    from codestory.config.settings import get_settings
+
+    weights = getattr(get_settings().ingestion, "resource_step_weights", None)
+    return step_weight(step_name, step_config, weights)
+
+
+def _lease_id(job_id: str | None, step_name: str, attempt: int = 0) -> str | None:
+    """Build the scheduler waiter/lease ID of a step attempt.
+
+    Args:
+        job_id: ID of the pipeline job
+        step_name: Name of the step
+        attempt: Retry count of the step
+
+    Returns:
+        Stable lease ID, or None for steps that are not part of a job
+    """
+    return f"{job_id}:{step_name}:{attempt}" if job_id else None
+
+
+def _release_lease(lease_id: str | None) -> None:
+    """Release a resource lease, logging rather than raising on errors."""
+    if not lease_id:
+        return
+    try:
+        _get_scheduler().release(lease_id)
+    except Exception as e:
+        logger.error(f"Error releasing resource lease {lease_id}: {e}")
+
+
+@task_prerun.connect  # type: ignore[misc]
+def _start_lease_heartbeat(task_id: str | None = None, task: Any = None, **_: Any) -> None:
+    """Renew the resource lease of a step task while it runs.
+
+    run_step sends the lease ID as a message header of the plugin task, so
+    whichever worker picks the step up takes over the lease from its
+    dispatch TTL and keeps it alive until the task returns.
+    """
+    lease_id = getattr(getattr(task, "request", None), "lease_id", None)
+    if not lease_id or not task_id:
+        return
+
+    try:
+        if not _get_scheduler().heartbeat(lease_id, RESOURCE_LEASE_TTL_SECONDS):
+            logger.warning(f"Resource lease {lease_id} expired before its step started")
+            return
+    except Exception as e:
+        logger.warning(f"Error taking over resource lease {lease_id}: {e}")
+
+    stop = threading.Event()
+    _lease_heartbeats[task_id] = stop
+
+    def _beat() -> None:
+        while not stop.wait(RESOURCE_LEASE_TTL_SECONDS / 3):
+            try:
+                if not _get_scheduler().heartbeat(lease_id, RESOURCE_LEASE_TTL_SECONDS):
+                    logger.warning(f"Resource lease {lease_id} expired while its step ran")
+                    return
+            except Exception as e:
+                logger.warning(f"Error renewing resource lease {lease_id}: {e}")
+
+    threading.Thread(target=_beat, name=f"lease-heartbeat-{lease_id}", daemon=True).start()
+
+
+@task_postrun.connect  # type: ignore[misc]
+def _stop_lease_heartbeat(task_id: str | None = None, **_: Any) -> None:
+    """Stop renewing the resource lease of a step task that returned."""
+    stop = _lease_heartbeats.pop(task_id, None) if task_id else None
+    if stop is not None:
+        stop.set()
+
 
 @app.task(name="codestory.ingestion_pipeline.tasks.run_step", bind=True)  # type: ignore[misc]
 def run_step(
@@ -32,14 +321,14 @@ def run_step(
     step_config: dict[str, Any],
     job_id: str | None = None,
 ) -> dict[str, Any]:
-    """Run a single pipeline step.
+    """Dispatch a single pipeline step.
 
-    Implements resource throttling using ResourceTokenManager.
+    Implements resource throttling using ResourceScheduler.
 
-    This task calls the appropriate plugin to execute a specific pipeline step.
-    It uses a task_name_map to route to the fully qualified task name for each step,
-    and applies parameter filtering to ensure each step receives only the parameters
-    it can handle.
+    This task sends the appropriate plugin task for the step and returns
+    immediately. The plugin task carries complete_step/fail_step
+    continuations, which record its outcome in the job store and release the
+    step's resource lease, so no worker sits waiting for the step to finish.
 
     Args:
         self: Celery task instance
@@ -49,15 +338,14 @@ def run_step(
         job_id: Optional job ID to use
 
     Returns:
-        Dict[str, Any]: Result information including:
+        Dict[str, Any]: Dispatch information including:
             - step: Name of the step
-            - status: StepStatus enum value
+            - status: StepStatus enum value (RUNNING once dispatched)
             - job_id: ID of the job
             - repository_path: Path to the repository
-            - start_time: When the step started
-            - end_time: When the step finished
-            - duration: Duration in seconds
-            - error: Optional error message if the step failed
+            - start_time: When the step was dispatched
+            - task_id: ID of the plugin task running the step
+            - error: Optional error message if dispatching failed
 
     Notes:
         This method includes two important mechanisms:
@@ -71,328 +359,558 @@ def run_step(
            "unexpected keyword argument" errors, this method filters the parameters
            based on the step type before passing them to the actual step task.
     """
-    # Record start time
     start_time = time.time()
-    logger.info(f"Starting step: {step_name} for repository: {repository_path}")
+    logger.info(f"Dispatching step: {step_name} for repository: {repository_path}")
 
-    # Record metric for step start
-    record_step_metrics(step_name, StepStatus.RUNNING)
-
-    # Initialize result
     result = {
         "step": step_name,
         "status": StepStatus.RUNNING,
         "job_id": job_id,
         "repository_path": repository_path,
         "start_time": start_time,
-        "task_id": self.request.id,
     }
 
-    import celery
+    # Extract retry/back-off config
+    max_retries = int(step_config.get("max_retries", 3))
+    back_off_seconds = int(step_config.get("back_off_seconds", 10))
+    timeout = int(step_config.get("timeout", DEFAULT_STEP_TIMEOUT))
+
+    attempt = 0
+    if job_id:
+        step = get_job_store().get_step(job_id, step_name)
+        if step and step["status"] != StepStatus.PENDING.value:
+            # Cancelled (or otherwise finished) while waiting for resources
+            logger.info(f"Step {step_name} of job {job_id} is {step['status']}, not dispatching")
+            result["status"] = StepStatus(step["status"])
+            return result
+        attempt = int(step.get("retry_count", 0)) if step else 0
+
+    # Wait briefly for a resource lease. If it isn't our turn yet, re-queue
+    # rather than holding this worker slot; the step keeps its place in the
+    # scheduler's FIFO queue meanwhile. The lease outlives the time the
+    # plugin task may wait in the broker queue.
+    lease_id = _get_scheduler().acquire(
+        _get_step_weight(step_name, step_config),
+        timeout=RESOURCE_WAIT_SECONDS,
+        waiter_id=_lease_id(job_id, step_name, attempt),
+        lease_ttl=RESOURCE_DISPATCH_TTL_SECONDS,
+        keep_place=True,
+    )
+    if lease_id is None:
+        logger.info(f"Step {step_name} is waiting for resources, re-queueing")
+        raise self.retry(countdown=RESOURCE_RETRY_SECONDS, max_retries=None)
+    result["lease_id"] = lease_id
+
+    # Map step name to the fully qualified task name
+    task_name_map = {
+        "filesystem": "codestory_filesystem.step.process_filesystem",
+        "blarify": "codestory_blarify.step.run_blarify",
+        "ast": "codestory_ast.step.run_ast_extraction",
+        "summarizer": "codestory_summarizer.step.run_summarizer",
+        "docgrapher": "codestory_docgrapher.step.run_docgrapher",
+        "documentation_grapher": "codestory_docgrapher.step.run_docgrapher",
+    }
 
-    from codestory.config.settings import get_settings
+    # Get the task name from the map or fallback to legacy format
+    task_name = task_name_map.get(step_name, f"{step_name}.run")
+    logger.debug(f"Dispatching to task: {task_name}")
+
+    # Prepare configuration for the step task - with parameter filtering
+    step_config_copy = step_config.copy()
+
+    # Don't add repository_path to kwargs as it's already passed in the task signature
+    # This avoids the "got multiple values for argument" error
+    if "repository_path" in step_config_copy:
+        logger.warning("Removing duplicate repository_path from step config to avoid conflicts")
+        del step_config_copy["repository_path"]
+
+    # Dependency declarations and resource weights are orchestration
+    # metadata, not step parameters
+    step_config_copy.pop("depends_on", None)
+    step_config_copy.pop("resource_weight", None)
+
+    # Include job_id in kwargs if present
+    if "job_id" not in step_config_copy and job_id:
+        step_config_copy["job_id"] = job_id
+
+    # Filter out step-specific parameters that are not common to all steps
+    # This prevents "unexpected keyword argument" errors when passing step configs
+    if step_name == "blarify":
+        # Blarify step doesn't use concurrency parameter
+        if "concurrency" in step_config_copy:
+            logger.debug(
+                "Removing 'concurrency' from blarify step config to avoid parameter mismatch"
+            )
+            del step_config_copy["concurrency"]
 
-    from .resource_manager import ResourceTokenManager
+    elif step_name in ("summarizer", "docgrapher", "documentation_grapher"):
+        # These steps might have specific parameters that other steps don't accept
+        safe_params = ["job_id", "ignore_patterns", "timeout", "incremental"]
+        for param in list(step_config_copy.keys()):
+            if param not in safe_params and param != step_name + "_specific":
+                logger.debug(
+                    f"Removing '{param}' from {step_name} step config to avoid "
+                    f"parameter mismatch"
+                )
+                del step_config_copy[param]
 
-    settings = get_settings()
-    redis_url = settings.redis.uri
-    max_tokens = getattr(settings.ingestion, "resource_max_tokens", 4)
+    try:
+        # Pass repository_path as the first positional argument. The step's
+        # timeout is enforced by Celery time limits instead of by polling,
+        # and the lease ID header has the worker heartbeat the lease.
+        step_task = app.send_task(
+            task_name,
+            args=[repository_path],
+            kwargs=step_config_copy,
+            headers={"lease_id": lease_id},
+            link=complete_step.s(job_id, step_name, lease_id),
+            link_error=fail_step.s(job_id, step_name, lease_id),
+            soft_time_limit=timeout,
+            time_limit=timeout + 60,
+        )
+    except Exception as e:
+        logger.error(f"Error sending task {task_name}: {e}")
+        _release_lease(lease_id)
 
-    token_manager = ResourceTokenManager(
-        redis_url=redis_url,
-        max_tokens=max_tokens,
-    )
+        # Retry on transient errors (example: network, resource busy)
+        if hasattr(e, "errno") and e.errno in (11, 10060, 110):  # EAGAIN, ETIMEDOUT, ECONNREFUSED
+            if self.request.retries < max_retries:
+                logger.warning(
+                    f"Transient error in step {step_name}, retrying "
+                    f"(attempt {self.request.retries + 1}/{max_retries}) in {back_off_seconds}s"
+                )
+                raise self.retry(countdown=back_off_seconds, max_retries=max_retries, exc=e) from e
 
-    acquired = token_manager.acquire_token()
-    if not acquired:
-        logger.error("Resource throttling: could not acquire resource token for step execution")
         result["status"] = StepStatus.FAILED
-        result["error"] = "Resource throttling: could not acquire resource token (system busy)"
-        end_time = time.time()
-        result["end_time"] = end_time
-        result["duration"] = end_time - start_time
-        record_step_metrics(step_name, StepStatus.FAILED, end_time - start_time)
+        result["error"] = f"Failed to send task {task_name}: {e}"
+        if job_id:
+            _handle_step_failure(get_job_store(), job_id, step_name, result["error"])
         return result
 
-    # Extract retry/back-off config
-    max_retries = int(step_config.get("max_retries", 3))
-    back_off_seconds = int(step_config.get("back_off_seconds", 10))
+    result["task_id"] = step_task.id
+    logger.info(f"Step {step_name} dispatched as task {task_name} (id: {step_task.id})")
+
+    if job_id:
+        get_job_store().transition_step(
+            job_id,
+            step_name,
+            StepStatus.RUNNING,
+            start_time=start_time,
+            task_id=step_task.id,
+            lease_id=lease_id,
+            message=f"Running {task_name}",
+        )
+        _publish_job_snapshot(get_job_store(), job_id)
+
+    record_step_metrics(step_name, StepStatus.RUNNING)
+    return result
 
-    try:
-        # This task doesn't directly run the step - instead it dispatches
-        # to the appropriate plugin's task which is registered separately
-        # Map step name to the fully qualified task name
-        task_name_map = {
-            "filesystem": "codestory_filesystem.step.process_filesystem",
-            "blarify": "codestory_blarify.step.run_blarify",
-            "summarizer": "codestory_summarizer.step.run_summarizer",
-            "docgrapher": "codestory_docgrapher.step.run_docgrapher",
-        }
 
-        # Get the task name from the map or fallback to legacy format
-        task_name = task_name_map.get(step_name, f"{step_name}.run")
+@app.task(name="codestory.ingestion_pipeline.tasks.complete_step")  # type: ignore[misc]
+def complete_step(
+    step_result: Any, job_id: str | None, step_name: str, lease_id: str | None = None
+) -> None:
+    """Continuation run after a step's plugin task returns.
 
-        # Log what we're trying to do
-        logger.debug(f"Dispatching to task: {task_name}")
-        logger.debug(f"Available tasks: {[t for t in app.tasks if step_name in t]}")
+    Args:
+        step_result: Return value of the plugin task
+        job_id: ID of the pipeline job
+        step_name: Name of the step
+        lease_id: ID of the step's resource lease
+    """
+    # Releasing is idempotent, so the lease is returned whatever happens next
+    _release_lease(lease_id)
+
+    # Steps may report failure in their result instead of raising
+    if isinstance(step_result, dict) and step_result.get("status") in (
+        StepStatus.FAILED,
+        StepStatus.FAILED.value,
+    ):
+        error = step_result.get("error") or step_result.get("message") or "Step failed"
+        _finish_failed_step(job_id, step_name, str(error))
+        return
+
+    if not job_id:
+        return
+
+    store = get_job_store()
+    step = store.get_step(job_id, step_name) or {}
+    end_time = time.time()
+    duration = end_time - float(step.get("start_time") or end_time)
+
+    fields: dict[str, Any] = {}
+    if isinstance(step_result, dict):
+        # Merge the step's own result, keeping our bookkeeping fields
+        fields.update(
+            {
+                k: v
+                for k, v in step_result.items()
+                if k
+                not in ("step", "status", "job_id", "repository_path", "start_time", "task_id")
+            }
+        )
 
-        # Prepare configuration for the step task - with parameter filtering
-        step_config_copy = step_config.copy()
+    record = store.transition_step(
+        job_id,
+        step_name,
+        StepStatus.COMPLETED,
+        **fields,
+        progress=100.0,
+        end_time=end_time,
+        duration=duration,
+        last_error=None,
+    )
+    if record is None:
+        # The step was cancelled while it ran
+        return
 
-        # Don't add repository_path to kwargs as it's already passed in the task signature
-        # This avoids the "got multiple values for argument" error
-        if "repository_path" in step_config_copy:
-            # If it's already in the config, remove it to avoid conflicts
-            logger.warning("Removing duplicate repository_path from step config to avoid conflicts")
-            del step_config_copy["repository_path"]
+    record_step_metrics(step_name, StepStatus.COMPLETED, duration)
+    logger.info(f"Completed step {step_name} of job {job_id} in {duration:.2f} seconds")
 
-        # Include job_id in kwargs if present
-        if "job_id" not in step_config_copy and job_id:
-            step_config_copy["job_id"] = job_id
+    _advance_job(store, job_id)
 
-        # Filter out step-specific parameters that are not common to all steps
-        # This prevents "unexpected keyword argument" errors when passing step configs
-        if step_name == "blarify":
-            # Blarify step doesn't use concurrency parameter
-            if "concurrency" in step_config_copy:
-                logger.debug(
-                    "Removing 'concurrency' from blarify step config to avoid parameter mismatch"
-                )
-                del step_config_copy["concurrency"]
-
-        elif step_name == "summarizer" or step_name == "docgrapher":
-            # These steps might have specific parameters that other steps don't accept
-            safe_params = ["job_id", "ignore_patterns", "timeout", "incremental"]
-            for param in list(step_config_copy.keys()):
-                if param not in safe_params and param != step_name + "_specific":
-                    logger.debug(
-                        f"Removing '{param}' from {step_name} step config to avoid "
-                        f"parameter mismatch"
-                    )
-                    del step_config_copy[param]
-
-        logger.debug(
-            f"Sending task {task_name} with args=[repository_path={repository_path}] "
-            f"and kwargs={step_config_copy}"
-        )
 
-        try:
-            # Pass repository_path as the first positional argument
-            step_task = app.send_task(
-                task_name,
-                args=[repository_path],  # Pass repository_path as first arg
-                kwargs=step_config_copy,
-            )
-            logger.debug(f"Task {task_name} sent successfully with ID: {step_task.id}")
-        except Exception as e:
-            logger.error(f"Error sending task {task_name}: {e}")
-            # Retry on transient errors (example: network, resource busy)
-            if hasattr(e, "errno") and e.errno in (11, 10060, 110):  # EAGAIN, ETIMEDOUT, ECONNREFUSED
-                if self.request.retries < max_retries:
-                    logger.warning(
-                        f"Transient error in step {step_name}, retrying "
-                        f"(attempt {self.request.retries + 1}/{max_retries}) in {back_off_seconds}s"
-                    )
-                    raise self.retry(
-                        countdown=back_off_seconds,
-                        max_retries=max_retries,
-                        exc=e,
-                    ) from e
-            # Try to get more detailed error message
-            raise Exception(f"Failed to send task {task_name}: {e}") from e
-
-        # FIXED: Don't use .get() inside a task as this is a known anti-pattern
-        # Instead, use the AsyncResult to check the task status without blocking
-        async_result = AsyncResult(step_task.id, app=app)
-        # Poll for completion with a timeout
-        timeout = step_config.get("timeout", 1800)  # 30 minutes default timeout
-        start_poll = time.time()
-        step_result = None
-
-        logger.info(f"Waiting for task {task_name} (id: {step_task.id}) with timeout {timeout}s")
-        last_log_time = start_poll
-        poll_counter = 0
-
-        while time.time() - start_poll < timeout:
-            poll_counter += 1
-            current_time = time.time()
-
-            # Collect resource usage
-            cpu_percent = None
-            memory_mb = None
-            if psutil:
-                try:
-                    p = psutil.Process()
-                    cpu_percent = p.cpu_percent(interval=0.0)
-                    memory_mb = p.memory_info().rss / 1024 / 1024
-                except Exception:
-                    cpu_percent = None
-                    memory_mb = None
-
-            # Emit progress update every 10 seconds or every 20 polls
-            if (current_time - last_log_time > 10 or poll_counter % 20 == 0):
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "progress": None,  # Could estimate based on step state if desired
-                        "message": f"Waiting for task {task_name} (elapsed: {current_time - start_poll:.1f}s)",
-                        "cpu_percent": cpu_percent,
-                        "memory_mb": memory_mb,
-                        "step": step_name,
-                        "retry_count": self.request.retries,
-                    },
-                )
+@app.task(name="codestory.ingestion_pipeline.tasks.fail_step")  # type: ignore[misc]
+def fail_step(
+    request: Any,
+    exc: BaseException,
+    traceback: Any,
+    job_id: str | None,
+    step_name: str,
+    lease_id: str | None = None,
+) -> None:
+    """Error continuation run when a step's plugin task raises.
 
-            # Check for task revocation/cancellation
-            if hasattr(self, "request") and getattr(self.request, "is_revoked", None):
-                if self.request.is_revoked():
-                    logger.warning(f"Step task {self.request.id} was revoked. Cancelling step execution.")
-                    result["status"] = StepStatus.CANCELLED
-                    result["error"] = "Step was cancelled by user"
-                    end_time = time.time()
-                    result["end_time"] = end_time
-                    result["duration"] = end_time - start_time
-                    result["retry_count"] = self.request.retries
-                    record_step_metrics(step_name, StepStatus.CANCELLED, end_time - start_time)
-                    logger.info(f"Step cancelled after {end_time - start_time:.2f} seconds")
-                    return result
-
-            # Log status every 30 seconds
-            if current_time - last_log_time > 30 or poll_counter % 30 == 0:
-                logger.info(
-                    f"[{poll_counter}] Still waiting for task {task_name} (id: {step_task.id}) - "
-                    f"elapsed: {current_time - start_poll:.1f}s"
-                )
-                last_log_time = current_time
-
-                # Check if task exists
-                task_state = None
-                try:
-                    task_state = async_result.state
-                    logger.info(f"Task state: {task_state}")
-                except Exception as e:
-                    logger.error(f"Error getting task state: {e}")
-
-            if async_result.ready():
-                logger.info(f"Task {task_name} is ready after {time.time() - start_poll:.1f}s")
-                if async_result.successful():
-                    try:
-                        step_result = async_result.result
-                        logger.info(f"Task completed successfully: {type(step_result)}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Error getting result: {e}")
-                        # Retry on transient error in result retrieval
-                        if hasattr(e, "errno") and e.errno in (11, 10060, 110):
-                            if self.request.retries < max_retries:
-                                logger.warning(
-                                    f"Transient error retrieving result for {step_name}, retrying "
-                                    f"(attempt {self.request.retries + 1}/{max_retries}) in {back_off_seconds}s"
-                                )
-                                raise self.retry(
-                                    countdown=back_off_seconds,
-                                    max_retries=max_retries,
-                                    exc=e,
-                                ) from e
-                        raise Exception(f"Error retrieving task result: {e}") from e
-                else:
-                    error_info = "Unknown error"
-                    try:
-                        error_info = async_result.result
-                    except Exception as e:
-                        error_info = f"Could not retrieve error info: {e}"
-                    logger.error(f"Task failed: {error_info}")
-                    # Retry on transient error in step execution
-                    if hasattr(error_info, "errno") and error_info.errno in (11, 10060, 110):
-                        if self.request.retries < max_retries:
-                            logger.warning(
-                                f"Transient error in step {step_name}, retrying "
-                                f"(attempt {self.request.retries + 1}/{max_retries}) in {back_off_seconds}s"
-                            )
-                            raise self.retry(
-                                countdown=back_off_seconds,
-                                max_retries=max_retries,
-                                exc=error_info,
-                            )
-                    raise Exception(f"Step task failed: {error_info}")
-            time.sleep(1)  # Wait before checking again
-
-        if step_result is None:
-            logger.error(f"Task {task_name} (id: {step_task.id}) timed out after {timeout}s")
-            # Retry on timeout if not exceeded max_retries
-            if self.request.retries < max_retries:
-                logger.warning(
-                    f"Step {step_name} timed out, retrying "
-                    f"(attempt {self.request.retries + 1}/{max_retries}) in {back_off_seconds}s"
-                )
-                raise self.retry(
-                    countdown=back_off_seconds,
-                    max_retries=max_retries,
-                    exc=TimeoutError(f"Step task timed out after {timeout} seconds"),
-                )
-            raise Exception(f"Step task timed out after {timeout} seconds")
-
-        # Update result with step's result
-        if isinstance(step_result, dict):
-            # If the step returns a dictionary, merge it with our result
-            result.update(
-                {
-                    k: v
-                    for k, v in step_result.items()
-                    if k not in ["step", "repository_path", "start_time", "task_id"]
-                }
-            )
-        else:
-            # If the step just returns a job ID
-            result["job_id"] = step_result
+    Args:
+        request: Request context of the failed plugin task
+        exc: Exception raised by the plugin task
+        traceback: Traceback of the exception
+        job_id: ID of the pipeline job
+        step_name: Name of the step
+        lease_id: ID of the step's resource lease
+    """
+    _release_lease(lease_id)
+    logger.error(f"Step {step_name} of job {job_id} failed: {exc}")
+    _finish_failed_step(job_id, step_name, str(exc))
 
-        # Mark as completed
-        result["status"] = StepStatus.COMPLETED
-        result["retry_count"] = self.request.retries
-        result["last_error"] = None
 
-    except Exception as e:
-        # Log the error
-        logger.exception(f"Error running step {step_name}: {e}")
+def _finish_failed_step(job_id: str | None, step_name: str, error: str) -> None:
+    """Record a step's failure.
 
-        # Update result with error information
-        result["status"] = StepStatus.FAILED
-        result["error"] = str(e)
-        result["retry_count"] = self.request.retries
-        result["last_error"] = str(e)
+    Args:
+        job_id: ID of the pipeline job
+        step_name: Name of the step
+        error: Error message
+    """
+    if not job_id:
+        return
+
+    store = get_job_store()
+    step = store.get_step(job_id, step_name)
+    if not step or step["status"] != StepStatus.RUNNING.value:
+        # Already finished or cancelled
+        return
+
+    _handle_step_failure(store, job_id, step_name, error)
 
-    finally:
-        # Always release the token if it was acquired
-        try:
-            token_manager.release_token()
-        except Exception as e:
-            logger.error(f"Error releasing resource token: {e}")
 
-    # Record end time and duration
+def _handle_step_failure(
+    store: PipelineJobStore, job_id: str, step_name: str, error: str
+) -> None:
+    """Retry a failed step or mark it and its dependents as failed.
+
+    Args:
+        store: Pipeline job store
+        job_id: ID of the pipeline job
+        step_name: Name of the step
+        error: Error message
+    """
+    job = store.get_job(job_id)
+    if not job:
+        return
+
+    step_config = job["step_configs"].get(step_name, {})
+    step = store.get_step(job_id, step_name) or {}
+    retry_count = int(step.get("retry_count", 0))
+    max_retries = int(step_config.get("max_retries", 3))
+    back_off_seconds = int(step_config.get("back_off_seconds", 10))
     end_time = time.time()
-    duration = end_time - start_time
-    result["end_time"] = end_time
-    result["duration"] = duration
+    duration = end_time - float(step.get("start_time") or end_time)
 
-    # Record metrics
-    record_step_metrics(step_name, StepStatus(result["status"]), duration)
+    if retry_count < max_retries and StepStatus(job["status"]) not in TERMINAL_STATUSES:
+        logger.warning(
+            f"Step {step_name} failed, retrying "
+            f"(attempt {retry_count + 1}/{max_retries}) in {back_off_seconds}s"
+        )
+        store.transition_step(
+            job_id, step_name, StepStatus.PENDING, retry_count=retry_count + 1, last_error=error
+        )
+        store.release_claim(job_id, step_name)
+        if store.claim(job_id, step_name):
+            _dispatch_step(store, job, step_name, countdown=back_off_seconds)
+        _publish_job_snapshot(store, job_id)
+        return
+
+    store.transition_step(
+        job_id,
+        step_name,
+        StepStatus.FAILED,
+        error=error,
+        last_error=error,
+        end_time=end_time,
+        duration=duration,
+    )
+    record_step_metrics(step_name, StepStatus.FAILED, duration)
+
+    # Steps that depend on the failed step can never run
+    for dependent in store.dependents_of(job_id, step_name):
+        if store.claim(job_id, dependent):
+            store.transition_step(
+                job_id,
+                dependent,
+                StepStatus.CANCELLED,
+                error=f"Skipped because dependency {step_name} failed",
+            )
+
+    _advance_job(store, job_id)
+
+
+def _dispatch_step(
+    store: PipelineJobStore, job: dict[str, Any], step_name: str, countdown: int = 0
+) -> None:
+    """Send the run_step task for a claimed step.
 
-    # Log completion
-    logger.info(
-        f"Completed step {step_name} with status {result['status']} in {duration:.2f} seconds"
+    Args:
+        store: Pipeline job store
+        job: Job dictionary from the store
+        step_name: Name of the step
+        countdown: Seconds to delay the step
+    """
+    step_config = {k: v for k, v in job["step_configs"][step_name].items() if k != "name"}
+    step_config["job_id"] = job["job_id"]
+    run_step.apply_async(
+        args=[job["repository_path"]],
+        kwargs={"step_name": step_name, "step_config": step_config, "job_id": job["job_id"]},
+        countdown=countdown or None,
     )
 
+
+def _advance_job(store: PipelineJobStore, job_id: str) -> None:
+    """Dispatch newly runnable steps and finalize the job once it is done.
+
+    Args:
+        store: Pipeline job store
+        job_id: ID of the pipeline job
+    """
+    ready = store.claim_ready_steps(job_id)
+    if ready:
+        job = store.get_job(job_id)
+        if job:
+            for step_name in ready:
+                logger.info(f"Dispatching step {step_name} of job {job_id}")
+                _dispatch_step(store, job, step_name)
+
+    if store.is_finished(job_id):
+        _finalize_job(store, job_id)
+    else:
+        _publish_job_snapshot(store, job_id)
+
+
+def _build_job_result(job: dict[str, Any]) -> dict[str, Any]:
+    """Build the externally visible result dictionary for a job.
+
+    Args:
+        job: Job dictionary from the store
+
+    Returns:
+        Dict[str, Any]: Job result in the orchestrate_pipeline result format
+    """
+    steps = job["steps"]
+    done = sum(1 for s in steps if StepStatus(s["status"]) in TERMINAL_STATUSES)
+    running = [s["step"] for s in steps if s["status"] == StepStatus.RUNNING.value]
+    levels = topological_levels(list(job["step_configs"].values()))
+
+    result = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "repository_path": job["repository_path"],
+        "steps": steps,
+        "levels": [[step["name"] for step in level] for level in levels],
+        "start_time": job["start_time"],
+        "progress": 100.0 * done / len(steps) if steps else 100.0,
+        "step": ", ".join(running) if running else "pipeline",
+        "message": f"{done}/{len(steps)} steps finished",
+    }
+    for key in ("end_time", "duration", "error"):
+        if job.get(key) not in (None, ""):
+            result[key] = float(job[key]) if key != "error" else job[key]
     return result
 
 
+def _publish_job_snapshot(store: PipelineJobStore, job_id: str) -> None:
+    """Expose the job's current state through the orchestrator task's result.
+
+    Args:
+        store: Pipeline job store
+        job_id: ID of the pipeline job
+    """
+    job = store.get_job(job_id)
+    if not job or not job.get("orchestrator_task_id"):
+        return
+
+    task_id = job["orchestrator_task_id"]
+    if StepStatus(job["status"]) in TERMINAL_STATUSES:
+        _store_final_result(job)
+        return
+
+    result = _build_job_result(job)
+    app.backend.store_result(task_id, result, "STARTED")
+    publish_job_progress(task_id, StepStatus(job["status"]), result["progress"], result["message"])
+
+    # The job may have been finalized while the snapshot was being written;
+    # make sure the final result is the one that sticks
+    job = store.get_job(job_id)
+    if job and StepStatus(job["status"]) in TERMINAL_STATUSES:
+        _store_final_result(job)
+
+
+def _store_final_result(job: dict[str, Any]) -> None:
+    """Store a finished job's result on the orchestrator task.
+
+    Args:
+        job: Job dictionary from the store
+    """
+    state = "REVOKED" if job["status"] == StepStatus.CANCELLED.value else "SUCCESS"
+    result = _build_job_result(job)
+    app.backend.store_result(job["orchestrator_task_id"], result, state)
+    publish_job_progress(
+        job["orchestrator_task_id"],
+        StepStatus(job["status"]),
+        result["progress"],
+        result.get("error") or result["message"],
+    )
+    _index_job(
+        job["orchestrator_task_id"],
+        StepStatus(job["status"]),
+        repository=job.get("repository_path"),
+        duration=job.get("duration"),
+        error=job.get("error") or None,
+    )
+    if job["status"] == StepStatus.COMPLETED.value:
+        _start_dependents(job["orchestrator_task_id"])
+
+
+def _finalize_job(store: PipelineJobStore, job_id: str) -> None:
+    """Compute a finished job's overall status and publish its result.
+
+    Args:
+        store: Pipeline job store
+        job_id: ID of the pipeline job
+    """
+    if not store.claim(job_id, "__job__"):
+        return
+
+    job = store.get_job(job_id)
+    if not job:
+        return
+
+    failed_steps = [
+        s["step"]
+        for s in job["steps"]
+        if s["status"] in (StepStatus.FAILED.value, StepStatus.CANCELLED.value)
+    ]
+    end_time = time.time()
+    fields: dict[str, Any] = {"end_time": end_time, "duration": end_time - job["start_time"]}
+
+    if failed_steps:
+        # Mark the job as failed if any step failed
+        fields["error"] = f"{len(failed_steps)} steps failed: {', '.join(failed_steps)}"
+        status = StepStatus.FAILED
+    else:
+        # Mark as completed if all steps succeeded
+        status = StepStatus.COMPLETED
+
+    if store.transition_job(job_id, status, **fields):
+        record_job_metrics(status)
+        logger.info(
+            f"Completed pipeline {job_id} with status {status.value} "
+            f"in {fields['duration']:.2f} seconds"
+        )
+
+    job = store.get_job(job_id)
+    if job:
+        if job.get("orchestrator_task_id"):
+            _store_final_result(job)
+        store.expire_job(job_id, job.get("orchestrator_task_id"))
+
+
+def cancel_pipeline(task_id: str) -> bool:
+    """Cancel the pipeline job started by an orchestrator task.
+
+    Pending steps are cancelled and leave the resource queue, running step
+    tasks are revoked and their resource leases released.
+
+    Args:
+        task_id: Celery task ID of the orchestrator
+
+    Returns:
+        True if a tracked pipeline job was cancelled
+    """
+    store = get_job_store()
+    job_id = store.job_id_for_task(task_id)
+    if not job_id:
+        return False
+
+    end_time = time.time()
+    job = store.get_job(job_id)
+    if not job or not store.transition_job(
+        job_id,
+        StepStatus.CANCELLED,
+        error="Pipeline was cancelled by user",
+        end_time=end_time,
+        duration=end_time - job["start_time"],
+    ):
+        return False
+
+    for step in job["steps"]:
+        if step["status"] == StepStatus.RUNNING.value:
+            if step.get("task_id"):
+                app.control.revoke(step["task_id"], terminate=True)
+            store.transition_step(
+                job_id, step["step"], StepStatus.CANCELLED, error="Step was cancelled by user"
+            )
+            _release_lease(step.get("lease_id"))
+        elif step["status"] == StepStatus.PENDING.value:
+            waiter_id = _lease_id(job_id, step["step"], int(step.get("retry_count", 0)))
+            if waiter_id:
+                _get_scheduler().cancel_wait(waiter_id)
+            store.claim(job_id, step["step"])
+            store.transition_step(
+                job_id, step["step"], StepStatus.CANCELLED, error="Step was cancelled by user"
+            )
+
+    record_job_metrics(StepStatus.CANCELLED)
+    store.claim(job_id, "__job__")
+    job = store.get_job(job_id)
+    if job:
+        _store_final_result(job)
+        store.expire_job(job_id, task_id)
+
+    logger.info(f"Pipeline {job_id} cancelled")
+    return True
+
+
 @app.task(name="codestory.ingestion_pipeline.tasks.orchestrate_pipeline", bind=True)  # type: ignore[misc]
 def orchestrate_pipeline(
     self: Any, repository_path: str, step_configs: list[dict[str, Any]], job_id: str
 ) -> dict[str, Any]:
-    """Orchestrate the execution of the entire pipeline.
+    """Start the execution of the entire pipeline.
 
-    This task creates a chain of steps to be executed in order,
-    tracks their progress, and returns the overall result.
+    This task records the job and its step dependency DAG (declared by the
+    steps' ``depends_on`` settings) in the job store and dispatches the steps
+    that have no dependencies. It does not wait for them: step continuations
+    advance the job, and the final result is stored on this task's result
+    once every step has finished. Independent steps run concurrently.
 
     Args:
         self: Celery task instance
@@ -401,207 +919,59 @@ def orchestrate_pipeline(
         job_id: ID for the overall pipeline job
 
     Returns:
-        Dict[str, Any]: Result information including:
+        Dict[str, Any]: Result information, stored on this task once the
+        pipeline finishes, including:
             - job_id: ID of the overall job
             - status: StepStatus enum value
             - repository_path: Path to the repository
             - steps: List of step results
+            - levels: Step names grouped by DAG level
             - start_time: When the pipeline started
             - end_time: When the pipeline finished
             - duration: Duration in seconds
             - error: Optional error message if the pipeline failed
     """
-    # Record start time
     start_time = time.time()
     logger.info(f"Starting pipeline for repository: {repository_path} (job_id: {job_id})")
 
     # Record metric for job start
     record_job_metrics(StepStatus.RUNNING)
 
-    # Initialize result
-    result = {
-        "job_id": job_id,
-        "status": StepStatus.RUNNING,
-        "repository_path": repository_path,
-        "steps": [],
-        "start_time": start_time,
-    }
-
     try:
-        # Create a chain of step tasks
-        workflow: list[Any] = []
-
-        # Add each step to the workflow
-        for step_config in step_configs:
-            step_name = step_config.pop("name")
-            # When creating signatures, we need to be careful about argument passing
-            # to avoid 'got multiple values for argument' errors
-            # Create a copy of step_config and explicitly set the job_id
-            step_config_copy = step_config.copy()
-            # Make sure job_id is included in every step
-            step_config_copy["job_id"] = job_id
-
-            workflow.append(
-                run_step.s(
-                    step_name=step_name,
-                    step_config=step_config_copy,
-                    job_id=job_id,  # Pass job_id explicitly as kwarg
-                    # Do not include repository_path here, will be passed as arg
-                )
-            )
-
-        # Run the workflow as a chain (sequential execution)
-        # Prepare arguments for the chain
-        try:
-            logger.info(f"Sending args=[{repository_path}] to chain with {len(workflow)} steps")
-
-            # The first argument to the chain is the repository_path
-            # This will be passed to the first task in the chain
-            chain_result = chain(*workflow).apply_async(args=[repository_path])
-
-            logger.info(f"Chain started with ID: {chain_result.id}")
-        except Exception as e:
-            logger.error(f"Error starting chain: {e}")
-            # Try to get more detailed error message
-            from celery.exceptions import CeleryError
-
-            if isinstance(e, CeleryError):
-                logger.error(f"Celery error details: {e.args}")
-            raise
-
-        # FIXED: Don't use .get() inside a task as this is a known anti-pattern
-        # Instead, use polling to check for completion
-        async_result = AsyncResult(chain_result.id, app=app)
-        timeout = 1800  # 30 minutes default timeout for the entire pipeline
-        start_poll = time.time()
-        all_results = None
-
-        logger.info(f"Waiting for chain (id: {chain_result.id}) with timeout {timeout}s")
-        last_log_time = start_poll
-        poll_counter = 0
-
-        import celery
-        while time.time() - start_poll < timeout:
-            poll_counter += 1
-            current_time = time.time()
-
-            # Check for task revocation/cancellation
-            if hasattr(self, "request") and getattr(self.request, "is_revoked", None):
-                if self.request.is_revoked():
-                    logger.warning(f"Pipeline task {self.request.id} was revoked. Cancelling pipeline execution.")
-                    result["status"] = StepStatus.CANCELLED
-                    result["error"] = "Pipeline was cancelled by user"
-                    end_time = time.time()
-                    result["end_time"] = end_time
-                    result["duration"] = end_time - start_time
-                    record_job_metrics(StepStatus.CANCELLED)
-                    logger.info(f"Pipeline cancelled after {end_time - start_time:.2f} seconds")
-                    return result
-
-            # Log status every 30 seconds or each 15 polls
-            if current_time - last_log_time > 30 or poll_counter % 15 == 0:
-                logger.info(
-                    f"[{poll_counter}] Still waiting for chain (id: {chain_result.id}) - "
-                    f"elapsed: {current_time - start_poll:.1f}s"
-                )
-                last_log_time = current_time
-
-                # Collect resource usage
-                cpu_percent = None
-                memory_mb = None
-                if psutil:
-                    try:
-                        p = psutil.Process()
-                        cpu_percent = p.cpu_percent(interval=0.0)
-                        memory_mb = p.memory_info().rss / 1024 / 1024
-                    except Exception:
-                        cpu_percent = None
-                        memory_mb = None
-
-                # Emit progress update
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "progress": None,  # Could estimate based on steps completed
-                        "message": f"Waiting for pipeline chain (elapsed: {current_time - start_poll:.1f}s)",
-                        "cpu_percent": cpu_percent,
-                        "memory_mb": memory_mb,
-                        "step": "pipeline",
-                    },
-                )
-
-                # Check current state
-                try:
-                    chain_state = async_result.state
-                    logger.info(f"Chain state: {chain_state}")
-                except Exception as e:
-                    logger.error(f"Error getting chain state: {e}")
-
-            if async_result.ready():
-                logger.info(f"Chain is ready after {time.time() - start_poll:.1f}s")
-                if async_result.successful():
-                    try:
-                        all_results = async_result.result
-                        logger.info(f"Chain completed successfully: {type(all_results)}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Error getting chain result: {e}")
-                        raise Exception(f"Error retrieving chain result: {e}") from e
-                else:
-                    error_info = "Unknown error"
-                    try:
-                        error_info = async_result.result
-                    except Exception as e:
-                        error_info = f"Could not retrieve error info: {e}"
-                    logger.error(f"Chain failed: {error_info}")
-                    raise Exception(f"Chain execution failed: {error_info}")
-
-            time.sleep(2)  # Check less frequently for longer-running pipeline
-
-        if all_results is None:
-            logger.error(f"Chain (id: {chain_result.id}) timed out after {timeout}s")
-            raise Exception(f"Pipeline timed out after {timeout} seconds")
-
-        # If there's only one step, wrap it in a list
-        if not isinstance(all_results, list):
-            all_results = [all_results]
-
-        # Update the result with step results
-        result["steps"] = all_results
-
-        # Check if any step failed
-        failed_steps = [s for s in all_results if s.get("status") == StepStatus.FAILED]
-        if failed_steps:
-            # Mark the job as failed if any step failed
-            result["status"] = StepStatus.FAILED
-            result[
-                "error"
-            ] = f"{len(failed_steps)} steps failed: {', '.join(s['step'] for s in failed_steps)}"
-        else:
-            # Mark as completed if all steps succeeded
-            result["status"] = StepStatus.COMPLETED
-
+        dependencies = resolve_step_dependencies(step_configs)
+        levels = topological_levels(step_configs)
+        logger.info(f"Pipeline DAG levels: {[[s['name'] for s in level] for level in levels]}")
+
+        store = get_job_store()
+        store.create_job(job_id, self.request.id, repository_path, step_configs, dependencies)
+        _index_job(self.request.id, StepStatus.RUNNING, repository=repository_path)
+        _advance_job(store, job_id)
     except Exception as e:
-        # Log the error
         logger.exception(f"Error orchestrating pipeline: {e}")
+        end_time = time.time()
+        record_job_metrics(StepStatus.FAILED)
+        if self.request.id:
+            _index_job(
+                self.request.id,
+                StepStatus.FAILED,
+                repository=repository_path,
+                duration=end_time - start_time,
+                error=str(e),
+            )
+        return {
+            "job_id": job_id,
+            "status": StepStatus.FAILED,
+            "repository_path": repository_path,
+            "steps": [],
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": end_time - start_time,
+            "error": str(e),
+        }
 
-        # Update result with error information
-        result["status"] = StepStatus.FAILED
-        result["error"] = str(e)
-
-    # Record end time and duration
-    end_time = time.time()
-    duration = end_time - start_time
-    result["end_time"] = end_time
-    result["duration"] = duration
-
-    # Record metrics
-    record_job_metrics(StepStatus(result["status"]))
-
-    # Log completion
-    logger.info(f"Completed pipeline with status {result['status']} in {duration:.2f} seconds")
-
-    return result
+    # The job's result is stored by the step continuations; don't let the
+    # worker overwrite it with this task's return value
+    raise Ignore()
 
 
 @app.task(name="codestory.ingestion_pipeline.tasks.get_job_status", bind=True)  # type: ignore[misc]
@@ -659,8 +1029,11 @@ def stop_job(self: Any, task_id: str) -> dict[str, Any]:
         result = AsyncResult(task_id, app=app)
 
         if not result.ready():
-            # Revoke the task (terminate=True means it will be killed if running)
-            app.control.revoke(task_id, terminate=True)
+            # Cancel the pipeline's steps; revoke the task itself for jobs
+            # that are not tracked in the job store
+            if not cancel_pipeline(task_id):
+                # Revoke the task (terminate=True means it will be killed if running)
+                app.control.revoke(task_id, terminate=True)
             return {
                 "status": StepStatus.STOPPED,
                 "message": f"Job {task_id} has been stopped",
@@ -682,4 +1055,4 @@ def stop_job(self: Any, task_id: str) -> dict[str, Any]:
         return {
             "status": StepStatus.FAILED,
             "error": f"Error stopping job: {e!s}",
-        }
\ No newline at end of file
+        }
@@ -20,6 +20,7 @@ except ImportError:
 
 from prometheus_client import Counter, Gauge, Histogram
 
+from .dag import topological_levels
 from .step import PipelineStep, StepStatus
 
 # Set up logging
@@ -187,6 +188,9 @@ def load_pipeline_config(config_path: str | Path) -> dict[str, Any]:
         if "name" not in step:
             raise ValueError(f"Step {i} must have a 'name' key")
 
+    # Ensure the step dependencies form a DAG
+    topological_levels(config["steps"])
+
     # Add default values if missing
     if "retry" not in config:
         config["retry"] = {}
@@ -278,6 +282,7 @@ def find_step_manually(step_name: str) -> type[PipelineStep] | None:
     """
     step_mapping = {
         "blarify": "codestory_blarify.step",
+        "ast": "codestory_ast.step",
         "filesystem": "codestory_filesystem.step",
         "summarizer": "codestory_summarizer.step",
         "documentation_grapher": "codestory_docgrapher.step",
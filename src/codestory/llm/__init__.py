@@ -5,9 +5,12 @@ including both synchronous and asynchronous APIs for completions,
 chat, and embeddings.
 """
 
+from .batch import BatchClient, BatchResult, create_batch_client
 from .client import OpenAIClient, create_client
 from .exceptions import (
     AuthenticationError,
+    BatchError,
+    CircuitOpenError,
     ContextLengthError,
     InvalidRequestError,
     OpenAIError,
@@ -28,10 +31,15 @@ from .models import (
 
 __all__ = [
     "AuthenticationError",
+    # Batch API
+    "BatchClient",
+    "BatchError",
+    "BatchResult",
     "ChatCompletionRequest",
     "ChatCompletionResponse",
     "ChatMessage",
     "ChatRole",
+    "CircuitOpenError",
     # Models
     "CompletionRequest",
     "CompletionResponse",
@@ -46,5 +54,6 @@ __all__ = [
     "RateLimitError",
     "ServiceUnavailableError",
     "TimeoutError",
+    "create_batch_client",
     "create_client",
 ]
@@ -1,30 +1,51 @@
 """Retry and backoff logic for OpenAI API calls.
 
-This module provides retry logic with exponential backoff for handling
-rate limiting and transient errors from the Azure OpenAI API.
+This module provides retry logic for handling rate limiting and transient
+errors from the Azure OpenAI API. A retry waits as long as the server asks
+(Retry-After) or, without such a hint, a decorrelated jittered backoff, so
+workers hit by the same error do not retry in lockstep. A process-wide retry
+budget keeps retries from multiplying the load on an overloaded endpoint, and
+a circuit breaker per endpoint fails calls fast while the endpoint is down.
 """
 
+import email.utils
 import functools
 import logging
-from collections.abc import Callable
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
 from typing import Any, TypeVar, cast
 
 import openai
 from tenacity import (
     RetryCallState,
-    before_sleep_log,
     retry,
     retry_if_exception_type,
+    retry_if_not_exception_type,
     stop_after_attempt,
-    wait_exponential,
 )
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
 
 from .exceptions import (
+    AuthenticationError,
+    CircuitOpenError,
+    ContextLengthError,
+    InvalidRequestError,
     RateLimitError,
     ServiceUnavailableError,
     TimeoutError,
 )
-from .metrics import OperationType, record_retry
+from .metrics import (
+    OperationType,
+    record_circuit_rejection,
+    record_circuit_state,
+    record_retry,
+    record_retry_budget_exhausted,
+    record_retry_budget_tokens,
+    record_retry_wait,
+)
 
 # Type variable for decorated functions
 F = TypeVar("F", bound=Callable[..., Any])
@@ -32,6 +53,56 @@ F = TypeVar("F", bound=Callable[..., Any])
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Longest server-requested delay that is honoured
+MAX_RETRY_AFTER = 60.0
+
+# Errors worth retrying
+RETRYABLE_ERRORS = (
+    RateLimitError,
+    ServiceUnavailableError,
+    TimeoutError,
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+)
+
+# Errors meaning the endpoint is down, as opposed to busy or rejecting the request
+OUTAGE_ERRORS = (ServiceUnavailableError, TimeoutError)
+
+
+def parse_retry_after(headers: Mapping[str, Any] | None) -> float | None:
+    """Parse the delay a server asks for from response headers.
+
+    Azure OpenAI sends ``retry-after-ms``; ``retry-after`` may hold seconds or
+    an HTTP date.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Delay in seconds, or None if the headers do not specify one
+    """
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if isinstance(retry_after_ms, str | int | float):
+            return max(0.0, float(retry_after_ms) / 1000)
+
+        retry_after = headers.get("retry-after")
+        if isinstance(retry_after, int | float):
+            return max(0.0, float(retry_after))
+        if isinstance(retry_after, str):
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                retry_at = email.utils.parsedate_to_datetime(retry_after)
+                return max(0.0, retry_at.timestamp() - time.time())
+    except (ValueError, TypeError):
+        pass
+    return None
+
 
 def get_retry_after(retry_state: RetryCallState) -> float | None:
     """Get retry-after time from the exception.
@@ -44,23 +115,319 @@ def get_retry_after(retry_state: RetryCallState) -> float | None:
     """
     exception = retry_state.outcome.exception()  # type: ignore[union-attr]
     if exception is not None and hasattr(exception, "retry_after") and exception.retry_after is not None:
-        return float(min(exception.retry_after, 60))  # Cap at 60 seconds
+        return float(min(exception.retry_after, MAX_RETRY_AFTER))
 
-    # Return None when no retry_after is specified to allow exponential backoff to handle timing
+    # Return None when no retry_after is specified to allow the backoff to handle timing
     return None
 
 
-def before_retry_callback(retry_state: RetryCallState) -> None:
+class DecorrelatedJitterWait(wait_base):  # type: ignore[misc]
+    """Wait honouring Retry-After, with decorrelated jitter otherwise.
+
+    Without a server hint, each wait is drawn uniformly between ``base`` and
+    three times the previous wait, capped at ``cap``. With a hint, the wait is
+    the requested delay plus up to ``base`` seconds, so clients told the same
+    delay do not all return at the same instant.
+    """
+
+    def __init__(
+        self,
+        base: float = 1.0,
+        cap: float = 60.0,
+        operation_type: OperationType | None = None,
+    ) -> None:
+        """Initialize the wait strategy.
+
+        Args:
+            base: Shortest wait in seconds
+            cap: Longest jittered wait in seconds
+            operation_type: Type of operation for metrics collection
+        """
+        self.base = base
+        self.cap = cap
+        self.operation_type = operation_type
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        """Get the time to wait before the next attempt."""
+        retry_after = get_retry_after(retry_state)
+        if retry_after is not None:
+            wait = retry_after + random.uniform(0, self.base)
+            source = "retry_after"
+        else:
+            # upcoming_sleep still holds the previous wait (0 before the first retry)
+            previous = max(retry_state.upcoming_sleep, self.base)
+            wait = min(self.cap, random.uniform(self.base, previous * 3))
+            source = "jitter"
+
+        record_retry_wait(self.operation_type, source, wait)
+        return wait
+
+
+class RetryBudget:
+    """Process-wide token bucket limiting retries.
+
+    Every successful call earns ``ratio`` retries, and ``min_per_second``
+    retries are granted over time so calls can recover after an outage.
+    When the bucket is empty, failures are raised instead of retried.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        max_tokens: float = 50.0,
+    ) -> None:
+        """Initialize the budget.
+
+        Args:
+            ratio: Retries earned per successful call
+            min_per_second: Retries granted per second regardless of successes
+            max_tokens: Maximum retries that can be saved up
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Grant the retries accrued over time (lock held)."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Retries currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def deposit(self) -> None:
+        """Earn retries for a successful call."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Take one retry from the budget.
+
+        Returns:
+            True if a retry was available
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            tokens = self._tokens
+        record_retry_budget_tokens(tokens)
+        return True
+
+
+class CircuitBreaker:
+    """Circuit breaker for one endpoint.
+
+    After ``failure_threshold`` consecutive outage errors the circuit opens
+    and calls fail immediately with CircuitOpenError. After
+    ``recovery_timeout`` seconds one trial call is let through: its success
+    closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0
+    ) -> None:
+        """Initialize the circuit breaker.
+
+        Args:
+            name: Name of the guarded endpoint
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds before a trial call is let through
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str) -> None:
+        """Change the state (lock held)."""
+        if state != self.state:
+            logger.warning(f"Circuit breaker for {self.name} is now {state}")
+            self.state = state
+            record_circuit_state(self.name, state)
+
+    def before_call(self) -> None:
+        """Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                # Let this call through as the trial; should it never report
+                # back, another trial follows after the next timeout
+                self._opened_at = time.monotonic()
+                self._set_state(self.HALF_OPEN)
+                return
+
+        record_circuit_rejection(self.name)
+        raise CircuitOpenError(
+            f"Circuit breaker for {self.name} is open after repeated failures; "
+            f"retrying in at most {self.recovery_timeout:.0f}s"
+        )
+
+    def record_success(self) -> None:
+        """Record a call that reached the endpoint."""
+        with self._lock:
+            self._failures = 0
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a call that failed because the endpoint is down."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+# Process-wide retry budget and circuit breakers by endpoint
+_retry_budget = RetryBudget()
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_retry_budget() -> RetryBudget:
+    """Get the process-wide retry budget."""
+    return _retry_budget
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """Get the circuit breaker of an endpoint.
+
+    Args:
+        endpoint: Endpoint URL
+
+    Returns:
+        Shared circuit breaker
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(endpoint)
+        if breaker is None:
+            breaker = _circuit_breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+
+def reset_retry_state() -> None:
+    """Reset the retry budget and close all circuit breakers."""
+    global _retry_budget
+    _retry_budget = RetryBudget()
+    with _circuit_breakers_lock:
+        _circuit_breakers.clear()
+
+
+def _circuit_breaker_for(args: tuple[Any, ...]) -> CircuitBreaker:
+    """Get the circuit breaker of the client a decorated method is called on."""
+    endpoint = getattr(args[0], "endpoint", None) if args else None
+    return get_circuit_breaker(endpoint if isinstance(endpoint, str) else "default")
+
+
+class StopOnExhaustedBudget(stop_base):  # type: ignore[misc]
+    """Stop retrying when the process-wide retry budget is exhausted."""
+
+    def __init__(self, operation_type: OperationType | None = None) -> None:
+        """Initialize the stop strategy.
+
+        Args:
+            operation_type: Type of operation for metrics collection
+        """
+        self.operation_type = operation_type
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        """Check whether to stop, taking a retry from the budget if not."""
+        if get_retry_budget().try_withdraw():
+            return False
+
+        model = retry_state.kwargs.get("model") or "unknown"
+        logger.warning(f"Retry budget exhausted; not retrying {model} request")
+        record_retry_budget_exhausted(self.operation_type, model)
+        return True
+
+
+def convert_openai_error(error: Exception) -> Exception:
+    """Convert an OpenAI SDK error into the matching Code Story error.
+
+    Args:
+        error: Error raised by the OpenAI SDK
+
+    Returns:
+        Converted error, or the error itself if it needs no conversion
+    """
+    if isinstance(error, openai.RateLimitError):
+        # Get retry-after time from headers if available
+        headers = getattr(error, "headers", None)
+        if headers is None:
+            headers = getattr(getattr(error, "response", None), "headers", None)
+        retry_after = parse_retry_after(headers if isinstance(headers, Mapping) else None)
+        return RateLimitError(
+            f"Rate limit exceeded: {error!s}", retry_after=retry_after, cause=error
+        )
+    if isinstance(error, openai.APITimeoutError):
+        return TimeoutError(f"API request timed out: {error!s}", cause=error)
+    if isinstance(error, openai.APIConnectionError):
+        return ServiceUnavailableError(f"API connection error: {error!s}", cause=error)
+    if isinstance(error, openai.BadRequestError):
+        # Check for context length error
+        if "maximum context length" in str(error).lower():
+            return ContextLengthError(
+                f"Input context length exceeded model maximum: {error!s}", cause=error
+            )
+        return InvalidRequestError(f"Invalid request: {error!s}", cause=error)
+    if isinstance(error, openai.AuthenticationError):
+        return AuthenticationError(f"Authentication error: {error!s}", cause=error)
+    if isinstance(error, openai.APIError):
+        return ServiceUnavailableError(f"API error: {error!s}", cause=error)
+    return error
+
+
+def _record_outcome(breaker: CircuitBreaker, error: Exception | None) -> None:
+    """Record the outcome of an attempt in the circuit breaker and retry budget."""
+    if error is None:
+        breaker.record_success()
+        get_retry_budget().deposit()
+    elif isinstance(error, OUTAGE_ERRORS):
+        breaker.record_failure()
+    else:
+        # The endpoint answered, even if it rejected the request
+        breaker.record_success()
+
+
+def before_retry_callback(
+    retry_state: RetryCallState, operation_type: OperationType | None = None
+) -> None:
     """Log and collect metrics before a retry.
 
     Args:
         retry_state: Current retry state
+        operation_type: Type of operation (default: taken from the call's kwargs)
     """
     exception = retry_state.outcome.exception()  # type: ignore[union-attr]
     attempt = retry_state.attempt_number
 
-    operation = getattr(retry_state.kwargs.get("_operation_type", None), "value", "unknown")
-    model = retry_state.kwargs.get("model", "unknown")
+    operation_type = operation_type or retry_state.kwargs.get("_operation_type")
+    operation = getattr(operation_type, "value", "unknown")
+    model = retry_state.kwargs.get("model") or "unknown"
 
     wait_time = retry_state.next_action.sleep  # type: ignore[union-attr]
 
@@ -70,21 +437,37 @@ def before_retry_callback(retry_state: RetryCallState) -> None:
     )
 
     # Record retry in metrics
-    operation_type = retry_state.kwargs.get("_operation_type")
     if operation_type:
         record_retry(operation_type, model)
 
 
+def _retry_policy(
+    max_retries: int, retry_backoff_factor: float, operation_type: OperationType | None
+) -> dict[str, Any]:
+    """Get the tenacity arguments shared by the sync and async decorators."""
+    return {
+        "stop": stop_after_attempt(max_retries) | StopOnExhaustedBudget(operation_type),
+        "wait": DecorrelatedJitterWait(
+            base=retry_backoff_factor, cap=60.0, operation_type=operation_type
+        ),
+        # An open circuit is not retried: that is the point of failing fast
+        "retry": retry_if_exception_type(RETRYABLE_ERRORS)
+        & retry_if_not_exception_type(CircuitOpenError),
+        "before_sleep": functools.partial(before_retry_callback, operation_type=operation_type),
+        "reraise": True,
+    }
+
+
 def retry_on_openai_errors(
     max_retries: int = 5,
     retry_backoff_factor: float = 2.0,
     operation_type: OperationType | None = None,
 ) -> Callable[[F], F]:
-    """Decorator for retrying OpenAI API calls with exponential backoff.
+    """Decorator for retrying OpenAI API calls with backoff.
 
     Args:
-        max_retries: Maximum number of retry attempts
-        retry_backoff_factor: Multiplier for exponential backoff
+        max_retries: Maximum number of attempts
+        retry_backoff_factor: Shortest wait between attempts in seconds
         operation_type: Type of operation for metrics collection
 
     Returns:
@@ -93,69 +476,25 @@ def retry_on_openai_errors(
 
     def decorator(func: F) -> F:
         @functools.wraps(func)
-        @retry(
-            stop=stop_after_attempt(max_retries),
-            wait=wait_exponential(multiplier=retry_backoff_factor, min=1, max=60),
-            retry=retry_if_exception_type(
-                (
-                    RateLimitError,
-                    ServiceUnavailableError,
-                    TimeoutError,
-                    openai.RateLimitError,
-                    openai.APIConnectionError,
-                    openai.APITimeoutError,
-                )
-            ),
-            before_sleep=before_sleep_log(logger, logging.WARNING),
-            after=before_retry_callback,
-        )
+        @retry(**_retry_policy(max_retries, retry_backoff_factor, operation_type))
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Inject operation type into kwargs for metric collection
             if operation_type:
                 kwargs["_operation_type"] = operation_type
 
+            breaker = _circuit_breaker_for(args)
+            breaker.before_call()
             try:
-                return func(*args, **kwargs)
-            except openai.RateLimitError as e:
-                # Get retry-after time from headers if available
-                retry_after = None
-                if hasattr(e, "headers") and e.headers:
-                    retry_after = e.headers.get("retry-after")
-                    if retry_after:
-                        try:
-                            retry_after = int(retry_after)
-                        except (ValueError, TypeError):
-                            retry_after = None
-
-                raise RateLimitError(
-                    f"Rate limit exceeded: {e!s}", retry_after=retry_after, cause=e
-                ) from e
-            except openai.APIConnectionError as e:
-                raise ServiceUnavailableError(f"API connection error: {e!s}", cause=e) from e
-            except openai.APITimeoutError as e:
-                raise TimeoutError(f"API request timed out: {e!s}", cause=e) from e
-            except openai.BadRequestError as e:
-                # Check for context length error
-                if "maximum context length" in str(e).lower():
-                    from .exceptions import ContextLengthError
-
-                    raise ContextLengthError(
-                        f"Input context length exceeded model maximum: {e!s}",
-                        cause=e,
-                    ) from e
-
-                from .exceptions import InvalidRequestError
-
-                raise InvalidRequestError(f"Invalid request: {e!s}", cause=e) from e
-            except openai.AuthenticationError as e:
-                from .exceptions import AuthenticationError
-
-                raise AuthenticationError(f"Authentication error: {e!s}", cause=e) from e
-            except openai.APIError as e:
-                raise ServiceUnavailableError(f"API error: {e!s}", cause=e) from e
+                result = func(*args, **kwargs)
             except Exception as e:
-                # Re-raise other exceptions
-                raise e
+                error = convert_openai_error(e)
+                _record_outcome(breaker, error)
+                if error is e:
+                    raise
+                raise error from e
+
+            _record_outcome(breaker, None)
+            return result
 
         return cast("F", wrapper)
 
@@ -167,11 +506,11 @@ def retry_on_openai_errors_async(
     retry_backoff_factor: float = 2.0,
     operation_type: OperationType | None = None,
 ) -> Callable[[F], F]:
-    """Decorator for retrying async OpenAI API calls with exponential backoff.
+    """Decorator for retrying async OpenAI API calls with backoff.
 
     Args:
-        max_retries: Maximum number of retry attempts
-        retry_backoff_factor: Multiplier for exponential backoff
+        max_retries: Maximum number of attempts
+        retry_backoff_factor: Shortest wait between attempts in seconds
         operation_type: Type of operation for metrics collection
 
     Returns:
@@ -180,70 +519,26 @@ def retry_on_openai_errors_async(
 
     def decorator(func: F) -> F:
         @functools.wraps(func)
-        @retry(
-            stop=stop_after_attempt(max_retries),
-            wait=wait_exponential(multiplier=retry_backoff_factor, min=1, max=60),
-            retry=retry_if_exception_type(
-                (
-                    RateLimitError,
-                    ServiceUnavailableError,
-                    TimeoutError,
-                    openai.RateLimitError,
-                    openai.APIConnectionError,
-                    openai.APITimeoutError,
-                )
-            ),
-            before_sleep=before_sleep_log(logger, logging.WARNING),
-            after=before_retry_callback,
-        )
+        @retry(**_retry_policy(max_retries, retry_backoff_factor, operation_type))
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Inject operation type into kwargs for metric collection
             if operation_type:
                 kwargs["_operation_type"] = operation_type
 
+            breaker = _circuit_breaker_for(args)
+            breaker.before_call()
             try:
-                return await func(*args, **kwargs)
-            except openai.RateLimitError as e:
-                # Get retry-after time from headers if available
-                retry_after = None
-                if hasattr(e, "headers") and e.headers:
-                    retry_after = e.headers.get("retry-after")
-                    if retry_after:
-                        try:
-                            retry_after = int(retry_after)
-                        except (ValueError, TypeError):
-                            retry_after = None
-
-                raise RateLimitError(
-                    f"Rate limit exceeded: {e!s}", retry_after=retry_after, cause=e
-                ) from e
-            except openai.APIConnectionError as e:
-                raise ServiceUnavailableError(f"API connection error: {e!s}", cause=e) from e
-            except openai.APITimeoutError as e:
-                raise TimeoutError(f"API request timed out: {e!s}", cause=e) from e
-            except openai.BadRequestError as e:
-                # Check for context length error
-                if "maximum context length" in str(e).lower():
-                    from .exceptions import ContextLengthError
-
-                    raise ContextLengthError(
-                        f"Input context length exceeded model maximum: {e!s}",
-                        cause=e,
-                    ) from e
-
-                from .exceptions import InvalidRequestError
-
-                raise InvalidRequestError(f"Invalid request: {e!s}", cause=e) from e
-            except openai.AuthenticationError as e:
-                from .exceptions import AuthenticationError
-
-                raise AuthenticationError(f"Authentication error: {e!s}", cause=e) from e
-            except openai.APIError as e:
-                raise ServiceUnavailableError(f"API error: {e!s}", cause=e) from e
+                result = await func(*args, **kwargs)
             except Exception as e:
-                # Re-raise other exceptions
-                raise e
+                error = convert_openai_error(e)
+                _record_outcome(breaker, error)
+                if error is e:
+                    raise
+                raise error from e
+
+            _record_outcome(breaker, None)
+            return result
 
         return cast("F", wrapper)
 
-    return decorator
\ No newline at end of file
+    return decorator
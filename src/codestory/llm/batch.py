@@ -0,0 +1,408 @@
+"""Batch API execution for bulk chat and embedding requests.
+
+Ingesting a whole repository sends many independent requests whose latency
+does not matter. BatchClient writes them as JSONL, submits them through the
+Azure OpenAI Batch API, at a lower price and with a separate, larger quota
+than online requests, polls until the batches are done and maps the results
+back to the caller's IDs.
+
+Batches are billed for the requests they complete until they end, so a run
+that is abandoned, by its timeout, deadline or an exception such as a Celery
+soft time limit, cancels the batches it submitted that are still running.
+"""
+
+import io
+import json
+import logging
+import time
+from collections.abc import Iterator, Mapping
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+from ..config.settings import get_settings
+from .backoff import retry_on_openai_errors
+from .client import OpenAIClient, create_client
+from .exceptions import BatchError
+from .models import (
+    ChatCompletionRequest,
+    ChatCompletionResponse,
+    ChatMessage,
+    EmbeddingRequest,
+    EmbeddingResponse,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+CHAT_ENDPOINT = "/chat/completions"
+EMBEDDINGS_ENDPOINT = "/embeddings"
+
+# Batch statuses after which the batch does not change anymore
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Limits of one batch input file (the service allows 100,000 requests and 200 MB)
+MAX_REQUESTS_PER_BATCH = 50000
+MAX_BYTES_PER_BATCH = 100 * 1024 * 1024
+
+
+class BatchResult(BaseModel, Generic[T]):  # noqa: UP046
+    """Results of a batch run, by the caller's request IDs."""
+
+    responses: dict[str, T] = Field(default_factory=dict)
+    errors: dict[str, str] = Field(default_factory=dict)
+    batch_ids: list[str] = Field(default_factory=list)
+
+
+class BatchClient:
+    """Client running chat and embedding requests through the Batch API.
+
+    Batches take minutes to hours, so this is meant for non-interactive jobs
+    such as bulk summarization. Requests that fail individually are reported
+    in ``BatchResult.errors``; the caller decides whether to retry them
+    online.
+    """
+
+    def __init__(
+        self,
+        client: OpenAIClient,
+        chat_model: str | None = None,
+        embedding_model: str | None = None,
+        poll_interval: float = 60.0,
+        timeout: float | None = None,
+        deadline: float | None = None,
+        completion_window: str = "24h",
+        max_requests_per_batch: int = MAX_REQUESTS_PER_BATCH,
+        max_bytes_per_batch: int = MAX_BYTES_PER_BATCH,
+    ) -> None:
+        """Initialize the batch client.
+
+        Args:
+            client: Client whose credentials and endpoint are used
+            chat_model: Batch deployment for chat requests (default: the
+                client's chat_model)
+            embedding_model: Batch deployment for embedding requests
+                (default: the client's embedding_model)
+            poll_interval: Seconds between status checks
+            timeout: Seconds each run waits for its batches before cancelling
+                them (default: until the service ends them)
+            deadline: ``time.monotonic()`` value after which every run
+                cancels its batches, e.g. ahead of a task's time limit
+            completion_window: Time the service has to complete a batch
+            max_requests_per_batch: Maximum requests per batch
+            max_bytes_per_batch: Maximum size of a batch input file
+        """
+        self.client = client
+        self.endpoint = client.endpoint
+        self.chat_model = chat_model or client.chat_model
+        self.embedding_model = embedding_model or client.embedding_model
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.deadline = deadline
+        self.completion_window = completion_window
+        self.max_requests_per_batch = max_requests_per_batch
+        self.max_bytes_per_batch = max_bytes_per_batch
+
+    def chat_batch(
+        self,
+        messages: Mapping[str, list[ChatMessage]],
+        model: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+        **kwargs: Any,
+    ) -> BatchResult[ChatCompletionResponse]:
+        """Generate chat completions for many conversations.
+
+        Args:
+            messages: Messages of each conversation, by request ID
+            model: Batch deployment to use (defaults to chat_model)
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (0-2)
+            **kwargs: Additional parameters for the OpenAI API
+
+        Returns:
+            Completions and errors by request ID
+
+        Raises:
+            BatchError: If a batch fails as a whole or does not finish in time
+        """
+        model = model or self.chat_model
+        bodies = {}
+        for custom_id, conversation in messages.items():
+            request = ChatCompletionRequest(
+                model=model,
+                messages=conversation,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs,
+            )
+            model_name, request_data = self.client._prepare_request_data(request)  # type: ignore[func-returns-value]
+            request_data = self.client._adjust_params_for_reasoning_model(request_data, model_name)
+            bodies[custom_id] = {
+                "model": model_name,
+                "messages": [m.model_dump() for m in conversation],
+                **request_data,
+            }
+
+        return self._run(CHAT_ENDPOINT, bodies, ChatCompletionResponse)
+
+    def embed_batch(
+        self, texts: Mapping[str, str], model: str | None = None, **kwargs: Any
+    ) -> BatchResult[EmbeddingResponse]:
+        """Generate embeddings for many texts.
+
+        Args:
+            texts: Text to embed, by request ID
+            model: Batch deployment to use (defaults to embedding_model)
+            **kwargs: Additional parameters for the OpenAI API
+
+        Returns:
+            Embeddings and errors by request ID
+
+        Raises:
+            BatchError: If a batch fails as a whole or does not finish in time
+        """
+        model = model or self.embedding_model
+        bodies = {}
+        for custom_id, text in texts.items():
+            request = EmbeddingRequest(model=model, input=[text], **kwargs)
+            model_name, request_data = self.client._prepare_request_data(request)  # type: ignore[func-returns-value]
+            bodies[custom_id] = {"model": model_name, "input": [text], **request_data}
+
+        return self._run(EMBEDDINGS_ENDPOINT, bodies, EmbeddingResponse)
+
+    def _run(
+        self, endpoint: str, bodies: dict[str, dict[str, Any]], response_type: type[T]
+    ) -> BatchResult[T]:
+        """Submit request bodies as batches and collect their results.
+
+        Args:
+            endpoint: API endpoint the requests are for
+            bodies: Request bodies by request ID
+            response_type: Model of a successful response body
+
+        Returns:
+            Responses and errors by request ID
+
+        Raises:
+            BatchError: If a batch fails as a whole or does not end in time
+        """
+        result: BatchResult[T] = BatchResult()
+        if not bodies:
+            return result
+
+        deadlines = [self.deadline]
+        if self.timeout is not None:
+            deadlines.append(time.monotonic() + self.timeout)
+        deadline = min((d for d in deadlines if d is not None), default=None)
+
+        ended: set[str] = set()
+        try:
+            # Submit all batches first so the service works on them concurrently
+            for content in self._write_batches(endpoint, bodies):
+                input_file = self._upload(content)
+                batch = self._create(input_file.id, endpoint)
+                result.batch_ids.append(batch.id)
+                logger.info(f"Submitted batch {batch.id} to {endpoint}")
+
+            for batch_id in result.batch_ids:
+                batch = self._wait(batch_id, deadline)
+                ended.add(batch_id)
+                if batch.output_file_id:
+                    self._read_results(batch.output_file_id, response_type, result)
+                if batch.error_file_id:
+                    self._read_results(batch.error_file_id, response_type, result)
+        except BaseException:
+            self._cancel_all([b for b in result.batch_ids if b not in ended])
+            raise
+
+        # Requests the service did not report on, e.g. when a batch expired
+        for custom_id in bodies.keys() - result.responses.keys() - result.errors.keys():
+            result.errors[custom_id] = "No result returned by the batch"
+
+        logger.info(
+            f"Batch run finished: {len(result.responses)} succeeded, {len(result.errors)} failed"
+        )
+        return result
+
+    def _write_batches(self, endpoint: str, bodies: dict[str, dict[str, Any]]) -> Iterator[bytes]:
+        """Write request bodies as JSONL, split into files within the batch limits.
+
+        Args:
+            endpoint: API endpoint the requests are for
+            bodies: Request bodies by request ID
+
+        Yields:
+            Contents of one batch input file
+        """
+        lines: list[bytes] = []
+        size = 0
+        for custom_id, body in bodies.items():
+            line = (
+                json.dumps(
+                    {"custom_id": custom_id, "method": "POST", "url": endpoint, "body": body}
+                )
+                + "\n"
+            ).encode()
+            if lines and (
+                len(lines) >= self.max_requests_per_batch
+                or size + len(line) > self.max_bytes_per_batch
+            ):
+                yield b"".join(lines)
+                lines, size = [], 0
+            lines.append(line)
+            size += len(line)
+        if lines:
+            yield b"".join(lines)
+
+    def _wait(self, batch_id: str, deadline: float | None = None) -> Any:
+        """Poll a batch until it ends.
+
+        Args:
+            batch_id: ID of the batch
+            deadline: ``time.monotonic()`` value to stop waiting at
+
+        Returns:
+            The ended batch
+
+        Raises:
+            BatchError: If the batch failed or did not end by the deadline
+        """
+        while True:
+            batch = self._retrieve(batch_id)
+            if batch.status in TERMINAL_STATUSES:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise BatchError(
+                    f"Batch {batch_id} did not finish in time",
+                    batch_id=batch_id,
+                    status=batch.status,
+                )
+            sleep = self.poll_interval
+            if deadline is not None:
+                sleep = max(0.0, min(sleep, deadline - time.monotonic()))
+            time.sleep(sleep)
+
+        logger.info(f"Batch {batch_id} ended with status {batch.status}")
+        if batch.status == "failed":
+            errors = getattr(batch.errors, "data", None) or []
+            messages = "; ".join(str(getattr(error, "message", error)) for error in errors)
+            raise BatchError(
+                f"Batch {batch_id} failed: {messages or 'unknown error'}",
+                batch_id=batch_id,
+                status=batch.status,
+            )
+        # Expired and cancelled batches still return the requests they completed
+        return batch
+
+    def _cancel_all(self, batch_ids: list[str]) -> None:
+        """Cancel batches of an abandoned run, so they are not billed further.
+
+        Failures are logged; the batches then end by their completion window.
+
+        Args:
+            batch_ids: IDs of the batches that have not ended
+        """
+        for batch_id in batch_ids:
+            try:
+                self._cancel(batch_id)
+                logger.warning(f"Cancelled batch {batch_id}")
+            except Exception as e:
+                logger.error(f"Failed to cancel batch {batch_id}: {e}")
+
+    def _read_results(self, file_id: str, response_type: type[T], result: BatchResult[T]) -> None:
+        """Map the lines of an output or error file to their request IDs.
+
+        Args:
+            file_id: ID of the file
+            response_type: Model of a successful response body
+            result: Result to add the responses and errors to
+        """
+        for line in self._download(file_id).splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            custom_id = record["custom_id"]
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+            error = record.get("error") or body.get("error")
+
+            if error is None and response.get("status_code") == 200:
+                result.responses[custom_id] = response_type.model_validate(body)
+            else:
+                error = error or {"message": f"HTTP {response.get('status_code')}"}
+                result.errors[custom_id] = str(error.get("message", error))
+
+    @retry_on_openai_errors()
+    def _upload(self, content: bytes) -> Any:
+        """Upload a batch input file."""
+        return self.client._sync_client.files.create(
+            file=("batch.jsonl", io.BytesIO(content)), purpose="batch"
+        )
+
+    @retry_on_openai_errors()
+    def _create(self, input_file_id: str, endpoint: str) -> Any:
+        """Create a batch from an uploaded input file."""
+        return self.client._sync_client.batches.create(
+            input_file_id=input_file_id,
+            endpoint=endpoint,
+            completion_window=self.completion_window,
+        )
+
+    @retry_on_openai_errors()
+    def _retrieve(self, batch_id: str) -> Any:
+        """Get the current state of a batch."""
+        return self.client._sync_client.batches.retrieve(batch_id)
+
+    @retry_on_openai_errors()
+    def _cancel(self, batch_id: str) -> Any:
+        """Cancel a batch."""
+        return self.client._sync_client.batches.cancel(batch_id)
+
+    @retry_on_openai_errors()
+    def _download(self, file_id: str) -> str:
+        """Download the contents of an output or error file."""
+        return str(self.client._sync_client.files.content(file_id).text)
+
+
+def completion_window_seconds(completion_window: str) -> float:
+    """Convert a batch completion window such as "24h" to seconds.
+
+    Args:
+        completion_window: Number followed by a unit: m, h, d or w
+
+    Returns:
+        Length of the window in seconds
+
+    Raises:
+        ValueError: If the window is not a number followed by a known unit
+    """
+    units = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+    window = completion_window.strip().lower()
+    try:
+        return float(window[:-1]) * units[window[-1:]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid batch completion window: {completion_window!r}") from None
+
+
+def create_batch_client(client: OpenAIClient | None = None, **kwargs: Any) -> BatchClient:
+    """Create a batch client configured from settings.
+
+    Args:
+        client: Client to submit batches with (default: the shared client)
+        **kwargs: Override parameters of the batch client
+
+    Returns:
+        Configured batch client
+    """
+    settings = get_settings()
+    params: dict[str, Any] = {
+        "chat_model": settings.openai.batch_chat_model,
+        "embedding_model": settings.openai.batch_embedding_model,
+        "poll_interval": settings.openai.batch_poll_interval,
+        "completion_window": settings.openai.batch_completion_window,
+    }
+    params.update(kwargs)
+    return BatchClient(client or create_client(), **params)
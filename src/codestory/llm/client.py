@@ -5,25 +5,19 @@ supporting completions, chat, and embeddings with both synchronous and
 asynchronous APIs.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
+import threading
 from typing import Any
 
 import openai
 from openai import AsyncAzureOpenAI, AzureOpenAI
 
-# Try to import azure.identity, but don't fail if it's not available
-try:
-    from azure.identity import DefaultAzureCredential, get_bearer_token_provider
-
-    AZURE_IDENTITY_AVAILABLE = True
-except ImportError:
-    logger = logging.getLogger(__name__)
-    logger.warning("azure.identity not found. Azure AD authentication will not be available.")
-    AZURE_IDENTITY_AVAILABLE = False
-
 from ..config.settings import get_settings
 from .backoff import retry_on_openai_errors, retry_on_openai_errors_async
+from .credentials import AZURE_IDENTITY_AVAILABLE, get_token_provider
 from .exceptions import (
     AuthenticationError,
     InvalidRequestError,
@@ -39,6 +33,7 @@ from .models import (
     EmbeddingRequest,
     EmbeddingResponse,
 )
+from .views import EmbeddingVectors
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -102,271 +97,64 @@ class OpenAIClient:
         self.retry_backoff_factor = retry_backoff_factor
         self.config_options = config_options
 
-        # Initialize clients
-        # Use tenant_id and subscription_id from settings if available
+        # Authenticate with the process-wide Azure AD token provider, which
+        # caches tokens and refreshes them before they expire. The tenant is
+        # passed with each token request, so no Azure CLI process is needed
+        # to switch accounts.
         try:
             settings = get_settings()
             tenant_id = getattr(settings.openai, "tenant_id", None)
-            subscription_id = getattr(settings.openai, "subscription_id", None)
         except Exception:
             tenant_id = None
-            subscription_id = None
-
-        # For DefaultAzureCredential - need to handle tenant separately
-        try:
-            # Set subscription if provided
-            if subscription_id:
-                import subprocess
-
-                try:
-                    # Set the default subscription
-                    subprocess.run(
-                        ["az", "account", "set", "--subscription", subscription_id],
-                        check=True,
-                        capture_output=True,
-                    )
-                    logger.info(f"Set Azure subscription to {subscription_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to set Azure subscription: {e}")
-
-            # If tenant_id is provided, check if we need to login
-            if tenant_id:
-                import subprocess
-
-                try:
-                    # Check if we need to log in specifically to the tenant
-                    # First check if we're already authenticated with the correct tenant
-                    show_result = subprocess.run(
-                        ["az", "account", "show", "--query", "tenantId", "-o", "tsv"],
-                        check=False,  # Don't raise error if not logged in
-                        capture_output=True,
-                        text=True,
-                    )
-
-                    current_tenant = show_result.stdout.strip()
-
-                    # If we're not logged in or tenant doesn't match, remind user
-                    if show_result.returncode != 0 or current_tenant != tenant_id:
-                        logger.warning(
-                            f"Currently logged into tenant '{current_tenant}', but need "
-                            f"tenant '{tenant_id}'. Attempting to run 'az login --tenant "
-                            f"{tenant_id}' automatically"
-                        )
-
-                        # Try to automatically log in to the required tenant
-                        try:
-                            logger.info(f"Attempting automatic Azure login to tenant {tenant_id}")
-                            login_cmd = [
-                                "az",
-                                "login",
-                                "--tenant",
-                                tenant_id,
-                                "--use-device-code",
-                            ]
-                            if "CODESTORY_AUTH_SCOPE" in os.environ:
-                                login_cmd.extend(["--scope", os.environ["CODESTORY_AUTH_SCOPE"]])
-                            else:
-                                login_cmd.extend(
-                                    [
-                                        "--scope",
-                                        "https://cognitiveservices.azure.com/.default",
-                                    ]
-                                )
-
-                            login_result = subprocess.run(
-                                login_cmd,
-                                check=False,  # Don't raise error if login fails
-                                capture_output=True,
-                                text=True,
-                            )
-
-                            if login_result.returncode == 0:
-                                logger.info(
-                                    f"Automatic Azure login to tenant {tenant_id} successful"
-                                )
-                            else:
-                                # Extract and display device code info if present
-                                if "devicelogin" in login_result.stdout:
-                                    try:
-                                        # Look for auth URL and code in the output
-                                        import re
-
-                                        url_match = re.search(
-                                            r"(https://microsoft\.com/devicelogin)",
-                                            login_result.stdout,
-                                        )
-                                        code_match = re.search(
-                                            r"Enter the code ([A-Z0-9]+) to authenticate",
-                                            login_result.stdout,
-                                        )
-
-                                        if url_match and code_match:
-                                            auth_url = url_match.group(1)
-                                            auth_code = code_match.group(1)
-
-                                            # Display the auth info prominently in logs
-                                            logger.warning("=" * 80)
-                                            logger.warning("AZURE AUTHENTICATION REQUIRED")
-                                            logger.warning("-" * 80)
-                                            logger.warning(f"Visit: {auth_url}")
-                                            logger.warning(f"Enter code: {auth_code}")
-                                            logger.warning("=" * 80)
-                                    except Exception as parse_err:
-                                        logger.warning(
-                                            f"Failed to parse device login info: {parse_err}"
-                                        )
-
-                                # Check for known CLI errors
-                                if (
-                                    "Can't get attribute 'NormalizedResponse'"
-                                    in login_result.stderr
-                                ):
-                                    logger.warning(
-                                        "Azure CLI appears to have an installation issue"
-                                    )
-                                    logger.warning(
-                                        "You may need to reinstall or update the Azure CLI with "
-                                        "'brew update && brew upgrade azure-cli'"
-                                    )
-                                    logger.warning(
-                                        f"Then run 'az login --tenant {tenant_id}' manually "
-                                        f"in a terminal"
-                                    )
-                                else:
-                                    logger.warning(
-                                        f"Automatic Azure login failed: {login_result.stderr}"
-                                    )
-                                    logger.warning(
-                                        "You may need to run 'az login' manually in a terminal"
-                                    )
-                        except Exception as login_err:
-                            logger.warning(f"Automatic Azure login attempt failed: {login_err}")
-                            logger.warning("You may need to run 'az login' manually in a terminal")
-
-                except Exception as e:
-                    logger.warning(f"Failed to check Azure tenant: {e}")
-        except Exception as e:
-            logger.warning(f"Error setting up Azure authentication: {e}")
+        self.tenant_id = tenant_id if isinstance(tenant_id, str) and tenant_id else None
 
-        # Create the client with or without Azure AD authentication
         logger.info("=== OpenAI Client Initialization ===")
         logger.info(f"Endpoint: {self.endpoint}")
         logger.info(f"API Version: {self.api_version}")
         logger.info(f"Chat Model: {self.chat_model}")
         logger.info(f"Embedding Model: {self.embedding_model}")
         logger.info(f"Reasoning Model: {self.reasoning_model}")
-        logger.info(f"Timeout: {self.timeout}")
-        logger.info(f"Max Retries: {self.max_retries}")
 
-        # Prepare client parameters for Azure OpenAI
-        deployment_id_env = os.environ.get("AZURE_OPENAI__DEPLOYMENT_ID")
-        client_params = {
-            "azure_endpoint": self.endpoint,
-            "api_version": self.api_version,
-            "timeout": self.timeout,
-            "max_retries": 0,  # We handle retries ourselves
-        }
-        # Do NOT add 'engine' or 'deployment_id' to client_params; pass per-request only
-        if not deployment_id_env:
-            logger.warning("No AZURE_OPENAI__DEPLOYMENT_ID set; Azure requests may fail.")
-        logger.info(f"Client parameters: {client_params}")
-
-        # Add Azure AD authentication if available
+        credentials: dict[str, Any] = {}
         if AZURE_IDENTITY_AVAILABLE:
-            logger.info(
-                "Azure identity available - attempting DefaultAzureCredential authentication"
-            )
             try:
-                logger.info("Creating DefaultAzureCredential...")
-                # Create the credential - DefaultAzureCredential doesn't accept tenant_id directly
-                credential = DefaultAzureCredential()
-                logger.info("DefaultAzureCredential created successfully")
-
-                # Test the credential by getting a token
-                logger.info("Testing credential by requesting token...")
-                token_provider = get_bearer_token_provider(
-                    credential, "https://cognitiveservices.azure.com/.default"
-                )
-                logger.info("Token provider created successfully")
-
-                client_params["azure_ad_token_provider"] = token_provider
-                logger.info("Added token provider to client parameters")
-
+                credentials["azure_ad_token_provider"] = get_token_provider(self.tenant_id)
             except Exception as e:
                 logger.warning(f"Failed to initialize Azure AD authentication: {e}")
-                logger.warning(f"Error type: {type(e).__name__}")
                 logger.warning("Falling back to API key authentication...")
-
-                # Continue without Azure AD authentication - try API key fallback
-                logger.info("Attempting to get API key from settings...")
-                try:
-                    settings = get_settings()
-                    api_key = getattr(settings.openai, "api_key", None)
-                    if api_key:
-                        # Convert SecretStr to string if needed
-                        if hasattr(api_key, "get_secret_value") and callable(
-                            api_key.get_secret_value
-                        ):
-                            client_params["api_key"] = api_key.get_secret_value()
-                            logger.info("Using API key from settings (SecretStr)")
-                        else:
-                            client_params["api_key"] = api_key
-                            logger.info("Using API key from settings (string)")
-                    else:
-                        logger.warning("No API key found in settings")
-                except Exception as settings_e:
-                    logger.error(f"Failed to get API key from settings: {settings_e}")
         else:
             logger.warning("Azure identity not available - using API key authentication only")
-            # Look for API key in the settings
-            try:
-                settings = get_settings()
-                api_key = getattr(settings.openai, "api_key", None)
-                if api_key:
-                    # Convert SecretStr to string if needed
-                    if hasattr(api_key, "get_secret_value") and callable(api_key.get_secret_value):
-                        client_params["api_key"] = api_key.get_secret_value()
-                        logger.info("Using API key authentication")
-                    else:
-                        client_params["api_key"] = api_key
-                        logger.info("Using API key authentication")
-                else:
-                    logger.error("No API key found - authentication will likely fail")
-            except Exception as e:
-                logger.error(f"Failed to get API key from settings: {e}")
 
-        # Log final client parameters (without sensitive data)
-        safe_params = {
-            k: v
-            for k, v in client_params.items()
-            if k not in ["api_key", "azure_ad_token_provider"]
-        }
-        logger.info(f"Final client parameters (sanitized): {safe_params}")
-        auth_method = 'Azure AD' if 'azure_ad_token_provider' in client_params else 'API Key'
-        logger.info(f"Authentication method: {auth_method}")
+        if not credentials:
+            api_key = _api_key_from_settings()
+            if api_key:
+                credentials["api_key"] = api_key
+            else:
+                logger.error("No API key found - authentication will likely fail")
 
-        # Create the Azure OpenAI clients (sync and async)
-        logger.info("Creating Azure OpenAI clients...")
+        auth_method = "Azure AD" if "azure_ad_token_provider" in credentials else "API Key"
+        logger.info(f"Authentication method: {auth_method}")
 
-        # Get deployment ID from environment or settings
+        # Do NOT add 'engine' or 'deployment_id' to the client; pass per-request only
+        deployment_id_env = os.environ.get("AZURE_OPENAI__DEPLOYMENT_ID")
+        if not deployment_id_env:
+            logger.warning("No AZURE_OPENAI__DEPLOYMENT_ID set; Azure requests may fail.")
         deployment_id = deployment_id_env or self.chat_model
         logger.info(f"Using deployment ID: {deployment_id}")
 
-        azure_openai_kwargs = {
-            "azure_endpoint": client_params.get("azure_endpoint"),
-            "azure_deployment": deployment_id,  # This is the key fix - use azure_deployment
-            "api_version": client_params.get("api_version"),
-            "api_key": client_params.get("api_key"),
-            "azure_ad_token_provider": client_params.get("azure_ad_token_provider"),
+        self._azure_openai_kwargs = {
+            "azure_endpoint": self.endpoint,
+            "azure_deployment": deployment_id,
+            "api_version": self.api_version,
+            **credentials,
         }
-        # Remove None values
-        azure_openai_kwargs = {k: v for k, v in azure_openai_kwargs.items() if v is not None}
-        logger.info(f"AzureOpenAI instantiation kwargs: {azure_openai_kwargs}")
+        # Async SDK clients by event loop, see _async_client
+        self._async_clients: dict[asyncio.AbstractEventLoop, AsyncAzureOpenAI] = {}
+        self._async_clients_lock = threading.Lock()
+        self._pinned_async_client: Any = None
         try:
-            self._sync_client = AzureOpenAI(**azure_openai_kwargs)  # type: ignore[call-overload]
-            logger.info("Sync client created successfully")
-            self._async_client = AsyncAzureOpenAI(**azure_openai_kwargs)  # type: ignore[call-overload]
-            logger.info("Async client created successfully")
+            self._sync_client = AzureOpenAI(**self._azure_openai_kwargs)  # type: ignore[call-overload]
+            self._default_async_client = AsyncAzureOpenAI(**self._azure_openai_kwargs)  # type: ignore[call-overload]
             logger.info("=== OpenAI Client Initialization Complete ===")
         except Exception as e:
             logger.error(f"Failed to create AzureOpenAI clients: {e}")
@@ -377,6 +165,52 @@ class OpenAIClient:
                 logger.error("Authentication error during client creation - check credentials")
             raise
 
+    @property
+    def _async_client(self) -> Any:
+        """Async SDK client for the running event loop.
+
+        Pooled connections of an async client cannot be used from another
+        event loop, and worker tasks may each run their own loop, so a shared
+        OpenAIClient keeps one async SDK client per loop. Owners of a loop
+        call aclose() before closing it; clients of loops closed without that
+        are dropped here, since their connections reference the loop and
+        would otherwise keep it alive.
+        """
+        if self._pinned_async_client is not None:
+            return self._pinned_async_client
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._default_async_client
+
+        with self._async_clients_lock:
+            for closed in [other for other in self._async_clients if other.is_closed()]:
+                logger.debug("Dropping the async client of a closed event loop")
+                del self._async_clients[closed]
+
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncAzureOpenAI(**self._azure_openai_kwargs)  # type: ignore[call-overload]
+                self._async_clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the async SDK client of the running event loop.
+
+        Call this before closing an event loop the client was used in; the
+        client is recreated if the loop uses it again.
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    @_async_client.setter
+    def _async_client(self, client: Any) -> None:
+        """Use one async SDK client in every event loop."""
+        self._pinned_async_client = client
+
     def _prepare_request_data(self, request) -> None:  # type: ignore[no-untyped-def]
         """Extract model name and prepare request data, removing internal parameters.
 
@@ -506,9 +340,9 @@ class OpenAIClient:
             logger.error(f"Invalid completion request: {message}")
             raise InvalidRequestError(f"Invalid request parameters: {message}", cause=e) from e
         except Exception as e:
-            # The retry decorator will handle most errors, but we need to catch and convert
-            # any that slip through to maintain a consistent interface
-            if not isinstance(e, OpenAIError):
+            # The retry decorator converts and retries API errors, but we need to
+            # catch and convert any other errors to maintain a consistent interface
+            if not isinstance(e, OpenAIError | openai.APIError):
                 logger.error(f"Unexpected error in completion: {e!s}")
                 raise OpenAIError(f"Error generating completion: {e!s}", cause=e) from e
             raise
@@ -575,9 +409,9 @@ class OpenAIClient:
             logger.error(f"Invalid chat request: {message}")
             raise InvalidRequestError(f"Invalid request parameters: {message}", cause=e) from e
         except Exception as e:
-            # The retry decorator will handle most errors, but we need to catch and convert
-            # any that slip through to maintain a consistent interface
-            if not isinstance(e, OpenAIError):
+            # The retry decorator converts and retries API errors, but we need to
+            # catch and convert any other errors to maintain a consistent interface
+            if not isinstance(e, OpenAIError | openai.APIError):
                 logger.error(f"Unexpected error in chat: {e!s}")
                 raise OpenAIError(f"Error generating chat completion: {e!s}", cause=e) from e
             raise
@@ -604,6 +438,43 @@ class OpenAIClient:
             ServiceUnavailableError: If the OpenAI API is unavailable
             OpenAIError: For other API errors
         """
+        return self._embed_vectors(texts, model, **kwargs).to_response()
+
+    @instrument_request(operation=OperationType.EMBEDDING)
+    @retry_on_openai_errors(operation_type=OperationType.EMBEDDING)
+    def embed_vectors(
+        self, texts: str | list[str], model: str | None = None, **kwargs: Any
+    ) -> EmbeddingVectors:
+        """Generate embeddings as one float32 buffer.
+
+        Unlike embed(), no Python float is created per element, which makes
+        this the path for bulk embedding.
+
+        Args:
+            texts: Text(s) to generate embeddings for
+            model: OpenAI model to use (defaults to embedding_model)
+            **kwargs: Additional parameters for the OpenAI API
+
+        Returns:
+            View of the embeddings in input order
+
+        Raises:
+            InvalidRequestError: If the request parameters are invalid
+            RateLimitError: If the API rate limit is exceeded
+            AuthenticationError: If authentication fails
+            ServiceUnavailableError: If the OpenAI API is unavailable
+            OpenAIError: For other API errors
+        """
+        return self._embed_vectors(texts, model, **kwargs)
+
+    def _embedding_params(
+        self, texts: str | list[str], model: str | None, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Prepare the parameters of an embedding request.
+
+        Embeddings are requested base64 encoded, so that EmbeddingVectors can
+        decode them directly into a float32 buffer.
+        """
         model = model or self.embedding_model
 
         # Ensure texts is a list
@@ -613,24 +484,33 @@ class OpenAIClient:
         # Create request payload
         request = EmbeddingRequest(model=model, input=texts, **kwargs)
 
+        # Extract model name and prepare request data
+        model_name, request_data = self._prepare_request_data(request)  # type: ignore[func-returns-value]
+        request_data.setdefault("encoding_format", "base64")
+        return {
+            "model": model_name,  # Use model instead of deployment_name
+            "input": texts,
+            **request_data,
+        }
+
+    def _embed_vectors(
+        self, texts: str | list[str], model: str | None, **kwargs: Any
+    ) -> EmbeddingVectors:
+        """Request embeddings with the sync client."""
         try:
             # Make API request
-            # Extract model name and prepare request data
-            model_name, request_data = self._prepare_request_data(request)  # type: ignore[func-returns-value]
             response = self._sync_client.embeddings.create(
-                model=model_name,  # Use model instead of deployment_name
-                input=texts,
-                **request_data,
+                **self._embedding_params(texts, model, **kwargs)
             )
-            return EmbeddingResponse.model_validate(response.model_dump())
+            return EmbeddingVectors.from_response(response)
         except openai.BadRequestError as e:
             message = str(e)
             logger.error(f"Invalid embedding request: {message}")
             raise InvalidRequestError(f"Invalid request parameters: {message}", cause=e) from e
         except Exception as e:
-            # The retry decorator will handle most errors, but we need to catch and convert
-            # any that slip through to maintain a consistent interface
-            if not isinstance(e, OpenAIError):
+            # The retry decorator converts and retries API errors, but we need to
+            # catch and convert any other errors to maintain a consistent interface
+            if not isinstance(e, OpenAIError | openai.APIError):
                 logger.error(f"Unexpected error in embedding: {e!s}")
                 raise OpenAIError(f"Error generating embeddings: {e!s}", cause=e) from e
             raise
@@ -692,9 +572,9 @@ class OpenAIClient:
             logger.error(f"Invalid completion request: {message}")
             raise InvalidRequestError(f"Invalid request parameters: {message}", cause=e) from e
         except Exception as e:
-            # The retry decorator will handle most errors, but we need to catch and convert
-            # any that slip through to maintain a consistent interface
-            if not isinstance(e, OpenAIError):
+            # The retry decorator converts and retries API errors, but we need to
+            # catch and convert any other errors to maintain a consistent interface
+            if not isinstance(e, OpenAIError | openai.APIError):
                 logger.error(f"Unexpected error in async completion: {e!s}")
                 raise OpenAIError(f"Error generating completion: {e!s}", cause=e) from e
             raise
@@ -761,9 +641,9 @@ class OpenAIClient:
             logger.error(f"Invalid chat request: {message}")
             raise InvalidRequestError(f"Invalid request parameters: {message}", cause=e) from e
         except Exception as e:
-            # The retry decorator will handle most errors, but we need to catch and convert
-            # any that slip through to maintain a consistent interface
-            if not isinstance(e, OpenAIError):
+            # The retry decorator converts and retries API errors, but we need to
+            # catch and convert any other errors to maintain a consistent interface
+            if not isinstance(e, OpenAIError | openai.APIError):
                 logger.error(f"Unexpected error in async chat: {e!s}")
                 raise OpenAIError(f"Error generating chat completion: {e!s}", cause=e) from e
             raise
@@ -790,40 +670,81 @@ class OpenAIClient:
             ServiceUnavailableError: If the OpenAI API is unavailable
             OpenAIError: For other API errors
         """
-        model = model or self.embedding_model
+        return (await self._embed_vectors_async(texts, model, **kwargs)).to_response()
 
-        # Ensure texts is a list
-        if isinstance(texts, str):
-            texts = [texts]
+    @instrument_async_request(operation=OperationType.EMBEDDING)
+    @retry_on_openai_errors_async(operation_type=OperationType.EMBEDDING)
+    async def embed_vectors_async(
+        self, texts: str | list[str], model: str | None = None, **kwargs: Any
+    ) -> EmbeddingVectors:
+        """Asynchronous version of embed_vectors() method.
 
-        # Create request payload
-        request = EmbeddingRequest(model=model, input=texts, **kwargs)
+        Args:
+            texts: Text(s) to generate embeddings for
+            model: OpenAI model to use (defaults to embedding_model)
+            **kwargs: Additional parameters for the OpenAI API
+
+        Returns:
+            View of the embeddings in input order
+
+        Raises:
+            InvalidRequestError: If the request parameters are invalid
+            RateLimitError: If the API rate limit is exceeded
+            AuthenticationError: If authentication fails
+            ServiceUnavailableError: If the OpenAI API is unavailable
+            OpenAIError: For other API errors
+        """
+        return await self._embed_vectors_async(texts, model, **kwargs)
 
+    async def _embed_vectors_async(
+        self, texts: str | list[str], model: str | None, **kwargs: Any
+    ) -> EmbeddingVectors:
+        """Request embeddings with the async client."""
         try:
             # Make API request
-            # Extract model name and prepare request data
-            model_name, request_data = self._prepare_request_data(request)  # type: ignore[func-returns-value]
             response = await self._async_client.embeddings.create(
-                model=model_name,  # Use model instead of deployment_name
-                input=texts,
-                **request_data,
+                **self._embedding_params(texts, model, **kwargs)
             )
-            return EmbeddingResponse.model_validate(response.model_dump())
+            return EmbeddingVectors.from_response(response)
         except openai.BadRequestError as e:
             message = str(e)
             logger.error(f"Invalid embedding request: {message}")
             raise InvalidRequestError(f"Invalid request parameters: {message}", cause=e) from e
         except Exception as e:
-            # The retry decorator will handle most errors, but we need to catch and convert
-            # any that slip through to maintain a consistent interface
-            if not isinstance(e, OpenAIError):
+            # The retry decorator converts and retries API errors, but we need to
+            # catch and convert any other errors to maintain a consistent interface
+            if not isinstance(e, OpenAIError | openai.APIError):
                 logger.error(f"Unexpected error in async embedding: {e!s}")
                 raise OpenAIError(f"Error generating embeddings: {e!s}", cause=e) from e
             raise
 
 
+def _api_key_from_settings() -> str | None:
+    """Get the OpenAI API key from settings, if one is configured."""
+    try:
+        settings = get_settings()
+        api_key = getattr(settings.openai, "api_key", None)
+    except Exception as e:
+        logger.error(f"Failed to get API key from settings: {e}")
+        return None
+
+    # Convert SecretStr to string if needed
+    if hasattr(api_key, "get_secret_value") and callable(api_key.get_secret_value):
+        return str(api_key.get_secret_value())
+    return api_key if isinstance(api_key, str) and api_key else None
+
+
+# Shared clients by configuration, see create_client
+_clients: dict[str, OpenAIClient] = {}
+_clients_lock = threading.Lock()
+
+
 def create_client(**kwargs: Any) -> OpenAIClient:
-    """Create an OpenAIClient with settings from configuration.
+    """Get the OpenAIClient for the settings from configuration.
+
+    Clients are shared process-wide: every call with the same endpoint,
+    credentials and models returns the same client, with its pooled
+    connections and cached Azure AD token.
 
     Args:
         **kwargs: Override configuration settings
@@ -837,20 +758,52 @@ def create_client(**kwargs: Any) -> OpenAIClient:
     try:
         settings = get_settings()
 
-        # Create client with settings
-        client = OpenAIClient(
-            endpoint=settings.openai.endpoint,
-            embedding_model=settings.openai.embedding_model,
-            chat_model=settings.openai.chat_model,
-            reasoning_model=settings.openai.reasoning_model,
-            api_version=settings.openai.api_version,
-            timeout=settings.openai.timeout,
-            max_retries=settings.openai.max_retries,
-            retry_backoff_factor=settings.openai.retry_backoff_factor,
+        params = {
+            "endpoint": settings.openai.endpoint,
+            "embedding_model": settings.openai.embedding_model,
+            "chat_model": settings.openai.chat_model,
+            "reasoning_model": settings.openai.reasoning_model,
+            "api_version": settings.openai.api_version,
+            "timeout": settings.openai.timeout,
+            "max_retries": settings.openai.max_retries,
+            "retry_backoff_factor": settings.openai.retry_backoff_factor,
             **kwargs,
-        )
+        }
 
+        # Credentials are part of the identity of a client; the API key is
+        # hashed to keep it out of the registry
+        api_key = _api_key_from_settings()
+        key = repr(
+            (
+                sorted(params.items(), key=lambda item: item[0]),
+                getattr(settings.openai, "tenant_id", None),
+                os.environ.get("AZURE_OPENAI__DEPLOYMENT_ID"),
+                hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None,
+            )
+        )
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = OpenAIClient(**params)
+                _clients[key] = client
         return client
     except Exception as e:
         logger.error(f"Failed to create OpenAI client from settings: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def clear_clients() -> None:
+    """Forget all shared clients, so the next create_client() builds a new one."""
+    with _clients_lock:
+        _clients.clear()
+
+
+def _reset_after_fork() -> None:
+    """Start a forked worker without the parent's clients and their connections."""
+    global _clients_lock
+    _clients_lock = threading.Lock()
+    _clients.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
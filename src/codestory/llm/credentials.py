@@ -0,0 +1,164 @@
+"""Cached Azure AD credentials for Azure OpenAI.
+
+DefaultAzureCredential is expensive to create and, when it falls back to the
+Azure CLI, to ask for a token. This module keeps one credential and one token
+provider per tenant per process. The provider caches the token and refreshes
+it in the background shortly before it expires, so requests never wait for a
+token except the first one.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+# Try to import azure.identity, but don't fail if it's not available
+try:
+    from azure.identity import DefaultAzureCredential
+
+    AZURE_IDENTITY_AVAILABLE = True
+except ImportError:
+    AZURE_IDENTITY_AVAILABLE = False
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+if not AZURE_IDENTITY_AVAILABLE:
+    logger.warning("azure.identity not found. Azure AD authentication will not be available.")
+
+# Token scope of Azure OpenAI
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+# Tokens expiring sooner than this are not used, but fetched again first
+MIN_TOKEN_VALIDITY = 30.0
+
+
+class CachedTokenProvider:
+    """Bearer token provider caching the token of a credential.
+
+    The provider is the ``azure_ad_token_provider`` of the OpenAI SDK clients:
+    a callable returning a token. Within ``refresh_margin`` seconds of the
+    token's expiry it keeps returning the cached token while one background
+    thread fetches the next.
+    """
+
+    def __init__(
+        self,
+        credential: Any,
+        scope: str = COGNITIVE_SERVICES_SCOPE,
+        tenant_id: str | None = None,
+        refresh_margin: float = 300.0,
+    ) -> None:
+        """Initialize the provider.
+
+        Args:
+            credential: Azure credential with a ``get_token`` method
+            scope: Token scope
+            tenant_id: Tenant to request tokens from (default: the credential's)
+            refresh_margin: Seconds before expiry at which the token is refreshed
+        """
+        self.credential = credential
+        self.scope = scope
+        self.tenant_id = tenant_id
+        self.refresh_margin = refresh_margin
+        self._token: Any = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _fetch(self) -> Any:
+        """Request a new token from the credential."""
+        kwargs = {"tenant_id": self.tenant_id} if self.tenant_id else {}
+        token = self.credential.get_token(self.scope, **kwargs)
+        logger.debug(f"Fetched Azure AD token expiring in {token.expires_on - time.time():.0f}s")
+        return token
+
+    def __call__(self) -> str:
+        """Get a valid bearer token.
+
+        Returns:
+            Bearer token
+        """
+        token = self._token
+        remaining = token.expires_on - time.time() if token is not None else 0.0
+
+        if remaining <= MIN_TOKEN_VALIDITY:
+            with self._lock:
+                # Another thread may have fetched one while we waited
+                token = self._token
+                if token is None or token.expires_on - time.time() <= MIN_TOKEN_VALIDITY:
+                    token = self._token = self._fetch()
+        elif remaining <= self.refresh_margin:
+            self._refresh_in_background()
+
+        return str(token.token)
+
+    def _refresh_in_background(self) -> None:
+        """Start fetching the next token unless a fetch is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="azure-ad-token-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        """Fetch the next token; the current one stays in use if that fails."""
+        try:
+            token = self._fetch()
+            with self._lock:
+                self._token = token
+        except Exception as e:
+            logger.warning(f"Failed to refresh Azure AD token: {e}")
+        finally:
+            self._refreshing = False
+
+
+# Token providers by tenant
+_providers: dict[str | None, CachedTokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_token_provider(tenant_id: str | None = None) -> CachedTokenProvider:
+    """Get the process-wide token provider for a tenant.
+
+    The credential is created without contacting Azure; the first token is
+    requested on the first API call.
+
+    Args:
+        tenant_id: Azure AD tenant ID (default: the credential's own tenant)
+
+    Returns:
+        Shared token provider
+
+    Raises:
+        ImportError: If azure.identity is not installed
+    """
+    if not AZURE_IDENTITY_AVAILABLE:
+        raise ImportError("azure.identity is required for Azure AD authentication")
+
+    with _providers_lock:
+        provider = _providers.get(tenant_id)
+        if provider is None:
+            credential = DefaultAzureCredential(
+                additionally_allowed_tenants=[tenant_id] if tenant_id else []
+            )
+            provider = CachedTokenProvider(credential, tenant_id=tenant_id)
+            _providers[tenant_id] = provider
+        return provider
+
+
+def clear_token_providers() -> None:
+    """Forget all token providers."""
+    with _providers_lock:
+        _providers.clear()
+
+
+def _reset_after_fork() -> None:
+    """Start a forked worker without the parent's providers and lock state."""
+    global _providers_lock
+    _providers_lock = threading.Lock()
+    _providers.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
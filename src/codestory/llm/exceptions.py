@@ -71,6 +71,12 @@ class ServiceUnavailableError(OpenAIError):
     pass
 
 
+class CircuitOpenError(ServiceUnavailableError):
+    """Call rejected without contacting the API, because it recently failed repeatedly."""
+
+    pass
+
+
 class TimeoutError(OpenAIError):
     """Request timed out."""
 
@@ -97,4 +103,27 @@ class ContextLengthError(InvalidRequestError):
         """
         super().__init__(message, **kwargs)
         self.max_tokens = max_tokens
-        self.input_tokens = input_tokens
\ No newline at end of file
+        self.input_tokens = input_tokens
+
+
+class BatchError(OpenAIError):
+    """Batch job failed, expired or did not finish in time."""
+
+    def __init__(
+        self,
+        message: str,
+        batch_id: str | None = None,
+        status: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize BatchError.
+
+        Args:
+            message: Human-readable error message
+            batch_id: ID of the batch job
+            status: Last known status of the batch job
+            **kwargs: Additional arguments to pass to the base class
+        """
+        super().__init__(message, **kwargs)
+        self.batch_id = batch_id
+        self.status = status
@@ -127,6 +127,40 @@ CURRENT_REQUESTS = _get_or_create_gauge(
     ["operation", "model"],
 )
 
+RETRY_WAIT = _get_or_create_histogram(
+    "openai_retry_wait_seconds",
+    "Time waited before retrying OpenAI API requests",
+    ["operation", "source"],
+    buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
+
+RETRY_BUDGET_EXHAUSTED = _get_or_create_counter(
+    "openai_retry_budget_exhausted_total",
+    "Number of retries skipped because the retry budget was exhausted",
+    ["operation", "model"],
+)
+
+RETRY_BUDGET_TOKENS = _get_or_create_gauge(
+    "openai_retry_budget_tokens",
+    "Retries currently available in the retry budget",
+    [],
+)
+
+CIRCUIT_BREAKER_STATE = _get_or_create_gauge(
+    "openai_circuit_breaker_state",
+    "State of the circuit breaker (0 closed, 1 half-open, 2 open)",
+    ["endpoint"],
+)
+
+CIRCUIT_BREAKER_REJECTED = _get_or_create_counter(
+    "openai_circuit_breaker_rejected_total",
+    "Number of requests rejected by an open circuit breaker",
+    ["endpoint"],
+)
+
+# Values of the circuit breaker state gauge
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
 
 def record_request(
     operation: OperationType,
@@ -182,6 +216,57 @@ def record_retry(
     RETRY_COUNT.labels(operation=operation.value, model=model).inc()
 
 
+def record_retry_wait(operation: OperationType | None, source: str, seconds: float) -> None:
+    """Record the time waited before a retry.
+
+    Args:
+        operation: Type of operation (completion, chat, embedding)
+        source: Where the wait came from (retry_after, jitter)
+        seconds: Time waited in seconds
+    """
+    label = operation.value if operation else "unknown"
+    RETRY_WAIT.labels(operation=label, source=source).observe(seconds)
+
+
+def record_retry_budget_exhausted(operation: OperationType | None, model: str) -> None:
+    """Record a retry skipped because the retry budget was exhausted.
+
+    Args:
+        operation: Type of operation (completion, chat, embedding)
+        model: Model used for the request
+    """
+    label = operation.value if operation else "unknown"
+    RETRY_BUDGET_EXHAUSTED.labels(operation=label, model=model).inc()
+
+
+def record_retry_budget_tokens(tokens: float) -> None:
+    """Record the retries available in the retry budget.
+
+    Args:
+        tokens: Available retries
+    """
+    RETRY_BUDGET_TOKENS.set(tokens)
+
+
+def record_circuit_state(endpoint: str, state: str) -> None:
+    """Record a circuit breaker state change.
+
+    Args:
+        endpoint: Endpoint guarded by the circuit breaker
+        state: New state (closed, half_open, open)
+    """
+    CIRCUIT_BREAKER_STATE.labels(endpoint=endpoint).set(CIRCUIT_STATE_VALUES[state])
+
+
+def record_circuit_rejection(endpoint: str) -> None:
+    """Record a request rejected by an open circuit breaker.
+
+    Args:
+        endpoint: Endpoint guarded by the circuit breaker
+    """
+    CIRCUIT_BREAKER_REJECTED.labels(endpoint=endpoint).inc()
+
+
 def instrument_request(
     operation: OperationType,
 ) -> Callable[[F], F]:
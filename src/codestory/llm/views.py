@@ -0,0 +1,143 @@
+"""Lightweight views of embedding responses.
+
+A batch of 2048 embeddings with 1536 dimensions holds over three million
+floats. Converting the SDK response into validated pydantic models creates a
+Python float object per element, several times over. EmbeddingVectors instead
+decodes the base64 payload of the API straight into one contiguous float32
+buffer and hands out zero-copy row views, lists for Neo4j parameters or a
+NumPy matrix only when asked.
+"""
+
+import base64
+from array import array
+from collections.abc import Iterator
+from typing import Any
+
+from .models import EmbeddingData, EmbeddingResponse, UsageInfo
+
+# NumPy is optional; without it vectors are served as arrays and lists
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class EmbeddingVectors:
+    """Embedding vectors of one request, in input order, as float32."""
+
+    __slots__ = ("buffer", "dimensions", "model", "usage")
+
+    def __init__(
+        self,
+        buffer: array,
+        dimensions: int,
+        model: str,
+        usage: UsageInfo | None = None,
+    ) -> None:
+        """Initialize the view.
+
+        Args:
+            buffer: Vectors concatenated in a float32 array
+            dimensions: Number of dimensions of each vector
+            model: Model that generated the embeddings
+            usage: Token usage of the request
+        """
+        self.buffer = buffer
+        self.dimensions = dimensions
+        self.model = model
+        self.usage = usage
+
+    @classmethod
+    def from_response(cls, response: Any) -> "EmbeddingVectors":
+        """Create a view of an SDK embedding response.
+
+        Embeddings requested with ``encoding_format="base64"`` are decoded
+        without creating a Python float per element; float lists are copied.
+
+        Args:
+            response: Embedding response of the OpenAI SDK
+
+        Returns:
+            View of the embeddings
+        """
+        buffer = array("f")
+        dimensions = 0
+        for item in sorted(response.data, key=lambda item: item.index):
+            embedding = item.embedding
+            if isinstance(embedding, str):
+                buffer.frombytes(base64.b64decode(embedding))
+            else:
+                buffer.fromlist(embedding)
+            if not dimensions:
+                dimensions = len(buffer)
+
+        usage = response.usage
+        if usage is not None:
+            usage = UsageInfo.model_construct(
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=getattr(usage, "completion_tokens", None),
+                total_tokens=usage.total_tokens,
+            )
+        return cls(buffer, dimensions, response.model, usage)
+
+    def __len__(self) -> int:
+        """Get the number of vectors."""
+        return len(self.buffer) // self.dimensions if self.dimensions else 0
+
+    def __getitem__(self, index: int) -> memoryview:
+        """Get a zero-copy float32 view of one vector.
+
+        Args:
+            index: Position of the input
+
+        Returns:
+            View of the vector
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("embedding index out of range")
+        start = index * self.dimensions
+        return memoryview(self.buffer)[start : start + self.dimensions]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        """Iterate over views of the vectors."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def tolist(self) -> list[list[float]]:
+        """Get the vectors as float lists, e.g. for Neo4j query parameters."""
+        return [vector.tolist() for vector in self]
+
+    def to_numpy(self) -> Any:
+        """Get the vectors as a float32 matrix sharing this view's buffer.
+
+        Returns:
+            Array of shape (number of vectors, dimensions)
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for to_numpy()")
+        return np.frombuffer(self.buffer, dtype=np.float32).reshape(len(self), self.dimensions)
+
+    def to_response(self) -> EmbeddingResponse:
+        """Get the vectors as an EmbeddingResponse.
+
+        The response is built from trusted data without validation.
+
+        Returns:
+            Embedding response
+        """
+        return EmbeddingResponse.model_construct(
+            object="list",
+            data=[
+                EmbeddingData.model_construct(embedding=vector, index=index, object="embedding")
+                for index, vector in enumerate(self.tolist())
+            ],
+            model=self.model,
+            usage=self.usage or UsageInfo.model_construct(prompt_tokens=0, total_tokens=0),
+        )
@@ -0,0 +1,10 @@
+"""AST extraction workflow step for Code Story ingestion pipeline.
+
+This package implements a workflow step that parses source files in-process
+with a pool of worker processes and stores classes, functions and their
+relationships in Neo4j, without the Blarify container.
+"""
+
+from .step import ASTExtractionStep
+
+__all__ = ["ASTExtractionStep"]
@@ -0,0 +1,397 @@
+"""Resolution of extracted code structure and batched writes to Neo4j.
+
+Extraction results are resolved against each other in the parent process:
+imported modules are mapped to repository files, base classes and call
+targets are mapped to the classes and functions defined in the repository.
+The resulting nodes and relationships are written with one UNWIND query per
+batch of rows rather than one query per node.
+
+Graph schema written (the schema read by the summarizer):
+
+- ``(File)-[:CONTAINS]->(Class)``, ``(Class)-[:CONTAINS]->(Function:Method)``
+  and ``(File|Function)-[:CONTAINS]->(Function)``
+- ``(File)-[:IMPORTS]->(File)``
+- ``(Class)-[:INHERITS_FROM]->(Class)``
+- ``(Function)-[:CALLS]->(Function)``
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from codestory.graphdb.neo4j_connector import Neo4jConnector
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Rows written per UNWIND query
+DEFAULT_BATCH_SIZE = 1000
+
+_MERGE_FILES = """
+UNWIND $rows AS row
+MERGE (f:File {path: row.path})
+SET f.module = row.module, f.language = row.language
+"""
+
+_MERGE_CLASSES = """
+UNWIND $rows AS row
+MERGE (c:Class {name: row.name, module: row.module})
+SET c += row.properties
+"""
+
+_MERGE_FUNCTIONS = """
+UNWIND $rows AS row
+MERGE (f:Function {name: row.name, module: row.module})
+SET f += row.properties
+"""
+
+_LABEL_METHODS = """
+UNWIND $rows AS row
+MATCH (f:Function {name: row.name, module: row.module})
+SET f:Method
+"""
+
+# Relationship ends: files are matched on their path, classes and functions
+# on their (name, module) key, which is backed by a uniqueness constraint
+_END_PATTERNS = {
+    "File": "(%(var)s:File {path: row.%(end)s})",
+    "Class": "(%(var)s:Class {name: row.%(end)s.name, module: row.%(end)s.module})",
+    "Function": "(%(var)s:Function {name: row.%(end)s.name, module: row.%(end)s.module})",
+}
+
+# Remove definitions of the processed files that no longer exist
+_REMOVE_STALE = """
+UNWIND $rows AS row
+MATCH (:File {path: row.path})-[:CONTAINS*1..]->(n)
+WHERE (n:Class OR n:Function) AND NOT n.qualified_name IN row.keep
+DETACH DELETE n
+"""
+
+
+def batched(rows: list[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    """Split rows into batches.
+
+    Args:
+        rows: Rows to split
+        size: Maximum number of rows per batch
+
+    Yields:
+        Lists of at most ``size`` rows
+    """
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def relationship_query(source_label: str, rel_type: str, target_label: str) -> str:
+    """Build the UNWIND query that merges relationships between two labels.
+
+    Args:
+        source_label: Label of the start nodes
+        rel_type: Relationship type
+        target_label: Label of the end nodes
+
+    Returns:
+        Cypher query taking ``$rows`` of distinct ``{source, target}`` keys
+        and returning the number of relationships it ``created``
+    """
+    source = _END_PATTERNS[source_label] % {"var": "a", "end": "source"}
+    target = _END_PATTERNS[target_label] % {"var": "b", "end": "target"}
+    return f"""
+UNWIND $rows AS row
+MATCH {source}
+MATCH {target}
+OPTIONAL MATCH (a)-[existing:{rel_type}]->(b)
+WITH a, b, count(existing) AS found
+MERGE (a)-[:{rel_type}]->(b)
+RETURN sum(CASE WHEN found = 0 THEN 1 ELSE 0 END) AS created
+"""
+
+
+def node_key(qualified_name: str) -> dict[str, str]:
+    """Get the (name, module) key of a class or function from its qualified name."""
+    module, _, name = qualified_name.rpartition(".")
+    return {"name": name, "module": module}
+
+
+class CodeGraph:
+    """Resolved nodes and relationships of a set of extracted files."""
+
+    def __init__(self, results: Iterable[dict[str, Any]]):
+        """Resolve extraction results.
+
+        Args:
+            results: Extraction results (see LanguageExtractor.extract)
+        """
+        self.files: list[dict[str, Any]] = list(results)
+
+        # Repository-wide lookup tables
+        self.module_paths: dict[str, str] = {}
+        self.classes: dict[str, dict[str, Any]] = {}
+        self.functions: dict[str, dict[str, Any]] = {}
+        self.paths: dict[str, str] = {}
+        self._by_name: dict[str, dict[str, list[str]]] = {
+            "class": defaultdict(list),
+            "function": defaultdict(list),
+        }
+        for result in self.files:
+            self.module_paths[result["module"]] = result["path"]
+            for cls in result["classes"]:
+                self.classes[cls["qualified_name"]] = cls
+                self.paths[cls["qualified_name"]] = result["path"]
+                self._by_name["class"][cls["name"]].append(cls["qualified_name"])
+            for func in result["functions"]:
+                self.functions[func["qualified_name"]] = func
+                self.paths[func["qualified_name"]] = result["path"]
+                self._by_name["function"][func["name"]].append(func["qualified_name"])
+
+    def _resolve(
+        self,
+        name: str,
+        module: str,
+        aliases: dict[str, str],
+        table: dict[str, dict[str, Any]],
+        kind: str,
+    ) -> str | None:
+        """Resolve a name used in a module to a qualified name in the repository.
+
+        Tries, in order: a definition in the same module, an imported name
+        (following ``alias.attribute`` chains), and a definition with that
+        simple name that is unique in the repository.
+        """
+        local = f"{module}.{name}"
+        if local in table:
+            return local
+
+        head, _, rest = name.partition(".")
+        if head in aliases:
+            target = f"{aliases[head]}.{rest}" if rest else aliases[head]
+            if target in table:
+                return target
+
+        candidates = self._by_name[kind].get(name.rpartition(".")[2], [])
+        return candidates[0] if len(candidates) == 1 else None
+
+    def imports(self) -> list[dict[str, str]]:
+        """Get the import relationships between repository files."""
+        rows = []
+        for result in self.files:
+            targets = set()
+            for name in result["imports"]:
+                # "from pkg.mod import name" imports pkg.mod, not pkg.mod.name
+                while name and name not in self.module_paths:
+                    name = name.rpartition(".")[0]
+                path = self.module_paths.get(name)
+                if path and path != result["path"]:
+                    targets.add(path)
+            rows.extend({"source": result["path"], "target": t} for t in sorted(targets))
+        return rows
+
+    def inherits(self) -> list[dict[str, str]]:
+        """Get the inheritance relationships between repository classes."""
+        rows = []
+        for result in self.files:
+            for cls in result["classes"]:
+                for base in cls["bases"]:
+                    target = self._resolve(
+                        base, cls["module"], result["aliases"], self.classes, "class"
+                    )
+                    if target is None and cls["module"] != result["module"]:
+                        target = self._resolve(
+                            base, result["module"], result["aliases"], self.classes, "class"
+                        )
+                    if target and target != cls["qualified_name"]:
+                        rows.append({"source": cls["qualified_name"], "target": target})
+        return rows
+
+    def calls(self) -> list[dict[str, str]]:
+        """Get the call relationships between repository functions."""
+        rows = []
+        for result in self.files:
+            aliases = result["aliases"]
+            for func in result["functions"]:
+                targets = set()
+                for name in func["calls"]:
+                    target = None
+                    head, _, attribute = name.partition(".")
+                    if func["is_method"] and head in ("self", "cls") and attribute:
+                        # self.method() resolves to a method of the same class
+                        target = f"{func['module']}.{attribute}"
+                        if target not in self.functions:
+                            target = None
+                    if target is None:
+                        target = self._resolve(
+                            name, result["module"], aliases, self.functions, "function"
+                        )
+                    if target is None and name in self._by_name["class"]:
+                        # Instantiating a class calls its constructor
+                        cls = self._resolve(name, result["module"], aliases, self.classes, "class")
+                        init = f"{cls}.__init__" if cls else None
+                        target = init if init in self.functions else None
+                    if target and target != func["qualified_name"]:
+                        targets.add(target)
+                rows.extend(
+                    {"source": func["qualified_name"], "target": t} for t in sorted(targets)
+                )
+        return rows
+
+    def node_rows(self) -> dict[str, list[dict[str, Any]]]:
+        """Get the rows for the file, class and function MERGE queries."""
+        files, classes, functions, methods = [], [], [], []
+        for result in self.files:
+            files.append(
+                {
+                    "path": result["path"],
+                    "module": result["module"],
+                    "language": result["language"],
+                }
+            )
+            for cls in result["classes"]:
+                classes.append(
+                    {
+                        "name": cls["name"],
+                        "module": cls["module"],
+                        "properties": {
+                            "qualified_name": cls["qualified_name"],
+                            "path": result["path"],
+                            "start_line": cls["start_line"],
+                            "end_line": cls["end_line"],
+                            "documentation": cls["documentation"],
+                        },
+                    }
+                )
+            for func in result["functions"]:
+                row = {
+                    "name": func["name"],
+                    "module": func["module"],
+                    "properties": {
+                        "qualified_name": func["qualified_name"],
+                        "path": result["path"],
+                        "signature": func["signature"],
+                        "start_line": func["start_line"],
+                        "end_line": func["end_line"],
+                        "documentation": func["documentation"],
+                    },
+                }
+                functions.append(row)
+                if func["is_method"]:
+                    methods.append({"name": func["name"], "module": func["module"]})
+        return {"files": files, "classes": classes, "functions": functions, "methods": methods}
+
+    def contains(self) -> dict[tuple[str, str], list[dict[str, str]]]:
+        """Get the containment relationships grouped by parent and child label."""
+        labels = {"file": "File", "class": "Class", "function": "Function"}
+        rows: dict[tuple[str, str], list[dict[str, str]]] = defaultdict(list)
+        for result in self.files:
+            for child_label, nodes in (
+                ("Class", result["classes"]),
+                ("Function", result["functions"]),
+            ):
+                for node in nodes:
+                    parent_type = node["parent_type"]
+                    parent = result["path"] if parent_type == "file" else node["parent"]
+                    rows[(labels[parent_type], child_label)].append(
+                        {"source": parent, "target": node["qualified_name"]}
+                    )
+        return rows
+
+
+class GraphWriter:
+    """Writes a CodeGraph to Neo4j with batched UNWIND queries."""
+
+    def __init__(self, connector: Neo4jConnector, batch_size: int = DEFAULT_BATCH_SIZE):
+        """Initialize the writer.
+
+        Args:
+            connector: Neo4j connector
+            batch_size: Rows written per query
+        """
+        self.connector = connector
+        self.batch_size = batch_size
+
+    def _write(self, query: str, rows: list[dict[str, Any]]) -> int:
+        for batch in batched(rows, self.batch_size):
+            self.connector.execute_query(query, params={"rows": batch}, write=True)
+        return len(rows)
+
+    def write_relationships(
+        self, source_label: str, rel_type: str, target_label: str, rows: list[dict[str, str]]
+    ) -> int:
+        """Write relationships between existing nodes.
+
+        Args:
+            source_label: Label of the start nodes
+            rel_type: Relationship type
+            target_label: Label of the end nodes
+            rows: ``{source, target}`` rows; files are given by path, classes
+                and functions by qualified name
+
+        Returns:
+            Number of relationships created; rows whose ends are missing or
+            that were already connected are not counted
+        """
+
+        # The queries match classes and functions on their (name, module) key
+        def end(label: str, value: str) -> Any:
+            return value if label == "File" else node_key(value)
+
+        # Duplicate rows would be counted as created twice within a batch
+        distinct = {(r["source"], r["target"]): r for r in rows}.values()
+        keyed = [
+            {"source": end(source_label, r["source"]), "target": end(target_label, r["target"])}
+            for r in distinct
+        ]
+        query = relationship_query(source_label, rel_type, target_label)
+        created = 0
+        for batch in batched(keyed, self.batch_size):
+            records = self.connector.execute_query(query, params={"rows": batch}, write=True)
+            created += sum(int(record.get("created") or 0) for record in records or [])
+        return created
+
+    def write(self, graph: CodeGraph, remove_stale: bool = True) -> dict[str, int]:
+        """Write the nodes and relationships of a graph.
+
+        Nodes are written before relationships so that every relationship
+        query can match both of its ends.
+
+        Args:
+            graph: Resolved code graph
+            remove_stale: Delete classes and functions of the written files
+                that are no longer defined in them
+
+        Returns:
+            Number of node rows written and relationships created per kind
+        """
+        nodes = graph.node_rows()
+        counts = {
+            "files": self._write(_MERGE_FILES, nodes["files"]),
+            "classes": self._write(_MERGE_CLASSES, nodes["classes"]),
+            "functions": self._write(_MERGE_FUNCTIONS, nodes["functions"]),
+        }
+        self._write(_LABEL_METHODS, nodes["methods"])
+
+        if remove_stale:
+            keep = [
+                {
+                    "path": result["path"],
+                    "keep": [
+                        node["qualified_name"]
+                        for node in [*result["classes"], *result["functions"]]
+                    ],
+                }
+                for result in graph.files
+            ]
+            self._write(_REMOVE_STALE, keep)
+
+        counts["contains"] = sum(
+            self.write_relationships(parent, "CONTAINS", child, rows)
+            for (parent, child), rows in graph.contains().items()
+        )
+        counts["imports"] = self.write_relationships("File", "IMPORTS", "File", graph.imports())
+        counts["inherits"] = self.write_relationships(
+            "Class", "INHERITS_FROM", "Class", graph.inherits()
+        )
+        counts["calls"] = self.write_relationships("Function", "CALLS", "Function", graph.calls())
+
+        logger.info(f"Wrote code graph: {counts}")
+        return counts
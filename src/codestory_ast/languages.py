@@ -0,0 +1,255 @@
+"""Language extractors for the AST extraction step.
+
+An extractor turns one source file into plain data: the classes and functions
+it defines (with line ranges), the modules it imports, the base classes of its
+classes and the calls made by its functions. Results are plain dictionaries
+so they can be returned from worker processes.
+
+Python is supported with the standard library ``ast`` module. Other languages
+plug in by subclassing LanguageExtractor and registering an instance with
+register_language().
+"""
+
+import abc
+import ast
+import logging
+from typing import Any
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class LanguageExtractor(abc.ABC):
+    """Extracts code structure from source files of one language."""
+
+    #: Language name, stored on the extracted nodes
+    name: str = ""
+
+    #: File extensions (without the dot) handled by the extractor
+    extensions: tuple[str, ...] = ()
+
+    @abc.abstractmethod
+    def module_name(self, path: str) -> str:
+        """Get the module name of a file.
+
+        Args:
+            path: Path of the file relative to the repository root, using "/"
+
+        Returns:
+            Dotted module name
+        """
+
+    @abc.abstractmethod
+    def extract(self, path: str, source: str) -> dict[str, Any]:
+        """Extract the code structure of a file.
+
+        Args:
+            path: Path of the file relative to the repository root, using "/"
+            source: Source code of the file
+
+        Returns:
+            Dict with:
+                - path, module, language: identify the file
+                - classes: list of class dicts (name, module, qualified_name,
+                  parent, start_line, end_line, documentation, bases)
+                - functions: list of function dicts (name, module,
+                  qualified_name, parent, parent_type, is_method, signature,
+                  start_line, end_line, documentation, calls)
+                - imports: imported module names
+                - aliases: local name -> qualified name of imported names
+        """
+
+
+def _dotted_name(node: ast.AST) -> str | None:
+    """Get the dotted name of a Name/Attribute chain, e.g. ``pkg.mod.Class``."""
+    parts: list[str] = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+
+class _PythonVisitor(ast.NodeVisitor):
+    """Collects classes, functions, imports and calls of one module."""
+
+    def __init__(self, module: str, package: str):
+        self.module = module
+        self.package = package
+        self.classes: list[dict[str, Any]] = []
+        self.functions: list[dict[str, Any]] = []
+        self.imports: list[str] = []
+        self.aliases: dict[str, str] = {}
+        # (qualified name, kind) of the enclosing definitions
+        self._scope: list[tuple[str, str]] = []
+        self._calls: list[list[str]] = []
+
+    def _container(self) -> tuple[str, str | None, str]:
+        if self._scope:
+            qualified, kind = self._scope[-1]
+            return qualified, qualified, kind
+        return self.module, None, "file"
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        container, parent, parent_type = self._container()
+        qualified_name = f"{container}.{node.name}"
+        self.classes.append(
+            {
+                "name": node.name,
+                "module": container,
+                "qualified_name": qualified_name,
+                "parent": parent,
+                "parent_type": parent_type,
+                "start_line": node.lineno,
+                "end_line": node.end_lineno,
+                "documentation": ast.get_docstring(node),
+                "bases": [b for b in map(_dotted_name, node.bases) if b],
+            }
+        )
+        self._scope.append((qualified_name, "class"))
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def _visit_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        container, parent, parent_type = self._container()
+        qualified_name = f"{container}.{node.name}"
+        calls: list[str] = []
+        self.functions.append(
+            {
+                "name": node.name,
+                "module": container,
+                "qualified_name": qualified_name,
+                "parent": parent,
+                "parent_type": parent_type,
+                "is_method": parent_type == "class",
+                "signature": f"{node.name}({ast.unparse(node.args)})",
+                "start_line": node.lineno,
+                "end_line": node.end_lineno,
+                "documentation": ast.get_docstring(node),
+                "calls": calls,
+            }
+        )
+        self._scope.append((qualified_name, "function"))
+        self._calls.append(calls)
+        self.generic_visit(node)
+        self._calls.pop()
+        self._scope.pop()
+
+    visit_FunctionDef = _visit_function  # noqa: N815
+    visit_AsyncFunctionDef = _visit_function  # noqa: N815
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if self._calls:
+            name = _dotted_name(node.func)
+            if name and name not in self._calls[-1]:
+                self._calls[-1].append(name)
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(alias.name)
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".")[0]
+                self.aliases.setdefault(top, top)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        base = node.module or ""
+        if node.level:
+            parts = self.package.split(".") if self.package else []
+            parts = parts[: len(parts) - (node.level - 1)] if node.level > 1 else parts
+            base = ".".join([*parts, base] if base else parts)
+        if base:
+            self.imports.append(base)
+        for alias in node.names:
+            if alias.name == "*":
+                continue
+            target = f"{base}.{alias.name}" if base else alias.name
+            # "from pkg import mod" may import a module rather than a name
+            self.imports.append(target)
+            self.aliases[alias.asname or alias.name] = target
+
+
+class PythonExtractor(LanguageExtractor):
+    """Extracts Python code structure with the standard library ``ast`` module."""
+
+    name = "python"
+    extensions = ("py", "pyi")
+
+    def module_name(self, path: str) -> str:
+        """Get the dotted module name of a Python file.
+
+        Args:
+            path: Path of the file relative to the repository root, using "/"
+
+        Returns:
+            Dotted module name; packages are named after their directory
+        """
+        stem = path.rsplit(".", 1)[0]
+        parts = [p for p in stem.split("/") if p]
+        if parts and parts[-1] == "__init__":
+            parts = parts[:-1]
+        return ".".join(parts) or stem
+
+    def extract(self, path: str, source: str) -> dict[str, Any]:
+        """Extract the classes, functions, imports and calls of a Python file.
+
+        Args:
+            path: Path of the file relative to the repository root, using "/"
+            source: Source code of the file
+
+        Returns:
+            Extraction result (see LanguageExtractor.extract)
+
+        Raises:
+            SyntaxError: If the file cannot be parsed
+        """
+        module = self.module_name(path)
+        is_package = path.endswith("/__init__.py") or path == "__init__.py"
+        package = module if is_package else module.rpartition(".")[0]
+
+        visitor = _PythonVisitor(module, package)
+        visitor.visit(ast.parse(source, filename=path))
+        return {
+            "path": path,
+            "module": module,
+            "language": self.name,
+            "classes": visitor.classes,
+            "functions": visitor.functions,
+            "imports": list(dict.fromkeys(visitor.imports)),
+            "aliases": visitor.aliases,
+        }
+
+
+# Registered extractors by file extension
+_LANGUAGES: dict[str, LanguageExtractor] = {}
+
+
+def register_language(extractor: LanguageExtractor) -> None:
+    """Register an extractor for the file extensions it handles.
+
+    Args:
+        extractor: Extractor instance; it is sent to worker processes, so it
+            must be picklable
+    """
+    for extension in extractor.extensions:
+        _LANGUAGES[extension.lower()] = extractor
+
+
+def get_extractor(path: str) -> LanguageExtractor | None:
+    """Get the extractor for a file.
+
+    Args:
+        path: File path
+
+    Returns:
+        Extractor registered for the file's extension, or None
+    """
+    _, _, extension = path.rpartition(".")
+    return _LANGUAGES.get(extension.lower()) if extension else None
+
+
+register_language(PythonExtractor())
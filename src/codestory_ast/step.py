@@ -0,0 +1,399 @@
+"""AST extraction workflow step implementation.
+
+This module implements the ASTExtractionStep class, which parses source files
+in-process with a pool of worker processes and stores classes, functions and
+their relationships in Neo4j. It produces the code graph the summarizer
+reads without the Blarify container, so it also runs where Docker is not
+available.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from uuid import uuid4
+
+from celery import current_app, shared_task
+from celery.result import AsyncResult
+
+from codestory.config.settings import get_settings
+from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory.ingestion_pipeline.progress import create_reporter
+from codestory.ingestion_pipeline.step import PipelineStep, StepStatus
+from codestory_filesystem.ignore import IgnoreMatcher
+
+from .graph import DEFAULT_BATCH_SIZE, CodeGraph, GraphWriter
+from .languages import get_extractor
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Default configuration
+DEFAULT_CHUNKSIZE = 16  # files sent to a worker process at a time
+MIN_PARALLEL_FILES = 64  # smaller repositories are parsed in the calling process
+
+
+def find_source_files(repository_path: str, ignore_patterns: list[str] | None = None) -> list[str]:
+    """Find the files of a repository that a registered extractor can parse.
+
+    Args:
+        repository_path: Path to the repository
+        ignore_patterns: Additional gitignore-style patterns to skip
+
+    Returns:
+        Paths relative to the repository root, using "/"
+    """
+    matcher = IgnoreMatcher(repository_path, ignore_patterns)
+    files = []
+    for root, dirs, names in os.walk(repository_path):
+        rel_root = os.path.relpath(root, repository_path).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root
+        prefix = f"{rel_root}/" if rel_root else ""
+
+        # Prune ignored directories instead of walking them
+        dirs[:] = [d for d in dirs if not matcher.match_entry(rel_root, d, is_dir=True)]
+        for name in names:
+            path = f"{prefix}{name}"
+            if get_extractor(path) is not None and not matcher.match_entry(rel_root, name):
+                files.append(path)
+    return sorted(files)
+
+
+def extract_file(task: tuple[str, str]) -> tuple[str, dict[str, Any] | None, str | None]:
+    """Extract the code structure of one file.
+
+    Runs in worker processes, so it takes and returns plain data.
+
+    Args:
+        task: (repository path, file path relative to the repository)
+
+    Returns:
+        (file path, extraction result or None, error message or None)
+    """
+    repository_path, path = task
+    extractor = get_extractor(path)
+    if extractor is None:
+        return path, None, "No extractor registered for file"
+
+    try:
+        with open(os.path.join(repository_path, path), encoding="utf-8") as f:
+            source = f.read()
+        return path, extractor.extract(path, source), None
+    except (OSError, UnicodeDecodeError, SyntaxError, ValueError, RecursionError) as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def parallel_map(
+    func: Callable[[Any], Any],
+    items: list[Any],
+    max_workers: int,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[Any]:
+    """Apply a function to items in a pool of worker processes.
+
+    Results are yielded as they complete, in no particular order.
+
+    Args:
+        func: Picklable module-level function
+        items: Picklable items
+        max_workers: Number of worker processes; 1 runs in this process
+        chunksize: Items sent to a worker at a time
+
+    Yields:
+        Results of the function
+    """
+    if max_workers <= 1 or len(items) < MIN_PARALLEL_FILES:
+        yield from map(func, items)
+    elif multiprocessing.current_process().daemon:
+        # Celery's prefork workers are daemonic processes, which
+        # ProcessPoolExecutor refuses to create children from; billiard (the
+        # multiprocessing fork Celery ships with) allows it
+        import billiard
+
+        with billiard.Pool(max_workers) as pool:
+            yield from pool.imap_unordered(func, items, chunksize)
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            yield from executor.map(func, items, chunksize=chunksize)
+
+
+class ASTExtractionStep(PipelineStep):
+    """Workflow step that extracts code structure with in-process parsers.
+
+    Files are parsed in parallel with the language extractors registered in
+    codestory_ast.languages, and the resulting classes, functions, imports,
+    inheritance and calls are written to Neo4j with batched UNWIND queries.
+    """
+
+    def __init__(self) -> Any:  # type: ignore[misc]
+        """Initialize the AST extraction step."""
+        self.settings = get_settings()
+        self.active_jobs: dict[str, dict[str, Any]] = {}
+
+    def run(self, repository_path: str, **config: Any) -> str:
+        """Run the AST extraction step.
+
+        Args:
+            repository_path: Path to the repository to process
+            **config: Additional configuration parameters
+                - ignore_patterns: List of patterns to ignore
+                - max_workers: Number of parser processes (default: CPU count)
+                - chunksize: Files sent to a parser process at a time
+                - batch_size: Rows written per Neo4j query
+
+        Returns:
+            str: Job ID that can be used to check the status
+
+        Raises:
+            ValueError: If the repository path is invalid
+        """
+        # Validate repository path
+        if not os.path.isdir(repository_path):
+            raise ValueError(f"Repository path is not a valid directory: {repository_path}")
+
+        # Generate job ID
+        job_id = f"ast-{uuid4()}"
+
+        # Use the fully qualified task name to avoid task routing issues
+        task = current_app.send_task(
+            "codestory_ast.step.run_ast_extraction",
+            kwargs={
+                "repository_path": repository_path,
+                "job_id": job_id,
+                "ignore_patterns": config.get("ignore_patterns", []),
+                "config": config,
+            },
+        )
+
+        # Store job information
+        self.active_jobs[job_id] = {
+            "task_id": task.id,
+            "repository_path": repository_path,
+            "start_time": time.time(),
+            "status": StepStatus.RUNNING,
+            "config": config,
+        }
+
+        logger.info(f"Started AST extraction job {job_id} for repository: {repository_path}")
+
+        return job_id
+
+    def status(self, job_id: str) -> dict[str, Any]:
+        """Check the status of a job.
+
+        Args:
+            job_id: Identifier for the job
+
+        Returns:
+            dict[str, Any]: Status information including:
+                - status: StepStatus enum value
+                - progress: Optional float (0-100) indicating completion percentage
+                - message: Optional human-readable status message
+                - error: Optional error details if status is FAILED
+
+        Raises:
+            ValueError: If the job ID is invalid or not found
+        """
+        job_info = self.active_jobs.get(job_id)
+        if job_info and job_info["status"] in (StepStatus.STOPPED, StepStatus.CANCELLED):
+            return {
+                "status": job_info["status"],
+                "message": f"Job {job_id} is {job_info['status']}",
+                "job_id": job_id,
+            }
+
+        try:
+            result = AsyncResult(job_info["task_id"] if job_info else job_id)
+            state = result.state
+        except Exception:
+            raise ValueError(f"Invalid job ID: {job_id}") from None
+
+        if state == "PENDING":
+            return {
+                "status": StepStatus.RUNNING,
+                "message": "Task is pending execution",
+            }
+        elif state == "SUCCESS":
+            return {
+                "status": StepStatus.COMPLETED,
+                "message": "Task completed successfully",
+                "result": result.result,
+            }
+        elif state == "FAILURE":
+            return {
+                "status": StepStatus.FAILED,
+                "message": "Task failed",
+                "error": str(result.result),
+            }
+        elif state == "REVOKED":
+            return {
+                "status": StepStatus.STOPPED,
+                "message": f"Job {job_id} has been stopped",
+                "job_id": job_id,
+            }
+
+        # Task is still running
+        status_info = {
+            "status": StepStatus.RUNNING,
+            "message": f"Task is in state: {state}",
+        }
+
+        # Add info from the task if available
+        if isinstance(result.info, dict):
+            status_info.update(result.info)
+
+        return status_info
+
+    def stop(self, job_id: str) -> dict[str, Any]:
+        """Stop a running job.
+
+        Args:
+            job_id: Identifier for the job
+
+        Returns:
+            dict[str, Any]: Status information (same format as status method)
+
+        Raises:
+            ValueError: If the job ID is invalid or not found
+        """
+        if job_id not in self.active_jobs:
+            raise ValueError(f"Invalid job ID: {job_id}")
+
+        job_info = self.active_jobs[job_id]
+
+        # Revoke the task; terminating it also ends its parser processes
+        current_app.control.revoke(job_info["task_id"], terminate=True)
+
+        # Update job status
+        job_info["status"] = StepStatus.STOPPED
+        job_info["end_time"] = time.time()
+
+        return {
+            "status": StepStatus.STOPPED,
+            "message": f"Job {job_id} has been stopped",
+            "job_id": job_id,
+        }
+
+    def cancel(self, job_id: str) -> dict[str, Any]:
+        """Cancel a job.
+
+        Args:
+            job_id: Identifier for the job
+
+        Returns:
+            dict[str, Any]: Status information (same format as status method)
+
+        Raises:
+            ValueError: If the job ID is invalid or not found
+        """
+        result = self.stop(job_id)
+        self.active_jobs[job_id]["status"] = StepStatus.CANCELLED
+        result["status"] = StepStatus.CANCELLED
+        result["message"] = f"Job {job_id} has been cancelled"
+
+        return result
+
+    def ingestion_update(self, repository_path: str, **config: Any) -> str:
+        """Update the code graph for a repository.
+
+        Extraction is cheap enough to re-run over the whole repository;
+        definitions that no longer exist are removed from the graph.
+
+        Args:
+            repository_path: Path to the repository to process
+            **config: Additional configuration parameters
+
+        Returns:
+            str: Job ID that can be used to check the status
+        """
+        return self.run(repository_path, **config)
+
+
+@shared_task(bind=True, name="codestory_ast.step.run_ast_extraction")  # type: ignore[misc]
+def run_ast_extraction(  # type: ignore[no-untyped-def]
+    self,  # Celery task instance
+    repository_path: str,
+    job_id: str | None = None,
+    ignore_patterns: list[str] | None = None,
+    config: dict[str, Any] | None = None,
+    **options: Any,
+) -> dict[str, Any]:
+    """Run the AST extraction workflow step as a Celery task.
+
+    Args:
+        self: Celery task instance
+        repository_path: Path to the repository to process
+        job_id: ID for the job
+        ignore_patterns: List of patterns to ignore
+        config: Additional configuration
+        **options: Configuration passed as keyword arguments by the pipeline
+
+    Returns:
+        Dict with results
+    """
+    logger.info(f"Starting AST extraction task for repository: {repository_path}")
+
+    start_time = time.time()
+    config = {**options, **(config or {})}
+    max_workers = int(config.get("max_workers") or os.cpu_count() or 1)
+    chunksize = int(config.get("chunksize", DEFAULT_CHUNKSIZE))
+    batch_size = int(config.get("batch_size", DEFAULT_BATCH_SIZE))
+
+    if not os.path.isdir(repository_path):
+        raise ValueError(f"Repository path is not a valid directory: {repository_path}")
+
+    # Progress is coalesced, so it can be reported for every file
+    reporter = create_reporter(job_id, "ast", task=self)
+
+    files = find_source_files(repository_path, ignore_patterns)
+    reporter.report(5.0, f"Parsing {len(files)} source files...")
+
+    # Parsing is scaled from 5% to 80%
+    results = []
+    errors: dict[str, str] = {}
+    tasks = [(repository_path, path) for path in files]
+    for done, (path, result, error) in enumerate(
+        parallel_map(extract_file, tasks, max_workers, chunksize), start=1
+    ):
+        if error:
+            errors[path] = error
+            logger.warning(f"Could not extract {path}: {error}")
+        else:
+            results.append(result)
+
+        reporter.report(5.0 + 75.0 * done / len(files), f"Parsed {done}/{len(files)} source files")
+
+    reporter.report(80.0, "Writing code graph to Neo4j...")
+
+    settings = get_settings()
+    connector = Neo4jConnector(
+        uri=settings.neo4j.uri,
+        username=settings.neo4j.username,
+        password=settings.neo4j.password.get_secret_value(),
+        database=settings.neo4j.database,
+    )
+    try:
+        counts = GraphWriter(connector, batch_size).write(CodeGraph(results))
+    finally:
+        connector.close()
+
+    duration = time.time() - start_time
+    message = (
+        f"AST extraction of {len(results)} files completed in {duration:.2f} seconds "
+        f"({len(errors)} files could not be parsed)"
+    )
+    logger.info(message)
+    reporter.report(100.0, message, StepStatus.COMPLETED)
+
+    return {
+        "status": StepStatus.COMPLETED,
+        "job_id": job_id,
+        "files_processed": len(results),
+        "files_failed": len(errors),
+        "errors": dict(list(errors.items())[:20]),
+        "counts": counts,
+        "duration": duration,
+    }
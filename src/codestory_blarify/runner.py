@@ -0,0 +1,586 @@
+"""Runners that execute Blarify for the Blarify step.
+
+Pulling the Blarify image and cold-starting a container for every job cost
+far more than parsing small repositories. Runners avoid both:
+
+- ``ContainerPoolRunner`` keeps warm, long-lived containers per image and
+  mount root and dispatches jobs to them with ``docker exec`` over the Docker
+  daemon's local socket. The image digest is only checked against the
+  registry once per TTL.
+- ``SubprocessRunner`` runs a Blarify CLI installed in the worker directly.
+
+Both report progress as ``BlarifyEvent`` objects. Blarify's output is parsed
+into events in one place, so callers never scrape log text themselves.
+"""
+
+import json
+import logging
+import os
+import posixpath
+import shutil
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Literal
+from uuid import uuid4
+
+import docker
+from docker.errors import DockerException, ImageNotFound, NotFound
+from pydantic import BaseModel, Field
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Directory the mount root is bound to inside pooled containers
+WORK_DIR = "/workspace"
+
+# Label that marks pooled Blarify containers
+POOL_LABEL = "codestory.blarify.pool"
+
+# Seconds between registry digest checks of an image
+DEFAULT_IMAGE_CHECK_TTL = 3600
+
+# Idle warm containers kept per pool
+DEFAULT_MAX_IDLE = 2
+
+# Seconds an idle warm container is kept before it is removed
+DEFAULT_IDLE_TTL = 900
+
+# Seconds a pooled container lives at most. Containers exit on their own
+# after this, so they don't outlive a worker that died without cleaning up.
+DEFAULT_MAX_LIFETIME = 6 * 3600
+
+# Seconds between checks whether a running Blarify command was cancelled
+CANCEL_CHECK_INTERVAL = 0.5
+
+
+class BlarifyEvent(BaseModel):
+    """Structured event reported while Blarify runs."""
+
+    type: Literal["progress", "log", "error", "exit"] = Field(..., description="Event type")
+    progress: float | None = Field(None, description="Blarify's own progress (0-100)")
+    message: str = Field("", description="Event message")
+    exit_code: int | None = Field(None, description="Exit code, for exit events")
+
+
+def parse_event(line: str) -> BlarifyEvent:
+    """Turn a line of Blarify output into an event.
+
+    JSON lines (``{"event": "progress", "progress": 42, ...}``) are used as
+    is. Plain ``Progress: 42%`` and ``Error: ...`` lines are translated.
+
+    Args:
+        line: Line of Blarify output
+
+    Returns:
+        The event the line describes
+    """
+    line = line.strip()
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            event_type = data.get("event") or data.get("type") or "log"
+            if event_type not in ("progress", "log", "error"):
+                event_type = "log"
+            progress = data.get("progress")
+            return BlarifyEvent(
+                type=event_type,
+                progress=float(progress) if progress is not None else None,
+                message=str(data.get("message", "")),
+            )
+
+    if "Progress:" in line:
+        try:
+            progress = float(line.split("Progress:")[1].strip().split("%")[0])
+            return BlarifyEvent(type="progress", progress=progress, message=line)
+        except (ValueError, IndexError):
+            pass
+    if "Error:" in line:
+        return BlarifyEvent(type="error", message=line)
+    return BlarifyEvent(type="log", message=line)
+
+
+def _split_lines(chunks: Iterable[bytes | str]) -> Iterator[str]:
+    """Re-assemble streamed output chunks into lines."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8", errors="replace") if isinstance(chunk, bytes) else chunk
+        *lines, buffer = buffer.split("\n")
+        yield from lines
+    if buffer:
+        yield buffer
+
+
+def _events(lines: Iterable[str]) -> Iterator[BlarifyEvent]:
+    for line in lines:
+        if line.strip():
+            yield parse_event(line)
+
+
+class _Watchdog:
+    """Kills a Blarify run once it times out or is cancelled."""
+
+    def __init__(
+        self, timeout: float, kill: Callable[[], None], cancel: threading.Event | None = None
+    ):
+        """Initialize the watchdog.
+
+        Args:
+            timeout: Seconds the run may take
+            kill: Function killing the run
+            cancel: Event that is set when the run is to be abandoned
+        """
+        self.timeout = timeout
+        self.kill = kill
+        self.cancel = cancel
+        self.timed_out = threading.Event()
+        self.cancelled = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def start(self) -> None:
+        """Start watching the run."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching a run that ended."""
+        self._done.set()
+
+    def _watch(self) -> None:
+        deadline = time.monotonic() + self.timeout
+        while not self._done.is_set():
+            if self.cancel is not None and self.cancel.is_set():
+                self.cancelled.set()
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.timed_out.set()
+                break
+            self._done.wait(min(remaining, CANCEL_CHECK_INTERVAL))
+        else:
+            return
+        self.kill()
+
+    def check(self) -> None:
+        """Raise if the run was killed by the watchdog.
+
+        Raises:
+            TimeoutError: If the run timed out
+            RuntimeError: If the run was cancelled
+        """
+        if self.timed_out.is_set():
+            raise TimeoutError(f"Blarify timed out after {self.timeout} seconds")
+        if self.cancelled.is_set():
+            raise RuntimeError("Blarify run was cancelled")
+
+
+def blarify_command(
+    target: str, neo4j_connection: str, ignore_patterns: list[str], incremental: bool
+) -> list[str]:
+    """Build the Blarify command line.
+
+    Args:
+        target: Path of the repository as Blarify sees it
+        neo4j_connection: Neo4j connection string to write results to
+        ignore_patterns: Patterns to ignore
+        incremental: Whether to run an incremental update
+
+    Returns:
+        Command and arguments
+    """
+    command = ["blarify", "parse", target]
+    for pattern in ignore_patterns:
+        command.extend(["--ignore", pattern])
+    if incremental:
+        command.append("--incremental")
+    command.extend(["--output", neo4j_connection])
+    return command
+
+
+class ImageChecker:
+    """Makes sure an image is present, checking its registry digest at most once per TTL."""
+
+    def __init__(self, client: docker.DockerClient, ttl: float = DEFAULT_IMAGE_CHECK_TTL):
+        """Initialize the checker.
+
+        Args:
+            client: Docker client
+            ttl: Seconds a digest check stays valid
+        """
+        self.client = client
+        self.ttl = ttl
+        self._checked: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def ensure(self, image: str) -> str:
+        """Make sure the latest version of an image is available locally.
+
+        The image is only pulled if it is missing or its registry digest
+        differs from the local one. If the registry can't be reached, the
+        local image is used.
+
+        Args:
+            image: Image reference
+
+        Returns:
+            ID of the local image
+        """
+        with self._lock:
+            cached = self._checked.get(image)
+            if cached and time.monotonic() - cached[1] < self.ttl:
+                return cached[0]
+
+            try:
+                local = self.client.images.get(image)
+            except ImageNotFound:
+                local = None
+
+            try:
+                digest = self.client.images.get_registry_data(image).id
+                repo_digests = local.attrs.get("RepoDigests", []) if local else []
+                if not any(d.endswith(f"@{digest}") for d in repo_digests):
+                    logger.info(f"Pulling Docker image {image} ({digest})")
+                    local = self.client.images.pull(image)
+            except DockerException as e:
+                if local is None:
+                    raise
+                logger.warning(f"Failed to check Docker image {image}: {e}. Using local image.")
+
+            self._checked[image] = (local.id, time.monotonic())
+            return local.id  # type: ignore[no-any-return]
+
+
+class _WarmContainer:
+    """A pooled container and when it can no longer be used."""
+
+    __slots__ = ("container", "expires_at", "idle_since", "image_id", "name")
+
+    def __init__(self, container: Any, name: str, image_id: str, expires_at: float):
+        self.container = container
+        self.name = name
+        self.image_id = image_id
+        self.expires_at = expires_at
+        self.idle_since = time.monotonic()
+
+
+class ContainerPoolRunner:
+    """Runs Blarify in warm, long-lived containers.
+
+    Containers mount ``mount_root`` read-only and idle on a sleep command.
+    Each job is a ``docker exec`` in an idle container, so only the first
+    job for a mount root pays for container startup.
+    """
+
+    def __init__(
+        self,
+        client: docker.DockerClient,
+        image: str,
+        mount_root: str,
+        image_checker: ImageChecker,
+        max_idle: int = DEFAULT_MAX_IDLE,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        max_lifetime: float = DEFAULT_MAX_LIFETIME,
+    ):
+        """Initialize the pool.
+
+        Args:
+            client: Docker client
+            image: Blarify image reference
+            mount_root: Host directory mounted into the containers; every
+                repository run by the pool must be below it
+            image_checker: Checker used to keep the image up to date
+            max_idle: Idle containers kept for reuse
+            idle_ttl: Seconds an idle container is kept
+            max_lifetime: Seconds a container lives at most
+        """
+        self.client = client
+        self.image = image
+        self.mount_root = os.path.abspath(mount_root)
+        self.image_checker = image_checker
+        self.max_idle = max_idle
+        self.idle_ttl = idle_ttl
+        self.max_lifetime = max_lifetime
+        self._idle: list[_WarmContainer] = []
+        self._lock = threading.Lock()
+
+    def container_path(self, repository_path: str) -> str:
+        """Get a repository's path inside the pool's containers.
+
+        Args:
+            repository_path: Host path of the repository
+
+        Returns:
+            Path of the repository inside the containers
+
+        Raises:
+            ValueError: If the repository is not below the mount root
+        """
+        relative = os.path.relpath(os.path.abspath(repository_path), self.mount_root)
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            raise ValueError(f"{repository_path} is not below {self.mount_root}")
+        if relative == os.curdir:
+            return WORK_DIR
+        return posixpath.join(WORK_DIR, *relative.split(os.sep))
+
+    def run(
+        self,
+        command: list[str],
+        timeout: float,
+        name: str | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Iterator[BlarifyEvent]:
+        """Run a Blarify command in a warm container.
+
+        Args:
+            command: Command to execute
+            timeout: Seconds the command may run before its container is killed
+            name: Name the container carries while the command runs, so that
+                the job's container can be found (and stopped) by name
+            cancel: Event that kills the container when set
+
+        Yields:
+            Events reported by Blarify, ending with an exit event
+        """
+        warm = self._acquire(timeout)
+        healthy = False
+        watchdog = _Watchdog(timeout, lambda: self._kill(warm), cancel)
+        try:
+            if name:
+                warm.container.rename(name)
+            exec_id = self.client.api.exec_create(warm.container.id, command, workdir=WORK_DIR)[
+                "Id"
+            ]
+            watchdog.start()
+            stream = self.client.api.exec_start(exec_id, stream=True)
+            yield from _events(_split_lines(stream))
+
+            exit_code = self.client.api.exec_inspect(exec_id).get("ExitCode")
+            watchdog.check()
+            healthy = exit_code == 0
+            yield BlarifyEvent(
+                type="exit",
+                exit_code=-1 if exit_code is None else int(exit_code),
+                message=f"Blarify exited with code {exit_code}",
+            )
+        finally:
+            watchdog.stop()
+            self._release(warm, healthy)
+
+    def close(self) -> None:
+        """Remove all idle containers."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for warm in idle:
+            self._remove(warm)
+
+    def sweep(self, image_id: str | None = None) -> None:
+        """Remove idle containers that have been idle too long.
+
+        Args:
+            image_id: Current image ID; idle containers of other images are
+                removed too
+        """
+        now = time.monotonic()
+        with self._lock:
+            keep: list[_WarmContainer] = []
+            stale: list[_WarmContainer] = []
+            for warm in self._idle:
+                outdated = image_id is not None and warm.image_id != image_id
+                if outdated or now - warm.idle_since > self.idle_ttl:
+                    stale.append(warm)
+                else:
+                    keep.append(warm)
+            self._idle = keep
+
+        for warm in stale:
+            self._remove(warm)
+
+    def _acquire(self, timeout: float) -> _WarmContainer:
+        image_id = self.image_checker.ensure(self.image)
+        self.sweep(image_id)
+        now = time.monotonic()
+
+        stale: list[_WarmContainer] = []
+        with self._lock:
+            reusable = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if candidate.expires_at - now > timeout + 60:
+                    reusable = candidate
+                    break
+                stale.append(candidate)
+
+        for warm in stale:
+            self._remove(warm)
+
+        if reusable is not None:
+            try:
+                reusable.container.reload()
+                if reusable.container.status == "running":
+                    logger.debug(f"Reusing warm Blarify container {reusable.container.id}")
+                    return reusable
+            except NotFound:
+                pass
+
+        return self._start(image_id, timeout)
+
+    def _start(self, image_id: str, timeout: float) -> _WarmContainer:
+        lifetime = max(self.max_lifetime, timeout + 120)
+        name = f"codestory-blarify-pool-{uuid4().hex[:12]}"
+        container = self.client.containers.run(
+            image=image_id,
+            name=name,
+            entrypoint=["sleep", str(int(lifetime))],
+            volumes={self.mount_root: {"bind": WORK_DIR, "mode": "ro"}},
+            labels={POOL_LABEL: "1"},
+            detach=True,
+            remove=True,
+        )
+        logger.info(f"Started warm Blarify container {container.id} for {self.mount_root}")
+        return _WarmContainer(container, name, image_id, time.monotonic() + lifetime)
+
+    def _release(self, warm: _WarmContainer, healthy: bool) -> None:
+        if healthy:
+            try:
+                warm.container.rename(warm.name)
+            except DockerException as e:
+                logger.warning(f"Error renaming Blarify container {warm.container.id}: {e}")
+                healthy = False
+        if healthy:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    warm.idle_since = time.monotonic()
+                    self._idle.append(warm)
+                    return
+        self._remove(warm)
+
+    def _kill(self, warm: _WarmContainer) -> None:
+        logger.error(f"Blarify timed out or was cancelled, killing container {warm.container.id}")
+        try:
+            warm.container.kill()
+        except DockerException as e:
+            logger.warning(f"Error killing Blarify container: {e}")
+
+    def _remove(self, warm: _WarmContainer) -> None:
+        try:
+            warm.container.remove(force=True)
+        except NotFound:
+            pass
+        except DockerException as e:
+            logger.warning(f"Error removing Blarify container {warm.container.id}: {e}")
+
+
+class SubprocessRunner:
+    """Runs a Blarify CLI installed in the worker."""
+
+    def __init__(self, executable: str):
+        """Initialize the runner.
+
+        Args:
+            executable: Path of the Blarify executable
+        """
+        self.executable = executable
+
+    @classmethod
+    def find(cls) -> "SubprocessRunner | None":
+        """Create a runner if Blarify is installed in the worker.
+
+        Returns:
+            SubprocessRunner, or None if no Blarify executable is on the PATH
+        """
+        executable = shutil.which("blarify")
+        return cls(executable) if executable else None
+
+    def run(
+        self,
+        command: list[str],
+        timeout: float,
+        name: str | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Iterator[BlarifyEvent]:
+        """Run a Blarify command as a subprocess.
+
+        Args:
+            command: Command to execute; its first element is replaced by the
+                runner's executable
+            timeout: Seconds the command may run before it is killed
+            name: Unused; accepted for compatibility with ContainerPoolRunner
+            cancel: Event that kills the subprocess when set
+
+        Yields:
+            Events reported by Blarify, ending with an exit event
+        """
+        process = subprocess.Popen(
+            [self.executable, *command[1:]],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        watchdog = _Watchdog(timeout, process.kill, cancel)
+        watchdog.start()
+        try:
+            assert process.stdout is not None
+            yield from _events(process.stdout)
+            exit_code = process.wait()
+            watchdog.check()
+            yield BlarifyEvent(
+                type="exit", exit_code=exit_code, message=f"Blarify exited with code {exit_code}"
+            )
+        finally:
+            watchdog.stop()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+
+# Per-process Docker client, image checker and pools, created on first use
+_docker_client: docker.DockerClient | None = None
+_image_checker: ImageChecker | None = None
+_pools: dict[tuple[str, str], ContainerPoolRunner] = {}
+_registry_lock = threading.Lock()
+
+
+def get_container_pool(image: str, mount_root: str, **options: Any) -> ContainerPoolRunner:
+    """Get the worker's container pool for an image and mount root.
+
+    Args:
+        image: Blarify image reference
+        mount_root: Host directory mounted into the containers
+        **options: Pool options used when the pool is created
+            (image_check_ttl, max_idle, idle_ttl, max_lifetime)
+
+    Returns:
+        ContainerPoolRunner shared by all jobs of this worker process
+    """
+    global _docker_client, _image_checker
+    key = (image, os.path.abspath(mount_root))
+    with _registry_lock:
+        # Other pools only release idle containers when they are used, so
+        # sweep them here; pools for one-off repositories don't linger
+        for other in _pools.values():
+            other.sweep()
+        pool = _pools.get(key)
+        if pool is None:
+            if _docker_client is None:
+                _docker_client = docker.from_env()
+            if _image_checker is None:
+                _image_checker = ImageChecker(
+                    _docker_client, options.pop("image_check_ttl", DEFAULT_IMAGE_CHECK_TTL)
+                )
+            options.pop("image_check_ttl", None)
+            pool = ContainerPoolRunner(_docker_client, image, key[1], _image_checker, **options)
+            _pools[key] = pool
+        return pool
+
+
+def close_pools() -> None:
+    """Remove the idle containers of all pools in this process."""
+    with _registry_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,360 @@
+"""Sharded Blarify runs for very large repositories.
+
+A repository is partitioned into shards of at most a given number of source
+files. Directories are kept whole where they fit the budget and split into
+their subdirectories (and loose files) where they do not; the resulting units
+are packed into shards. Every shard is a Blarify run over the whole
+repository that ignores the units of the other shards, so node paths are the
+same as in an unsharded run.
+
+Shards run in parallel with bounded concurrency, sharing one time budget.
+Blarify cannot resolve references between shards, so cross-shard IMPORTS and
+CALLS edges are added afterwards by a resolution pass over the whole
+repository.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from typing import Any, Protocol
+
+from pydantic import BaseModel, Field
+
+from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory_filesystem.ignore import IgnoreMatcher
+
+from .runner import BlarifyEvent
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Source files per shard; repositories below the budget run unsharded
+DEFAULT_SHARD_MAX_FILES = 5000
+
+# Shards running at the same time
+DEFAULT_SHARD_CONCURRENCY = 4
+
+# Seconds to wait for aborted shards to be killed before giving up on them
+SHARD_KILL_TIMEOUT = 30.0
+
+
+class Shard(BaseModel):
+    """A part of a repository processed by one Blarify run."""
+
+    name: str
+    roots: list[str] = Field(default_factory=list)
+    file_count: int = 0
+    exclude: list[str] = Field(default_factory=list)
+
+
+class BlarifyRunner(Protocol):
+    """Interface shared by the Blarify runners."""
+
+    def run(
+        self,
+        command: list[str],
+        timeout: float,
+        name: str | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Iterator[BlarifyEvent]:
+        """Run a Blarify command, yielding its events."""
+        ...
+
+
+def _count_files(repository_path: str, matcher: IgnoreMatcher) -> dict[str, Any]:
+    """Count the files below each directory of a repository.
+
+    Returns:
+        Tree of ``{"count": int, "files": [names], "dirs": {name: subtree}}``
+    """
+    tree: dict[str, Any] = {"count": 0, "files": [], "dirs": {}}
+    nodes = {"": tree}
+
+    for root, dirs, names in os.walk(repository_path):
+        rel_root = os.path.relpath(root, repository_path).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root
+        prefix = f"{rel_root}/" if rel_root else ""
+        node = nodes[rel_root]
+
+        # Prune ignored directories instead of walking them
+        dirs[:] = sorted(d for d in dirs if not matcher.match_entry(rel_root, d, is_dir=True))
+        for d in dirs:
+            child = {"count": 0, "files": [], "dirs": {}}
+            node["dirs"][d] = child
+            nodes[f"{prefix}{d}"] = child
+        node["files"] = sorted(n for n in names if not matcher.match_entry(rel_root, n))
+
+    def total(node: dict[str, Any]) -> int:
+        node["count"] = len(node["files"]) + sum(map(total, node["dirs"].values()))
+        return int(node["count"])
+
+    total(tree)
+    return tree
+
+
+def _loose_file_patterns(prefix: str, files: list[str], dirs: list[str]) -> list[str]:
+    """Build the patterns excluding the loose files of one directory.
+
+    Files are excluded by extension (``/dir/*.py``) so the Blarify command
+    line does not grow with the number of files. Extensions that are shared
+    by a subdirectory's name, and files without one, are listed one by one.
+
+    Args:
+        prefix: Repository-relative path of the directory with a trailing
+            ``/``, or an empty string for the root
+        files: Names of the loose files
+        dirs: Names of the directory's subdirectories
+
+    Returns:
+        Root-anchored gitignore-style patterns
+    """
+    by_extension: dict[str, list[str]] = {}
+    for name in files:
+        stem, dot, extension = name.lstrip(".").rpartition(".")
+        by_extension.setdefault(extension if dot and stem else "", []).append(name)
+
+    patterns = []
+    for extension, names in by_extension.items():
+        wildcard = f"*.{extension}"
+        if extension and len(names) > 1 and not any(fnmatch(d, wildcard) for d in dirs):
+            patterns.append(f"/{prefix}{wildcard}")
+        else:
+            patterns.extend(f"/{prefix}{name}" for name in names)
+    return patterns
+
+
+def plan_shards(
+    repository_path: str,
+    ignore_patterns: list[str] | None = None,
+    max_files: int = DEFAULT_SHARD_MAX_FILES,
+    matcher: IgnoreMatcher | None = None,
+) -> list[Shard]:
+    """Partition a repository into shards of at most ``max_files`` files.
+
+    Directories larger than the budget are split into their subdirectories;
+    their loose files form one unit per directory, excluded from the other
+    shards by extension. Units are packed into
+    shards largest first, so top-level packages stay together when they fit.
+    A single directory level with more loose files than the budget ends up
+    as one oversized shard.
+
+    Args:
+        repository_path: Path to the repository
+        ignore_patterns: Additional gitignore-style patterns to skip
+        max_files: File budget per shard
+        matcher: Ignore matcher of the repository, built from
+            ``ignore_patterns`` if not given; the walk reads the repository's
+            nested .gitignore files into it
+
+    Returns:
+        Shards covering the repository; one shard without exclusions if the
+        repository fits the budget
+    """
+    tree = _count_files(repository_path, matcher or IgnoreMatcher(repository_path, ignore_patterns))
+    if tree["count"] <= max_files:
+        return [Shard(name="shard-0", roots=[""], file_count=tree["count"])]
+
+    # Units: (file count, root paths, exclusion patterns)
+    units: list[tuple[int, list[str], list[str]]] = []
+
+    def split(node: dict[str, Any], path: str) -> None:
+        prefix = f"{path}/" if path else ""
+        if node["files"]:
+            files = [f"{prefix}{name}" for name in node["files"]]
+            patterns = _loose_file_patterns(prefix, node["files"], list(node["dirs"]))
+            units.append((len(files), files, patterns))
+        for name, child in node["dirs"].items():
+            child_path = f"{prefix}{name}"
+            if child["count"] == 0:
+                continue
+            if child["count"] <= max_files:
+                units.append((child["count"], [child_path], [f"/{child_path}/"]))
+            else:
+                split(child, child_path)
+
+    split(tree, "")
+
+    # First-fit decreasing packing
+    bins: list[list[tuple[int, list[str], list[str]]]] = []
+    loads: list[int] = []
+    for unit in sorted(units, key=lambda u: -u[0]):
+        for i, load in enumerate(loads):
+            if load + unit[0] <= max_files:
+                bins[i].append(unit)
+                loads[i] += unit[0]
+                break
+        else:
+            bins.append([unit])
+            loads.append(unit[0])
+
+    shards = []
+    for i, members in enumerate(bins):
+        others = [pattern for j, b in enumerate(bins) if j != i for u in b for pattern in u[2]]
+        shards.append(
+            Shard(
+                name=f"shard-{i}",
+                roots=[root for u in members for root in u[1]],
+                file_count=loads[i],
+                exclude=others,
+            )
+        )
+    return shards
+
+
+def shard_lookup(shards: list[Shard]) -> Callable[[str], int | None]:
+    """Build a function mapping a repository-relative path to its shard index.
+
+    Args:
+        shards: Shards of the repository
+
+    Returns:
+        Function returning the index of the shard containing a path, or None
+    """
+    roots = {root: i for i, shard in enumerate(shards) for root in shard.roots}
+
+    def lookup(path: str) -> int | None:
+        if "" in roots:
+            return roots[""]
+        candidate = path
+        while candidate:
+            if candidate in roots:
+                return roots[candidate]
+            candidate = candidate.rpartition("/")[0]
+        return None
+
+    return lookup
+
+
+def run_shards(
+    runner: BlarifyRunner,
+    commands: list[list[str]],
+    timeout: float,
+    max_concurrency: int = DEFAULT_SHARD_CONCURRENCY,
+    name_prefix: str | None = None,
+) -> Iterator[tuple[int, BlarifyEvent]]:
+    """Run Blarify commands in parallel with bounded concurrency.
+
+    Events are yielded in the calling thread as the shards produce them.
+    Every shard ends with an ``exit`` event; a shard that raised (for
+    example on timeout) reports an ``error`` event and exit code -1.
+
+    The shards share the time budget: each one may run until the budget of
+    the whole run is spent, so shards started late get the time that is
+    left. If the caller stops iterating early, or the budget runs out, shards
+    that are still running are killed before this returns.
+
+    Args:
+        runner: Runner executing the commands
+        commands: Command per shard
+        timeout: Seconds all shards may take together
+        max_concurrency: Shards running at the same time
+        name_prefix: Prefix of the container name of each shard's run
+
+    Yields:
+        (shard index, event) tuples
+    """
+    events: queue.Queue[tuple[int, BlarifyEvent]] = queue.Queue()
+    cancelled = threading.Event()
+    deadline = time.monotonic() + timeout
+
+    def run(index: int) -> None:
+        name = name_prefix
+        if name_prefix and len(commands) > 1:
+            name = f"{name_prefix}-{index}"
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No time left of the {timeout} second budget")
+            for event in runner.run(commands[index], remaining, name=name, cancel=cancelled):
+                if cancelled.is_set():
+                    return
+                events.put((index, event))
+        except Exception as e:
+            events.put((index, BlarifyEvent(type="error", message=f"{type(e).__name__}: {e}")))
+            events.put((index, BlarifyEvent(type="exit", exit_code=-1, message=str(e))))
+
+    executor = ThreadPoolExecutor(max(1, max_concurrency), thread_name_prefix="blarify-shard")
+    futures = [executor.submit(run, i) for i in range(len(commands))]
+    try:
+        finished = 0
+        while finished < len(commands):
+            try:
+                index, event = events.get(timeout=1.0)
+            except queue.Empty:
+                if all(f.done() for f in futures) and events.empty():
+                    break
+                continue
+            if event.type == "exit":
+                finished += 1
+            yield index, event
+    finally:
+        # Kill the shards that are still running; the runners' watchdogs
+        # see the event and kill their process or container
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        started = [f for f in futures if not f.cancelled()]
+        _, running = wait(started, timeout=SHARD_KILL_TIMEOUT)
+        if running:
+            logger.warning(f"{len(running)} Blarify shard(s) did not stop after being killed")
+
+
+def stitch_cross_shard_edges(
+    connector: Neo4jConnector,
+    repository_path: str,
+    shards: list[Shard],
+    ignore_patterns: list[str] | None = None,
+    max_workers: int | None = None,
+) -> dict[str, int]:
+    """Add the IMPORTS and CALLS edges between shards that Blarify could not see.
+
+    The repository is parsed with the in-process AST extractors and
+    references are resolved across all files; only edges whose ends lie in
+    different shards are written.
+
+    Args:
+        connector: Neo4j connector
+        repository_path: Path to the repository
+        shards: Shards the repository was processed in
+        ignore_patterns: Additional gitignore-style patterns to skip
+        max_workers: Parser processes (default: CPU count)
+
+    Returns:
+        Number of cross-shard edges created per relationship type
+    """
+    from codestory_ast.graph import CodeGraph, GraphWriter
+    from codestory_ast.step import extract_file, find_source_files, parallel_map
+
+    files = find_source_files(repository_path, ignore_patterns)
+    tasks = [(repository_path, path) for path in files]
+    results = [
+        result
+        for _, result, _ in parallel_map(extract_file, tasks, max_workers or os.cpu_count() or 1)
+        if result is not None
+    ]
+    graph = CodeGraph(results)
+    shard_of = shard_lookup(shards)
+
+    def crosses(source_path: str | None, target_path: str | None) -> bool:
+        if source_path is None or target_path is None:
+            return False
+        return shard_of(source_path) != shard_of(target_path)
+
+    imports = [row for row in graph.imports() if crosses(row["source"], row["target"])]
+    calls = [
+        row
+        for row in graph.calls()
+        if crosses(graph.paths.get(row["source"]), graph.paths.get(row["target"]))
+    ]
+
+    writer = GraphWriter(connector)
+    counts = {
+        "imports": writer.write_relationships("File", "IMPORTS", "File", imports),
+        "calls": writer.write_relationships("Function", "CALLS", "Function", calls),
+    }
+    logger.info(f"Stitched cross-shard edges: {counts}")
+    return counts
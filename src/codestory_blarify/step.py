@@ -7,6 +7,7 @@ and store AST and symbol bindings in Neo4j.
 import logging
 import os
 import time
+from contextlib import closing
 from typing import Any
 from uuid import uuid4
 
@@ -14,27 +15,55 @@ import docker
 from celery import current_app, shared_task
 from celery.app.control import Control
 from celery.result import AsyncResult
+from celery.signals import worker_process_shutdown
 from docker.errors import DockerException
 
 from codestory.config.settings import get_settings
 from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory.ingestion_pipeline.progress import create_reporter
 from codestory.ingestion_pipeline.step import PipelineStep, StepStatus
+from codestory_filesystem.ignore import IgnoreMatcher
+
+from .runner import (
+    DEFAULT_IDLE_TTL,
+    DEFAULT_IMAGE_CHECK_TTL,
+    DEFAULT_MAX_IDLE,
+    ContainerPoolRunner,
+    SubprocessRunner,
+    blarify_command,
+    close_pools,
+    get_container_pool,
+)
+from .sharding import (
+    DEFAULT_SHARD_CONCURRENCY,
+    DEFAULT_SHARD_MAX_FILES,
+    plan_shards,
+    run_shards,
+    stitch_cross_shard_edges,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Remove the worker's warm containers when it shuts down
+worker_process_shutdown.connect(lambda **kwargs: close_pools(), weak=False)
+
 # Default configuration
 DEFAULT_IMAGE = "blarapp/blarify:latest"
 DEFAULT_TIMEOUT = 3600  # 1 hour
 DEFAULT_CONTAINER_NAME_PREFIX = "codestory-blarify-"
-WORK_DIR = "/workspace"
+
+# Share of the step timeout left to the cross-shard stitching pass when a
+# repository is sharded; the shards get the rest
+STITCH_TIME_FRACTION = 0.2
 
 
 class BlarifyStep(PipelineStep):
     """Workflow step that runs Blarify to parse code and store AST in Neo4j.
 
-    This step runs the Blarify tool in a Docker container to analyze the code
-    structure and store the results directly in the Neo4j database.
+    This step runs the Blarify tool to analyze the code structure and store the
+    results directly in the Neo4j database. Blarify runs in the worker if it is
+    installed there, otherwise in a warm, reused Docker container.
     """
 
     def __init__(self, docker_image: str | None = None, timeout: int | None = None):
@@ -68,6 +97,15 @@ class BlarifyStep(PipelineStep):
                 - ignore_patterns: List of patterns to ignore
                 - docker_image: Override the default Docker image
                 - timeout: Override the default timeout
+                - runner: "auto" (default), "subprocess" or "container"
+                - mount_root: Host directory mounted into warm containers,
+                  shared by all repositories below it (default: the repository)
+                - image_check_ttl: Seconds between registry checks of the image
+                - pool_max_idle: Idle warm containers kept per mount root
+                - pool_idle_ttl: Seconds an idle warm container is kept
+                - shard_max_files: Source files per shard; larger repositories
+                  are split into shards that run in parallel
+                - shard_concurrency: Shards running at the same time
 
         Returns:
             str: Job ID that can be used to check the status
@@ -306,12 +344,14 @@ class BlarifyStep(PipelineStep):
         container_stopped = False
         if self.docker_client:
             try:
+                # Sharded runs use one container per shard
                 for container in self.docker_client.containers.list():
-                    if container.name == container_name:
+                    if container.name == container_name or container.name.startswith(
+                        f"{container_name}-"
+                    ):
                         container.stop(timeout=10)
-                        logger.info(f"Container {container_name} stopped")
+                        logger.info(f"Container {container.name} stopped")
                         container_stopped = True
-                        break
             except DockerException as e:
                 logger.warning(f"Failed to stop container {container_name}: {e}")
 
@@ -475,211 +515,136 @@ def run_blarify(  # type: ignore[no-untyped-def]
         # Use the configured host directly
         neo4j_connection = f"neo4j://{neo4j_username}:{neo4j_password}@{host}/{neo4j_database}"
 
-    try:
-        # Try to use Docker directly
-        client = docker.from_env()
+    # Progress is coalesced, so it can be reported for every shard event
+    reporter = create_reporter(job_id, "blarify", task=self)
 
+    try:
         # Make sure the repository path exists
         if not os.path.isdir(repository_path):
             raise ValueError(f"Repository path is not a valid directory: {repository_path}")
 
-        # Check if we're running inside Docker and modify paths accordingly
-        container_repository_path = repository_path
-        if os.environ.get("CODESTORY_IN_CONTAINER", "false").lower() == "true":
-            # We're inside a container, map host path to container path if needed
-            if repository_path.startswith("/repositories/"):
-                # Already container path, use as is
-                pass
-            else:
-                # Try to map host path to container path
-                for host_path, container_path in os.environ.get(  # type: ignore[misc]
-                    "CODESTORY_MOUNT_MAPPINGS", ""
-                ).split(";"):
-                    if host_path and container_path and repository_path.startswith(host_path):  # type: ignore[has-type]
-                        container_repository_path = repository_path.replace(
-                            host_path, container_path, 1  # type: ignore[has-type]
-                        )
-                        logger.info(
-                            f"Mapped repository path from {repository_path} to "
-                            f"{container_repository_path}"
-                        )
-                        break
-
-        # Container name for easier identification
-        container_name = f"{DEFAULT_CONTAINER_NAME_PREFIX}{job_id}"
-
-        # Check if the repository path is already mounted in any running container
-        try:
-            running_containers = client.containers.list()
-            for container in running_containers:
-                if container.name == "codestory-worker" or container.name == "codestory-service":
-                    logger.info(f"Found existing container: {container.name}")
-                    # Check if the repository is mounted in this container
-                    container_info = container.attrs
-                    for mount in container_info.get("Mounts", []):
-                        if mount["Type"] == "bind" and mount["Source"] == repository_path:
-                            # Repository is already mounted, use the container path
-                            container_repository_path = mount["Destination"]
-                            logger.info(
-                                f"Found existing mount: {repository_path} -> "
-                                f"{container_repository_path}"
-                            )
-                            break
-        except Exception as e:
-            logger.warning(f"Error checking existing containers: {e}")
-
-        # Update status
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 10.0,
-                "message": "Pulling Blarify Docker image...",
-            },
-        )
-
-        # Pull the Docker image
-        try:
-            client.images.pull(docker_image)
-            logger.info(f"Pulled Docker image: {docker_image}")
-        except DockerException as e:
-            logger.warning(f"Failed to pull Docker image: {e}. Assuming it exists locally.")
-
-        # Update status
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 20.0,
-                "message": "Starting Blarify container...",
-            },
-        )
-
-        # Prepare command arguments
-        blarify_cmd = ["blarify", "parse", WORK_DIR]
-
-        # Add ignore patterns
-        for pattern in ignore_patterns:
-            blarify_cmd.extend(["--ignore", pattern])
-
-        # Add incremental flag if needed
-        if incremental:
-            blarify_cmd.append("--incremental")
-
-        # Add output destination (Neo4j)
-        blarify_cmd.extend(["--output", neo4j_connection])
-
-        # Prepare volume mapping
-        volumes = {repository_path: {"bind": WORK_DIR, "mode": "ro"}}
-        logger.info(f"Using volume mapping: {repository_path} -> {WORK_DIR}")
-
-        # Run the container
-        container = client.containers.run(
-            image=docker_image,
-            name=container_name,
-            command=blarify_cmd,
-            volumes=volumes,
-            detach=True,
-            remove=True,
+        reporter.report(10.0, "Preparing Blarify runner...")
+
+        # Run Blarify in the worker if it is installed there, otherwise in a
+        # warm container that mounts the repository (or a configured root)
+        runner_mode = config.get("runner", "auto")
+        runner: SubprocessRunner | ContainerPoolRunner | None = None
+        if runner_mode in ("auto", "subprocess"):
+            runner = SubprocessRunner.find()
+            if runner is None and runner_mode == "subprocess":
+                raise RuntimeError("Blarify executable not found for subprocess runner")
+
+        if runner is not None:
+            target = repository_path
+            connection = f"neo4j://{neo4j_username}:{neo4j_password}@{host}/{neo4j_database}"
+            logger.info(f"Running Blarify in the worker: {runner.executable}")
+        else:
+            runner = get_container_pool(
+                docker_image,
+                config.get("mount_root") or repository_path,
+                image_check_ttl=config.get("image_check_ttl", DEFAULT_IMAGE_CHECK_TTL),
+                max_idle=config.get("pool_max_idle", DEFAULT_MAX_IDLE),
+                idle_ttl=config.get("pool_idle_ttl", DEFAULT_IDLE_TTL),
+            )
+            target = runner.container_path(repository_path)
+            connection = neo4j_connection
+            logger.info(f"Running Blarify in a warm {docker_image} container")
+
+        # Large repositories are split into shards that run in parallel. The
+        # planning walk reads the nested .gitignore files into the matcher, so
+        # Blarify is given the same root-anchored rules as the other steps
+        matcher = IgnoreMatcher(repository_path, ignore_patterns)
+        shards = plan_shards(
+            repository_path,
+            ignore_patterns,
+            max_files=config.get("shard_max_files", DEFAULT_SHARD_MAX_FILES),
+            matcher=matcher,
         )
-
-        logger.info(f"Started Blarify container: {container.id}")
-
-        # Monitor container progress with improved timeout handling
-        last_log_time = time.time()
-        log_interval = 5  # seconds
-
-        # Initialize progress at 20%
-        progress = 20.0
-        last_activity_time = time.time()
-        max_inactivity = 300  # Maximum inactivity before considering timeout (5 minutes)
-
-        # Stream logs and track progress
-        for log_line in container.logs(stream=True, follow=True):
-            try:
-                log_line = log_line.decode("utf-8").strip()
-
-                # Reset inactivity timer on any log output
-                last_activity_time = time.time()
-
-                # Extract progress information if available
-                if "Progress:" in log_line:
-                    try:
-                        progress_str = log_line.split("Progress:")[1].strip().split("%")[0]
-                        parsed_progress = float(progress_str)
-                        # Scale progress from 20% to 90%
-                        progress = 20.0 + (parsed_progress * 0.7)
-                    except (ValueError, IndexError):
-                        # If parsing fails, increment progress slightly
-                        progress = min(progress + 0.5, 90.0)
-                elif "Error:" in log_line:
-                    logger.error(f"Blarify error: {log_line}")
-
-                # Update progress at regular intervals
-                current_time = time.time()
-                if current_time - last_log_time > log_interval:
-                    last_log_time = current_time
-                    self.update_state(
-                        state="PROGRESS",
-                        meta={
-                            "progress": progress,
-                            "message": f"Processing repository with Blarify... ({progress:.1f}%)",
-                        },
-                    )
-                    logger.debug(f"Blarify progress: {progress:.1f}%")
-
-                # Check for inactivity timeout
-                if current_time - last_activity_time > max_inactivity:
-                    logger.error(
-                        f"Blarify process timed out due to inactivity after "
-                        f"{max_inactivity} seconds"
-                    )
-                    # Attempt to stop the container gracefully
-                    try:
-                        container.stop(timeout=10)
-                        logger.info(
-                            f"Stopped container {container.id} due to inactivity timeout"
+        ignore_arguments = matcher.patterns()
+        commands = [
+            blarify_command(target, connection, ignore_arguments + shard.exclude, incremental)
+            for shard in shards
+        ]
+        total_files = sum(shard.file_count for shard in shards) or 1
+        if len(shards) > 1:
+            largest = max(shard.file_count for shard in shards)
+            logger.info(f"Running Blarify in {len(shards)} shards of up to {largest} files")
+
+        reporter.report(20.0, f"Running Blarify ({len(shards)} shard(s))...")
+
+        # The shards share the step's time limit, less the time kept for
+        # stitching, so they are killed before the task's soft limit hits
+        shard_budget = timeout
+        if len(shards) > 1:
+            shard_budget = timeout * (1 - STITCH_TIME_FRACTION)
+        shard_budget -= time.time() - start_time
+
+        # Blarify's progress, weighted by the size of each shard, is scaled
+        # from 20% to 90%
+        shard_progress = [0.0] * len(shards)
+        exit_codes: dict[int, int] = {}
+        recent_output: list[str] = []
+        # Closing the generator kills the shards still running if the task
+        # is interrupted, for example by its soft time limit
+        with closing(
+            run_shards(
+                runner,
+                commands,
+                shard_budget,
+                max_concurrency=config.get("shard_concurrency", DEFAULT_SHARD_CONCURRENCY),
+                name_prefix=f"{DEFAULT_CONTAINER_NAME_PREFIX}{job_id}",
+            )
+        ) as shard_events:
+            for index, event in shard_events:
+                if event.type == "exit":
+                    exit_codes[index] = event.exit_code if event.exit_code is not None else -1
+                    if exit_codes[index] == 0:
+                        shard_progress[index] = 100.0
+                else:
+                    if event.message:
+                        prefix = f"[{shards[index].name}] " if len(shards) > 1 else ""
+                        recent_output = [*recent_output[-9:], f"{prefix}{event.message}"]
+                    if event.type == "error":
+                        logger.error(f"Blarify error in {shards[index].name}: {event.message}")
+                    elif event.type == "progress" and event.progress is not None:
+                        shard_progress[index] = max(
+                            shard_progress[index], min(event.progress, 100.0)
                         )
-                    except Exception as e:
-                        logger.warning(f"Error stopping container: {e}")
-
-                    raise TimeoutError(
-                        f"Blarify process timed out due to inactivity after "
-                        f"{max_inactivity} seconds"
-                    )
-            except Exception as e:
-                logger.warning(f"Error processing log line: {e}")
-                # Don't break the loop for parsing errors
-                if not isinstance(e, ValueError | IndexError):
-                    # Break if it's a more serious error like a timeout
-                    break
-
-        # Wait for container to finish
-        result = container.wait(timeout=timeout)
-        exit_code = result.get("StatusCode", -1)
-
-        if exit_code != 0:
-            error_msg = f"Blarify container exited with code {exit_code}"
-            logger.error(error_msg)
 
-            # Try to get error from logs
-            try:
-                logs = container.logs(tail=100).decode("utf-8")
-                error_details = "\n".join(logs.splitlines()[-10:])
-                error_msg += f"\nLast log lines:\n{error_details}"
-            except Exception:
-                pass
+                done = sum(
+                    p * shard.file_count for p, shard in zip(shard_progress, shards, strict=True)
+                )
+                progress = 20.0 + 0.7 * done / total_files
+                reporter.report(
+                    progress,
+                    (
+                        f"Processing repository with Blarify... ({progress:.1f}%, "
+                        f"{len(exit_codes)}/{len(shards)} shards done)"
+                    ),
+                    shards=len(shards),
+                    shards_done=len(exit_codes),
+                )
 
+        failed = {
+            shards[i].name: exit_codes.get(i, -1)
+            for i in range(len(shards))
+            if exit_codes.get(i, -1) != 0
+        }
+        if failed:
+            if len(shards) > 1:
+                error_msg = f"Blarify failed in shards: {failed}"
+            else:
+                error_msg = f"Blarify exited with code {failed['shard-0']}"
+            logger.error(error_msg)
+            if recent_output:
+                error_msg += "\nLast log lines:\n" + "\n".join(recent_output)
             raise RuntimeError(error_msg)
 
         # Verify results in Neo4j
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 95.0,
-                "message": "Verifying results in Neo4j...",
-            },
-        )
+        reporter.report(95.0, "Verifying results in Neo4j...")
 
         # Connect to Neo4j and verify data
+        connector: Neo4jConnector | None = None
         try:
             # Try localhost first if in Docker container
             if ":" not in host and not host.startswith(("localhost", "127.0.0.1")):
@@ -724,6 +689,15 @@ def run_blarify(  # type: ignore[no-untyped-def]
             logger.warning(f"Error connecting to Neo4j for verification: {e}")
             ast_count = 0  # Unable to verify, assume 0
 
+        # Blarify cannot see references between shards; resolve them over the
+        # whole repository and add the missing edges
+        stitched: dict[str, int] = {}
+        if len(shards) > 1:
+            reporter.report(97.0, "Stitching cross-shard edges...")
+            if connector is None:
+                raise RuntimeError("Cannot stitch cross-shard edges without a Neo4j connection")
+            stitched = stitch_cross_shard_edges(connector, repository_path, shards, ignore_patterns)
+
         # Calculate final stats
         end_time = time.time()
         duration = end_time - start_time
@@ -736,6 +710,8 @@ def run_blarify(  # type: ignore[no-untyped-def]
             "end_time": end_time,
             "duration": duration,
             "nodes_processed": ast_count,
+            "shards": len(shards),
+            "cross_shard_edges": stitched,
             "progress": 100.0,  # Mark as completed
             "status": StepStatus.COMPLETED,
             "message": (
@@ -745,10 +721,12 @@ def run_blarify(  # type: ignore[no-untyped-def]
         }
 
         logger.info(f"Blarify task completed: {result['message']}")
+        reporter.report(100.0, result["message"], StepStatus.COMPLETED)
 
         return result  # type: ignore[no-any-return]
-    except (docker.errors.DockerException, TimeoutError) as e:
+    except (DockerException, TimeoutError) as e:
         logger.error(f"Docker error: {e}")
+        reporter.report(None, f"Docker error: {e!s}", StepStatus.FAILED)
         # Return error result
         end_time = time.time()
         duration = end_time - start_time
@@ -765,6 +743,7 @@ def run_blarify(  # type: ignore[no-untyped-def]
         }
     except Exception as e:
         logger.exception(f"Error in Blarify task: {e}")
+        reporter.report(None, str(e), StepStatus.FAILED)
 
         # Return error result
         end_time = time.time()
@@ -9,9 +9,9 @@ documentation within code files.
 
 import logging
 import os
-import re
 
 from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory_filesystem.ignore import IgnoreMatcher
 
 from .models import DocumentationFile, DocumentType
 
@@ -67,57 +67,26 @@ class DocumentFinder:
         """Find documentation files in the repository.
 
         Args:
-            ignore_patterns: Optional list of patterns to ignore
+            ignore_patterns: Optional gitignore-style patterns to ignore
 
         Returns:
             List of DocumentationFile objects
         """
-        ignore_patterns = ignore_patterns or []
-        ignore_regex = self._compile_ignore_patterns(ignore_patterns)
+        # The ignore rules of the filesystem step, including .gitignore files
+        matcher = IgnoreMatcher(self.repository_path, ignore_patterns)
 
         doc_files: list[Any] = []
-        doc_files.extend(self._find_standalone_docs(ignore_regex))
-        doc_files.extend(self._find_code_docstrings(ignore_regex))
+        doc_files.extend(self._find_standalone_docs(matcher))
+        doc_files.extend(self._find_code_docstrings(matcher))
 
         logger.info(f"Found {len(doc_files)} documentation files in repository")
         return doc_files
 
-    def _compile_ignore_patterns(self, patterns: list[str]) -> list[re.Pattern[str]]:
-        """Compile ignore patterns into regular expressions.
-
-        Args:
-            patterns: List of glob patterns to ignore
-
-        Returns:
-            List of compiled regular expressions
-        """
-        result: list[Any] = []
-        for pattern in patterns:
-            # Convert glob pattern to regex
-            regex = pattern.replace(".", r"\.").replace("*", ".*").replace("?", ".")
-            try:
-                result.append(re.compile(regex))
-            except re.error:
-                logger.warning(f"Invalid ignore pattern: {pattern}")
-        return result
-
-    def _should_ignore(self, path: str, ignore_patterns: list[re.Pattern[str]]) -> bool:
-        """Check if a path should be ignored.
-
-        Args:
-            path: Path to check
-            ignore_patterns: List of patterns to ignore
-
-        Returns:
-            True if the path should be ignored, False otherwise
-        """
-        return any(pattern.search(path) for pattern in ignore_patterns)
-
-    def _find_standalone_docs(self, ignore_patterns: list[re.Pattern[str]]) -> list[DocumentationFile]:
+    def _find_standalone_docs(self, matcher: IgnoreMatcher) -> list[DocumentationFile]:
         """Find standalone documentation files (Markdown, RST, etc.).
 
         Args:
-            ignore_patterns: List of patterns to ignore
+            matcher: Ignore matcher of the repository
 
         Returns:
             List of DocumentationFile objects
@@ -139,7 +108,7 @@ class DocumentFinder:
             file_id = str(file_data["id"])
 
             # Skip ignored files
-            if self._should_ignore(file_path, ignore_patterns):
+            if matcher.is_ignored(file_path):
                 continue
 
             # Check if the file is a documentation file by extension
@@ -187,11 +156,11 @@ class DocumentFinder:
 
         return result
 
-    def _find_code_docstrings(self, ignore_patterns: list[re.Pattern[str]]) -> list[DocumentationFile]:
+    def _find_code_docstrings(self, matcher: IgnoreMatcher) -> list[DocumentationFile]:
         """Find documentation within code files (docstrings, comments).
 
         Args:
-            ignore_patterns: List of patterns to ignore
+            matcher: Ignore matcher of the repository
 
         Returns:
             List of DocumentationFile objects
@@ -213,7 +182,7 @@ class DocumentFinder:
             file_id = str(file_data["id"])
 
             # Skip ignored files
-            if self._should_ignore(file_path, ignore_patterns):
+            if matcher.is_ignored(file_path):
                 continue
 
             # Check if there are docstrings in the file
@@ -19,6 +19,7 @@ from .models import (
     DocumentationRelationship,
     RelationType,
 )
+from .utils.content_analyzer import ContentAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +69,32 @@ class KnowledgeGraph:
         for relationship in relationships:
             self.graph.add_relationship(relationship)
 
+    def extract_purposes(self, analyzer: ContentAnalyzer) -> int:
+        """Extract the purposes of the function, class and module descriptions.
+
+        Purposes are extracted for all entities at once, in deduplicated,
+        batched and cached LLM requests, and stored in the entities'
+        ``purpose`` metadata.
+
+        Args:
+            analyzer: Content analyzer with a purpose engine
+
+        Returns:
+            Number of entities a purpose was found for
+        """
+        entities = list(self.graph.entities.values())
+        analyses = analyzer.analyze_entities(entities)
+
+        count = 0
+        for entity in entities:
+            purpose = analyses.get(entity.id, {}).get("purpose")
+            if purpose:
+                entity.metadata["purpose"] = purpose
+                count += 1
+
+        logger.info(f"Extracted purposes for {count} documentation entities")
+        return count
+
     def link_to_code_entities(self) -> None:
         """Link documentation entities to code entities.
 
@@ -159,6 +186,7 @@ class KnowledgeGraph:
                 file_path: $file_path,
                 source_text: $source_text,
                 line_number: $line_number,
+                purpose: $purpose,
                 metadata: $metadata
             })
             WITH e
@@ -182,6 +210,7 @@ class KnowledgeGraph:
                     "file_path": entity.file_path,
                     "source_text": entity.source_text[:1000],  # Limit length
                     "line_number": entity.line_number,
+                    "purpose": entity.metadata.get("purpose"),
                     "metadata": metadata,
                 },
                 fetch_one=True,
@@ -14,11 +14,13 @@ from celery import shared_task
 
 from codestory.config.settings import get_settings
 from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory.ingestion_pipeline.progress import create_reporter
 from codestory.ingestion_pipeline.step import PipelineStep, StepStatus
 
 from .document_finder import DocumentFinder
 from .knowledge_graph import KnowledgeGraph
 from .parsers import get_parser_for_file
+from .utils.content_analyzer import ContentAnalyzer
 from .utils.progress_tracker import ProgressTracker
 
 # Set up logging
@@ -45,6 +47,9 @@ class DocumentationGrapherStep(PipelineStep):
             **config: Additional configuration parameters
                 - ignore_patterns: List of patterns to ignore
                 - use_llm: Whether to use LLM for advanced analysis
+                - purpose_cache_path: Path of the SQLite cache of extracted
+                  purposes (default: ``$CODESTORY_DOCGRAPHER_CACHE`` or a file
+                  under ``~/.cache/codestory``)
 
         Returns:
             str: Job ID that can be used to check the status
@@ -293,16 +298,14 @@ def run_docgrapher(  # type: ignore[no-untyped-def]
         password=settings.neo4j.password.get_secret_value(),
         database=settings.neo4j.database,
     )
+    analyzer: ContentAnalyzer | None = None
+
+    # Progress is published to the job's stream as well as the task state
+    reporter = create_reporter(job_id, "docgrapher", task=self)
 
     try:
         # Notify of progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 0.0,
-                "message": "Finding documentation files...",
-            },
-        )
+        reporter.report(0.0, "Finding documentation files...")
 
         # Find documentation files
         document_finder = DocumentFinder(connector, repository_path)
@@ -316,13 +319,7 @@ def run_docgrapher(  # type: ignore[no-untyped-def]
         tracker.set_total_documents(len(doc_files))
 
         # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 5.0,
-                "message": f"Found {len(doc_files)} documentation files to process",
-            },
-        )
+        reporter.report(5.0, f"Found {len(doc_files)} documentation files to process")
 
         # Process each documentation file
         for doc_file in doc_files:
@@ -346,34 +343,28 @@ def run_docgrapher(  # type: ignore[no-untyped-def]
             # Update progress
             if tracker.should_update():
                 progress_message = tracker.update_progress()
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "progress": tracker.get_progress(),
-                        "message": progress_message,
-                    },
+                reporter.report(tracker.get_progress(), progress_message)
+
+        # Extract entity purposes in batched, cached LLM requests
+        purposes_extracted = 0
+        if use_llm and knowledge_graph.graph.entities:
+            reporter.report(70.0, "Extracting documentation purposes...")
+            try:
+                analyzer = ContentAnalyzer(
+                    use_llm=True, purpose_cache_path=config.get("purpose_cache_path")
                 )
+                purposes_extracted = knowledge_graph.extract_purposes(analyzer)
+            except Exception as e:
+                logger.warning(f"Skipping purpose extraction: {e}")
 
         # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 75.0,
-                "message": "Linking documentation to code entities...",
-            },
-        )
+        reporter.report(75.0, "Linking documentation to code entities...")
 
         # Link documentation to code entities
         knowledge_graph.link_to_code_entities()
 
         # Update progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 90.0,
-                "message": "Storing documentation graph in Neo4j...",
-            },
-        )
+        reporter.report(90.0, "Storing documentation graph in Neo4j...")
 
         # Store graph in Neo4j
         knowledge_graph.store_in_neo4j()
@@ -393,6 +384,7 @@ def run_docgrapher(  # type: ignore[no-untyped-def]
             "documents_processed": stats["documents"],
             "entities_processed": stats["entities"],
             "relationships_processed": stats["relationships"],
+            "purposes_extracted": purposes_extracted,
             "progress": 100.0,  # Mark as completed
             "status": StepStatus.COMPLETED,
             "message": (
@@ -404,10 +396,12 @@ def run_docgrapher(  # type: ignore[no-untyped-def]
         }
 
         logger.info(f"DocumentationGrapher task completed: {result['message']}")
+        reporter.report(100.0, result["message"], StepStatus.COMPLETED)
 
         return result
     except Exception as e:
         logger.exception(f"Error in DocumentationGrapher task: {e}")
+        reporter.report(None, str(e), StepStatus.FAILED)
 
         # Return error result
         end_time = time.time()
@@ -425,4 +419,6 @@ def run_docgrapher(  # type: ignore[no-untyped-def]
         }
     finally:
         # Close connections
+        if analyzer is not None:
+            analyzer.close()
         connector.close()
\ No newline at end of file
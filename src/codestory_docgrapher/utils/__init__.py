@@ -7,9 +7,13 @@ matching paths, and tracking progress during documentation processing.
 from .content_analyzer import ContentAnalyzer
 from .path_matcher import PathMatcher
 from .progress_tracker import ProgressTracker
+from .purpose_engine import PurposeCache, PurposeEngine, PurposeKind
 
 __all__ = [
     "ContentAnalyzer",
     "PathMatcher",
     "ProgressTracker",
+    "PurposeCache",
+    "PurposeEngine",
+    "PurposeKind",
 ]
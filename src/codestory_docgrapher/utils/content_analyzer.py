@@ -10,9 +10,9 @@ import logging
 import re
 
 from codestory.llm.client import create_client
-from codestory.llm.models import ChatMessage, ChatRole
 
 from ..models import DocumentationEntity, EntityType
+from .purpose_engine import PurposeEngine, PurposeKind
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +24,38 @@ class ContentAnalyzer:
     relationships, and other structured information from documentation content.
     """
 
-    def __init__(self, use_llm: bool = True):
+    # Entity types whose purpose is extracted with the LLM
+    PURPOSE_KINDS = {
+        EntityType.FUNCTION_DESC: PurposeKind.FUNCTION,
+        EntityType.CLASS_DESC: PurposeKind.CLASS,
+        EntityType.MODULE_DESC: PurposeKind.MODULE,
+    }
+
+    def __init__(
+        self,
+        use_llm: bool = True,
+        purpose_engine: PurposeEngine | None = None,
+        purpose_cache_path: str | None = None,
+    ):
         """Initialize the content analyzer.
 
         Args:
             use_llm: Whether to use LLM for advanced analysis
+            purpose_engine: Engine used for LLM purpose extraction (created from
+                the LLM client if None, and closed by close())
+            purpose_cache_path: Path of the purpose cache of the engine created
+                if ``purpose_engine`` is None
         """
         self.use_llm = use_llm
         self.llm_client = create_client() if use_llm else None
+        self.purpose_engine = purpose_engine
+        self._owns_engine = False
+        if self.purpose_engine is None and self.llm_client:
+            self.purpose_engine = PurposeEngine(self.llm_client, cache_path=purpose_cache_path)
+            self._owns_engine = True
+
+        # Purposes extracted ahead of time by analyze_entities()
+        self._prefetched_purposes: dict[str, str] = {}
 
         # Regular expressions for common patterns
         self.heading_pattern = re.compile(r"^(#+)\s+(.+)$", re.MULTILINE)
@@ -41,6 +65,11 @@ class ContentAnalyzer:
         self.api_class_pattern = re.compile(r"`([A-Z][a-zA-Z0-9_]*)`")
         self.api_module_pattern = re.compile(r"`([a-zA-Z0-9_]+\.[a-zA-Z0-9_]+)`")
 
+    def close(self) -> None:
+        """Release the purpose engine, if the analyzer created it."""
+        if self._owns_engine and self.purpose_engine:
+            self.purpose_engine.close()
+
     def analyze_entity_content(self, entity: DocumentationEntity) -> dict[str, Any]:
         """Analyze the content of a documentation entity.
 
@@ -67,6 +96,35 @@ class ContentAnalyzer:
             # Generic analysis for other entity types
             return self._analyze_generic(content)
 
+    def analyze_entities(self, entities: list[DocumentationEntity]) -> dict[str, dict[str, Any]]:
+        """Analyze the content of many documentation entities at once.
+
+        LLM purposes for function, class and module descriptions are
+        extracted up front in deduplicated, batched requests rather than one
+        request per entity.
+
+        Args:
+            entities: The documentation entities to analyze
+
+        Returns:
+            Dict mapping entity IDs to analysis results
+        """
+        if self.use_llm and self.purpose_engine:
+            items = [
+                (self.PURPOSE_KINDS[entity.type], entity.content)
+                for entity in entities
+                if entity.type in self.PURPOSE_KINDS
+            ]
+            if items:
+                purposes = self.purpose_engine.extract_purposes(items)
+                for (kind, content), purpose in zip(items, purposes, strict=True):
+                    self._prefetched_purposes[PurposeEngine.content_key(kind, content)] = purpose
+
+        try:
+            return {entity.id: self.analyze_entity_content(entity) for entity in entities}
+        finally:
+            self._prefetched_purposes.clear()
+
     def _analyze_heading(self, content: str) -> dict[str, Any]:
         """Analyze a heading.
 
@@ -176,7 +234,7 @@ class ContentAnalyzer:
 
         # Use LLM to extract function purpose if enabled
         purpose = ""
-        if self.use_llm and self.llm_client:
+        if self.use_llm and self.purpose_engine:
             purpose = self._extract_function_purpose(content)
 
         return {
@@ -211,7 +269,7 @@ class ContentAnalyzer:
 
         # Use LLM to extract class purpose if enabled
         purpose = ""
-        if self.use_llm and self.llm_client:
+        if self.use_llm and self.purpose_engine:
             purpose = self._extract_class_purpose(content)
 
         return {"methods": methods, "attributes": attributes, "purpose": purpose}
@@ -241,7 +299,7 @@ class ContentAnalyzer:
 
         # Use LLM to extract module purpose if enabled
         purpose = ""
-        if self.use_llm and self.llm_client:
+        if self.use_llm and self.purpose_engine:
             purpose = self._extract_module_purpose(content)
 
         return {"classes": classes, "functions": functions, "purpose": purpose}
@@ -311,41 +369,37 @@ class ContentAnalyzer:
         sorted_keywords = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
         return [k for k, _ in sorted_keywords[:10]]
 
-    def _extract_function_purpose(self, content: str) -> str:
-        """Extract function purpose using LLM.
+    def _extract_purpose(self, kind: PurposeKind, content: str) -> str:
+        """Extract an entity purpose using the LLM.
 
         Args:
-            content: Function description content
+            kind: Kind of entity the content describes
+            content: Description content
 
         Returns:
-            Function purpose
-        """
-        prompt = f"""
-        Extract the purpose of this function from its docstring. Return a single sentence
-        that describes what the function does, starting with a verb.
-        
-        Docstring:
-        {content}
-        
-        Function purpose:
+            Entity purpose, or an empty string if it could not be extracted
         """
-
-        messages = [
-            ChatMessage(
-                role=ChatRole.SYSTEM,
-                content="You are a technical documentation analyzer.",
-            ),
-            ChatMessage(role=ChatRole.USER, content=prompt),
-        ]
+        key = PurposeEngine.content_key(kind, content)
+        if key in self._prefetched_purposes:
+            return self._prefetched_purposes[key]
 
         try:
-            response = self.llm_client.chat(messages=messages, max_tokens=100, temperature=0.0)  # type: ignore[union-attr]
-
-            return response.choices[0].message.content.strip()  # type: ignore[no-any-return]
+            return self.purpose_engine.extract_purposes([(kind, content)])[0]  # type: ignore[union-attr]
         except Exception as e:
-            logger.warning(f"Error extracting function purpose: {e}")
+            logger.warning(f"Error extracting {kind.value} purpose: {e}")
             return ""
 
+    def _extract_function_purpose(self, content: str) -> str:
+        """Extract function purpose using LLM.
+
+        Args:
+            content: Function description content
+
+        Returns:
+            Function purpose
+        """
+        return self._extract_purpose(PurposeKind.FUNCTION, content)
+
     def _extract_class_purpose(self, content: str) -> str:
         """Extract class purpose using LLM.
 
@@ -355,31 +409,7 @@ class ContentAnalyzer:
         Returns:
             Class purpose
         """
-        prompt = f"""
-        Extract the purpose of this class from its docstring. Return a single sentence
-        that describes what the class represents or does.
-        
-        Docstring:
-        {content}
-        
-        Class purpose:
-        """
-
-        messages = [
-            ChatMessage(
-                role=ChatRole.SYSTEM,
-                content="You are a technical documentation analyzer.",
-            ),
-            ChatMessage(role=ChatRole.USER, content=prompt),
-        ]
-
-        try:
-            response = self.llm_client.chat(messages=messages, max_tokens=100, temperature=0.0)  # type: ignore[union-attr]
-
-            return response.choices[0].message.content.strip()  # type: ignore[no-any-return]
-        except Exception as e:
-            logger.warning(f"Error extracting class purpose: {e}")
-            return ""
+        return self._extract_purpose(PurposeKind.CLASS, content)
 
     def _extract_module_purpose(self, content: str) -> str:
         """Extract module purpose using LLM.
@@ -390,28 +420,4 @@ class ContentAnalyzer:
         Returns:
             Module purpose
         """
-        prompt = f"""
-        Extract the purpose of this module from its docstring. Return a single sentence
-        that describes what the module provides or does.
-        
-        Docstring:
-        {content}
-        
-        Module purpose:
-        """
-
-        messages = [
-            ChatMessage(
-                role=ChatRole.SYSTEM,
-                content="You are a technical documentation analyzer.",
-            ),
-            ChatMessage(role=ChatRole.USER, content=prompt),
-        ]
-
-        try:
-            response = self.llm_client.chat(messages=messages, max_tokens=100, temperature=0.0)  # type: ignore[union-attr]
-
-            return response.choices[0].message.content.strip()  # type: ignore[no-any-return]
-        except Exception as e:
-            logger.warning(f"Error extracting module purpose: {e}")
-            return ""
\ No newline at end of file
+        return self._extract_purpose(PurposeKind.MODULE, content)
@@ -8,11 +8,30 @@ to actual filesystem paths in the repository.
 
 import logging
 import os
+from collections import OrderedDict
 
 from codestory.graphdb.neo4j_connector import Neo4jConnector
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of resolved references kept in the path cache
+DEFAULT_PATH_CACHE_SIZE = 10000
+
+
+class _SuffixTrieNode:
+    """Node in a trie keyed by path components in reverse order.
+
+    Each node records every path whose trailing components spell out the
+    route from the root to the node, so a multi-segment suffix lookup is a
+    walk of ``len(components)`` dictionary hops.
+    """
+
+    __slots__ = ("children", "paths")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _SuffixTrieNode] = {}
+        self.paths: list[str] = []
+
 
 class PathMatcher:
     """Matches documentation references to filesystem paths.
@@ -21,16 +40,23 @@ class PathMatcher:
     filesystem paths or entities in the repository.
     """
 
-    def __init__(self, connector: Neo4jConnector, repository_path: str):
+    def __init__(
+        self,
+        connector: Neo4jConnector,
+        repository_path: str,
+        cache_size: int = DEFAULT_PATH_CACHE_SIZE,
+    ):
         """Initialize the path matcher.
 
         Args:
             connector: Neo4j database connector
             repository_path: Path to the repository
+            cache_size: Maximum number of resolved references to keep (LRU)
         """
         self.connector = connector
         self.repository_path = repository_path
-        self.path_cache: dict[Any, Any] = {}
+        self.cache_size = cache_size
+        self.path_cache: OrderedDict[str, str | None] = OrderedDict()
 
         # Load repository structure for faster matching
         self._load_repository_structure()
@@ -45,6 +71,7 @@ class PathMatcher:
 
         files = self.connector.run_query(query, fetch_all=True)
         self.file_paths = {record["path"] for record in files}
+        self._build_path_indexes()
 
         # Get all directory paths
         query = """
@@ -79,6 +106,68 @@ class PathMatcher:
             record["qualified_name"] for record in funcs if record["qualified_name"]
         }
 
+    def _build_path_indexes(self) -> None:
+        """Build the basename, extension and suffix indexes over file paths."""
+        self._basename_index: dict[str, list[str]] = {}
+        self._extension_index: dict[str, list[str]] = {}
+        self._suffix_trie = _SuffixTrieNode()
+
+        # Sort so that index lists (and therefore fallbacks) are deterministic
+        for path in sorted(p for p in self.file_paths if p):
+            components = [c for c in path.split("/") if c]
+            if not components:
+                continue
+
+            basename = components[-1]
+            self._basename_index.setdefault(basename, []).append(path)
+
+            if "." in basename:
+                ext = basename.rsplit(".", 1)[-1]
+                self._extension_index.setdefault(ext, []).append(path)
+
+            node = self._suffix_trie
+            for component in reversed(components):
+                node = node.children.setdefault(component, _SuffixTrieNode())
+                node.paths.append(path)
+
+        logger.debug(
+            f"Indexed {len(self.file_paths)} file paths "
+            f"({len(self._basename_index)} basenames, {len(self._extension_index)} extensions)"
+        )
+
+    def _match_suffix(self, components: list[str]) -> list[str]:
+        """Find all file paths ending with the given path components.
+
+        Args:
+            components: Path components of the reference, in natural order
+
+        Returns:
+            Paths whose trailing components equal ``components``
+        """
+        node = self._suffix_trie
+        for component in reversed(components):
+            child = node.children.get(component)
+            if child is None:
+                return []
+            node = child
+        return node.paths
+
+    def _cache_result(self, path_reference: str, result: str | None) -> str | None:
+        """Store a resolved reference in the LRU path cache.
+
+        Args:
+            path_reference: Path reference from documentation
+            result: Resolved path, or None if nothing matched
+
+        Returns:
+            The resolved path, for convenient chaining
+        """
+        self.path_cache[path_reference] = result
+        self.path_cache.move_to_end(path_reference)
+        if len(self.path_cache) > self.cache_size:
+            self.path_cache.popitem(last=False)
+        return result
+
     def match_path(self, path_reference: str) -> str | None:
         """Match a path reference to an actual path.
 
@@ -90,71 +179,57 @@ class PathMatcher:
         """
         # Check cache first
         if path_reference in self.path_cache:
-            return self.path_cache[path_reference]  # type: ignore[no-any-return]
+            self.path_cache.move_to_end(path_reference)
+            return self.path_cache[path_reference]
 
         # Try exact match first
-        if path_reference in self.file_paths:
-            self.path_cache[path_reference] = path_reference
-            return path_reference
-
-        if path_reference in self.dir_paths:
-            self.path_cache[path_reference] = path_reference
-            return path_reference
+        if path_reference in self.file_paths or path_reference in self.dir_paths:
+            return self._cache_result(path_reference, path_reference)
 
         # Try to find file by basename
         basename = os.path.basename(path_reference)
-        matching_paths = [p for p in self.file_paths if p.endswith(f"/{basename}")]
+        matching_paths = self._basename_index.get(basename, [])
 
         if len(matching_paths) == 1:
             # Unambiguous match
-            self.path_cache[path_reference] = matching_paths[0]
-            return matching_paths[0]  # type: ignore[no-any-return]
+            return self._cache_result(path_reference, matching_paths[0])
         elif len(matching_paths) > 1:
-            # Multiple matches, try to find the best one
-            # Check if any match contains directory components from the reference
-            dir_components = os.path.dirname(path_reference).split("/")
-            dir_components = [c for c in dir_components if c]
+            # Multiple matches, try to find the best one using the
+            # directory components from the reference
+            dir_components = [
+                c for c in os.path.dirname(path_reference).split("/") if c not in ("", ".", "..")
+            ]
 
             if dir_components:
-                # Filter matches by directory components
-                filtered_paths: list[Any] = []
-                for p in matching_paths:
-                    p_dir = os.path.dirname(p)
-                    match = True
-                    for comp in dir_components:
-                        if comp not in p_dir:
-                            match = False
-                            break
-                    if match:
-                        filtered_paths.append(p)
-
-                if len(filtered_paths) == 1:
-                    self.path_cache[path_reference] = filtered_paths[0]
-                    return filtered_paths[0]  # type: ignore[no-any-return]
-                elif len(filtered_paths) > 1:
-                    # Still ambiguous, return the shortest path
-                    shortest = min(filtered_paths, key=len)
-                    self.path_cache[path_reference] = shortest
-                    return shortest  # type: ignore[no-any-return]
+                # Prefer paths that end with the full reference suffix
+                suffix_paths = self._match_suffix([*dir_components, basename])
+                if suffix_paths:
+                    return self._cache_result(path_reference, min(suffix_paths, key=len))
+
+                # Fall back to loose matching of directory components
+                filtered_paths = [
+                    p
+                    for p in matching_paths
+                    if all(comp in os.path.dirname(p) for comp in dir_components)
+                ]
+                if filtered_paths:
+                    # Return the shortest path if still ambiguous
+                    return self._cache_result(path_reference, min(filtered_paths, key=len))
 
             # No directory components or still ambiguous, return the shortest path
-            shortest = min(matching_paths, key=len)
-            self.path_cache[path_reference] = shortest
-            return shortest  # type: ignore[no-any-return]
+            return self._cache_result(path_reference, min(matching_paths, key=len))
 
         # Try to match by extension
         if "." in basename:
-            ext = basename.split(".")[-1]
-            matching_paths = [p for p in self.file_paths if p.endswith(f".{ext}")]
+            ext = basename.rsplit(".", 1)[-1]
+            ext_paths = self._extension_index.get(ext)
 
-            if matching_paths:
+            if ext_paths:
                 # Return any one file with matching extension
-                self.path_cache[path_reference] = matching_paths[0]
-                return matching_paths[0]  # type: ignore[no-any-return]
+                return self._cache_result(path_reference, ext_paths[0])
 
         # No match found
-        self.path_cache[path_reference] = None
-        return None
+        return self._cache_result(path_reference, None)
 
     def match_class(self, class_reference: str) -> str | None:
         """Match a class reference to an actual class.
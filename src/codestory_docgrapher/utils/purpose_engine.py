@@ -0,0 +1,430 @@
+"""Batched, cached LLM purpose extraction for documentation entities.
+
+This module provides an engine that extracts one-sentence purposes for
+function, class and module docstrings. Docstrings are deduplicated by
+content hash, looked up in a persistent cache, and the remaining ones are
+packed into structured-output chat requests that run concurrently through
+the async LLM client.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from enum import Enum
+from typing import Any
+
+from codestory.llm.models import ChatMessage, ChatRole
+
+logger = logging.getLogger(__name__)
+
+# Environment variable that overrides the location of the purpose cache
+CACHE_PATH_ENV = "CODESTORY_DOCGRAPHER_CACHE"
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "codestory", "docgrapher_purposes.sqlite3"
+)
+
+
+class PurposeKind(str, Enum):
+    """Kinds of documentation entities a purpose can be extracted for."""
+
+    FUNCTION = "function"
+    CLASS = "class"
+    MODULE = "module"
+
+
+# Per-kind guidance on what the extracted sentence should describe
+PURPOSE_GUIDANCE = {
+    PurposeKind.FUNCTION: "what the function does, starting with a verb",
+    PurposeKind.CLASS: "what the class represents or does",
+    PurposeKind.MODULE: "what the module provides or does",
+}
+
+SYSTEM_PROMPT = "You are a technical documentation analyzer."
+
+BATCH_PROMPT = """
+Extract the purpose of each docstring below. For every item, return a single
+sentence describing {guidance_summary}.
+
+Respond with a JSON object of the form
+{{"results": [{{"id": <item id>, "purpose": "<one sentence>"}}, ...]}}
+containing exactly one entry for each item id.
+
+Items:
+{items}
+"""
+
+
+class PurposeCache:
+    """Persistent cache of extracted purposes keyed by content hash.
+
+    Backed by SQLite so that results survive across docgrapher runs and
+    worker restarts. Access is serialized with a lock so the cache can be
+    shared between threads.
+    """
+
+    def __init__(self, path: str | None = None):
+        """Initialize the purpose cache.
+
+        The database is opened on first use, so creating a cache that is
+        never used does not touch the filesystem.
+
+        Args:
+            path: Path to the SQLite database file, or ":memory:" for an
+                in-process cache. Defaults to ``$CODESTORY_DOCGRAPHER_CACHE``
+                or a file under ``~/.cache/codestory``.
+        """
+        self.path = path or os.environ.get(CACHE_PATH_ENV) or DEFAULT_CACHE_PATH
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the database connection, opening it if needed.
+
+        Must be called with the lock held.
+        """
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS purposes (key TEXT PRIMARY KEY, purpose TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look up cached purposes.
+
+        Args:
+            keys: Content hashes to look up
+
+        Returns:
+            Dict mapping each cached key to its purpose
+        """
+        found: dict[str, str] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            query = f"SELECT key, purpose FROM purposes WHERE key IN ({placeholders})"
+            with self._lock:
+                rows = self._connection().execute(query, chunk).fetchall()
+            found.update(dict(rows))
+        return found
+
+    def set_many(self, items: dict[str, str]) -> None:
+        """Store purposes in the cache.
+
+        Args:
+            items: Dict mapping content hashes to purposes
+        """
+        if not items:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO purposes (key, purpose) VALUES (?, ?)", items.items()
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection, if it was opened."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PurposeEngine:
+    """Extracts docstring purposes with deduplication, caching and batching.
+
+    Many docstrings repeat across overloads and generated code, so requests
+    are collapsed by content hash before anything is sent to the LLM. Cache
+    misses are packed into multi-item structured-output requests and the
+    batches are executed concurrently.
+    """
+
+    def __init__(
+        self,
+        llm_client: Any,
+        cache: PurposeCache | None = None,
+        cache_path: str | None = None,
+        max_batch_items: int = 20,
+        max_batch_chars: int = 12000,
+        max_concurrency: int = 4,
+        max_tokens_per_item: int = 80,
+    ):
+        """Initialize the purpose engine.
+
+        Args:
+            llm_client: LLM client providing ``chat_async``
+            cache: Persistent purpose cache, closed by its owner. If None, the
+                engine creates one at ``cache_path`` and closes it in close().
+            cache_path: Path of the cache created if ``cache`` is None (see
+                PurposeCache)
+            max_batch_items: Maximum number of docstrings per LLM request
+            max_batch_chars: Maximum total docstring characters per LLM request
+            max_concurrency: Maximum number of concurrent LLM requests
+            max_tokens_per_item: Completion token budget per docstring
+        """
+        self.llm_client = llm_client
+        self._owns_cache = cache is None
+        self.cache = cache if cache is not None else PurposeCache(cache_path)
+        self.max_batch_items = max_batch_items
+        self.max_batch_chars = max_batch_chars
+        self.max_concurrency = max_concurrency
+        self.max_tokens_per_item = max_tokens_per_item
+
+        # Counters for reporting
+        self.llm_calls = 0
+        self.cache_hits = 0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+
+    @staticmethod
+    def content_key(kind: PurposeKind, content: str) -> str:
+        """Compute the cache key for a docstring.
+
+        Args:
+            kind: Kind of entity the docstring belongs to
+            content: Docstring content
+
+        Returns:
+            Hex digest identifying the (kind, content) pair
+        """
+        digest = hashlib.sha256()
+        digest.update(kind.value.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content.strip().encode("utf-8"))
+        return digest.hexdigest()
+
+    def extract_purposes(self, items: list[tuple[PurposeKind, str]]) -> list[str]:
+        """Extract purposes for a list of docstrings.
+
+        Args:
+            items: List of (kind, docstring content) pairs
+
+        Returns:
+            List of purposes in the same order as ``items``. Empty strings are
+            returned for docstrings whose purpose could not be extracted.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.extract_purposes_async(items), self._get_loop()
+        )
+        return future.result()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the engine's background event loop, starting it if needed.
+
+        The async LLM client keeps pooled connections bound to the loop that
+        opened them, so every synchronous call is dispatched onto one
+        long-lived loop instead of a fresh ``asyncio.run`` loop.
+
+        Returns:
+            The background event loop
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="docgrapher-purposes", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def close(self) -> None:
+        """Stop the background event loop and close the cache the engine created.
+
+        The engine can still be used afterwards; a new loop is started on the
+        next synchronous call.
+        """
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is not None and thread is not None:
+            # Close the LLM client's connections bound to the loop
+            aclose = getattr(self.llm_client, "aclose", None)
+            if aclose is not None:
+                try:
+                    asyncio.run_coroutine_threadsafe(aclose(), loop).result()
+                except Exception as e:
+                    logger.warning(f"Failed to close the LLM client of the purpose loop: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        if self._owns_cache:
+            self.cache.close()
+
+    async def extract_purposes_async(self, items: list[tuple[PurposeKind, str]]) -> list[str]:
+        """Asynchronous version of extract_purposes().
+
+        Args:
+            items: List of (kind, docstring content) pairs
+
+        Returns:
+            List of purposes in the same order as ``items``
+        """
+        keys = [self.content_key(kind, content) for kind, content in items]
+
+        # Deduplicate by content hash
+        unique: dict[str, tuple[PurposeKind, str]] = {}
+        for key, (kind, content) in zip(keys, items, strict=True):
+            if content.strip():
+                unique.setdefault(key, (kind, content.strip()))
+
+        purposes = self.cache.get_many(list(unique))
+        self.cache_hits += len(purposes)
+
+        pending = [
+            (key, kind, content) for key, (kind, content) in unique.items() if key not in purposes
+        ]
+        if pending:
+            batches = self._pack_batches(pending)
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            results = await asyncio.gather(
+                *(self._run_batch(batch, semaphore) for batch in batches)
+            )
+
+            extracted: dict[str, str] = {}
+            for batch_result in results:
+                extracted.update(batch_result)
+            self.cache.set_many(extracted)
+            purposes.update(extracted)
+
+            logger.info(
+                f"Extracted {len(extracted)}/{len(pending)} docstring purposes "
+                f"in {len(batches)} LLM requests ({len(items)} requested, "
+                f"{len(unique) - len(pending)} cached)"
+            )
+
+        return [purposes.get(key, "") for key in keys]
+
+    def _pack_batches(
+        self, pending: list[tuple[str, PurposeKind, str]]
+    ) -> list[list[tuple[str, PurposeKind, str]]]:
+        """Pack pending docstrings into batches bounded by item count and size.
+
+        Args:
+            pending: List of (key, kind, content) tuples
+
+        Returns:
+            List of batches
+        """
+        batches: list[list[tuple[str, PurposeKind, str]]] = []
+        current: list[tuple[str, PurposeKind, str]] = []
+        current_chars = 0
+
+        for item in pending:
+            size = len(item[2])
+            if current and (
+                len(current) >= self.max_batch_items
+                or current_chars + size > self.max_batch_chars
+            ):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(item)
+            current_chars += size
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _build_messages(self, batch: list[tuple[str, PurposeKind, str]]) -> list[ChatMessage]:
+        """Build the chat messages for a batch.
+
+        Args:
+            batch: List of (key, kind, content) tuples
+
+        Returns:
+            Chat messages for the request
+        """
+        kinds = sorted({kind for _, kind, _ in batch}, key=lambda k: k.value)
+        guidance_summary = "; ".join(
+            f"for a {kind.value}, {PURPOSE_GUIDANCE[kind]}" for kind in kinds
+        )
+        items = "\n\n".join(
+            f"[id={index}] ({kind.value})\n{content}"
+            for index, (_, kind, content) in enumerate(batch)
+        )
+        prompt = BATCH_PROMPT.format(guidance_summary=guidance_summary, items=items)
+
+        return [
+            ChatMessage(role=ChatRole.SYSTEM, content=SYSTEM_PROMPT),
+            ChatMessage(role=ChatRole.USER, content=prompt),
+        ]
+
+    async def _run_batch(
+        self, batch: list[tuple[str, PurposeKind, str]], semaphore: asyncio.Semaphore
+    ) -> dict[str, str]:
+        """Send one batch to the LLM and map the results back to content keys.
+
+        Args:
+            batch: List of (key, kind, content) tuples
+            semaphore: Semaphore bounding concurrent requests
+
+        Returns:
+            Dict mapping content keys to extracted purposes
+        """
+        messages = self._build_messages(batch)
+
+        async with semaphore:
+            self.llm_calls += 1
+            try:
+                response = await self.llm_client.chat_async(
+                    messages=messages,
+                    max_tokens=self.max_tokens_per_item * len(batch) + 50,
+                    temperature=0.0,
+                    response_format={"type": "json_object"},
+                )
+                content = response.choices[0].message.content or ""
+            except Exception as e:
+                logger.warning(f"Error extracting purposes for batch of {len(batch)}: {e}")
+                return {}
+
+        return self._parse_batch_response(content, batch)
+
+    def _parse_batch_response(
+        self, content: str, batch: list[tuple[str, PurposeKind, str]]
+    ) -> dict[str, str]:
+        """Parse a structured batch response.
+
+        Args:
+            content: Raw response content
+            batch: The batch the response belongs to
+
+        Returns:
+            Dict mapping content keys to extracted purposes
+        """
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Could not parse batched purpose response: {e}")
+            return {}
+
+        entries = data.get("results", []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            logger.warning("Batched purpose response did not contain a results array")
+            return {}
+
+        purposes: dict[str, str] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("id"))  # type: ignore[arg-type]
+            except (TypeError, ValueError):
+                continue
+            purpose = entry.get("purpose")
+            if 0 <= index < len(batch) and isinstance(purpose, str) and purpose.strip():
+                purposes[batch[index][0]] = purpose.strip()
+
+        if len(purposes) < len(batch):
+            logger.debug(f"Batched purpose response covered {len(purposes)}/{len(batch)} items")
+        return purposes
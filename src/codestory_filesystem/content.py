@@ -0,0 +1,165 @@
+"""Content hashes, binary detection and capped text content of files.
+
+The filesystem step can read every file once while scanning: the whole file
+is hashed, so consumers can detect changed files by comparing hashes, and
+the beginning of text files is kept as the content stored on the File node.
+
+Hashes use xxHash (XXH3, 128 bit) if the ``xxhash`` package is installed and
+BLAKE2b otherwise. They are prefixed with the algorithm, so hashes computed
+by workers with different algorithms never compare equal.
+
+Files are classified as binary by sniffing their first bytes, like git and
+``file`` do, rather than by extension.
+"""
+
+import hashlib
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# xxHash is optional; BLAKE2b from the standard library is the fallback
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Bytes inspected to decide whether a file is binary
+SNIFF_BYTES = 8192
+
+# Size of the blocks files are read in
+READ_BLOCK_SIZE = 1 << 20
+
+# Default maximum number of bytes of content stored per file
+DEFAULT_CONTENT_MAX_BYTES = 256 * 1024
+
+# Bytes that occur in text: printable ASCII, common control characters and
+# anything above 0x7F, which may be part of a multi-byte character
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x7F)) | set(range(0x80, 0x100)))
+
+# Share of other bytes above which a sample is binary
+_BINARY_THRESHOLD = 0.3
+
+if XXHASH_AVAILABLE:
+    HASH_ALGORITHM = "xxh3_128"
+    _new_hash: Callable[[], Any] = xxhash.xxh3_128
+else:
+    HASH_ALGORITHM = "blake2b"
+
+    def _new_hash() -> Any:
+        return hashlib.blake2b(digest_size=16)
+
+
+def is_binary(sample: bytes) -> bool:
+    """Check whether the first bytes of a file indicate binary content.
+
+    Args:
+        sample: First bytes of the file
+
+    Returns:
+        True if the sample contains a NUL byte or mostly non-text bytes
+    """
+    if not sample:
+        return False
+    if b"\0" in sample:
+        return True
+    non_text = len(sample.translate(None, _TEXT_BYTES))
+    return non_text / len(sample) > _BINARY_THRESHOLD
+
+
+def trim_partial_utf8(data: bytes) -> bytes:
+    """Drop a UTF-8 sequence cut off at the end of truncated content.
+
+    Args:
+        data: Beginning of a file, cut at an arbitrary byte
+
+    Returns:
+        The data up to its last complete character, so that decoding it does
+        not produce a replacement character for the cut one
+    """
+    # A sequence is at most 4 bytes: find the lead byte of the last one
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            continue  # Continuation byte
+        if byte >= 0xF0:
+            length = 4
+        elif byte >= 0xE0:
+            length = 3
+        elif byte >= 0xC0:
+            length = 2
+        else:
+            length = 1
+        return data[:-back] if back < length else data
+    return data
+
+
+@dataclass
+class FileContent:
+    """What was read of a file."""
+
+    content_hash: str | None = None
+    binary: bool = False
+    text: str | None = None
+    truncated: bool = False
+    text_bytes: int = 0
+
+
+def read_file_content(
+    path: str, hash_content: bool = True, max_bytes: int = DEFAULT_CONTENT_MAX_BYTES
+) -> FileContent:
+    """Read a file once for its hash and capped text content.
+
+    Args:
+        path: Path of the file
+        hash_content: Whether to hash the whole file
+        max_bytes: Maximum number of bytes of text content to keep; 0 keeps
+            none
+
+    Returns:
+        Hash (``"<algorithm>:<hex digest>"``), binary flag and, for text
+        files, the decoded content up to ``max_bytes``
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    hasher = _new_hash() if hash_content else None
+    kept: list[bytes] = []
+    kept_size = 0
+    total = 0
+    binary = False
+
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            if total == 0:
+                binary = is_binary(block[:SNIFF_BYTES])
+            total += len(block)
+            if hasher is not None:
+                hasher.update(block)
+            if not binary and kept_size < max_bytes:
+                kept.append(block[: max_bytes - kept_size])
+                kept_size += len(kept[-1])
+            if hasher is None and (binary or kept_size >= max_bytes):
+                # Nothing more is needed from the rest of the file
+                total += 1 if f.read(1) else 0
+                break
+
+    result = FileContent(binary=binary)
+    if hasher is not None:
+        result.content_hash = f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
+    if not binary and max_bytes > 0:
+        data = b"".join(kept)
+        result.truncated = total > kept_size
+        if result.truncated:
+            data = trim_partial_utf8(data)
+        result.text = data.decode("utf-8", errors="replace")
+        result.text_bytes = len(data)
+    return result
@@ -0,0 +1,163 @@
+"""Batched writes of the scanned directory tree to Neo4j.
+
+Graph schema written:
+
+- ``(Repository)-[:CONTAINS]->(Directory|File)`` for top-level entries
+- ``(Directory)-[:CONTAINS]->(Directory|File)``
+
+If the scan read file content, File nodes also get ``content_hash``,
+``is_binary``, ``content`` (capped, indexed by the ``file_content``
+full-text index) and ``content_truncated``.
+
+Each batch is written with one UNWIND query per kind of node and
+relationship. Nodes are merged before relationships, so a relationship query
+always finds both of its ends, including parents merged in the same batch.
+"""
+
+import logging
+from typing import Any
+
+from codestory.graphdb.neo4j_connector import Neo4jConnector
+
+from .scanner import ScanBatch
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_MERGE_DIRECTORIES = """
+UNWIND $rows AS row
+MERGE (d:Directory {path: row.path})
+SET d.name = row.name
+"""
+
+_MERGE_FILES = """
+UNWIND $rows AS row
+MERGE (f:File {path: row.path})
+SET f.name = row.name,
+    f.extension = row.extension,
+    f.size = row.size,
+    f.modified = row.modified
+"""
+
+# Also writes the content fields and returns the paths of files that are
+# new or whose content hash changed. The hash is only written for files that
+# were hashed, so storing content without hashing keeps the stored hashes.
+_MERGE_FILES_WITH_CONTENT = """
+UNWIND $rows AS row
+MERGE (f:File {path: row.path})
+WITH f, row, f.content_hash AS previous_hash
+SET f.name = row.name,
+    f.extension = row.extension,
+    f.size = row.size,
+    f.modified = row.modified,
+    f.content_hash = coalesce(row.content_hash, f.content_hash),
+    f.is_binary = row.is_binary,
+    f.content = row.content,
+    f.content_truncated = row.content_truncated
+WITH row, previous_hash
+WHERE row.content_hash IS NOT NULL
+  AND (previous_hash IS NULL OR previous_hash <> row.content_hash)
+RETURN row.path AS path
+"""
+
+_FILE_HASHES = """
+MATCH (f:File)
+WHERE f.content_hash IS NOT NULL AND ($paths IS NULL OR f.path IN $paths)
+RETURN f.path AS path, f.content_hash AS content_hash
+"""
+
+_LINK_TO_REPOSITORY = """
+MATCH (r:Repository {path: $repo_path})
+UNWIND $rows AS row
+MATCH (n:%(label)s {path: row.path})
+MERGE (r)-[:CONTAINS]->(n)
+"""
+
+_LINK_TO_DIRECTORY = """
+UNWIND $rows AS row
+MATCH (p:Directory {path: row.parent})
+MATCH (n:%(label)s {path: row.path})
+MERGE (p)-[:CONTAINS]->(n)
+"""
+
+
+class FilesystemWriter:
+    """Writes scanned directories and files to Neo4j."""
+
+    def __init__(self, connector: Neo4jConnector, repository_path: str, with_content: bool = False):
+        """Initialize the writer.
+
+        Args:
+            connector: Neo4j connector
+            repository_path: Path of the Repository node entries are linked to
+            with_content: Whether file rows carry content fields to write;
+                otherwise the content properties of File nodes are left as
+                they are
+        """
+        self.connector = connector
+        self.repository_path = repository_path
+        self.with_content = with_content
+
+    def _write(self, query: str, rows: list[dict[str, Any]], **params: Any) -> list[Any]:
+        if not rows:
+            return []
+        return self.connector.execute_query(  # type: ignore[no-any-return]
+            query, params={"rows": rows, **params}, write=True
+        )
+
+    def _link(self, label: str, rows: list[dict[str, Any]]) -> None:
+        top_level = [row for row in rows if not row["parent"]]
+        nested = [row for row in rows if row["parent"]]
+        self._write(
+            _LINK_TO_REPOSITORY % {"label": label}, top_level, repo_path=self.repository_path
+        )
+        self._write(_LINK_TO_DIRECTORY % {"label": label}, nested)
+
+    def write_nodes(self, batch: ScanBatch) -> list[str]:
+        """Merge the directory and file nodes of a batch.
+
+        Returns:
+            Paths of the files that are new or whose content changed, if
+            content is written and the files were hashed
+        """
+        self._write(_MERGE_DIRECTORIES, batch.directories)
+        if not self.with_content:
+            self._write(_MERGE_FILES, batch.files)
+            return []
+        return [record["path"] for record in self._write(_MERGE_FILES_WITH_CONTENT, batch.files)]
+
+    def write_relationships(self, batch: ScanBatch) -> None:
+        """Link the entries of a batch to their parents.
+
+        The parents must have been written, in this or an earlier batch.
+        """
+        self._link("Directory", batch.directories)
+        self._link("File", batch.files)
+
+    def write(self, batch: ScanBatch) -> list[str]:
+        """Write the nodes of a batch and link them to their parents.
+
+        Returns:
+            Paths of the files that are new or whose content changed, if
+            content is written and the files were hashed
+        """
+        changed = self.write_nodes(batch)
+        self.write_relationships(batch)
+        return changed
+
+
+def file_hashes(connector: Neo4jConnector, paths: list[str] | None = None) -> dict[str, str]:
+    """Get the stored content hashes of files.
+
+    Incremental consumers compare these with the hashes of the files on disk,
+    or with the hashes they recorded, to only process changed files.
+
+    Args:
+        connector: Neo4j connector
+        paths: Paths of the files, or None for all files with a hash
+
+    Returns:
+        Path -> content hash
+    """
+    records = connector.execute_query(_FILE_HASHES, params={"paths": paths})
+    return {record["path"]: record["content_hash"] for record in records}
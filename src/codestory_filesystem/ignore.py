@@ -0,0 +1,317 @@
+"""Compiled, hierarchical matching of gitignore-style ignore patterns.
+
+IgnoreMatcher decides which paths of a repository the ingestion steps skip.
+The rules come from:
+
+- the built-in patterns and the extra patterns of the step configuration,
+  which apply to the whole repository
+- the repository's ``.gitignore`` and the ``.gitignore`` files of its
+  subdirectories, each applying to paths below its own directory
+
+As in git, the last matching pattern decides and ``!pattern`` re-includes a
+path. Rules of a deeper ``.gitignore`` take precedence over those of its
+parents. A path inside an ignored directory is ignored, whatever the
+patterns say about the path itself.
+
+The patterns of one source are compiled into a single regular expression.
+Its alternatives are ordered last pattern first, so the first alternative to
+match is the deciding pattern. Each directory's chain of rules is built once
+and cached, and so is the decision for each directory. Walkers prune ignored
+directories, so the entries below them are never matched at all.
+"""
+
+import logging
+import os
+import re
+from collections.abc import Iterable
+
+from pathspec.patterns import GitWildMatchPattern
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Built-in ignore patterns for common noise files and directories
+BUILTIN_IGNORE_PATTERNS = [
+    ".git/",
+    "__pycache__/",
+    "*.pyc",
+    "*.pyo",
+    "*.log",
+    "*.tmp",
+    "node_modules/",
+    "build/",
+    "dist/",
+    ".venv/",
+    ".idea/",
+    ".vscode/",
+]
+
+# Name of the per-directory ignore files
+GITIGNORE = ".gitignore"
+
+
+class IgnoreRules:
+    """The patterns of one ignore source, compiled into one regular expression."""
+
+    def __init__(self, patterns: Iterable[str]):
+        """Compile the patterns.
+
+        Args:
+            patterns: Gitignore-style patterns; blank lines and comments are
+                skipped
+        """
+        self.patterns: list[str] = []
+        alternatives: list[tuple[str, bool]] = []
+        for pattern in patterns:
+            try:
+                regex, include = GitWildMatchPattern.pattern_to_regex(pattern)
+            except ValueError as e:
+                logger.warning(f"Invalid ignore pattern {pattern!r}: {e}")
+                continue
+            if regex is None:
+                continue
+            self.patterns.append(pattern)
+            # pathspec's expressions also match every path below a matching
+            # directory. Only the path itself is matched here: the contents
+            # of an ignored directory are ignored through the directory, and
+            # a negated pattern must not re-include what other patterns
+            # ignore below it.
+            regex = regex.replace("(?:(?P<ps_d>/).*)?$", "/?$").replace("(?P<ps_d>/).*$", "/$")
+            # The alternatives share one expression, so the groups of the
+            # individual patterns must not capture
+            alternatives.append((regex.replace("(?P<ps_d>", "(?:"), bool(include)))
+
+        # A negated pattern can only re-include a path if it decides the
+        # match, so the deciding alternative is only needed if there is one
+        self._has_negation = not all(include for _, include in alternatives)
+        self._include = {f"p{i}": include for i, (_, include) in enumerate(alternatives)}
+        self._regex = (
+            re.compile(
+                "|".join(
+                    f"(?P<p{i}>{regex})"
+                    for i, (regex, _) in reversed(list(enumerate(alternatives)))
+                )
+            )
+            if alternatives
+            else None
+        )
+
+    def __bool__(self) -> bool:
+        """Check whether there are any patterns."""
+        return self._regex is not None
+
+    def match(self, path: str) -> bool | None:
+        """Match a path against the patterns.
+
+        Args:
+            path: Path relative to the directory of the rules, with a
+                trailing ``/`` for directories
+
+        Returns:
+            True if the path is ignored, False if it is re-included and None
+            if no pattern matches
+        """
+        if self._regex is None:
+            return None
+        match = self._regex.match(path)
+        if match is None:
+            return None
+        if not self._has_negation:
+            return True
+        return self._include[match.lastgroup]  # type: ignore[index]
+
+
+# Rules applying in a directory: (path prefix of the rules' directory, rules),
+# from the repository root down
+_Chain = tuple[tuple[str, IgnoreRules], ...]
+
+
+def anchor_pattern(pattern: str, prefix: str) -> str:
+    """Rewrite a pattern of a nested ignore file relative to the repository root.
+
+    Args:
+        pattern: Pattern of the ignore file
+        prefix: Path of the ignore file's directory, with a trailing ``/``
+
+    Returns:
+        Equivalent pattern for the repository root
+    """
+    negation = "!" if pattern.startswith("!") else ""
+    body = pattern[len(negation) :]
+    if "/" in body.rstrip("/"):
+        # Patterns containing a slash are relative to their directory
+        return f"{negation}/{prefix}{body.lstrip('/')}"
+    return f"{negation}/{prefix}**/{body}"
+
+
+class IgnoreMatcher:
+    """Decides which paths of a repository are ignored.
+
+    Nested ``.gitignore`` files are read the first time a path of their
+    directory is matched. The matcher is safe to share between the threads
+    of a scan: its caches only ever gain entries, and an entry computed twice
+    has the same value.
+    """
+
+    def __init__(
+        self,
+        root: str | None,
+        extra_patterns: list[str] | None = None,
+        builtin: bool = True,
+        nested: bool = True,
+    ):
+        """Initialize the matcher.
+
+        Args:
+            root: Path of the repository, or None to only apply the built-in
+                and extra patterns
+            extra_patterns: Additional patterns applying to the whole
+                repository
+            builtin: Whether to apply BUILTIN_IGNORE_PATTERNS
+            nested: Whether to read ``.gitignore`` files of subdirectories
+        """
+        self.root = os.path.abspath(root) if root else None
+        self.nested = nested
+
+        patterns = list(BUILTIN_IGNORE_PATTERNS) if builtin else []
+        patterns.extend(self._read_patterns(""))
+        patterns.extend(extra_patterns or [])
+        if builtin and ".git/" not in patterns:
+            patterns.append(".git/")
+        root_rules = IgnoreRules(patterns)
+
+        self._chains: dict[str, _Chain] = {"": (("", root_rules),) if root_rules else ()}
+        self._ignored_dirs: dict[str, bool] = {"": False}
+
+    def _read_patterns(self, rel_dir: str) -> list[str]:
+        """Read the patterns of a directory's ignore file, if it has one."""
+        if self.root is None:
+            return []
+        path = os.path.join(self.root, rel_dir, GITIGNORE)
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return [
+                    line.rstrip()
+                    for line in f
+                    if line.strip() and not line.lstrip().startswith("#")
+                ]
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.warning(f"Cannot read {path}: {e}")
+            return []
+
+    def _chain(self, rel_dir: str) -> _Chain:
+        """Get the rules applying to the entries of a directory."""
+        chain = self._chains.get(rel_dir)
+        if chain is None:
+            parent, _, _ = rel_dir.rpartition("/")
+            chain = self._chain(parent)
+            if self.nested:
+                rules = IgnoreRules(self._read_patterns(rel_dir))
+                if rules:
+                    chain = (*chain, (f"{rel_dir}/", rules))
+            self._chains[rel_dir] = chain
+        return chain
+
+    def match_entry(self, rel_dir: str, name: str, is_dir: bool = False) -> bool:
+        """Check whether an entry of a directory is ignored by the patterns.
+
+        Walkers that prune ignored directories use this to match the entries
+        of a directory they list; the directory itself is not checked.
+
+        Args:
+            rel_dir: Path of the directory relative to the root, ``""`` for
+                the root
+            name: Name of the entry
+            is_dir: Whether the entry is a directory
+
+        Returns:
+            True if the entry is ignored
+        """
+        rel_path = f"{rel_dir}/{name}" if rel_dir else name
+        if is_dir:
+            cached = self._ignored_dirs.get(rel_path)
+            if cached is not None:
+                return cached
+
+        candidate = f"{rel_path}/" if is_dir else rel_path
+        ignored = False
+        for prefix, rules in reversed(self._chain(rel_dir)):
+            result = rules.match(candidate[len(prefix) :])
+            if result is not None:
+                ignored = result
+                break
+
+        if is_dir:
+            self._ignored_dirs[rel_path] = ignored
+        return ignored
+
+    def _dir_ignored(self, rel_dir: str) -> bool:
+        """Check whether a directory or any of its parents is ignored."""
+        cached = self._ignored_dirs.get(rel_dir)
+        if cached is not None:
+            return cached
+        parent, _, name = rel_dir.rpartition("/")
+        ignored = self._dir_ignored(parent) or self.match_entry(parent, name, is_dir=True)
+        self._ignored_dirs[rel_dir] = ignored
+        return ignored
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """Check whether a path is ignored, taking its parent directories into account.
+
+        Args:
+            path: Path relative to the root, or an absolute path below it
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the path is ignored
+        """
+        if self.root is not None and os.path.isabs(path):
+            path = os.path.relpath(path, self.root)
+            if path == ".." or path.startswith(f"..{os.sep}"):
+                return False
+        path = path.replace(os.sep, "/").strip("/")
+        if path in ("", "."):
+            return False
+        if path.startswith("./"):
+            path = path[2:]
+
+        parent, _, name = path.rpartition("/")
+        if self._dir_ignored(parent):
+            return True
+        return self.match_entry(parent, name, is_dir)
+
+    def match_file(self, path: str) -> bool:
+        """Check whether a path is ignored, like ``pathspec.PathSpec.match_file``.
+
+        Args:
+            path: Path relative to the root; directories end with ``/``
+
+        Returns:
+            True if the path is ignored
+        """
+        return self.is_ignored(path, is_dir=path.endswith("/"))
+
+    def patterns(self) -> list[str]:
+        """Get the patterns of all rules read so far, relative to the root.
+
+        Patterns of nested ignore files are anchored to their directory, so
+        tools that only take root-level patterns ignore the same paths.
+
+        Returns:
+            Patterns in increasing order of precedence
+        """
+        result: list[str] = []
+        seen: set[str] = set()
+        for chain in sorted(self._chains.values(), key=len):
+            for prefix, rules in chain:
+                if prefix in seen:
+                    continue
+                seen.add(prefix)
+                result.extend(
+                    rules.patterns
+                    if not prefix
+                    else [anchor_pattern(pattern, prefix) for pattern in rules.patterns]
+                )
+        return result
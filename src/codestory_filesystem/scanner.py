@@ -0,0 +1,271 @@
+"""Parallel, single-pass scanner of a repository's directory tree.
+
+The scanner lists every directory once with ``os.scandir``. File metadata is
+taken from ``DirEntry.stat()``, which is a single ``stat`` call on POSIX and
+free on Windows. Each entry is matched against the ignore rules once, and
+ignored directories are pruned before they are listed.
+
+Directories are listed by a thread pool: a listed directory's subdirectories
+are submitted as new tasks. ``os.scandir`` and ``stat`` release the GIL, so
+workers overlap their filesystem round trips, which makes a large difference
+on network filesystems. Results are grouped into batches as they complete,
+so the consumer writes the first batches while the rest of the tree is still
+being scanned.
+
+Optionally, files are read by the same threads to hash them and keep the
+beginning of text files as their content (see ``content``).
+
+Every directory row is yielded before the rows of its contents: a directory
+is only listed after the result containing its own row has been collected.
+"""
+
+import logging
+import os
+import queue
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from .content import read_file_content
+from .ignore import IgnoreMatcher
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Default number of threads listing directories
+DEFAULT_WORKERS = 8
+
+# Default number of directory and file rows per batch
+DEFAULT_BATCH_SIZE = 1000
+
+# Default maximum bytes of file content per batch, which bounds the size of a
+# write to Neo4j when content is stored
+DEFAULT_BATCH_MAX_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class ScanBatch:
+    """Rows of directories and files found by the scanner.
+
+    Paths are relative to the repository root and use ``/`` separators. The
+    ``parent`` of an entry is the path of its directory, or ``""`` for the
+    repository root.
+    """
+
+    directories: list[dict[str, Any]] = field(default_factory=list)
+    files: list[dict[str, Any]] = field(default_factory=list)
+    skipped: int = 0
+
+    def __len__(self) -> int:
+        """Get the number of directory and file rows."""
+        return len(self.directories) + len(self.files)
+
+
+@dataclass
+class _Listing:
+    """Result of listing one directory."""
+
+    path: str
+    depth: int
+    directories: list[dict[str, Any]] = field(default_factory=list)
+    files: list[dict[str, Any]] = field(default_factory=list)
+    skipped: int = 0
+    # Bytes of content of each file row
+    file_bytes: list[int] = field(default_factory=list)
+
+
+class FilesystemScanner:
+    """Scans a repository with one ``os.scandir`` per directory."""
+
+    def __init__(
+        self,
+        root: str,
+        matcher: IgnoreMatcher | None = None,
+        include_extensions: list[str] | None = None,
+        max_depth: int | None = None,
+        workers: int = DEFAULT_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_max_bytes: int = DEFAULT_BATCH_MAX_BYTES,
+        hash_content: bool = False,
+        content_max_bytes: int = 0,
+    ):
+        """Initialize the scanner.
+
+        Args:
+            root: Path of the repository
+            matcher: Ignore matcher deciding which entries are skipped; by
+                default nothing is ignored
+            include_extensions: Only include files ending with one of these
+            max_depth: Maximum depth of directories to include, the
+                repository's top-level directories being at depth 1
+            workers: Number of threads listing directories
+            batch_size: Approximate number of rows per batch
+            batch_max_bytes: Maximum bytes of file content per batch; a
+                single file larger than this gets a batch of its own
+            hash_content: Whether to hash the content of every file
+            content_max_bytes: Maximum number of bytes of content kept per
+                text file; 0 keeps none
+        """
+        self.root = os.path.abspath(root)
+        self.matcher = matcher or IgnoreMatcher(None, builtin=False)
+        self.include_extensions = tuple(include_extensions) if include_extensions else None
+        self.max_depth = max_depth
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.batch_max_bytes = max(batch_max_bytes, 1)
+        self.hash_content = hash_content
+        self.content_max_bytes = max(content_max_bytes, 0)
+
+        # Directories found and listed so far, for progress reporting
+        self.dirs_found = 0
+        self.dirs_listed = 0
+
+    def _list(self, rel_dir: str, depth: int) -> _Listing:
+        """List one directory.
+
+        Args:
+            rel_dir: Relative path of the directory, ``""`` for the root
+            depth: Depth of the directory, 0 for the root
+
+        Returns:
+            The directory's included subdirectories and files
+        """
+        listing = _Listing(rel_dir, depth)
+        matcher = self.matcher
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        descend = self.max_depth is None or depth < self.max_depth
+
+        try:
+            with os.scandir(os.path.join(self.root, rel_dir)) as entries:
+                for entry in entries:
+                    rel_path = prefix + entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not descend or matcher.match_entry(rel_dir, entry.name, True):
+                                listing.skipped += 1
+                                continue
+                            listing.directories.append(
+                                {"path": rel_path, "name": entry.name, "parent": rel_dir}
+                            )
+                        elif entry.is_file():
+                            if matcher.match_entry(rel_dir, entry.name) or (
+                                self.include_extensions
+                                and not entry.name.endswith(self.include_extensions)
+                            ):
+                                listing.skipped += 1
+                                continue
+                            stat = entry.stat()
+                            row = {
+                                "path": rel_path,
+                                "name": entry.name,
+                                "parent": rel_dir,
+                                "extension": os.path.splitext(entry.name)[1].lstrip(".") or None,
+                                "size": stat.st_size,
+                                "modified": stat.st_mtime,
+                            }
+                            size = 0
+                            if self.hash_content or self.content_max_bytes:
+                                size = self._read_content(entry.path, row)
+                            listing.files.append(row)
+                            listing.file_bytes.append(size)
+                        else:
+                            # Sockets, devices, broken links, links to directories
+                            listing.skipped += 1
+                    except OSError as e:
+                        logger.warning(f"Skipping {rel_path}: {e}")
+                        listing.skipped += 1
+        except OSError as e:
+            logger.warning(f"Cannot list directory {rel_dir or '.'}: {e}")
+
+        return listing
+
+    def _read_content(self, path: str, row: dict[str, Any]) -> int:
+        """Add the content fields to a file's row.
+
+        Returns:
+            Bytes of content added
+        """
+        try:
+            content = read_file_content(path, self.hash_content, self.content_max_bytes)
+        except OSError as e:
+            logger.warning(f"Cannot read {path}: {e}")
+            row.update(
+                {
+                    "content_hash": None,
+                    "is_binary": None,
+                    "content": None,
+                    "content_truncated": None,
+                }
+            )
+            return 0
+        row.update(
+            {
+                "content_hash": content.content_hash,
+                "is_binary": content.binary,
+                "content": content.text,
+                "content_truncated": content.truncated,
+            }
+        )
+        return content.text_bytes
+
+    def scan(self) -> Iterator[ScanBatch]:
+        """Scan the repository.
+
+        Yields:
+            Batches of directory and file rows, of about ``batch_size`` rows
+            and at most ``batch_max_bytes`` of content. A directory's row is
+            yielded in the same batch as, or in a batch before, the rows of
+            its contents.
+        """
+        pool = ThreadPoolExecutor(self.workers, thread_name_prefix="fs-scan")
+        # Completed listings are collected from a queue: waiting on the set
+        # of pending futures would cost time linear in its size per listing
+        completed: queue.SimpleQueue[Future[_Listing]] = queue.SimpleQueue()
+
+        def submit(rel_dir: str, depth: int) -> None:
+            pool.submit(self._list, rel_dir, depth).add_done_callback(completed.put)
+
+        self.dirs_found, self.dirs_listed = 0, 0
+        outstanding = 1
+        submit("", 0)
+        batch = ScanBatch()
+        batch_bytes = 0
+        try:
+            while outstanding:
+                listing = completed.get().result()
+                outstanding -= 1
+                self.dirs_listed += 1
+                self.dirs_found += len(listing.directories)
+                for directory in listing.directories:
+                    submit(directory["path"], listing.depth + 1)
+                outstanding += len(listing.directories)
+
+                batch.directories.extend(listing.directories)
+                batch.skipped += listing.skipped
+                # The files of a directory are split across batches if their
+                # content exceeds the byte limit; their directory's row was
+                # yielded before the directory was listed
+                for row, size in zip(listing.files, listing.file_bytes, strict=True):
+                    if batch.files and batch_bytes + size > self.batch_max_bytes:
+                        yield batch
+                        batch, batch_bytes = ScanBatch(), 0
+                    batch.files.append(row)
+                    batch_bytes += size
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch, batch_bytes = ScanBatch(), 0
+            if batch or batch.skipped:
+                yield batch
+        finally:
+            # Stop listing if the consumer gave up on the scan
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def progress(self) -> float:
+        """Get the share of the found directories listed so far, in percent.
+
+        The number of directories grows as the scan proceeds, so this is an
+        estimate that only reaches 100 at the end of the scan.
+        """
+        return min(self.dirs_listed / (self.dirs_found + 1) * 100, 100.0)
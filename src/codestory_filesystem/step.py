@@ -6,59 +6,46 @@ of directories and files, which can be linked to AST nodes.
 
 import logging
 import os
-import pathlib
 import time
 import traceback
 from typing import Any
 
-import pathspec
 from celery import shared_task
 
 from codestory.config.settings import get_settings
 from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory.ingestion_pipeline.progress import create_reporter
 from codestory.ingestion_pipeline.step import PipelineStep, StepStatus, generate_job_id
+from codestory.ingestion_pipeline.step_logging import StepLogger
+
+from .graph import FilesystemWriter
+from .ignore import IgnoreMatcher
+from .scanner import (
+    DEFAULT_BATCH_MAX_BYTES,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_WORKERS,
+    FilesystemScanner,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Configure detailed logging
-DEBUG_ENABLED = True  # Set to False to disable detailed debug logs
-
-# Built-in ignore patterns for common noise files and directories
-BUILTIN_IGNORE_PATTERNS = [
-    ".git/",
-    "__pycache__/",
-    "*.pyc",
-    "*.pyo",
-    "*.log",
-    "*.tmp",
-    "node_modules/",
-    "build/",
-    "dist/",
-    ".venv/",
-    ".idea/",
-    ".vscode/",
-    ]
-    
+# Configure detailed logging. When enabled, log lines are also printed to the
+# console; this is slow for large repositories, so it is opt-in.
+DEBUG_ENABLED = os.environ.get("CODESTORY_FILESYSTEM_DEBUG", "").lower() in ("1", "true", "yes")
+
+
 def get_combined_ignore_spec(
     repository_path: str, extra_patterns: list[str] | None = None
-) -> pathspec.PathSpec:
-    """Returns a PathSpec combining built-in ignore patterns, .gitignore (if present), and any extra patterns.
-    
-    Built-in patterns are always first, then .gitignore, then extra_patterns.
+) -> IgnoreMatcher:
+    """Returns the ignore matcher of a repository.
+
+    Built-in patterns apply first, then the repository's .gitignore, then
+    extra_patterns; .gitignore files of subdirectories apply below their
+    directory. The matcher supports ``match_file`` like a pathspec.PathSpec.
     """
-    repo_root = pathlib.Path(repository_path)
-    gitignore_path = repo_root / ".gitignore"
-    pathspec_patterns = list(BUILTIN_IGNORE_PATTERNS)
-    if gitignore_path.exists():
-        with open(gitignore_path, "r") as f:
-            gitignore_patterns = [line.strip() for line in f if line.strip() and not line.startswith("#")]
-            pathspec_patterns.extend(gitignore_patterns)
-    if extra_patterns:
-        pathspec_patterns.extend(extra_patterns)
-    if ".git/" not in pathspec_patterns:
-        pathspec_patterns.append(".git/")
-    return pathspec.PathSpec.from_lines("gitwildmatch", pathspec_patterns)
+    return IgnoreMatcher(repository_path, extra_patterns)
+
 
 def log_debug(message: str, job_id: str | None = None) -> None:
     """Log a debug message with consistent formatting.
@@ -148,6 +135,8 @@ class FileSystemStep(PipelineStep):
                 - ignore_patterns: list of glob patterns to ignore
                 - max_depth: Maximum directory depth to traverse
                 - include_extensions: list of file extensions to include
+                - hash_content: Whether to store a content hash on File nodes
+                - content_max_bytes: Bytes of each text file stored as its content
                 - job_id: Optional job ID to use (will be generated if not provided)
 
         Returns:
@@ -515,7 +504,12 @@ def process_filesystem(  # type: ignore[no-untyped-def]
         max_depth: Maximum directory depth to traverse
         include_extensions: list of file extensions to include
         job_id: Identifier for the job
-        **config: Additional configuration parameters
+        **config: Additional configuration parameters; ``scan_workers`` sets the
+            number of threads scanning the tree, ``batch_size`` the number of
+            entries written per batch, ``batch_max_bytes`` the bytes of file
+            content written per batch, ``hash_content`` whether files are
+            hashed and ``content_max_bytes`` how much of each text file is
+            stored as its content
 
     Returns:
         dict[str, Any]: Result information
@@ -529,6 +523,9 @@ def process_filesystem(  # type: ignore[no-untyped-def]
     # Get task ID for logging
     task_id = self.request.id if hasattr(self, "request") else "Unknown"
 
+    # Progress is coalesced, so it can be reported for every directory
+    reporter = create_reporter(job_id, "filesystem", task=self)
+
     log_info(f"Starting filesystem processing task for repository: {repository_path}", job_id)
     log_debug(f"Task ID: {task_id}", job_id)
     log_debug(
@@ -565,27 +562,10 @@ def process_filesystem(  # type: ignore[no-untyped-def]
     except Exception as e:
         log_error("Error listing repository contents", error=e, job_id=job_id)
 
-    # Build pathspec from built-in ignore list and .gitignore (if present)
-    repo_root = pathlib.Path(repository_path)
-    gitignore_path = repo_root / ".gitignore"
-    pathspec_patterns = list(BUILTIN_IGNORE_PATTERNS)  # Start with built-in patterns
-
-    # If .gitignore exists, append its patterns (repo rules take precedence after built-in)
-    if gitignore_path.exists():
-        with open(gitignore_path, "r") as f:
-            gitignore_patterns = [line.strip() for line in f if line.strip() and not line.startswith("#")]
-            pathspec_patterns.extend(gitignore_patterns)
-
-    # If ignore_patterns is provided, add them as well (for legacy/config compatibility)
-    if ignore_patterns:
-        pathspec_patterns.extend(ignore_patterns)
-
-    # Always ensure .git/ is ignored (should be in built-in, but double-check)
-    if ".git/" not in pathspec_patterns:
-        pathspec_patterns.append(".git/")
-
-    spec = pathspec.PathSpec.from_lines("gitwildmatch", pathspec_patterns)
-    log_info(f"Using pathspec ignore patterns: {pathspec_patterns}", job_id)
+    # Built-in patterns, the repository's .gitignore files and the configured
+    # patterns, compiled once and shared by the scanner's threads
+    matcher = IgnoreMatcher(repository_path, ignore_patterns)
+    log_info(f"Using ignore patterns: {matcher.patterns()}", job_id)
 
     # Try multiple Neo4j connection configurations
     neo4j = None
@@ -760,445 +740,97 @@ def process_filesystem(  # type: ignore[no-untyped-def]
         except Exception as e:
             log_error("Error listing repository contents", error=e, job_id=job_id)
 
-        # Track overall directory processing performance
-        dir_timing_stats = {
-            "dir_node_creation": 0.0,
-            "dir_linking": 0.0,
-            "dir_total": 0.0,
-        }
-
-        log_info(f"Starting directory traversal. Ignore patterns: {ignore_patterns}", job_id)
-
-        # Track total directories to process (approximate count for progress)
-        total_dirs_estimate = sum(
-            len(dirs) for _, dirs, _ in os.walk(repository_path, topdown=True)
+        # Per-batch events go through the hot-path logger: formatted lazily,
+        # and timings aggregated across the scan
+        slog = StepLogger(logger, job_id)
+        slog.info("Starting directory scan. Ignore patterns: %s", ignore_patterns)
+
+        # Files can be read during the scan for their hash and capped content
+        hash_content = bool(config.get("hash_content", False))
+        content_max_bytes = int(config.get("content_max_bytes", 0))
+
+        # One scandir pass over the tree; batches are written as they arrive,
+        # while the scanner's threads keep listing the rest of the tree
+        scanner = FilesystemScanner(
+            repository_path,
+            matcher,
+            include_extensions=include_extensions,
+            max_depth=max_depth,
+            workers=config.get("scan_workers", DEFAULT_WORKERS),
+            batch_size=config.get("batch_size", DEFAULT_BATCH_SIZE),
+            batch_max_bytes=config.get("batch_max_bytes", DEFAULT_BATCH_MAX_BYTES),
+            hash_content=hash_content,
+            content_max_bytes=content_max_bytes,
         )
-        log_info(f"Estimated total directories: {total_dirs_estimate}", job_id)
-
-        for current_dir, dirs, files in os.walk(repository_path):
-            dir_start_time = time.time()
-            rel_path = os.path.relpath(current_dir, repository_path)
-            # Compute rel_path for pathspec (normalize to posix)
-            rel_path_posix = pathlib.Path(rel_path).as_posix() if rel_path != "." else ""
-            # Filter directories in-place using pathspec
-            dirs_to_remove = []
-            for d in list(dirs):
-                dir_rel = os.path.normpath(os.path.join(rel_path_posix, d)).replace("\\", "/")
-                if spec.match_file(dir_rel + "/"):
-                    log_debug(f"Ignoring directory {dir_rel} (matched .gitignore/pathspec)", job_id)
-                    dirs_to_remove.append(d)
-            for d in dirs_to_remove:
-                dirs.remove(d)
-            if dirs_to_remove:
-                log_info(
-                    f"Filtered {len(dirs_to_remove)} directories in {rel_path} due to .gitignore/pathspec",
-                    job_id,
+        writer = FilesystemWriter(
+            neo4j, repository_path, with_content=hash_content or content_max_bytes > 0
+        )
+        files_skipped = 0
+        changed_files = 0
+
+        batches = scanner.scan()
+        while True:
+            scan_start = time.perf_counter()
+            batch = next(batches, None)
+            slog.add_time("scan", time.perf_counter() - scan_start)
+            if batch is None:
+                break
+
+            files_skipped += batch.skipped
+            if batch.directories:
+                slog.item(
+                    "Writing %d directories, e.g. %s",
+                    len(batch.directories),
+                    batch.directories[0]["path"],
                 )
-    
-            # Create directory node
-            rel_dir_path = os.path.relpath(current_dir, repository_path)
-            if rel_dir_path == ".":
-                # This is the repository root
-                dir_node = repo_node
-                log_info("Using repository node as root directory node", job_id)
-            else:
-                log_info(f"Creating directory node: {rel_dir_path}", job_id)
-                try:
-                    # Create directory node
-                    dir_node_start = time.time()
-                    # Use MERGE for directory nodes to handle existing nodes
-                    dir_properties = {
-                        "name": os.path.basename(current_dir),
-                        "path": rel_dir_path,
-                    }
-                    dir_query = """
-                    MERGE (d:Directory {path: $props.path})
-                    SET d.name = $props.name
-                    RETURN d
-                    """
-                    dir_result = neo4j.execute_query(
-                        dir_query, params={"props": dir_properties}, write=True
-                    )
-                    dir_node = dir_result[0]["d"] if dir_result else None
-                    dir_node_end = time.time()
-                    dir_node_time = dir_node_end - dir_node_start
-                    dir_timing_stats["dir_node_creation"] += dir_node_time
-    
-                    if not dir_node:
-                        log_error(
-                            f"Failed to create directory node for {rel_dir_path}",
-                            job_id=job_id,
-                        )
-                    else:
-                        log_debug(
-                            f"Directory node created in {dir_node_time:.3f}s: {rel_dir_path}",
-                            job_id,
-                        )
-    
-                    # Link to parent directory using MERGE for relationship
-                    dir_linking_start = time.time()
-                    parent_path = os.path.dirname(rel_dir_path)
-                    if parent_path == "":
-                        # Parent is the repo
-                        log_debug(f"Linking directory {rel_dir_path} to repository", job_id)
-                        rel_query = """
-                        MATCH (r:Repository {path: $repo_path})
-                        MATCH (d:Directory {path: $dir_path})
-                        MERGE (r)-[rel:CONTAINS]->(d)
-                        RETURN rel
-                        """
-                        neo4j.execute_query(
-                            rel_query,
-                            params={
-                                "repo_path": repository_path,
-                                "dir_path": rel_dir_path,
-                            },
-                            write=True,
-                        )
-                    else:
-                        # Parent is another directory
-                        log_debug(
-                            f"Linking directory {rel_dir_path} to parent directory {parent_path}",
-                            job_id,
-                        )
-                        rel_query = """
-                        MATCH (p:Directory {path: $parent_path})
-                        MATCH (d:Directory {path: $dir_path})
-                        MERGE (p)-[rel:CONTAINS]->(d)
-                        RETURN rel
-                        """
-                        neo4j.execute_query(
-                            rel_query,
-                            params={
-                                "parent_path": parent_path,
-                                "dir_path": rel_dir_path,
-                            },
-                            write=True,
-                        )
-                    dir_linking_end = time.time()
-                    dir_linking_time = dir_linking_end - dir_linking_start
-                    dir_timing_stats["dir_linking"] += dir_linking_time
-                    log_debug(
-                        f"Directory relationship created in {dir_linking_time:.3f}s: "
-                        f"{rel_dir_path}",
-                        job_id,
-                    )
-    
-                    dir_count += 1
-    
-                    # Report directory progress for every directory
-                    if total_dirs_estimate > 0:
-                        progress_percent = min(100, (dir_count / total_dirs_estimate) * 100)
-                    else:
-                        progress_percent = 0
-    
-                    if dir_count > 0:
-                        avg_dir_node_time = dir_timing_stats["dir_node_creation"] / dir_count
-                        avg_dir_linking_time = dir_timing_stats["dir_linking"] / dir_count
-                    else:
-                        avg_dir_node_time = 0
-                        avg_dir_linking_time = 0
-    
-                    # Always report directory creation
-                    dir_progress_msg = (
-                        f"Created directory {dir_count}/{total_dirs_estimate} "
-                        f"({progress_percent:.1f}%): {rel_dir_path} "
-                        f"Avg times - node: {avg_dir_node_time:.3f}s, "
-                        f"linking: {avg_dir_linking_time:.3f}s"
-                    )
-                    log_info(dir_progress_msg, job_id)
-    
-                    # Update Celery task state
-                    try:
-                        self.update_state(
-                            state="PROGRESS",
-                            meta={
-                                "progress": progress_percent,
-                                "message": dir_progress_msg,
-                                "directory": rel_dir_path,
-                                "dir_count": dir_count,
-                                "total_dirs_estimate": total_dirs_estimate,
-                                "timing": {
-                                    "avg_dir_creation": avg_dir_node_time,
-                                    "avg_dir_linking": avg_dir_linking_time,
-                                },
-                            },
-                        )
-                    except Exception as e:
-                        log_error(
-                            "Error updating directory progress state",
-                            error=e,
-                            job_id=job_id,
-                        )
-    
-                except Exception as e:
-                    log_error(
-                        f"Error creating directory node for {rel_dir_path}",
-                        error=e,
-                        job_id=job_id,
-                    )
-                    raise
-    
-            # Track total directory processing time
-            dir_processing_end = time.time()
-            dir_timing_stats["dir_total"] += dir_processing_end - dir_start_time
-    
-            # Process files in the current directory
-            start_dir_time = time.time()
-            log_info(f"Processing {len(files)} files in directory {rel_dir_path}", job_id)
-            files_processed = 0
-            files_skipped = 0
-    
-            # Track timing for each operation type
-            file_timing_stats = {
-                "file_metadata": 0.0,
-                "file_node_creation": 0.0,
-                "linking": 0.0,
-                "total": 0.0,
-            }
-    
-            for file_idx, file in enumerate(files):
-                start_file_time = time.time()
-                file_rel = os.path.normpath(os.path.join(rel_path_posix, file)).replace("\\", "/")
-                # Skip files matching .gitignore/pathspec
-                if spec.match_file(file_rel):
-                    files_skipped += 1
-                    continue
-    
-                # Check if extension is included
-                if include_extensions and not any(file.endswith(ext) for ext in include_extensions):
-                    files_skipped += 1
-                    continue
-    
-                # Create file node
-                file_path = os.path.join(rel_dir_path, file)
-                if rel_dir_path == ".":
-                    file_path = file
-    
-                log_debug(f"[{file_idx + 1}/{len(files)}] Processing file: {file_path}", job_id)
-                try:
-                    # Get file metadata
-                    metadata_start = time.time()
-                    abs_file_path = os.path.join(current_dir, file)
-                    file_size = os.path.getsize(abs_file_path)
-                    file_modified = os.path.getmtime(abs_file_path)
-                    file_extension = os.path.splitext(file)[1].lstrip(".") or None
-                    metadata_end = time.time()
-                    file_timing_stats["file_metadata"] += metadata_end - metadata_start
-    
-                    # Use MERGE for file nodes to handle existing nodes
-                    node_start = time.time()
-                    file_properties = {
-                        "name": file,
-                        "path": file_path,
-                        "extension": file_extension,
-                        "size": file_size,
-                        "modified": file_modified,
-                    }
-                    file_query = """
-                    MERGE (f:File {path: $props.path})
-                    SET f.name = $props.name,
-                        f.extension = $props.extension,
-                        f.size = $props.size,
-                        f.modified = $props.modified
-                    RETURN f
-                    """
-                    file_result = neo4j.execute_query(
-                        file_query, params={"props": file_properties}, write=True
-                    )
-                    file_node = file_result[0]["f"] if file_result else None
-                    node_end = time.time()
-                    node_time = node_end - node_start
-                    file_timing_stats["file_node_creation"] += node_time
-    
-                    if not file_node:
-                        log_error(f"Failed to create file node for {file_path}", job_id=job_id)
-                    else:
-                        log_debug(
-                            f"File node created in {node_time:.3f}s: {file_path}",
-                            job_id,
-                        )
-    
-                    # Link to parent (repository or directory)
-                    linking_start = time.time()
-                    if rel_dir_path == ".":
-                        # Parent is the repo
-                        log_debug(f"Linking file {file_path} to repository", job_id)
-                        rel_query = """
-                        MATCH (r:Repository {path: $repo_path})
-                        MATCH (f:File {path: $file_path})
-                        MERGE (r)-[rel:CONTAINS]->(f)
-                        RETURN rel
-                        """
-                        neo4j.execute_query(
-                            rel_query,
-                            params={
-                                "repo_path": repository_path,
-                                "file_path": file_path,
-                            },
-                            write=True,
-                        )
-                    else:
-                        # Parent is a directory
-                        log_debug(
-                            f"Linking file {file_path} to directory {rel_dir_path}",
-                            job_id,
-                        )
-                        rel_query = """
-                        MATCH (d:Directory {path: $dir_path})
-                        MATCH (f:File {path: $file_path})
-                        MERGE (d)-[rel:CONTAINS]->(f)
-                        RETURN rel
-                        """
-                        neo4j.execute_query(
-                            rel_query,
-                            params={"dir_path": rel_dir_path, "file_path": file_path},
-                            write=True,
-                        )
-                    linking_end = time.time()
-                    linking_time = linking_end - linking_start
-                    file_timing_stats["linking"] += linking_time
-                    log_debug(
-                        f"File relationship created in {linking_time:.3f}s: {file_path}",
-                        job_id,
-                    )
-    
-                    file_count += 1
-                    files_processed += 1
-    
-                    file_end_time = time.time()
-                    file_total_time = file_end_time - start_file_time
-                    file_timing_stats["total"] += file_total_time
-    
-                    # Calculate average times for reporting
-                    if files_processed > 0:
-                        avg_time_per_file = file_timing_stats["total"] / files_processed
-                        avg_node_time = file_timing_stats["file_node_creation"] / files_processed
-                        avg_linking_time = file_timing_stats["linking"] / files_processed
-                    else:
-                        avg_time_per_file = 0
-                        avg_node_time = 0
-                        avg_linking_time = 0
-    
-                    # Report progress more frequently for better visibility
-                    if file_count % 10 == 0:
-                        progress_msg = (
-                            f"Processed {file_count}/{file_count + files_skipped} files, "
-                            f"{dir_count} directories. "
-                            f"Avg time per file: {avg_time_per_file:.3f}s "
-                            f"(node: {avg_node_time:.3f}s, linking: {avg_linking_time:.3f}s)"
-                        )
-                        log_info(progress_msg, job_id)
-    
-                        # Update Celery task state
-                        try:
-                            self.update_state(
-                                state="PROGRESS",
-                                meta={
-                                    "progress": None,  # Can't know total
-                                    "message": progress_msg,
-                                    "file_count": file_count,
-                                    "dir_count": dir_count,
-                                    "timing": {
-                                        "avg_per_file": avg_time_per_file,
-                                        "avg_node_creation": avg_node_time,
-                                        "avg_linking": avg_linking_time,
-                                    },
-                                },
-                            )
-                        except Exception as e:
-                            log_error("Error updating progress state", error=e, job_id=job_id)
-    
-                except Exception as e:
-                    log_error(
-                        f"Error creating file node for {file_path}",
-                        error=e,
-                        job_id=job_id,
-                    )
-                    # Continue with other files
-                    continue
-    
-            # Log directory completion with timing info
-            dir_end_time = time.time()
-            dir_total_time = dir_end_time - start_dir_time
-            dir_summary = (
-                f"Directory {rel_dir_path} completed in {dir_total_time:.2f}s: "
-                f"{files_processed} files processed, {files_skipped} files skipped"
+            try:
+                node_start = time.perf_counter()
+                changed_files += len(writer.write_nodes(batch))
+                slog.add_time("node_creation", time.perf_counter() - node_start)
+
+                linking_start = time.perf_counter()
+                writer.write_relationships(batch)
+                slog.add_time("linking", time.perf_counter() - linking_start)
+            except Exception as e:
+                slog.error("Error writing a batch of %d entries: %s", len(batch), e, exc_info=e)
+                raise
+
+            dir_count += len(batch.directories)
+            file_count += len(batch.files)
+
+            # Report progress; the reporter coalesces reports
+            reporter.report(
+                scanner.progress,
+                f"Processed {file_count} files, {dir_count} directories",
+                file_count=file_count,
+                dir_count=dir_count,
             )
-            log_info(dir_summary, job_id)
-    
-            # Log summary for this directory
-            if files_processed > 0 or files_skipped > 0:
-                log_debug(
-                    f"Directory {rel_dir_path} processed: {files_processed} files created, "
-                    f"{files_skipped} files skipped",
-                    job_id,
-                )
+
+            # Aggregated timings are logged periodically rather than per batch
+            slog.maybe_log_stats()
+
+        slog.log_stats()
+        slog.info(
+            "Scan complete: %d files processed, %d entries skipped", file_count, files_skipped
+        )
+        if hash_content:
+            slog.info("%d files are new or have changed content", changed_files)
 
         # Record end time and compile detailed timing statistics
         end_time = time.time()
         duration = end_time - start_time
 
-        # Calculate timing averages and totals
+        node_creation = slog.total("node_creation")
+        linking = slog.total("linking")
+        write_batches = slog.count("node_creation")
         overall_timing_stats = {
             "total_duration": duration,
-            "directory_operations": {
-                "total": dir_timing_stats.get("dir_total", 0),
-                "node_creation": dir_timing_stats.get("dir_node_creation", 0),
-                "linking": dir_timing_stats.get("dir_linking", 0),
-                "avg_per_directory": dir_timing_stats.get("dir_total", 0) / max(1, dir_count)
-                if dir_count
-                else 0,
-            },
-            "file_operations": {
-                "total": file_timing_stats.get("total", 0)
-                if "file_timing_stats" in locals()
-                else 0,
-                "metadata": file_timing_stats.get("file_metadata", 0)
-                if "file_timing_stats" in locals()
-                else 0,
-                "node_creation": file_timing_stats.get("file_node_creation", 0)
-                if "file_timing_stats" in locals()
-                else 0,
-                "linking": file_timing_stats.get("linking", 0)
-                if "file_timing_stats" in locals()
-                else 0,
-                "avg_per_file": file_timing_stats.get("total", 0) / max(1, file_count)
-                if "file_timing_stats" in locals() and file_count
-                else 0,
-            },
+            "scan": slog.total("scan"),
             "neo4j_operations": {
-                "node_creation": (
-                    dir_timing_stats.get("dir_node_creation", 0)
-                    + (
-                        file_timing_stats.get("file_node_creation", 0)
-                        if "file_timing_stats" in locals()
-                        else 0
-                    )
-                ),
-                "relationship_creation": (
-                    dir_timing_stats.get("dir_linking", 0)
-                    + (
-                        file_timing_stats.get("linking", 0)
-                        if "file_timing_stats" in locals()
-                        else 0
-                    )
-                ),
-                "avg_operation_time": (
-                    dir_timing_stats.get("dir_node_creation", 0)
-                    + dir_timing_stats.get("dir_linking", 0)
-                    + (
-                        file_timing_stats.get("file_node_creation", 0)
-                        if "file_timing_stats" in locals()
-                        else 0
-                    )
-                    + (
-                        file_timing_stats.get("linking", 0)
-                        if "file_timing_stats" in locals()
-                        else 0
-                    )
-                )
-                / max(1, (dir_count * 2 + file_count * 2)),
+                "node_creation": node_creation,
+                "relationship_creation": linking,
+                "batches": write_batches,
+                "avg_batch_time": (node_creation + linking) / max(1, write_batches),
             },
         }
 
@@ -1206,26 +838,12 @@ def process_filesystem(  # type: ignore[no-untyped-def]
         detailed_timing = (
             f"Detailed Timing Stats:\n"
             f"Total Duration: {duration:.2f}s\n"
-            f"Directory Operations ({dir_count} dirs):\n"
-            f"  - Total: {overall_timing_stats['directory_operations']['total']:.2f}s\n"  # type: ignore[index]
-            f"  - Node creation: "
-            f"{overall_timing_stats['directory_operations']['node_creation']:.2f}s\n"  # type: ignore[index]
-            f"  - Linking: {overall_timing_stats['directory_operations']['linking']:.2f}s\n"  # type: ignore[index]
-            f"  - Avg per directory: "
-            f"{overall_timing_stats['directory_operations']['avg_per_directory']:.3f}s\n"  # type: ignore[index]
-            f"File Operations ({file_count} files):\n"
-            f"  - Total: {overall_timing_stats['file_operations']['total']:.2f}s\n"  # type: ignore[index]
-            f"  - Metadata: {overall_timing_stats['file_operations']['metadata']:.2f}s\n"  # type: ignore[index]
-            f"  - Node creation: {overall_timing_stats['file_operations']['node_creation']:.2f}s\n"  # type: ignore[index]
-            f"  - Linking: {overall_timing_stats['file_operations']['linking']:.2f}s\n"  # type: ignore[index]
-            f"  - Avg per file: {overall_timing_stats['file_operations']['avg_per_file']:.3f}s\n"  # type: ignore[index]
-            f"Neo4j Operations:\n"
-            f"  - Node creation total: "
-            f"{overall_timing_stats['neo4j_operations']['node_creation']:.2f}s\n"  # type: ignore[index]
-            f"  - Relationship creation total: "
-            f"{overall_timing_stats['neo4j_operations']['relationship_creation']:.2f}s\n"  # type: ignore[index]
-            f"  - Avg operation time: "
-            f"{overall_timing_stats['neo4j_operations']['avg_operation_time']:.3f}s\n"  # type: ignore[index]
+            f"Waiting for the scanner: {overall_timing_stats['scan']:.2f}s\n"
+            f"Neo4j Operations ({dir_count} dirs, {file_count} files, {write_batches} batches):\n"
+            f"  - Node creation total: {node_creation:.2f}s\n"
+            f"  - Relationship creation total: {linking:.2f}s\n"
+            f"  - Avg batch time: "
+            f"{overall_timing_stats['neo4j_operations']['avg_batch_time']:.3f}s\n"  # type: ignore[index]
         )
 
         log_info(f"Performance Analysis:\n{detailed_timing}", job_id)
@@ -1255,12 +873,9 @@ def process_filesystem(  # type: ignore[no-untyped-def]
                 "file_count": file_count,
                 "dir_count": dir_count,
                 "performance": {
-                    "avg_file_time": overall_timing_stats["file_operations"]["avg_per_file"],  # type: ignore[index]
-                    "avg_dir_time": overall_timing_stats["directory_operations"][  # type: ignore[index]
-                        "avg_per_directory"
-                    ],
-                    "avg_neo4j_op_time": overall_timing_stats["neo4j_operations"][  # type: ignore[index]
-                        "avg_operation_time"
+                    "scan_time": overall_timing_stats["scan"],
+                    "avg_batch_time": overall_timing_stats["neo4j_operations"][  # type: ignore[index]
+                        "avg_batch_time"
                     ],
                 },
             }
@@ -1276,14 +891,17 @@ def process_filesystem(  # type: ignore[no-untyped-def]
         completion_msg = (
             f"Completed filesystem processing for {repository_path}:\n"
             f"- {file_count} files, {dir_count} directories in {duration:.2f} seconds\n"
-            f"- Average Neo4j operation time: "
-            f"{overall_timing_stats['neo4j_operations']['avg_operation_time']:.3f}s\n"  # type: ignore[index]
-            f"- Average file processing time: "
-            f"{overall_timing_stats['file_operations']['avg_per_file']:.3f}s\n"  # type: ignore[index]
-            f"- Average directory processing time: "
-            f"{overall_timing_stats['directory_operations']['avg_per_directory']:.3f}s"  # type: ignore[index]
+            f"- Average Neo4j batch time: "
+            f"{overall_timing_stats['neo4j_operations']['avg_batch_time']:.3f}s"  # type: ignore[index]
         )
         log_info(completion_msg, job_id)
+        reporter.report(
+            100.0,
+            completion_msg,
+            StepStatus.COMPLETED,
+            file_count=file_count,
+            dir_count=dir_count,
+        )
 
         # Update task state to SUCCESS with detailed timing information
         try:
@@ -1295,6 +913,7 @@ def process_filesystem(  # type: ignore[no-untyped-def]
                     "duration": duration,
                     "file_count": file_count,
                     "dir_count": dir_count,
+                    "changed_files": changed_files,
                     "message": completion_msg,
                     "timing_stats": overall_timing_stats,
                 },
@@ -1309,6 +928,7 @@ def process_filesystem(  # type: ignore[no-untyped-def]
             "duration": duration,
             "file_count": file_count,
             "dir_count": dir_count,
+            "changed_files": changed_files,
             "message": completion_msg,
             "timing_stats": overall_timing_stats,
         }
@@ -1317,6 +937,7 @@ def process_filesystem(  # type: ignore[no-untyped-def]
         # Handle any unhandled exceptions in the main processing block
         error_msg = f"Error processing filesystem for repository {repository_path}"
         log_error(error_msg, error=e, job_id=job_id)
+        reporter.report(None, str(e), StepStatus.FAILED)
 
         # Update task state to FAILURE
         try:
@@ -1340,4 +961,4 @@ def process_filesystem(  # type: ignore[no-untyped-def]
                 log_debug("Closing Neo4j connection", job_id)
                 neo4j.close()
             except Exception as close_error:
-                log_error("Error closing Neo4j connection", error=close_error, job_id=job_id)
\ No newline at end of file
+                log_error("Error closing Neo4j connection", error=close_error, job_id=job_id)
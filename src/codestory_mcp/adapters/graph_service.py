@@ -12,32 +12,84 @@ import structlog
 from fastapi import status
 from neo4j.graph import Node, Relationship
 
+from codestory_mcp.adapters.http_client import ServiceClient, get_service_client
 from codestory_mcp.tools.base import ToolError
 from codestory_mcp.utils.config import get_mcp_settings
 from codestory_mcp.utils.metrics import get_metrics
 
 logger = structlog.get_logger(__name__)
 
+# Fetch a node with its stored summaries, newest first, and the content hash of
+# the file the node is in; embeddings are left out of the properties to keep the
+# response small
+NODE_SUMMARIES_QUERY = """
+MATCH (n) WHERE {match}
+OPTIONAL MATCH (f:File)-[:CONTAINS*0..]->(n)
+WITH n, head(collect(f.content_hash)) AS source_hash
+OPTIONAL MATCH (n)-[:HAS_SUMMARY]->(s:Summary)
+WITH n, source_hash, s ORDER BY s.timestamp DESC
+RETURN elementId(n) AS id,
+       labels(n) AS labels,
+       n {{.*, embedding: null}} AS properties,
+       source_hash,
+       [x IN collect(s) | {{
+           id: x.id,
+           text: x.text,
+           timestamp: x.timestamp,
+           content_hash: x.content_hash,
+           source_hash: x.source_hash
+       }}] AS summaries
+"""
+
+# Store a summary and link it to its node
+STORE_SUMMARY_QUERY = """
+MATCH (n) WHERE {match}
+CREATE (s:Summary {{
+    id: randomUUID(),
+    text: $summary,
+    timestamp: $timestamp,
+    source_type: $source_type,
+    content_hash: $content_hash,
+    source_hash: $source_hash
+}})
+CREATE (n)-[:HAS_SUMMARY]->(s)
+RETURN s.id AS id
+"""
+
+
+def _node_match(node_id: str) -> str:
+    """Get the condition matching node ``n`` by internal or element ID."""
+    if node_id.isdigit():
+        return "id(n) = toInteger($node_id)"
+    return "elementId(n) = $node_id"
+
 
 class GraphServiceAdapter:
     """Adapter for the Code Story Graph Service."""
 
-    def __init__(self, base_url: str | None = None) -> None:
+    def __init__(self, base_url: str | None = None, client: ServiceClient | None = None) -> None:
         """Initialize the adapter.
 
         Args:
             base_url: Base URL of the Code Story service
+            client: Optional HTTP client (default: the client shared by all
+                adapters of the service URL)
         """
         settings = get_mcp_settings()
         self.base_url = base_url or settings.code_story_service_url
         self.metrics = get_metrics()
 
-        # Create HTTP client for API requests
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=30.0,
-            follow_redirects=True,
-        )
+        self._client = client
+
+    @property
+    def client(self) -> ServiceClient:
+        """Get the HTTP client.
+
+        Unless one was given, this is the pooled client shared across tool
+        invocations, looked up on each use so that a client closed at server
+        shutdown is replaced.
+        """
+        return self._client or get_service_client(self.base_url)
 
     async def search(
         self, query: str, node_types: list[str] | None = None, limit: int = 10
@@ -69,7 +121,7 @@ class GraphServiceAdapter:
                 payload["node_types"] = node_types
 
             # Make request to Code Story service
-            response = await self.client.post(endpoint, json=payload)
+            response = await self.client.post(endpoint, json=payload, coalesce=True)
 
             # Check for errors
             if response.status_code != 200:
@@ -209,7 +261,7 @@ class GraphServiceAdapter:
             }
 
             # Make request to Code Story service
-            response = await self.client.post(endpoint, json=payload)
+            response = await self.client.post(endpoint, json=payload, coalesce=True)
 
             # Check for errors
             if response.status_code != 200:
@@ -272,13 +324,14 @@ class GraphServiceAdapter:
             raise ToolError(error_message, status_code=status.HTTP_502_BAD_GATEWAY) from e
 
     async def execute_cypher(
-        self, query: str, parameters: dict[str, Any] | None = None
+        self, query: str, parameters: dict[str, Any] | None = None, write: bool = False
     ) -> dict[str, Any]:
         """Execute a Cypher query.
 
         Args:
             query: Cypher query
             parameters: Optional query parameters
+            write: Whether the query writes to the database
 
         Returns:
             Query results
@@ -298,8 +351,12 @@ class GraphServiceAdapter:
             if parameters:
                 payload["parameters"] = parameters  # type: ignore  # TODO: Fix type compatibility
 
-            # Make request to Code Story service
-            response = await self.client.post(endpoint, json=payload)
+            if write:
+                payload["query_type"] = "write"
+
+            # Make request to Code Story service; identical concurrent reads
+            # share one round trip
+            response = await self.client.post(endpoint, json=payload, coalesce=not write)
 
             # Check for errors
             if response.status_code != 200:
@@ -328,9 +385,81 @@ class GraphServiceAdapter:
             self.metrics.record_service_api_call(endpoint, "error", time.time() - start_time)
             raise ToolError(error_message, status_code=status.HTTP_502_BAD_GATEWAY) from e
 
+    async def find_node_summaries(
+        self, node_id: str
+    ) -> tuple[Node, list[dict[str, Any]], str | None]:
+        """Find a node together with its stored summaries.
+
+        Args:
+            node_id: Internal or element ID of the node
+
+        Returns:
+            Node, its summaries (id, text, timestamp, content_hash,
+            source_hash) newest first, and the content hash of the file the
+            node is in, or None if the file was not hashed
+
+        Raises:
+            ToolError: If the node is not found or the query fails
+        """
+        result = await self.execute_cypher(
+            NODE_SUMMARIES_QUERY.format(match=_node_match(node_id)), {"node_id": node_id}
+        )
+        rows = result.get("rows", [])
+        if not rows:
+            raise ToolError("Node not found", status_code=status.HTTP_404_NOT_FOUND)
+
+        record = dict(zip(result.get("columns", []), rows[0], strict=False))
+        properties = {k: v for k, v in (record.get("properties") or {}).items() if v is not None}
+        node = MockNode(id=record["id"], labels=record.get("labels") or [], properties=properties)
+        summaries = [s for s in record.get("summaries") or [] if s.get("text")]
+        return node, summaries, record.get("source_hash")  # type: ignore[return-value]
+
+    async def store_summary(
+        self,
+        node_id: str,
+        summary: str,
+        source_type: str,
+        content_hash: str | None = None,
+        source_hash: str | None = None,
+    ) -> str | None:
+        """Store a summary for a node.
+
+        Args:
+            node_id: Internal or element ID of the node
+            summary: Summary text
+            source_type: Type of the summarized node
+            content_hash: Hash of the summarized content
+            source_hash: Content hash of the file the node is in
+
+        Returns:
+            ID of the stored summary, or None if the node was not found
+
+        Raises:
+            ToolError: If the query fails
+        """
+        result = await self.execute_cypher(
+            STORE_SUMMARY_QUERY.format(match=_node_match(node_id)),
+            {
+                "node_id": node_id,
+                "summary": summary,
+                "timestamp": time.time(),
+                "source_type": source_type,
+                "content_hash": content_hash,
+                "source_hash": source_hash,
+            },
+            write=True,
+        )
+        rows = result.get("rows", [])
+        return rows[0][0] if rows else None
+
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Close the HTTP client given to the adapter.
+
+        The shared client of the service URL is left open for the other
+        adapters; it is closed by close_service_clients at server shutdown.
+        """
+        if self._client is not None:
+            await self._client.aclose()
 
 
 class MockNode:
@@ -384,6 +513,17 @@ class MockNode:
             return self.properties[key]
         raise KeyError(key)
 
+    def __contains__(self, key: object) -> bool:
+        """Check whether a property is set.
+
+        Args:
+            key: Property key
+
+        Returns:
+            True if the property is set
+        """
+        return key in self.properties
+
 
 class MockRelationship:
     """Mock Neo4j Relationship for use with the adapter."""
@@ -449,6 +589,17 @@ class MockRelationship:
             return self.properties[key]
         raise KeyError(key)
 
+    def __contains__(self, key: object) -> bool:
+        """Check whether a property is set.
+
+        Args:
+            key: Property key
+
+        Returns:
+            True if the property is set
+        """
+        return key in self.properties
+
 
 @lru_cache
 def get_graph_service() -> GraphServiceAdapter:
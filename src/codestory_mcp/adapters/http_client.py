@@ -0,0 +1,207 @@
+"""Shared HTTP client for calls from the MCP Adapter to the Code Story service.
+
+Tool instances are created per request, so the adapters they use share one
+connection-pooled client per service URL instead of opening connections of
+their own. The client speaks HTTP/2 when the ``h2`` package is installed
+(the ``http2`` extra) and the service is reached over TLS, where HTTP/2 is
+negotiated; plain ``http://`` URLs stay on HTTP/1.1. It applies per-endpoint
+timeouts and lets identical concurrent read requests share one round trip to
+the service.
+"""
+
+import asyncio
+import importlib.util
+import json
+from typing import Any
+
+import httpx
+import structlog
+
+from codestory_mcp.utils.config import get_mcp_settings
+
+logger = structlog.get_logger(__name__)
+
+
+def _http2_available() -> bool:
+    """Check whether httpx can speak HTTP/2 (requires the ``h2`` package)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ServiceClient:
+    """Connection-pooled client for the Code Story service."""
+
+    def __init__(
+        self,
+        base_url: str,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        endpoint_timeouts: dict[str, float] | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            base_url: Base URL of the Code Story service
+            http2: Use HTTP/2 if the ``h2`` package is installed
+            max_connections: Maximum number of open connections
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Default request timeout in seconds
+            endpoint_timeouts: Request timeouts by endpoint path prefix; the
+                longest matching prefix wins
+            transport: Optional transport, for tests
+        """
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but the h2 package is not installed")
+            http2 = False
+
+        self.base_url = base_url
+        self.http2 = http2
+        self.timeout = timeout
+        # Longest prefixes first, so the first match is the most specific
+        self.endpoint_timeouts = dict(
+            sorted((endpoint_timeouts or {}).items(), key=lambda item: -len(item[0]))
+        )
+        self._inflight: dict[str, asyncio.Future[httpx.Response]] = {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether the client has been closed."""
+        return self._client.is_closed
+
+    def timeout_for(self, path: str) -> float:
+        """Get the request timeout for an endpoint.
+
+        Args:
+            path: Endpoint path
+
+        Returns:
+            Timeout in seconds
+        """
+        for prefix, timeout in self.endpoint_timeouts.items():
+            if path.startswith(prefix):
+                return timeout
+        return self.timeout
+
+    async def _coalesced(self, key: str, send: Any) -> httpx.Response:
+        """Send a request, or join an identical one already in flight.
+
+        Args:
+            key: Identity of the request
+            send: Zero-argument coroutine function sending the request
+
+        Returns:
+            Response, shared by all callers that joined
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(send())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield the shared request from cancellation of a single caller
+        return await asyncio.shield(future)
+
+    async def get(self, path: str, params: dict[str, Any] | None = None) -> httpx.Response:
+        """Send a GET request; identical concurrent GETs share one round trip.
+
+        Args:
+            path: Endpoint path
+            params: Optional query parameters
+
+        Returns:
+            Response
+        """
+        key = f"GET {path} {_dumps(params or {})}"
+        return await self._coalesced(
+            key,
+            lambda: self._client.get(path, params=params, timeout=self.timeout_for(path)),
+        )
+
+    async def post(
+        self, path: str, json: dict[str, Any] | None = None, coalesce: bool = False
+    ) -> httpx.Response:
+        """Send a POST request.
+
+        Args:
+            path: Endpoint path
+            json: JSON payload
+            coalesce: Share the round trip with identical concurrent requests;
+                only for requests that do not modify anything
+
+        Returns:
+            Response
+        """
+
+        def send() -> Any:
+            return self._client.post(path, json=json, timeout=self.timeout_for(path))
+
+        if not coalesce:
+            return await send()  # type: ignore[no-any-return]
+
+        key = f"POST {path} {_dumps(json)}"
+        return await self._coalesced(key, send)
+
+    async def aclose(self) -> None:
+        """Close the client and its connections."""
+        await self._client.aclose()
+
+
+def _dumps(payload: Any) -> str:
+    """Serialize a payload canonically for use as a coalescing key."""
+    return json.dumps(payload, sort_keys=True, default=str)
+
+
+# Shared clients by service URL
+_clients: dict[str, ServiceClient] = {}
+
+
+def get_service_client(base_url: str | None = None) -> ServiceClient:
+    """Get the shared client for a service URL, creating it on first use.
+
+    Args:
+        base_url: Service URL (default: the configured Code Story service)
+
+    Returns:
+        Shared client
+    """
+    settings = get_mcp_settings()
+    base_url = base_url or settings.code_story_service_url
+
+    client = _clients.get(base_url)
+    if client is None or client.is_closed:
+        client = ServiceClient(
+            base_url,
+            http2=settings.service_http2,
+            max_connections=settings.service_max_connections,
+            max_keepalive_connections=settings.service_max_keepalive_connections,
+            keepalive_expiry=settings.service_keepalive_expiry,
+            timeout=settings.service_timeout,
+            endpoint_timeouts=settings.service_endpoint_timeouts,
+        )
+        _clients[base_url] = client
+        logger.info("Created service client", base_url=base_url, http2=client.http2)
+    return client
+
+
+async def close_service_clients() -> None:
+    """Close all shared clients."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
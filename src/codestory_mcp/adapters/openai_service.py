@@ -12,8 +12,18 @@ from fastapi import status
 
 from codestory.llm.client import OpenAIClient
 from codestory.llm.models import ChatCompletionRequest, ChatMessage
+from codestory_mcp.adapters.graph_service import GraphServiceAdapter, get_graph_service
 from codestory_mcp.tools.base import ToolError
+from codestory_mcp.utils.config import get_mcp_settings
 from codestory_mcp.utils.metrics import get_metrics
+from codestory_mcp.utils.similarity import (
+    CODE_LABELS,
+    SIMILAR_CODE_QUERY,
+    SUMMARY_VECTOR_INDEX,
+    EmbeddingCache,
+    identifier_tokens,
+    rerank,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -21,14 +31,31 @@ logger = structlog.get_logger(__name__)
 class OpenAIServiceAdapter:
     """Adapter for the OpenAI client."""
 
-    def __init__(self, client: OpenAIClient | None = None) -> None:
+    def __init__(
+        self,
+        client: OpenAIClient | None = None,
+        graph_service: GraphServiceAdapter | None = None,
+    ) -> None:
         """Initialize the adapter.
 
         Args:
             client: Optional OpenAI client
+            graph_service: Optional graph service adapter used for vector search
         """
+        settings = get_mcp_settings()
         self.client = client or OpenAIClient()
         self.metrics = get_metrics()
+        self._graph_service = graph_service
+        self.embedding_cache = EmbeddingCache(settings.similar_code_cache_size)
+        self.candidate_factor = settings.similar_code_candidate_factor
+        self.lexical_weight = settings.similar_code_lexical_weight
+
+    @property
+    def graph_service(self) -> GraphServiceAdapter:
+        """Get the graph service adapter, created on first use."""
+        if self._graph_service is None:
+            self._graph_service = get_graph_service()
+        return self._graph_service
 
     async def generate_code_summary(
         self, code: str, context: str | None = None, max_tokens: int = 500
@@ -218,6 +245,12 @@ class OpenAIServiceAdapter:
     async def find_similar_code(self, code: str, limit: int = 5) -> list[dict[str, Any]]:
         """Find semantically similar code.
 
+        The snippet is embedded (embeddings of repeated snippets are cached),
+        the Summary vector index is queried for ``limit * candidate_factor``
+        summaries, which are mapped to the Function, Class and File nodes they
+        summarize, and the candidates are reranked by identifier overlap with
+        the snippet.
+
         Args:
             code: Code snippet to find similar code for
             limit: Maximum number of results to return
@@ -232,28 +265,56 @@ class OpenAIServiceAdapter:
 
         try:
             # Get embeddings for the code snippet
-            await self.client.create_embedding(code)
-
-            # Record metrics for embedding creation
-            embedding_duration = time.time() - start_time
-            self.metrics.record_service_api_call("openai_embedding", "success", embedding_duration)
-
-            # TODO: Implement vector search for similar code
-            # This would typically use the embedding to search a vector index
-            # For now, return a placeholder implementation
+            embedding = self.embedding_cache.get(code)
+            if embedding is None:
+                response = await self.client.embed_async([code])
+                embedding = response.data[0].embedding
+                self.embedding_cache.put(code, embedding)
+
+                # Record metrics for embedding creation
+                embedding_duration = time.time() - start_time
+                self.metrics.record_service_api_call(
+                    "openai_embedding", "success", embedding_duration
+                )
 
-            # Mock results for similar code
-            results = [
+            # Search the summaries of code entities
+            result = await self.graph_service.execute_cypher(
+                SIMILAR_CODE_QUERY,
                 {
-                    "id": f"mock-{i}",
-                    "type": "Function",
-                    "name": f"similarFunction{i}",
-                    "content": f"def similarFunction{i}():\n    print('Similar to provided code')",
-                    "path": f"/path/to/file{i}.py",
-                    "score": 1.0 - (i * 0.1),
+                    "index": SUMMARY_VECTOR_INDEX,
+                    "labels": list(CODE_LABELS),
+                    "k": limit * self.candidate_factor,
+                    "embedding": embedding,
+                },
+            )
+
+            # Convert rows to candidates
+            columns = result.get("columns", [])
+            candidates: dict[str, dict[str, Any]] = {}
+            for row in result.get("rows", []):
+                record = dict(zip(columns, row, strict=False))
+                if record["id"] in candidates:
+                    continue
+                labels = record.get("labels") or []
+                candidates[record["id"]] = {
+                    "id": record["id"],
+                    "type": next((label for label in CODE_LABELS if label in labels), None)
+                    or (labels[0] if labels else "Unknown"),
+                    "name": record.get("name"),
+                    "qualified_name": record.get("qualified_name"),
+                    "content": record.get("content") or "",
+                    "path": record.get("path"),
+                    "start_line": record.get("start_line"),
+                    "end_line": record.get("end_line"),
+                    "vector_score": float(record["score"]),
                 }
-                for i in range(min(limit, 5))
-            ]
+
+            results = rerank(
+                list(candidates.values()),
+                identifier_tokens(code),
+                limit,
+                self.lexical_weight,
+            )
 
             # Record metrics
             total_duration = time.time() - start_time
@@ -273,6 +334,9 @@ class OpenAIServiceAdapter:
                 error=str(e),
             )
 
+            if isinstance(e, ToolError):
+                raise
+
             # Raise tool error
             raise ToolError(
                 f"Similar code search failed: {e!s}",
@@ -0,0 +1,201 @@
+"""Caches for token validation.
+
+TokenCache keeps the claims of tokens that passed validation, so a token is
+verified once rather than on every request. JWKSCache keeps the signing keys
+of the identity provider in memory, refreshes them in the background and
+fetches them again, once for all waiting requests, when a token is signed
+with an unknown key.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+import jwt
+import structlog
+from jwt import PyJWK
+from jwt.jwks_client import PyJWKClient
+
+logger = structlog.get_logger(__name__)
+
+
+class TokenCache:
+    """Least-recently-used cache of validated token claims.
+
+    Entries are keyed by a hash of the token, so tokens are not kept in
+    memory, and expire when the token does or after ``max_ttl`` seconds,
+    whichever comes first.
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl: float = 300.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached tokens; 0 disables the cache
+            max_ttl: Maximum seconds claims are reused without validation
+        """
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        """Get the cache key of a token."""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Get the cached claims of a token.
+
+        Args:
+            token: Bearer token
+
+        Returns:
+            Claims, or None if the token is not cached or has expired
+        """
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        """Cache the claims of a validated token.
+
+        Tokens without an ``exp`` claim are not cached.
+
+        Args:
+            token: Bearer token
+            claims: Its validated claims
+        """
+        if self.max_size <= 0 or not isinstance(claims.get("exp"), int | float):
+            return
+        expires_at = min(float(claims["exp"]), time.time() + self.max_ttl)
+        key = self.key(token)
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached tokens."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached tokens."""
+        return len(self._entries)
+
+
+class JWKSCache:
+    """In-memory signing key set, refreshed in the background."""
+
+    def __init__(
+        self,
+        jwks_client: PyJWKClient,
+        refresh_interval: float = 3600.0,
+        min_refresh_interval: float = 60.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            jwks_client: Client fetching the key set
+            refresh_interval: Seconds between background refreshes
+            min_refresh_interval: Minimum seconds between refreshes caused
+                by unknown key IDs, so that tokens with made-up key IDs cannot
+                make the server hammer the key endpoint
+        """
+        self.jwks_client = jwks_client
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, PyJWK] = {}
+        self._fetched_at = 0.0
+        self._refreshing: asyncio.Future[None] | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    async def refresh(self) -> None:
+        """Fetch the key set; concurrent callers share one fetch."""
+        refreshing = self._refreshing
+        if refreshing is None or refreshing.get_loop() is not asyncio.get_running_loop():
+            refreshing = asyncio.ensure_future(self._fetch())
+            self._refreshing = refreshing
+            refreshing.add_done_callback(self._refresh_done)
+
+        # Shield the shared fetch from cancellation of a single caller
+        await asyncio.shield(refreshing)
+
+    def _refresh_done(self, refreshing: "asyncio.Future[None]") -> None:
+        """Forget a finished fetch, unless a newer one replaced it."""
+        if self._refreshing is refreshing:
+            self._refreshing = None
+
+    async def _fetch(self) -> None:
+        """Fetch the key set from the key endpoint."""
+        # PyJWKClient fetches synchronously; keep it off the event loop
+        keys = await asyncio.to_thread(self.jwks_client.get_signing_keys, True)
+        self._keys = {key.key_id: key for key in keys if key.key_id}
+        self._fetched_at = time.monotonic()
+        logger.info("Fetched signing keys", key_count=len(self._keys))
+
+    async def _refresh_periodically(self) -> None:
+        """Refresh the key set every ``refresh_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the keys we have
+                logger.warning("Signing key refresh failed", error=str(e))
+
+    def start(self) -> None:
+        """Start the background refresh in the running event loop."""
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._refresh_task = loop.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background refresh."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def get_signing_key(self, token: str) -> PyJWK:
+        """Get the key a token is signed with.
+
+        Args:
+            token: Bearer token
+
+        Returns:
+            Signing key
+
+        Raises:
+            jwt.PyJWTError: If the token has no key ID or no key matches it
+        """
+        self.start()
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            raise jwt.InvalidTokenError("Token header does not contain a key ID")
+
+        key = self._keys.get(kid)
+        if key is None:
+            stale = time.monotonic() - self._fetched_at >= self.min_refresh_interval
+            if not self._keys or stale or self._refreshing is not None:
+                await self.refresh()
+                key = self._keys.get(kid)
+
+        if key is None:
+            raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
@@ -1,15 +1,21 @@
 """JWT token validator for Microsoft Entra ID.
 
 This module provides functions for validating JWT tokens issued by Microsoft Entra ID.
+Validated claims are cached by token until the token expires, and signing keys
+are kept in memory, so most requests are authenticated without verifying a
+signature or fetching the key set.
 """
 
+from functools import lru_cache
 from typing import Any
 
 import jwt
 import structlog
 from jwt.jwks_client import PyJWKClient
 
+from codestory_mcp.auth.cache import JWKSCache, TokenCache
 from codestory_mcp.auth.scope_manager import ScopeManager
+from codestory_mcp.utils.config import get_mcp_settings
 
 logger = structlog.get_logger(__name__)
 
@@ -43,7 +49,15 @@ class AuthorizationError(Exception):
 class EntraValidator:
     """JWT token validator for Microsoft Entra ID."""
 
-    def __init__(self, tenant_id: str, audience: str, scope_manager=None, jwks_client=None) -> None:  # type: ignore[no-untyped-def]
+    def __init__(  # type: ignore[no-untyped-def]
+        self,
+        tenant_id: str,
+        audience: str,
+        scope_manager=None,
+        jwks_client=None,
+        token_cache: TokenCache | None = None,
+        jwks_cache: JWKSCache | None = None,
+    ) -> None:
         """Initialize the validator.
 
         Args:
@@ -51,6 +65,8 @@ class EntraValidator:
             audience: Expected audience claim
             scope_manager: Optional scope manager instance
             jwks_client: Optional JWKS client instance
+            token_cache: Optional cache of validated tokens
+            jwks_cache: Optional signing key cache (default: one over jwks_client)
         """
         self.tenant_id = tenant_id
         self.audience = audience
@@ -63,6 +79,10 @@ class EntraValidator:
         # Create scope manager
         self.scope_manager = scope_manager or ScopeManager()
 
+        # Create caches for validated tokens and signing keys
+        self.token_cache = token_cache if token_cache is not None else TokenCache()
+        self.jwks_cache = jwks_cache if jwks_cache is not None else JWKSCache(self.jwks_client)
+
     async def validate_token(self, token: str) -> dict[str, Any]:
         """Validate JWT token and return claims if valid.
 
@@ -76,9 +96,14 @@ class EntraValidator:
             AuthenticationError: If token validation fails
             AuthorizationError: If token lacks required scopes
         """
+        # Reuse the claims of a token validated before
+        cached = self.token_cache.get(token)
+        if cached is not None:
+            return cached
+
         try:
             # Get signing key from JWT header
-            signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+            signing_key = await self.jwks_cache.get_signing_key(token)
 
             # Decode and validate token
             claims = jwt.decode(
@@ -99,6 +124,9 @@ class EntraValidator:
             # Verify required scopes are present
             self._verify_scopes(claims)
 
+            # Only tokens that passed every check are cached
+            self.token_cache.put(token, claims)
+
             return claims  # type: ignore[no-any-return]
 
         except jwt.PyJWTError as e:
@@ -135,4 +163,32 @@ class EntraValidator:
                 provided_scopes=scopes,
                 required_scopes=self.scope_manager.get_required_scopes(),
             )
-            raise AuthorizationError("Token lacks required scopes")
\ No newline at end of file
+            raise AuthorizationError("Token lacks required scopes")
+
+
+@lru_cache
+def get_entra_validator(tenant_id: str, audience: str) -> EntraValidator:
+    """Get the validator shared by all requests.
+
+    Sharing the validator shares its token and signing key caches.
+
+    Args:
+        tenant_id: Microsoft Entra ID tenant ID
+        audience: Expected audience claim
+
+    Returns:
+        Shared validator
+    """
+    settings = get_mcp_settings()
+    jwks_client = PyJWKClient(f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys")
+    return EntraValidator(
+        tenant_id,
+        audience,
+        jwks_client=jwks_client,
+        token_cache=TokenCache(settings.auth_token_cache_size, settings.auth_token_cache_ttl),
+        jwks_cache=JWKSCache(
+            jwks_client,
+            refresh_interval=settings.jwks_refresh_interval,
+            min_refresh_interval=settings.jwks_min_refresh_interval,
+        ),
+    )
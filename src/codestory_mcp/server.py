@@ -4,9 +4,12 @@ This module implements the Model Context Protocol (MCP) server
 for the Code Story knowledge graph.
 """
 
+import asyncio
+import importlib
+import json
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
 from functools import wraps
 from typing import Any
@@ -14,11 +17,13 @@ from typing import Any
 import structlog
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.routing import APIRouter
 from prometheus_client import make_asgi_app
+from pydantic import BaseModel, Field
 
-from codestory_mcp.auth.entra_validator import EntraValidator
+from codestory_mcp.adapters.http_client import close_service_clients, get_service_client
+from codestory_mcp.auth.entra_validator import get_entra_validator
 from codestory_mcp.tools import get_all_tools, get_tool
 from codestory_mcp.tools.base import ToolError
 from codestory_mcp.utils.config import get_mcp_settings
@@ -27,6 +32,9 @@ from codestory_mcp.utils.metrics import get_metrics
 # Configure structured logging
 logger = structlog.get_logger(__name__)
 
+# Modules whose tools are registered on import
+TOOL_MODULES = ["path_to", "search_graph", "similar_code", "summarize_node"]
+
 
 # Authentication dependency
 async def get_current_user(request: Request) -> dict[str, Any]:
@@ -63,7 +71,7 @@ async def get_current_user(request: Request) -> dict[str, Any]:
 
     # Validate token
     try:
-        validator = EntraValidator(settings.azure_tenant_id, settings.api_audience)
+        validator = get_entra_validator(settings.azure_tenant_id, settings.api_audience)
         claims = await validator.validate_token(token)
         metrics.record_auth_attempt("success")
         return claims  # type: ignore[no-any-return]
@@ -76,6 +84,62 @@ async def get_current_user(request: Request) -> dict[str, Any]:
         ) from e
 
 
+async def execute_tool_call(tool_name: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Execute one tool call with error handling and metrics collection.
+
+    Args:
+        tool_name: Name of the tool to execute
+        params: Tool parameters
+
+    Returns:
+        Tool execution results
+
+    Raises:
+        HTTPException: If the tool is not found or its execution fails
+    """
+    metrics = get_metrics()
+    start_time = time.time()
+
+    try:
+        # Get the tool
+        tool_class = get_tool(tool_name)
+        tool = tool_class()
+
+        # Validate parameters
+        tool.validate_parameters(params)
+
+        # Execute tool
+        result = await tool(params)
+
+        # Record metrics
+        duration = time.time() - start_time
+        metrics.record_tool_call(tool_name, "success", duration)
+
+        return result  # type: ignore[no-any-return]
+    except KeyError as err:
+        metrics.record_tool_call(tool_name, "error", time.time() - start_time)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tool not found: {tool_name}",
+        ) from err
+    except ToolError as e:
+        metrics.record_tool_call(tool_name, "error", time.time() - start_time)
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+        ) from e
+    except HTTPException:
+        metrics.record_tool_call(tool_name, "error", time.time() - start_time)
+        raise
+    except Exception as e:
+        metrics.record_tool_call(tool_name, "error", time.time() - start_time)
+        logger.exception("Tool execution error", tool_name=tool_name, error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Tool execution error: {e!s}",
+        ) from e
+
+
 # Tool execution wrapper
 def tool_executor(func: Callable[..., Any]) -> Callable[..., Any]:
     """Wrapper for tool execution.
@@ -96,49 +160,64 @@ def tool_executor(func: Callable[..., Any]) -> Callable[..., Any]:
         params: dict[str, Any],
         user: dict[str, Any] = Depends(get_current_user),
     ) -> dict[str, Any]:
-        metrics = get_metrics()
-        start_time = time.time()
+        return await execute_tool_call(tool_name, params)
 
-        try:
-            # Get the tool
-            tool_class = get_tool(tool_name)
-            tool = tool_class()
+    return wrapper
 
-            # Validate parameters
-            tool.validate_parameters(params)
 
-            # Execute tool
-            result = await tool(params)
+class ToolCall(BaseModel):
+    """One tool invocation of a batch."""
 
-            # Record metrics
-            duration = time.time() - start_time
-            metrics.record_tool_call(tool_name, "success", duration)
+    id: str | None = Field(None, description="Caller-chosen ID echoed in the result")
+    tool: str = Field(..., description="Name of the tool to execute")
+    params: dict[str, Any] = Field(default_factory=dict, description="Tool parameters")
 
-            return result  # type: ignore[no-any-return]
-        except KeyError as err:
-            metrics.record_tool_call(tool_name, "error", time.time() - start_time)
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Tool not found: {tool_name}",
-            ) from err
-        except ToolError as e:
-            metrics.record_tool_call(tool_name, "error", time.time() - start_time)
-            raise HTTPException(
-                status_code=e.status_code,
-                detail=e.message,
-            ) from e
-        except HTTPException:
-            metrics.record_tool_call(tool_name, "error", time.time() - start_time)
-            raise
-        except Exception as e:
-            metrics.record_tool_call(tool_name, "error", time.time() - start_time)
-            logger.exception("Tool execution error", tool_name=tool_name, error=str(e))
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Tool execution error: {e!s}",
-            ) from e
 
-    return wrapper
+class ToolBatchRequest(BaseModel):
+    """A batch of independent tool invocations."""
+
+    calls: list[ToolCall] = Field(..., min_length=1, description="Tool invocations")
+    max_concurrency: int | None = Field(
+        None, ge=1, description="Calls executed at the same time (capped by the server)"
+    )
+
+
+async def run_tool_batch(
+    calls: list[ToolCall], max_concurrency: int
+) -> AsyncIterator[dict[str, Any]]:
+    """Execute tool calls concurrently, yielding results as they complete.
+
+    Failed calls yield an error result instead of failing the batch. If the
+    consumer stops early, the calls still running are cancelled.
+
+    Args:
+        calls: Tool invocations
+        max_concurrency: Calls executed at the same time
+
+    Yields:
+        Result per call, with its index in the batch, its ID and tool name,
+        an HTTP-style status and either ``result`` or ``error``
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(index: int, call: ToolCall) -> dict[str, Any]:
+        outcome: dict[str, Any] = {"index": index, "id": call.id, "tool": call.tool}
+        async with semaphore:
+            try:
+                outcome["result"] = await execute_tool_call(call.tool, call.params)
+                outcome["status"] = status.HTTP_200_OK
+            except HTTPException as e:
+                outcome["status"] = e.status_code
+                outcome["error"] = {"message": str(e.detail), "type": e.__class__.__name__}
+        return outcome
+
+    tasks = [asyncio.ensure_future(run(i, call)) for i, call in enumerate(calls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 @asynccontextmanager
@@ -153,11 +232,20 @@ async def lifespan(app: FastAPI) -> Any:
     # Startup: Initialize resources
     logger.info("Starting MCP server")
 
+    # Open the pooled client shared by all tool invocations
+    get_service_client()
+
     # Yield control to the application
     yield
 
     # Shutdown: Clean up resources
     logger.info("Shutting down MCP server")
+    await close_service_clients()
+
+    # Stop the background refresh of the signing keys
+    settings = get_mcp_settings()
+    if settings.auth_enabled:
+        await get_entra_validator(settings.azure_tenant_id, settings.api_audience).jwks_cache.stop()
 
 
 def create_app() -> FastAPI:
@@ -168,6 +256,10 @@ def create_app() -> FastAPI:
     """
     settings = get_mcp_settings()
 
+    # Register the tools
+    for module in TOOL_MODULES:
+        importlib.import_module(f"codestory_mcp.tools.{module}")
+
     # Create the FastAPI application
     app = FastAPI(
         title="Code Story MCP",
@@ -198,6 +290,50 @@ def create_app() -> FastAPI:
     # Create API router
     router = APIRouter(prefix="/v1")
 
+    # Batch tool call endpoint; registered before /tools/{tool_name}, which
+    # would otherwise match it
+    @router.post(
+        "/tools/batch",
+        summary="Execute a batch of tools",
+        description=(
+            "Execute independent tool calls concurrently and stream their results "
+            "as newline-delimited JSON in completion order"
+        ),
+        response_class=StreamingResponse,
+    )
+    async def execute_tool_batch(
+        batch: ToolBatchRequest,
+        user: dict[str, Any] = Depends(get_current_user),
+    ) -> StreamingResponse:
+        """Execute a batch of tool calls.
+
+        The token is validated once for the whole batch.
+
+        Args:
+            batch: Tool invocations
+            user: Current user (from auth)
+
+        Returns:
+            NDJSON stream with one result per call
+        """
+        if len(batch.calls) > settings.batch_max_calls:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Batch exceeds the limit of {settings.batch_max_calls} calls",
+            )
+
+        max_concurrency = min(
+            batch.max_concurrency or settings.batch_max_concurrency,
+            settings.batch_max_concurrency,
+        )
+        logger.info("Executing tool batch", calls=len(batch.calls), concurrency=max_concurrency)
+
+        async def stream() -> AsyncIterator[str]:
+            async for outcome in run_tool_batch(batch.calls, max_concurrency):
+                yield json.dumps(outcome, default=str) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
     # Tool call endpoint
     @router.post(
         "/tools/{tool_name}",
@@ -1,9 +1,20 @@
 """SummarizeNode tool implementation.
 
 This module implements the summarizeNode tool for the MCP Adapter.
+
+Summaries stored by the summarizer step are served directly. A summary is only
+generated when every stored summary is known to be stale; generated summaries
+are stored for later calls, and concurrent requests for the same node share one
+generation.
+
+Summaries record the content hash of the file their node is in (its
+``source_hash``), which is compared to the file's current hash. Summaries of
+files that were not hashed fall back to the hash of the node's content
+property, which only File nodes have.
 """
 
-from typing import Any
+import asyncio
+from typing import Any, ClassVar
 
 import structlog
 from fastapi import status
@@ -13,14 +24,65 @@ from codestory_mcp.adapters.openai_service import get_openai_service
 from codestory_mcp.tools import register_tool
 from codestory_mcp.tools.base import BaseTool, ToolError
 from codestory_mcp.utils.metrics import get_metrics
+from codestory_summarizer.utils import content_hash
 
 logger = structlog.get_logger(__name__)
 
 
+def _is_current(
+    summary: dict[str, Any], source_hash: str | None, current_hash: str | None
+) -> bool | None:
+    """Check whether a stored summary was generated from the current content.
+
+    Args:
+        summary: Stored summary
+        source_hash: Current content hash of the file the node is in
+        current_hash: Hash of the node's current content property
+
+    Returns:
+        Whether the summary is current, or None if that cannot be told
+    """
+    if source_hash and summary.get("source_hash"):
+        return bool(summary["source_hash"] == source_hash)
+    if current_hash and summary.get("content_hash"):
+        return bool(summary["content_hash"] == current_hash)
+    return None
+
+
+def select_summary(
+    summaries: list[dict[str, Any]],
+    source_hash: str | None,
+    current_hash: str | None = None,
+) -> dict[str, Any] | None:
+    """Select the stored summary to serve for a node.
+
+    Args:
+        summaries: Stored summaries of the node, newest first
+        source_hash: Current content hash of the file the node is in, or None
+            if the file was not hashed
+        current_hash: Hash of the node's current content property, or None if
+            the node has none
+
+    Returns:
+        The newest current summary; failing that, the newest summary whose
+        freshness cannot be told. None if every summary is stale.
+    """
+    verdicts = [_is_current(summary, source_hash, current_hash) for summary in summaries]
+    for verdict in (True, None):
+        for summary, current in zip(summaries, verdicts, strict=True):
+            if current is verdict:
+                return summary
+    return None
+
+
 @register_tool
 class SummarizeNodeTool(BaseTool):
     """Tool for generating a natural language summary of a code element."""
 
+    # Summary generations in progress, shared by all tool instances and keyed
+    # by node ID and content hashes
+    _inflight: ClassVar[dict[tuple[str, str | None, str], "asyncio.Future[str]"]] = {}
+
     name = "summarizeNode"
     description = "Generate a natural language summary of a code element"
 
@@ -63,44 +125,48 @@ class SummarizeNodeTool(BaseTool):
         logger.info("Summarizing node", node_id=node_id, include_context=include_context)
 
         try:
-            # Get node details
-            node = await self.graph_service.find_node(node_id)
+            # Get node details and stored summaries
+            node, summaries, source_hash = await self.graph_service.find_node_summaries(node_id)
+            node_type = node.labels[0] if node.labels else "Unknown"
 
             # Extract code content
-            code = node.get("content", "")
+            code = node.get("content", "") or node.get("code", "")
+            current_hash = content_hash(code) if code else None
 
-            if not code:
-                raise ToolError(
-                    "Node does not contain code content to summarize",
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                )
+            stored = select_summary(summaries, source_hash, current_hash)
+            if stored is not None:
+                summary = stored["text"]
+                source = "stored"
+            else:
+                if not code:
+                    raise ToolError(
+                        "Node does not contain code content to summarize",
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                    )
 
-            # Get contextual information if requested
-            context = None
-            if include_context:
-                # Get the node's name and type
-                node_name = node.get("name", "")
-                node_type = node.labels[0] if node.labels else "Unknown"
-                node_path = node.get("path", "")
-
-                # Build context string
-                context = f"{node_type} '{node_name}'"
-                if node_path:
-                    context += f" at {node_path}"
-
-            # Generate summary
-            summary = await self.openai_service.generate_code_summary(
-                code=code,
-                context=context,
-                max_tokens=500,  # Adjust based on typical summary length
-            )
+                # Get contextual information if requested
+                context = None
+                if include_context:
+                    # Get the node's name and path
+                    node_name = node.get("name", "")
+                    node_path = node.get("path", "")
+
+                    # Build context string
+                    context = f"{node_type} '{node_name}'"
+                    if node_path:
+                        context += f" at {node_path}"
+
+                summary = await self._generate(
+                    node_id, node_type, code, source_hash, content_hash(code), context
+                )
+                source = "generated"
 
             # Create response
             response = {
                 "summary": summary,
                 "node": {
                     "id": node_id,
-                    "type": node.labels[0] if node.labels else "Unknown",
+                    "type": node_type,
                     "name": node.get("name", ""),
                     "path": node.get("path", ""),
                 },
@@ -110,6 +176,7 @@ class SummarizeNodeTool(BaseTool):
             response["metadata"] = {
                 "node_id": node_id,
                 "include_context": include_context,
+                "source": source,
             }
 
             # Log success
@@ -117,10 +184,13 @@ class SummarizeNodeTool(BaseTool):
                 "Node summarization completed",
                 node_id=node_id,
                 summary_length=len(summary),
+                source=source,
             )
 
             # Record graph operation
-            self.metrics.record_graph_operation("summarization")
+            self.metrics.record_graph_operation(
+                "summarization" if source == "generated" else "stored_summary"
+            )
 
             return response
 
@@ -135,4 +205,85 @@ class SummarizeNodeTool(BaseTool):
             raise ToolError(
                 f"Node summarization failed: {e!s}",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            ) from e
\ No newline at end of file
+            ) from e
+
+    async def _generate(
+        self,
+        node_id: str,
+        node_type: str,
+        code: str,
+        source_hash: str | None,
+        current_hash: str,
+        context: str | None,
+    ) -> str:
+        """Generate a summary, sharing the generation with concurrent requests.
+
+        Args:
+            node_id: ID of the node
+            node_type: Type of the node
+            code: Code content of the node
+            source_hash: Content hash of the file the node is in
+            current_hash: Hash of the code content
+            context: Optional context for the summary
+
+        Returns:
+            Generated summary
+        """
+        key = (node_id, source_hash, current_hash)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._generate_and_store(
+                    node_id, node_type, code, source_hash, current_hash, context
+                )
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info("Joining in-flight summary generation", node_id=node_id)
+
+        # Shield the shared generation from cancellation of a single request
+        return await asyncio.shield(future)
+
+    async def _generate_and_store(
+        self,
+        node_id: str,
+        node_type: str,
+        code: str,
+        source_hash: str | None,
+        current_hash: str,
+        context: str | None,
+    ) -> str:
+        """Generate a summary and store it for later requests.
+
+        Failing to store the summary is logged but does not fail the request.
+
+        Args:
+            node_id: ID of the node
+            node_type: Type of the node
+            code: Code content of the node
+            source_hash: Content hash of the file the node is in
+            current_hash: Hash of the code content
+            context: Optional context for the summary
+
+        Returns:
+            Generated summary
+        """
+        summary = await self.openai_service.generate_code_summary(
+            code=code,
+            context=context,
+            max_tokens=500,  # Adjust based on typical summary length
+        )
+
+        try:
+            await self.graph_service.store_summary(
+                node_id,
+                summary,
+                source_type=node_type,
+                content_hash=current_hash,
+                source_hash=source_hash,
+            )
+        except Exception as e:
+            logger.warning("Could not store generated summary", node_id=node_id, error=str(e))
+
+        return summary  # type: ignore[no-any-return]
@@ -19,7 +19,22 @@ class MCPSettings(BaseSettings):
         azure_tenant_id: Microsoft Entra ID tenant ID
         azure_client_id: Client ID for the MCP adapter
         auth_enabled: Enable/disable authentication
+        auth_token_cache_size: Validated tokens cached for reuse across requests
+        auth_token_cache_ttl: Maximum seconds a validated token is reused
+        jwks_refresh_interval: Seconds between background signing key refreshes
+        jwks_min_refresh_interval: Minimum seconds between refreshes on unknown key IDs
         code_story_service_url: URL of the Code Story service
+        service_http2: Use HTTP/2 for calls to the service
+        service_max_connections: Maximum open connections to the service
+        service_max_keepalive_connections: Idle connections kept for reuse
+        service_keepalive_expiry: Seconds an idle connection is kept open
+        service_timeout: Default timeout of calls to the service
+        service_endpoint_timeouts: Timeouts by service endpoint path prefix
+        batch_max_calls: Maximum tool calls in one batch
+        batch_max_concurrency: Maximum tool calls of a batch running at once
+        similar_code_cache_size: Snippet embeddings cached for similar code search
+        similar_code_candidate_factor: Vector candidates fetched per result
+        similar_code_lexical_weight: Weight of identifier overlap in reranking
         api_token_issuer: Issuer claim for JWT tokens
         api_audience: Audience claim for JWT tokens
         required_scopes: Required scopes for authorization
@@ -51,11 +66,41 @@ class MCPSettings(BaseSettings):
     azure_tenant_id: str | None = Field(None, description="Microsoft Entra ID tenant ID")
     azure_client_id: str | None = Field(None, description="Client ID for the MCP adapter")
     auth_enabled: bool = Field(False, description="Enable/disable authentication")
+    auth_token_cache_size: int = Field(
+        10000, description="Validated tokens cached for reuse across requests"
+    )
+    auth_token_cache_ttl: float = Field(
+        300.0, description="Maximum seconds a validated token is reused without validation"
+    )
+    jwks_refresh_interval: float = Field(
+        3600.0, description="Seconds between background refreshes of the signing keys"
+    )
+    jwks_min_refresh_interval: float = Field(
+        60.0, description="Minimum seconds between signing key refreshes on unknown key IDs"
+    )
 
     # Service configuration
     code_story_service_url: str = Field(
         "http://localhost:8000", description="URL of the Code Story service"
     )
+    service_http2: bool = Field(True, description="Use HTTP/2 for calls to the service")
+    service_max_connections: int = Field(100, description="Maximum open connections to the service")
+    service_max_keepalive_connections: int = Field(
+        20, description="Idle connections to the service kept for reuse"
+    )
+    service_keepalive_expiry: float = Field(
+        30.0, description="Seconds an idle connection to the service is kept open"
+    )
+    service_timeout: float = Field(30.0, description="Default timeout of calls to the service")
+    service_endpoint_timeouts: dict[str, float] = Field(
+        {
+            "/v1/query/search": 10.0,
+            "/v1/query/node": 10.0,
+            "/v1/query/paths": 30.0,
+            "/v1/query/cypher": 30.0,
+        },
+        description="Timeouts of calls to the service by endpoint path prefix",
+    )
 
     # JWT configuration
     api_token_issuer: str = Field(
@@ -73,6 +118,23 @@ class MCPSettings(BaseSettings):
     # gRPC configuration
     enable_grpc: bool = Field(True, description="Enable gRPC server")
 
+    # Batch tool execution
+    batch_max_calls: int = Field(100, description="Maximum tool calls in one batch")
+    batch_max_concurrency: int = Field(
+        16, description="Maximum tool calls of a batch executed at the same time"
+    )
+
+    # Similar code search
+    similar_code_cache_size: int = Field(
+        1024, description="Snippet embeddings cached for similar code search"
+    )
+    similar_code_candidate_factor: int = Field(
+        4, description="Vector search candidates fetched per result before reranking"
+    )
+    similar_code_lexical_weight: float = Field(
+        0.3, description="Weight of identifier overlap when reranking similar code"
+    )
+
     # Metrics and tracing
     prometheus_metrics_path: str = Field("/metrics", description="Path for Prometheus metrics")
     enable_opentelemetry: bool = Field(False, description="Enable OpenTelemetry tracing")
@@ -0,0 +1,177 @@
+"""Helpers for code similarity search.
+
+Vector search over the embeddings of code summaries finds candidates that are
+semantically close to a snippet; a cheap lexical score over identifiers then
+reranks them so that candidates sharing names with the snippet come first.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any
+
+# Labels of the code entities searched
+CODE_LABELS = ("Function", "Class", "File")
+
+# Vector index over the summaries the summarizer embeds; code entities are
+# found through the summaries attached to them
+SUMMARY_VECTOR_INDEX = "summary_embedding_vector_idx"
+
+# Query the Summary vector index, follow HAS_SUMMARY back to the summarized
+# code entities and return them as columns that serialize cleanly through the
+# service's Cypher endpoint. A node with several summaries keeps its best
+# score; the limit applies after this merge.
+SIMILAR_CODE_QUERY = """
+CALL db.index.vector.queryNodes($index, $k, $embedding) YIELD node AS summary, score
+MATCH (node)-[:HAS_SUMMARY]->(summary)
+WHERE any(label IN labels(node) WHERE label IN $labels)
+WITH node, max(score) AS score
+RETURN elementId(node) AS id,
+       labels(node) AS labels,
+       node.name AS name,
+       coalesce(node.qualified_name, node.name) AS qualified_name,
+       coalesce(node.path, node.file_path) AS path,
+       coalesce(node.code, node.content, node.text) AS content,
+       node.start_line AS start_line,
+       node.end_line AS end_line,
+       score
+ORDER BY score DESC
+LIMIT $k
+"""
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_CAMEL_PARTS = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# Words that carry no signal about what the code does
+_STOP_WORDS = frozenset(
+    {
+        "and", "as", "async", "await", "class", "def", "else", "for", "from", "function",
+        "if", "import", "in", "is", "none", "not", "null", "or", "pass", "return", "self",
+        "the", "this", "true", "false", "var", "let", "const", "new", "public", "private",
+        "static", "void",
+    }
+)  # fmt: skip
+
+
+def identifier_tokens(text: str) -> set[str]:
+    """Split the identifiers of a text into lower-case word tokens.
+
+    ``parseHTTPResponse`` and ``parse_http_response`` both yield
+    ``{"parse", "http", "response"}``.
+
+    Args:
+        text: Source code or name
+
+    Returns:
+        Set of tokens
+    """
+    tokens = set()
+    for identifier in _IDENTIFIER.findall(text):
+        for part in identifier.split("_"):
+            for word in _CAMEL_PARTS.findall(part):
+                word = word.lower()
+                if len(word) > 1 and word not in _STOP_WORDS:
+                    tokens.add(word)
+    return tokens
+
+
+def lexical_score(query_tokens: set[str], text: str) -> float:
+    """Score the identifier overlap between a snippet and a candidate.
+
+    Args:
+        query_tokens: Tokens of the snippet
+        text: Candidate text
+
+    Returns:
+        Jaccard similarity of the token sets (0-1)
+    """
+    tokens = identifier_tokens(text)
+    if not query_tokens or not tokens:
+        return 0.0
+    return len(query_tokens & tokens) / len(query_tokens | tokens)
+
+
+def rerank(
+    candidates: list[dict[str, Any]],
+    query_tokens: set[str],
+    limit: int,
+    lexical_weight: float = 0.3,
+) -> list[dict[str, Any]]:
+    """Rerank vector search candidates with a lexical score.
+
+    Args:
+        candidates: Candidates with a ``vector_score`` and name/content fields
+        query_tokens: Tokens of the snippet
+        limit: Number of candidates to keep
+        lexical_weight: Weight of the lexical score in the final score
+
+    Returns:
+        Best candidates with ``lexical_score`` and combined ``score`` fields
+    """
+    for candidate in candidates:
+        text = " ".join(str(candidate.get(field) or "") for field in ("qualified_name", "content"))
+        lexical = lexical_score(query_tokens, text)
+        candidate["lexical_score"] = lexical
+        vector = candidate["vector_score"]
+        candidate["score"] = (1 - lexical_weight) * vector + lexical_weight * lexical
+    return sorted(candidates, key=lambda c: c["score"], reverse=True)[:limit]
+
+
+def normalize_snippet(code: str) -> str:
+    """Normalize whitespace so trivially different snippets share a cache entry."""
+    return "\n".join(line.rstrip() for line in code.strip().splitlines())
+
+
+class EmbeddingCache:
+    """Least-recently-used cache of snippet embeddings."""
+
+    def __init__(self, max_size: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of embeddings kept
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(code: str) -> str:
+        """Get the cache key of a snippet."""
+        return hashlib.sha256(normalize_snippet(code).encode()).hexdigest()
+
+    def get(self, code: str) -> list[float] | None:
+        """Get the cached embedding of a snippet.
+
+        Args:
+            code: Code snippet
+
+        Returns:
+            Embedding, or None if it is not cached
+        """
+        key = self.key(code)
+        embedding = self._entries.get(key)
+        if embedding is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return embedding
+
+    def put(self, code: str, embedding: list[float]) -> None:
+        """Cache the embedding of a snippet, evicting the least recently used one.
+
+        Args:
+            code: Code snippet
+            embedding: Its embedding
+        """
+        key = self.key(code)
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Get the number of cached embeddings."""
+        return len(self._entries)
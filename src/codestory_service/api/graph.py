@@ -1,7 +1,8 @@
 """API routes for graph operations.
 
 This module provides endpoints for querying the graph database, including
-Cypher queries, vector search, path finding, and natural language queries.
+Cypher queries, vector search, full-text and hybrid search, path finding,
+and natural language queries.
 It also provides visualization endpoints for generating graph visualizations.
 """
 
@@ -21,6 +22,8 @@ from ..domain.graph import (
     PathRequest,
     PathResult,
     QueryResult,
+    SearchQuery,
+    SearchResponse,
     VectorQuery,
     VectorResult,
     VisualizationRequest,
@@ -133,6 +136,46 @@ async def execute_vector_search(
         ) from e
 
 
+@query_router.post(
+    "/search",
+    response_model=SearchResponse,
+    summary="Full-text and hybrid search",
+    description=(
+        "Search nodes with the full-text indexes and the vector indexes, fusing the "
+        "rankings with reciprocal rank fusion."
+    ),
+)
+async def search(
+    query: SearchQuery,
+    graph_service: GraphService = Depends(get_graph_service),
+    user: dict[str, Any] = Depends(get_current_user),
+) -> SearchResponse:
+    """Search the graph with full-text and vector queries.
+
+    Args:
+        query: Search query
+        graph_service: Graph service instance
+        user: Current authenticated user
+
+    Returns:
+        SearchResponse with the requested page of results
+
+    Raises:
+        HTTPException: If the search fails
+    """
+    try:
+        logger.info(f"Executing {query.mode.value} search: {query.query[:100]}...")
+        return await graph_service.search(query)
+    except Exception as e:
+        logger.error(f"Error executing search: {e!s}")
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error executing search: {e!s}",
+        ) from e
+
+
 @query_router.post(
     "/path",
     response_model=PathResult,
@@ -1,22 +1,25 @@
 """API routes for health checks.
 
 This module provides endpoints for checking the health of the service
-and its dependencies.
+and its dependencies. Component checks run in the background through a
+HealthMonitor, and health probes are answered from its cached results.
 """
 
 import contextlib
 import logging
 import os
 import time
+from collections.abc import Callable
 from typing import Any, Literal, cast
 
 import redis.asyncio as redis
 from fastapi import APIRouter, Depends, Query, status
 from pydantic import BaseModel, Field
 
-from ..infrastructure.celery_adapter import CeleryAdapter, get_celery_adapter
+from ..infrastructure.celery_adapter import CeleryAdapter
 from ..infrastructure.error_log import get_and_clear_errors
-from ..infrastructure.neo4j_adapter import Neo4jAdapter, get_neo4j_adapter
+from ..infrastructure.health_monitor import ComponentCheck, HealthMonitor
+from ..infrastructure.neo4j_adapter import Neo4jAdapter
 from ..infrastructure.openai_adapter import OpenAIAdapter, get_openai_adapter
 from ..settings import get_service_settings
 
@@ -59,63 +62,135 @@ class HealthReport(BaseModel):
 SERVICE_START_TIME = time.time()
 SERVICE_VERSION = "0.1.0"  # Would be loaded from package metadata in a real implementation
 
+# Process-wide health monitor, created on first use
+_health_monitor: HealthMonitor | None = None
+
+
+def _adapter_check(adapter: Any, factory: Callable[[], Any]) -> ComponentCheck:
+    """Build a component check that calls an adapter's check_health.
+
+    The adapter is created on the first check and reused afterwards.
+
+    Args:
+        adapter: Adapter instance, or None to create one with the factory
+        factory: Callable creating the adapter
+
+    Returns:
+        Coroutine function running the adapter's health check
+    """
+    instance = adapter
+
+    async def check() -> dict[str, Any]:
+        nonlocal instance
+        if instance is None:
+            instance = factory()
+        return await instance.check_health()  # type: ignore[no-any-return]
+
+    return check
+
+
+def build_health_monitor(
+    neo4j: Neo4jAdapter | None = None,
+    celery: CeleryAdapter | None = None,
+    openai: OpenAIAdapter | None = None,
+) -> HealthMonitor:
+    """Create a health monitor for the service's dependencies.
+
+    Args:
+        neo4j: Neo4j adapter instance (created on first check if omitted)
+        celery: Celery adapter instance (created on first check if omitted)
+        openai: OpenAI adapter instance (shared adapter if omitted)
+
+    Returns:
+        HealthMonitor with the neo4j, celery, openai and redis components
+    """
+    settings = get_service_settings()
+    monitor = HealthMonitor(default_interval=getattr(settings, "health_check_interval", 30))
+    monitor.register("neo4j", _adapter_check(neo4j, Neo4jAdapter), timeout=5)
+    monitor.register("celery", _adapter_check(celery, CeleryAdapter), timeout=5)
+    # The OpenAI check calls the model, so it runs less often and gets a
+    # longer timeout for az login calls
+    monitor.register(
+        "openai",
+        _adapter_check(openai, get_openai_adapter),
+        interval=getattr(settings, "health_check_openai_interval", 300),
+        timeout=10,
+    )
+    monitor.register("redis", _check_redis_health, timeout=5)
+    return monitor
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get the process-wide health monitor.
+
+    This is used as a FastAPI dependency.
+
+    Returns:
+        HealthMonitor instance
+    """
+    global _health_monitor
+    if _health_monitor is None:
+        _health_monitor = build_health_monitor()
+    return _health_monitor
+
 
 @router.get(
     "/health",
     response_model=HealthReport,
     summary="Health check",
-    description="Check the health of the service and its dependencies.",
+    description=(
+        "Check the health of the service and its dependencies. Results are served from "
+        "the background health monitor unless deep=true."
+    ),
     status_code=status.HTTP_200_OK,  # Always return 200 for health endpoint
 )
 @router.get(
     "/v1/health",
     response_model=HealthReport,
     summary="Health check",
-    description="Check the health of the service and its dependencies.",
+    description=(
+        "Check the health of the service and its dependencies. Results are served from "
+        "the background health monitor unless deep=true."
+    ),
     status_code=status.HTTP_200_OK,  # Always return 200 for health endpoint
 )
 async def health_check(
-    neo4j: Neo4jAdapter = Depends(get_neo4j_adapter),
-    celery: CeleryAdapter = Depends(get_celery_adapter),
-    openai: OpenAIAdapter = Depends(get_openai_adapter),
     auto_fix: bool = Query(
         False, description="Automatically attempt to fix Azure authentication issues"
     ),
+    deep: bool = Query(
+        False, description="Run every component check now instead of serving cached results"
+    ),
+    monitor: HealthMonitor = Depends(get_health_monitor),
 ) -> HealthReport:
     """Check the health of the service and its dependencies.
 
     Args:
-        neo4j: Neo4j adapter instance
-        celery: Celery adapter instance
-        openai: OpenAI adapter instance
         auto_fix: If True, attempt to automatically fix Azure auth issues
+        deep: If True, check every component now instead of using cached results
+        monitor: Health monitor holding the component results
 
     Returns:
         HealthReport with health status of the service and its components
     """
     import asyncio
 
-    logger.info("=== Health Check Started ===")
+    logger.debug("=== Health Check Started ===")
     # Check for new service errors
     errors = get_and_clear_errors()
     error_package = errors if errors else None
 
-    logger.info(f"Error package: {error_package}")
+    logger.debug(f"Error package: {error_package}")
 
     # Use a global timeout to prevent the health check from hanging
     try:
-        logger.info("Starting health check implementation with 30s timeout...")
-        # Run the full health check
+        # Serve the cached results, or run every check for deep=true
         health_report = await asyncio.wait_for(
-            _health_check_impl(neo4j, celery, openai),
+            _health_check_impl(monitor, deep),
             timeout=30,  # 30 second timeout for entire health check
         )
 
-        logger.info(f"Health check completed. Overall status: {health_report.status}")
-        logger.info(
-            f"Component statuses: "
-            f"{[(name, comp.status) for name, comp in health_report.components.items()]}"
-        )
+        logger.debug(f"Health check completed. Overall status: {health_report.status}")
 
         # Attach any errors to the report
         if error_package:
@@ -150,10 +225,11 @@ async def health_check(
                 # Try an auth renewal with a timeout
                 try:
                     # This will leverage the retry logic in the OpenAI adapter
-                    renewal_result = await asyncio.wait_for(
-                        openai.check_health(),
+                    renewed = await asyncio.wait_for(
+                        monitor.refresh(["openai"]),
                         timeout=15,  # 15 second timeout for renewal attempt
                     )
+                    renewal_result = renewed.get("openai", {})
 
                     # Check if renewal succeeded
                     if renewal_result.get("status") == "healthy":
@@ -166,6 +242,11 @@ async def health_check(
                         )
                         # Update overall health status
                         health_report.status = "healthy"
+                    else:
+                        renewal_details = renewal_result.get("details") or {}
+                        raise RuntimeError(
+                            renewal_details.get("error", "OpenAI is still unhealthy")
+                        )
                 except Exception as e:
                     logger.error(f"Azure authentication renewal failed: {e}")
                     # Update the health report with renewal attempt information
@@ -488,134 +569,82 @@ async def auth_renew(
     return response
 
 
-async def _health_check_impl(
-    neo4j: Neo4jAdapter,
-    celery: CeleryAdapter,
-    openai: OpenAIAdapter,
-) -> HealthReport:
-    """Shared implementation for all health check endpoints.
-
-    Args:
-        neo4j: Neo4j adapter instance
-        celery: Celery adapter instance
-        openai: OpenAI adapter instance
+async def _check_redis_health() -> dict[str, Any]:
+    """Check the health of the Redis server.
 
     Returns:
-        HealthReport with health status of the service and its components
+        Dictionary containing health information
     """
-    import asyncio
-
-    logger.info("Performing health check")
-
-    # Define component health check with timeout
-    async def check_component_health(component_name, check_func, timeout_seconds=5) -> None:  # type: ignore[no-untyped-def]
-        try:
-            # Use asyncio.wait_for to apply timeout to each health check
-            result = await asyncio.wait_for(check_func(), timeout=timeout_seconds)
-            return result  # type: ignore[no-any-return]
-        except TimeoutError:
-            logger.error(f"{component_name} health check timed out after {timeout_seconds} seconds")
-            return {  # type: ignore[return-value]
-                "status": "unhealthy",
-                "details": {
-                    "error": f"Health check timed out after {timeout_seconds} seconds",
-                    "type": "TimeoutError",
-                },
-            }
-        except Exception as e:
-            logger.error(f"{component_name} health check failed with exception: {e}")
-            return {  # type: ignore[return-value]
-                "status": "unhealthy",
-                "details": {"error": str(e), "type": type(e).__name__},
-            }
-
-    # Run all health checks in parallel with timeouts
-    tasks = [
-        check_component_health("Neo4j", neo4j.check_health, 5),
-        check_component_health("Celery", celery.check_health, 5),
-        check_component_health(
-            "OpenAI", openai.check_health, 10
-        ),  # Longer timeout for OpenAI due to az login calls
-    ]
-
-    # Run component checks in parallel
-    neo4j_health, celery_health, openai_health = await asyncio.gather(*tasks)
-
-    # Check Redis health with timeout
-    async def check_redis_health() -> Any:
-        settings = get_service_settings()
-        redis_host = getattr(settings, "redis_host", "redis")
-        redis_port = getattr(settings, "redis_port", 6379)
-        redis_db = getattr(settings, "redis_db", 0)
-
-        # Log Redis connection details for debugging
-        logger.info(f"Attempting to connect to Redis at {redis_host}:{redis_port}/{redis_db}")
-
-        # Create Redis client with socket timeout
-        redis_client = redis.Redis(
-            host=redis_host,
-            port=redis_port,
-            db=redis_db,
-            decode_responses=True,
-            socket_timeout=2.0,  # 2 second socket timeout
-        )
+    settings = get_service_settings()
+    redis_host = getattr(settings, "redis_host", "redis")
+    redis_port = getattr(settings, "redis_port", 6379)
+    redis_db = getattr(settings, "redis_db", 0)
+
+    # Log Redis connection details for debugging
+    logger.debug(f"Attempting to connect to Redis at {redis_host}:{redis_port}/{redis_db}")
+
+    # Create Redis client with socket timeout
+    redis_client = redis.Redis(
+        host=redis_host,
+        port=redis_port,
+        db=redis_db,
+        decode_responses=True,
+        socket_timeout=2.0,  # 2 second socket timeout
+    )
 
-        try:
-            # Ping Redis to check connection
-            await redis_client.ping()
+    try:
+        # Ping Redis to check connection
+        await redis_client.ping()
 
-            # Get basic Redis info
-            info = await redis_client.info(section="server")
+        # Get basic Redis info
+        info = await redis_client.info(section="server")
 
-            # Close the connection
-            await redis_client.close()
+        # Close the connection
+        await redis_client.close()
 
-            return {
-                "status": "healthy",
-                "details": {
-                    "connection": f"redis://{redis_host}:{redis_port}/{redis_db}",
-                    "version": info.get("redis_version", "unknown"),
-                    "memory": info.get("used_memory_human", "unknown"),
-                },
-            }
-        except Exception as e:
-            logger.error(f"Redis health check failed with exception: {e}")
-            # Make sure to close the Redis connection on error
-            with contextlib.suppress(Exception):
-                await redis_client.close()
-            return {
-                "status": "unhealthy",
-                "details": {"error": str(e), "type": type(e).__name__},
-            }
-
-    # Run Redis health check with timeout
-    try:
-        redis_health = await asyncio.wait_for(check_redis_health(), timeout=5)
-    except TimeoutError:
-        logger.error("Redis health check timed out")
-        redis_health = {
-            "status": "unhealthy",
+        return {
+            "status": "healthy",
             "details": {
-                "error": "Health check timed out after 5 seconds",
-                "type": "TimeoutError",
+                "connection": f"redis://{redis_host}:{redis_port}/{redis_db}",
+                "version": info.get("redis_version", "unknown"),
+                "memory": info.get("used_memory_human", "unknown"),
             },
         }
     except Exception as e:
-        logger.error(f"Redis health check failed: {e}")
-        redis_health = {
+        logger.error(f"Redis health check failed with exception: {e}")
+        # Make sure to close the Redis connection on error
+        with contextlib.suppress(Exception):
+            await redis_client.close()
+        return {
             "status": "unhealthy",
             "details": {"error": str(e), "type": type(e).__name__},
         }
 
+
+async def _health_check_impl(monitor: HealthMonitor, deep: bool = False) -> HealthReport:
+    """Shared implementation for all health check endpoints.
+
+    Args:
+        monitor: Health monitor holding the component results
+        deep: If True, check every component now instead of using cached results
+
+    Returns:
+        HealthReport with health status of the service and its components
+    """
+    logger.debug(f"Performing {'deep' if deep else 'cached'} health check")
+
+    if deep:
+        component_health = await monitor.refresh()
+    else:
+        component_health = await monitor.current()
+
     # Calculate service uptime
     uptime = int(time.time() - SERVICE_START_TIME)
 
     # Determine overall status
     components = {
-        "neo4j": ComponentHealth(**neo4j_health),  # type: ignore[arg-type]
-        "celery": ComponentHealth(**celery_health),  # type: ignore[arg-type]
-        "openai": ComponentHealth(**openai_health),  # type: ignore[arg-type]
-        "redis": ComponentHealth(**redis_health),
+        name: ComponentHealth(**health)  # type: ignore[arg-type]
+        for name, health in component_health.items()
     }
 
     # Check component statuses
@@ -624,7 +653,7 @@ async def _health_check_impl(
 
     # Determine overall status - prioritize service functionality over absolute health
     # Service can be "healthy" for API consumers even with some component issues
-    if components["celery"].status == "unhealthy":
+    if "celery" in components and components["celery"].status == "unhealthy":
         # Celery is a required component for ingestion jobs
         overall_status = "unhealthy"
     elif unhealthy_count > 2:
@@ -646,4 +675,4 @@ async def _health_check_impl(
         version=SERVICE_VERSION,
         uptime=uptime,
         components=components,
-    )
\ No newline at end of file
+    )
@@ -5,10 +5,13 @@ ingestion pipeline jobs.
 """
 
 import contextlib
+import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
 
 from ..application.ingestion_service import IngestionService, get_ingestion_service
 from ..domain.ingestion import (
@@ -78,7 +81,10 @@ async def start_ingestion(
     "",
     response_model=PaginatedIngestionJobs,
     summary="List ingestion jobs",
-    description="Get a paginated list of ingestion jobs with optional filtering by status.",
+    description=(
+        "Get a paginated list of ingestion jobs with optional filtering by status "
+        "and repository."
+    ),
 )
 async def list_jobs(
     status: list[JobStatus] | None = Query(None, description="Filter by job status"),
@@ -86,6 +92,7 @@ async def list_jobs(
     offset: int = Query(0, description="Number of jobs to skip"),
     sort_by: str = Query("created_at", description="Field to sort by"),
     sort_order: str = Query("desc", description="Sort direction (asc or desc)"),
+    repository: str | None = Query(None, description="Filter by repository (ingestion source)"),
     ingestion_service: IngestionService = Depends(get_ingestion_service),
     user: dict[str, Any] = Depends(get_current_user),
 ) -> PaginatedIngestionJobs:
@@ -97,6 +104,7 @@ async def list_jobs(
         offset: Number of jobs to skip
         sort_by: Field to sort by
         sort_order: Sort direction ("asc" or "desc")
+        repository: Repository to filter by
         ingestion_service: Ingestion service instance
         user: Current authenticated user
 
@@ -114,6 +122,7 @@ async def list_jobs(
             offset=offset,
             sort_by=sort_by,
             sort_order=sort_order,
+            repository=repository,
         )
     except Exception as e:
         logger.error(f"Failed to list jobs: {e!s}")
@@ -162,6 +171,38 @@ async def get_job_status(
         ) from e
 
 
+@router.get(
+    "/{job_id}/events",
+    summary="Stream job progress",
+    description=(
+        "Stream the progress events of an ingestion job as newline-delimited JSON. "
+        "Events recorded before the request are replayed first; the stream ends "
+        "when the job finishes."
+    ),
+)
+async def stream_job_events(
+    job_id: str,
+    ingestion_service: IngestionService = Depends(get_ingestion_service),
+    user: dict[str, Any] = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream the progress events of an ingestion job.
+
+    Args:
+        job_id: ID of the ingestion job
+        ingestion_service: Ingestion service instance
+        user: Current authenticated user
+
+    Returns:
+        Streaming response with one JSON event per line
+    """
+
+    async def stream() -> AsyncIterator[str]:
+        async for event in ingestion_service.stream_progress(job_id):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post(
     "/{job_id}/cancel",
     response_model=IngestionJob,
@@ -5,8 +5,11 @@ the graph database, including query execution, vector search, and
 path finding, as well as visualization generation.
 """
 
+import asyncio
 import json
 import logging
+import time
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from fastapi import Depends, HTTPException, status
@@ -20,6 +23,10 @@ from ..domain.graph import (
     PathRequest,
     PathResult,
     QueryResult,
+    SearchHit,
+    SearchMode,
+    SearchQuery,
+    SearchResponse,
     VectorQuery,
     VectorResult,
     VisualizationRequest,
@@ -30,6 +37,52 @@ from ..infrastructure.openai_adapter import OpenAIAdapter, get_openai_adapter
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Rank constant of reciprocal rank fusion; 60 is the value of the original
+# paper and damps the influence of the first few ranks of any one ranking
+RRF_K = 60
+
+# Candidates fetched per ranking, as a multiple of the results needed up to
+# the end of the requested page
+SEARCH_CANDIDATE_FACTOR = 2
+
+# Maximum number of candidates fetched per ranking
+SEARCH_MAX_CANDIDATES = 1000
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[str]], k: int = RRF_K
+) -> list[tuple[str, float, dict[str, int]]]:
+    """Fuse rankings with reciprocal rank fusion.
+
+    Each item scores ``sum(1 / (k + rank))`` over the rankings it appears
+    in, ranks starting at 1. Only ranks are used, so rankings with
+    incomparable scores, like Lucene and cosine scores, fuse cleanly.
+
+    Args:
+        rankings: Ranking name -> item IDs, best first; repeated IDs keep
+            their best rank
+        k: Rank constant
+
+    Returns:
+        (item ID, fused score, ranking name -> rank) tuples, best first.
+        Ties are broken by best rank, then by ID, so the order is stable.
+    """
+    scores: dict[str, float] = {}
+    ranks: dict[str, dict[str, int]] = {}
+    for name, ranking in rankings.items():
+        rank = 0
+        for item in ranking:
+            item_ranks = ranks.setdefault(item, {})
+            if name in item_ranks:
+                continue
+            rank += 1
+            item_ranks[name] = rank
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(
+        ((item, score, ranks[item]) for item, score in scores.items()),
+        key=lambda entry: (-entry[1], min(entry[2].values()), entry[0]),
+    )
+
 
 class GraphService:
     """Application service for graph operations.
@@ -111,6 +164,134 @@ class GraphService:
                 detail=f"Error executing vector search: {e!s}",
             ) from e
 
+    async def search(self, query: SearchQuery) -> SearchResponse:
+        """Search the graph with full-text and vector queries.
+
+        In hybrid mode the full-text indexes are queried while the query
+        embedding is generated and the vector indexes are queried. Each
+        full-text index and the vector search yield one ranking, and the
+        rankings are fused with reciprocal rank fusion. If one side of a
+        hybrid search fails, the results of the other side are returned.
+
+        Args:
+            query: Search query
+
+        Returns:
+            SearchResponse with the requested page of results
+
+        Raises:
+            HTTPException: If the search fails
+        """
+        start_time = time.time()
+        k = min((query.offset + query.limit) * SEARCH_CANDIDATE_FACTOR, SEARCH_MAX_CANDIDATES)
+        timings: dict[str, int] = {}
+
+        async def timed(name: str, operation: Any) -> Any:
+            started = time.time()
+            try:
+                return await operation
+            finally:
+                timings[name] = int((time.time() - started) * 1000)
+
+        operations: dict[str, Any] = {}
+        if query.mode != SearchMode.VECTOR:
+            operations["fulltext"] = timed(
+                "fulltext", self.neo4j.fulltext_search(query.query, query.node_types, k)
+            )
+        if query.mode != SearchMode.FULLTEXT:
+            operations["vector"] = timed(
+                "vector", self._vector_candidates(query.query, query.node_types, k)
+            )
+
+        logger.info(f"Searching ({query.mode.value}) for: {query.query[:100]}")
+        outcomes = dict(
+            zip(
+                operations,
+                await asyncio.gather(*operations.values(), return_exceptions=True),
+                strict=True,
+            )
+        )
+        failures = {name: o for name, o in outcomes.items() if isinstance(o, BaseException)}
+        if len(failures) == len(outcomes):
+            e = next(iter(failures.values()))
+            logger.error(f"Error executing search: {e!s}")
+            if isinstance(e, HTTPException):
+                raise e
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error executing search: {e!s}",
+            ) from e
+        for name, error in failures.items():
+            if not isinstance(error, Exception):
+                raise error
+            logger.warning(f"The {name} search failed, returning the other results: {error!s}")
+
+        rankings: dict[str, list[str]] = {}
+        candidates: dict[str, dict[str, Any]] = {}
+        if "fulltext" in outcomes and "fulltext" not in failures:
+            for index, rows in outcomes["fulltext"].items():
+                rankings[index] = [row["id"] for row in rows]
+                for row in rows:
+                    candidates.setdefault(row["id"], row)
+        if "vector" in outcomes and "vector" not in failures:
+            rankings["vector"] = [row["id"] for row in outcomes["vector"]]
+            for row in outcomes["vector"]:
+                candidates.setdefault(row["id"], row)
+
+        fused = reciprocal_rank_fusion(rankings)
+        page = fused[query.offset : query.offset + query.limit]
+        mode = query.mode
+        if "vector" in failures:
+            mode = SearchMode.FULLTEXT
+        elif "fulltext" in failures:
+            mode = SearchMode.VECTOR
+
+        logger.info(f"Search fused {len(rankings)} rankings into {len(fused)} results")
+        return SearchResponse(
+            data=[self._search_hit(candidates[id_], score, ranks) for id_, score, ranks in page],
+            total_count=len(fused),
+            offset=query.offset,
+            limit=query.limit,
+            has_more=len(fused) > query.offset + query.limit,
+            mode=mode,
+            execution_time_ms=int((time.time() - start_time) * 1000),
+            fulltext_time_ms=timings.get("fulltext"),
+            vector_time_ms=timings.get("vector"),
+        )
+
+    async def _vector_candidates(
+        self, text: str, labels: list[str] | None, k: int
+    ) -> list[dict[str, Any]]:
+        """Embed a search text and query the vector indexes with it."""
+        embeddings = await self.openai.create_embeddings([text])
+        if not embeddings:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to generate embedding for query",
+            )
+        return await self.neo4j.vector_index_search(embeddings[0], labels, k)
+
+    @staticmethod
+    def _search_hit(candidate: dict[str, Any], score: float, ranks: dict[str, int]) -> SearchHit:
+        """Build a search hit from a candidate row."""
+        labels = list(candidate.get("labels") or [])
+        properties = {
+            key: value
+            for key, value in (candidate.get("properties") or {}).items()
+            if value is not None
+        }
+        return SearchHit(
+            id=candidate["id"],
+            type=labels[0] if labels else "Node",
+            labels=labels,
+            name=properties.get("name"),
+            path=properties.get("path") or properties.get("file_path"),
+            score=score,
+            ranks=ranks,
+            content_snippet=candidate.get("snippet") or None,
+            properties=properties,
+        )
+
     async def find_path(self, path_request: PathRequest) -> PathResult:
         """Find paths between nodes in the graph.
 
@@ -8,10 +8,13 @@ import asyncio
 import json
 import logging
 import time
+from collections.abc import AsyncIterator
+from uuid import uuid4
 
-import redis.asyncio as redis
 from fastapi import Depends, HTTPException, WebSocket, status
 
+from codestory.ingestion_pipeline.job_index import DependencyFailedError
+
 from ..domain.ingestion import (
     IngestionJob,
     IngestionRequest,
@@ -21,6 +24,7 @@ from ..domain.ingestion import (
     PaginatedIngestionJobs,
 )
 from ..infrastructure.celery_adapter import CeleryAdapter, get_celery_adapter
+from ..infrastructure.progress_hub import get_progress_hub
 from ..settings import get_service_settings
 
 # Set up logging
@@ -32,7 +36,7 @@ class IngestionService:
 
     This service orchestrates interactions with the ingestion pipeline,
     providing high-level methods for the API layer and managing
-    real-time progress updates via Redis PubSub.
+    real-time progress updates via the job progress streams.
     """
 
     def __init__(self, celery_adapter: CeleryAdapter) -> None:
@@ -44,121 +48,61 @@ class IngestionService:
         self.celery = celery_adapter
         self.settings = get_service_settings()
 
-        # Initialize Redis connection for real-time updates
-        self.redis = None
-        self.pubsub_channel = "codestory:ingestion:progress"
-
-        # Don't try to connect to Redis during test initialization
-        # In production code, we would use asyncio.create_task
-        self._init_redis_task = None
-
-    async def _init_redis(self) -> None:
-        """Initialize Redis connection asynchronously."""
-        try:
-            # Get Redis connection details from core settings
-            # In a real implementation, these would be retrieved from settings
-            redis_host = "localhost"
-            redis_port = 6379
-            redis_db = 0
-
-            self.redis = redis.Redis(  # type: ignore  # TODO: Fix type compatibility
-                host=redis_host, port=redis_port, db=redis_db, decode_responses=True
-            )
-
-            # Ping Redis to verify connection
-            await self.redis.ping()  # type: ignore[attr-defined]
-            logger.info("Connected to Redis successfully")
-        except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e!s}")
-            self.redis = None
+        # Progress events are read and written through the shared hub; it
+        # only connects to Redis when first used
+        self.progress_hub = get_progress_hub()
 
     async def publish_progress(self, job_id: str, event: JobProgressEvent) -> None:
-        """Publish a progress event to Redis PubSub.
+        """Publish a progress event to the job's progress stream.
 
         Args:
             job_id: ID of the ingestion job
             event: Progress event details
-
-        Raises:
-            RuntimeError: If Redis is not available
         """
-        if not self.redis:
-            logger.warning("Redis not available for publishing progress")
-            return
-
-        try:  # type: ignore[unreachable]
-            # Create channel name specific to this job
-            channel = f"{self.pubsub_channel}:{job_id}"
-
-            # Serialize event to JSON
-            event_json = json.dumps(event.model_dump())
-
-            # Publish to Redis
-            await self.redis.publish(channel, event_json)
-
-            # Also store the latest event in a Redis key for retrieval
-            key = f"codestory:ingestion:latest:{job_id}"
-            await self.redis.set(key, event_json, ex=3600 * 24)  # Expire after 24 hours
+        try:
+            await self.progress_hub.publish(job_id, event.model_dump(mode="json"))
         except Exception as e:
             logger.error(f"Failed to publish progress event: {e!s}")
 
-    async def subscribe_to_progress(self, websocket: WebSocket, job_id: str) -> None:
-        """Subscribe to progress events for a job via WebSocket.
+    async def stream_progress(self, job_id: str) -> AsyncIterator[dict]:
+        """Iterate over the progress events of a job.
+
+        The job's history is replayed first, then live events follow until
+        the job finishes. A heartbeat is yielded whenever no event arrived
+        within the configured heartbeat interval.
 
         Args:
-            websocket: WebSocket connection to send events to
             job_id: ID of the ingestion job to monitor
 
-        Raises:
-            HTTPException: If Redis is not available
+        Yields:
+            Progress events and heartbeats
         """
-        if not self.redis:
-            logger.error("Redis not available for progress subscription")
-            await websocket.close(code=1011, reason="Service unavailable")
-            return
-
-        try:  # type: ignore[unreachable]
-            # Create channel name specific to this job
-            channel = f"{self.pubsub_channel}:{job_id}"
-
-            # Get the latest event from Redis
-            key = f"codestory:ingestion:latest:{job_id}"
-            latest_event = await self.redis.get(key)
-
-            if latest_event:
-                # Send the latest event immediately
-                await websocket.send_text(latest_event)
-
-            # Subscribe to the channel
-            pubsub = self.redis.pubsub()
-            await pubsub.subscribe(channel)
-
-            # Listen for messages
+        async with self.progress_hub.subscribe(job_id) as subscription:
             while True:
                 try:
-                    # Add heartbeat/timeout to prevent connections from hanging
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(ignore_subscribe_messages=True),
-                        timeout=self.settings.websocket_heartbeat,
+                    event = await asyncio.wait_for(
+                        subscription.get(), timeout=self.settings.websocket_heartbeat
                     )
-
-                    if message and message["type"] == "message":
-                        # Forward the message to the WebSocket
-                        await websocket.send_text(message["data"])
-                    else:
-                        # Send heartbeat
-                        await websocket.send_json({"type": "heartbeat"})
                 except TimeoutError:
-                    # Send heartbeat on timeout
-                    await websocket.send_json({"type": "heartbeat"})
-                except Exception as e:
-                    logger.error(f"Error in WebSocket communication: {e!s}")
+                    yield {"type": "heartbeat"}
+                    continue
+                if event is None:
                     break
+                yield event
+
+    async def subscribe_to_progress(self, websocket: WebSocket, job_id: str) -> None:
+        """Subscribe to progress events for a job via WebSocket.
 
-            # Unsubscribe and close
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
+        Args:
+            websocket: WebSocket connection to send events to
+            job_id: ID of the ingestion job to monitor
+        """
+        try:
+            async for event in self.stream_progress(job_id):
+                await websocket.send_text(json.dumps(event))
 
+            # The job has finished
+            await websocket.close()
         except Exception as e:
             logger.error(f"WebSocket error: {e!s}")
             if websocket.client_state.CONNECTED:
@@ -179,28 +123,33 @@ class IngestionService:
         try:
             logger.info(f"Starting ingestion for source: {request.source}")
 
-            # Initialize Redis if not already done
-            if self.redis is None:
-                await self._init_redis()
-
             # Dependency-aware job scheduling
             dependencies = getattr(request, "dependencies", None)
             job_id = None
 
             if dependencies:
-                # Store the job as waiting in Redis with its dependencies
-                job_id = f"job-{int(time.time() * 1000)}"
-                waiting_key = f"codestory:ingestion:waiting:{job_id}"
-                await self.redis.set(
-                    waiting_key,
-                    json.dumps({
-                        "request": request.model_dump(),
-                        "dependencies": dependencies,
-                        "status": "waiting"
-                    }),
-                    ex=3600 * 24
-                )
-                logger.info(f"Job {job_id} is waiting for dependencies: {dependencies}")
+                # Index the job as waiting on the dependencies that have not
+                # completed yet; completing jobs release their dependents, and
+                # failing or cancelled ones fail or cancel them
+                job_id = str(uuid4())
+                try:
+                    unmet = await asyncio.to_thread(
+                        self.celery.job_index.add_waiting,
+                        job_id,
+                        dependencies,
+                        request.model_dump(mode="json"),
+                        request.source,
+                    )
+                except DependencyFailedError as e:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"Cannot start ingestion: {e!s}",
+                    ) from e
+                if not unmet:
+                    logger.info(f"Dependencies of job {job_id} already complete, starting it")
+                    return await self._start_job(request, job_id)
+
+                logger.info(f"Job {job_id} is waiting for dependencies: {unmet}")
 
                 # Publish initial progress event
                 from codestory.ingestion_pipeline.step import StepStatus
@@ -210,7 +159,8 @@ class IngestionService:
                     status=StepStatus.PENDING,
                     progress=0.0,
                     overall_progress=0.0,
-                    message=f"Waiting for dependencies: {dependencies}",
+                    message=f"Waiting for dependencies: {unmet}",
+                    job_status=JobStatus.PENDING,
                     cpu_percent=None,
                     memory_mb=None,
                     timestamp=time.time(),
@@ -224,31 +174,11 @@ class IngestionService:
                     source=request.source,
                     # started_at is optional, so omit it if not available
                     steps=request.steps or [],
-                    message=f"Job is waiting for dependencies: {dependencies}",
+                    message=f"Job is waiting for dependencies: {unmet}",
                     eta=None,
                 )
             else:
-                # Start the job using the Celery adapter
-                ingestion_started = await self.celery.start_ingestion(request)
-
-                # Publish initial progress event
-                from codestory.ingestion_pipeline.step import StepStatus
-
-                initial_event = JobProgressEvent(
-                    job_id=ingestion_started.job_id,
-                    step="Initializing",
-                    status=StepStatus.PENDING,
-                    progress=0.0,
-                    overall_progress=0.0,
-                    message="Preparing to start ingestion",
-                    cpu_percent=None,
-                    memory_mb=None,
-                    timestamp=ingestion_started.eta if ingestion_started.eta else None,  # type: ignore[arg-type]
-                )
-
-                await self.publish_progress(ingestion_started.job_id, initial_event)
-
-                return ingestion_started
+                return await self._start_job(request)
         except Exception as e:
             logger.error(f"Failed to start ingestion: {e!s}")
             if isinstance(e, HTTPException):
@@ -258,6 +188,44 @@ class IngestionService:
                 detail=f"Failed to start ingestion: {e!s}",
             ) from e
 
+    async def _start_job(
+        self, request: IngestionRequest, job_id: str | None = None
+    ) -> IngestionStarted:
+        """Submit an ingestion job to Celery and publish its initial progress.
+
+        Args:
+            request: Details of the ingestion request
+            job_id: ID to give the job, or None to generate one
+
+        Returns:
+            IngestionStarted with job ID and status
+        """
+        # Start the job using the Celery adapter
+        if job_id is None:
+            ingestion_started = await self.celery.start_ingestion(request)
+        else:
+            ingestion_started = await self.celery.start_ingestion(request, job_id=job_id)
+
+        # Publish initial progress event
+        from codestory.ingestion_pipeline.step import StepStatus
+
+        initial_event = JobProgressEvent(
+            job_id=ingestion_started.job_id,
+            step="Initializing",
+            status=StepStatus.PENDING,
+            progress=0.0,
+            overall_progress=0.0,
+            message="Preparing to start ingestion",
+            job_status=JobStatus.PENDING,
+            cpu_percent=None,
+            memory_mb=None,
+            timestamp=ingestion_started.eta if ingestion_started.eta else None,  # type: ignore[arg-type]
+        )
+
+        await self.publish_progress(ingestion_started.job_id, initial_event)
+
+        return ingestion_started
+
     async def get_job_status(self, job_id: str) -> IngestionJob:
         """Get the status of an ingestion job.
 
@@ -318,6 +286,7 @@ class IngestionService:
                 progress=0.0,
                 overall_progress=job.progress,
                 message="Job was cancelled by user",
+                job_status=job.status,
                 cpu_percent=None,
                 memory_mb=None,
                 timestamp=job.updated_at if job.updated_at else None,  # type: ignore[arg-type]
@@ -342,6 +311,7 @@ class IngestionService:
         offset: int = 0,
         sort_by: str = "created_at",
         sort_order: str = "desc",
+        repository: str | None = None,
     ) -> PaginatedIngestionJobs:
         """List ingestion jobs with optional filtering.
 
@@ -349,8 +319,9 @@ class IngestionService:
             status: List of job statuses to filter by
             limit: Maximum number of jobs to return
             offset: Number of jobs to skip
-            sort_by: Field to sort by
+            sort_by: Field to sort by (only "created_at" is supported)
             sort_order: Sort direction ("asc" or "desc")
+            repository: Only list jobs for this repository
 
         Returns:
             PaginatedIngestionJobs with list of jobs
@@ -361,19 +332,27 @@ class IngestionService:
         try:
             logger.info(f"Listing jobs with status filter: {status}")
 
-            # Get jobs from the Celery adapter
-            jobs = await self.celery.list_jobs(status, limit, offset)
-
-            # In a real implementation, we would also get the total count
-            # and properly implement pagination. This is a placeholder.
-            total = len(jobs)
+            # Jobs are indexed by creation time only
+            if sort_by != "created_at":
+                logger.warning(f"Unsupported sort field {sort_by}, sorting by created_at")
+
+            jobs, total = await asyncio.gather(
+                self.celery.list_jobs(
+                    status,
+                    limit,
+                    offset,
+                    repository=repository,
+                    descending=sort_order != "asc",
+                ),
+                self.celery.count_jobs(status, repository=repository),
+            )
 
             return PaginatedIngestionJobs(
                 items=jobs,
                 total=total,
                 limit=limit,
                 offset=offset,
-                has_more=False,  # Placeholder
+                has_more=offset + len(jobs) < total,
             )
         except Exception as e:
             logger.error(f"Failed to list jobs: {e!s}")
@@ -392,17 +371,17 @@ class IngestionService:
         Plus recent job metrics (duration, CPU %, memory MB).
         """
         from codestory.config.settings import get_settings
-        from codestory.ingestion_pipeline.resource_manager import ResourceTokenManager
+        from codestory.ingestion_pipeline.resource_manager import ResourceScheduler
     
         # Token status
         settings = get_settings()
         redis_url = settings.redis.uri
         max_tokens = getattr(settings.ingestion, "resource_max_tokens", 4)
-        token_manager = ResourceTokenManager(
+        scheduler = ResourceScheduler(
             redis_url=redis_url,
-            max_tokens=max_tokens,
+            capacity=max_tokens,
         )
-        token_status = token_manager.get_status()
+        token_status = scheduler.get_status()
     
         # Recent job metrics
         try:
@@ -453,43 +432,33 @@ class IngestionService:
 
 
     async def _check_and_trigger_dependents(self, completed_job_id: str) -> None:
-        """Check for jobs waiting on this job and enqueue if all dependencies are complete."""
-        if self.redis is None:
-            await self._init_redis()
-        # Scan for all waiting jobs
-        pattern = "codestory:ingestion:waiting:*"
-        async for key in self.redis.scan_iter(match=pattern):
-            data = await self.redis.get(key)
-            if not data:
-                continue
+        """Start the jobs that were only waiting on this job.
+
+        Completing pipelines start their dependents themselves; this covers
+        jobs whose completion could not reach the job index. Only the job's
+        own dependents are looked at. Each dependent that no longer waits on
+        anything is handed to exactly one caller, so the pipeline and
+        concurrent status requests don't start it twice.
+
+        Args:
+            completed_job_id: ID of the job that completed
+        """
+        index = self.celery.job_index
+        ready = await asyncio.to_thread(index.complete, completed_job_id)
+        for job_id in ready:
             try:
-                job_info = json.loads(data)
-                dependencies = job_info.get("dependencies", [])
-                if completed_job_id in dependencies:
-                    # Check if all dependencies are now complete
-                    all_complete = True
-                    for dep in dependencies:
-                        status_key = f"codestory:ingestion:latest:{dep}"
-                        dep_event = await self.redis.get(status_key)
-                        if not dep_event:
-                            all_complete = False
-                            break
-                        dep_event_data = json.loads(dep_event)
-                        dep_status = dep_event_data.get("status", None)
-                        if dep_status not in ("completed", JobStatus.COMPLETED):
-                            all_complete = False
-                            break
-                    if all_complete:
-                        # All dependencies are complete, dequeue and enqueue the job
-                        request_data = job_info["request"]
-                        # Remove from waiting
-                        await self.redis.delete(key)
-                        # Enqueue the job
-                        logger.info(f"All dependencies complete for waiting job, enqueuing: {key}")
-                        req = IngestionRequest(**request_data)
-                        await self.start_ingestion(req)
+                job_info = await asyncio.to_thread(index.get_job, job_id)
+                if not job_info or not job_info.get("request"):
+                    raise ValueError("Job has no stored request")
+
+                logger.info(f"All dependencies complete for waiting job, enqueuing: {job_id}")
+                await self._start_job(IngestionRequest(**job_info["request"]), job_id)
             except Exception as e:
-                logger.error(f"Error checking/enqueuing dependent job for {completed_job_id}: {e!s}")
+                logger.error(f"Error enqueuing dependent job {job_id} of {completed_job_id}: {e!s}")
+                await asyncio.to_thread(
+                    index.record, job_id, JobStatus.FAILED.value, error=str(e)
+                )
+
 
 async def get_ingestion_service(
     celery: CeleryAdapter = Depends(get_celery_adapter),
@@ -153,6 +153,99 @@ class VectorResult(BaseModel):
     )
 
 
+class SearchMode(str, Enum):
+    """Mode for graph search."""
+
+    HYBRID = "hybrid"  # Full-text and vector rankings fused
+    FULLTEXT = "fulltext"  # Full-text indexes only
+    VECTOR = "vector"  # Vector indexes only
+
+
+class SearchQuery(BaseModel):
+    """Model for full-text, vector or hybrid search over the graph."""
+
+    query: str = Field(
+        ...,
+        description="Keywords, identifier or natural language description",
+        examples=["parse config file"],
+    )
+    node_types: list[str] | None = Field(
+        default=None,
+        description="Node labels to restrict the results to",
+        examples=[["Function", "Class"]],
+    )
+    mode: SearchMode = Field(
+        default=SearchMode.HYBRID,
+        description="Search mode (hybrid, fulltext, vector)",
+    )
+    limit: int = Field(
+        default=10,
+        description="Maximum number of results to return",
+        ge=1,
+        le=100,
+    )
+    offset: int = Field(
+        default=0,
+        description="Number of results to skip, for pagination",
+        ge=0,
+        le=1000,
+    )
+
+    @field_validator("query")
+    @classmethod
+    def query_must_not_be_empty(cls, v: str) -> str:
+        """Validate that query is not empty."""
+        if not v.strip():
+            raise ValueError("Query must not be empty")
+        return v.strip()
+
+    @field_validator("node_types")
+    @classmethod
+    def normalize_node_types(cls, v: list[str] | None) -> list[str] | None:
+        """Normalize node types to labels, so ``function`` matches ``Function``."""
+        if v is None:
+            return None
+        labels = [t.strip() for t in v if t.strip()]
+        labels = [t.capitalize() if t.islower() else t for t in labels]
+        return labels or None
+
+
+class SearchHit(BaseModel):
+    """Single result of a graph search."""
+
+    id: str = Field(..., description="Node element ID")
+    type: str = Field(..., description="Primary node label")
+    labels: list[str] = Field(default_factory=list, description="All node labels")
+    name: str | None = Field(default=None, description="Node name")
+    path: str | None = Field(default=None, description="File path of the node")
+    score: float = Field(..., description="Fused reciprocal rank score")
+    ranks: dict[str, int] = Field(
+        default_factory=dict,
+        description="1-based rank of the node in each ranking it appeared in",
+    )
+    content_snippet: str | None = Field(default=None, description="Beginning of the content")
+    properties: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Node properties, without embeddings and content",
+    )
+
+
+class SearchResponse(BaseModel):
+    """Model for graph search results."""
+
+    data: list[SearchHit] = Field(..., description="Results of the requested page")
+    total_count: int = Field(..., description="Number of candidates found by all rankings")
+    offset: int = Field(..., description="Offset of the page")
+    limit: int = Field(..., description="Size of the page")
+    has_more: bool = Field(default=False, description="Whether there are more results")
+    mode: SearchMode = Field(
+        ..., description="Mode actually used, fulltext if the vector search was unavailable"
+    )
+    execution_time_ms: int = Field(..., description="Search execution time in milliseconds")
+    fulltext_time_ms: int | None = Field(default=None, description="Full-text query time")
+    vector_time_ms: int | None = Field(default=None, description="Embedding and vector query time")
+
+
 class PathRelationshipType(str, Enum):
     """Types of relationship constraints for path finding."""
 
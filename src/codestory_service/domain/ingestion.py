@@ -336,6 +336,9 @@ class JobProgressEvent(BaseModel):
     cpu_percent: float | None = Field(None, description="CPU usage percent for the job process")
     memory_mb: float | None = Field(None, description="Memory usage (MB) for the job process")
     timestamp: float = Field(default_factory=time.time, description="Event timestamp")
+    job_status: JobStatus | None = Field(
+        None, description="Status of the job as a whole, as opposed to the step's status"
+    )
 
 
 class PaginationParams(BaseModel):
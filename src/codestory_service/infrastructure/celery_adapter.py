@@ -4,6 +4,7 @@ This module provides a service-specific adapter for Celery operations,
 facilitating interaction with the ingestion pipeline and other background tasks.
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime
@@ -12,6 +13,12 @@ from typing import Any
 from fastapi import HTTPException, status
 
 from codestory.ingestion_pipeline.celery_app import app as celery_app
+from codestory.ingestion_pipeline.job_index import JobIndex, get_job_index
+from codestory.ingestion_pipeline.tasks import (
+    build_step_configs,
+    cancel_pipeline,
+    priority_queue,
+)
 from codestory.ingestion_pipeline.tasks import (
     orchestrate_pipeline as run_ingestion_pipeline,
 )
@@ -36,9 +43,26 @@ class CeleryAdapter:
     checking task status, and revoking tasks.
     """
 
-    def __init__(self) -> None:
-        """Initialize the Celery adapter."""
+    def __init__(self, job_index: JobIndex | None = None) -> None:
+        """Initialize the Celery adapter.
+
+        Args:
+            job_index: Index of submitted jobs; the process-wide index is used
+                if not given
+        """
         self.app = celery_app
+        self._job_index = job_index
+
+    @property
+    def job_index(self) -> JobIndex:
+        """Index of submitted jobs, used for listing them."""
+        if self._job_index is None:
+            self._job_index = get_job_index()
+        return self._job_index
+
+    @job_index.setter
+    def job_index(self, job_index: JobIndex) -> None:
+        self._job_index = job_index
 
     async def check_health(self) -> dict[str, Any]:
         """Check Celery worker health.
@@ -47,10 +71,14 @@ class CeleryAdapter:
             Dictionary containing health information
         """
         try:
-            # Perform a simple ping to check if Celery is responsive
-            inspector = self.app.control.inspect()
-            active_workers = inspector.active()
-            registered_workers = inspector.registered()
+            # Perform a simple ping to check if Celery is responsive. The
+            # inspect calls are blocking broadcasts, so keep them off the loop.
+            inspector = self.app.control.inspect(timeout=1.0)
+
+            def _inspect() -> tuple[Any, Any]:
+                return inspector.active(), inspector.registered()
+
+            active_workers, registered_workers = await asyncio.to_thread(_inspect)
 
             if not active_workers and not registered_workers:
                 return {
@@ -75,11 +103,15 @@ class CeleryAdapter:
                 "details": {"error": str(e), "type": type(e).__name__},
             }
 
-    async def start_ingestion(self, request: IngestionRequest) -> IngestionStarted:
+    async def start_ingestion(
+        self, request: IngestionRequest, job_id: str | None = None
+    ) -> IngestionStarted:
         """Start an ingestion pipeline job.
 
         Args:
             request: Details of the ingestion request
+            job_id: ID to give the job, e.g. one it was given while waiting
+                for its dependencies; a new ID is generated if not given
 
         Returns:
             IngestionStarted with job ID and status
@@ -106,65 +138,21 @@ class CeleryAdapter:
             # Use the source as the repository path
             repository_path = request.source
 
-            # Generate a job_id
+            # Generate IDs for the pipeline job and, unless given, for the
+            # orchestrator task, which is the job's ID outside the pipeline
             from uuid import uuid4
 
-            job_id = str(uuid4())
-
-            # Create step configs
-            step_configs: list[Any] = []
-            if request.steps:
-                for step_name in request.steps:
-                    step_configs.append({"name": step_name})
-            else:
-                # Default steps if none provided
-                for step_name in ["filesystem", "blarify", "summarizer", "docgrapher"]:
-                    step_configs.append({"name": step_name})
-
-            # Add options to each step if provided, with parameter filtering
-            if request.options:
-                for step_config in step_configs:
-                    step_name = step_config["name"]
-
-                    # Filter options based on step type to avoid parameter conflicts
-                    if step_name == "blarify":
-                        # Blarify step doesn't use certain parameters
-                        filtered_options = {
-                            k: v for k, v in request.options.items() if k not in ["concurrency"]
-                        }
-                        step_config.update(filtered_options)
-                        logger.debug(
-                            f"Applied filtered options for blarify step: {filtered_options}"
-                        )
-
-                    elif step_name in ["summarizer", "docgrapher"]:
-                        # These steps have specific parameters
-                        safe_params = [
-                            "job_id",
-                            "ignore_patterns",
-                            "timeout",
-                            "incremental",
-                        ]
-                        filtered_options = {
-                            k: v
-                            for k, v in request.options.items()
-                            if k in safe_params or k == step_name + "_specific"
-                        }
-                        step_config.update(filtered_options)
-                        logger.debug(
-                            f"Applied filtered options for {step_name} step: {filtered_options}"
-                        )
+            pipeline_job_id = str(uuid4())
+            job_id = job_id or str(uuid4())
 
-                    else:
-                        # For filesystem and other steps, include all options
-                        step_config.update(request.options)
-                        logger.debug(f"Applied all options for {step_name} step")
+            # Create step configs, with the options each step accepts
+            step_configs = build_step_configs(request.steps, request.options)
 
             # Submit the Celery task with positional parameters
             # For testing, use a local reference that can be mocked
             task_func = getattr(self, "_run_ingestion_pipeline", run_ingestion_pipeline)
             # Map priority to queue name
-            queue_name = request.priority if request.priority in {"high", "default", "low"} else "default"
+            queue_name = priority_queue(request.priority)
             # Scheduling support: determine eta/countdown
             eta = None
             countdown = 0
@@ -180,8 +168,18 @@ class CeleryAdapter:
             elif getattr(request, "countdown", None):
                 countdown = int(request.countdown)
 
+            # Index the job before submitting it, so that the pipeline's own
+            # status updates always come after this one
+            try:
+                await asyncio.to_thread(
+                    self.job_index.record, job_id, JobStatus.PENDING.value, repository_path
+                )
+            except Exception as e:
+                logger.warning(f"Failed to index job {job_id}: {e!s}")
+
             task = task_func.apply_async(
-                args=[repository_path, step_configs, job_id],
+                args=[repository_path, step_configs, pipeline_job_id],
+                task_id=job_id,
                 queue=queue_name,
                 eta=eta,
                 countdown=countdown if eta is None else None,
@@ -418,8 +416,16 @@ class CeleryAdapter:
                     error=str(task.result) if task.state == "FAILURE" else None,
                 )
 
-            # Attempt to revoke the task
-            self.app.control.revoke(job_id, terminate=True)
+            # Cancel the pipeline's steps; fall back to revoking the task for
+            # jobs that are not tracked in the job store
+            if not cancel_pipeline(job_id):
+                self.app.control.revoke(job_id, terminate=True)
+                try:
+                    await asyncio.to_thread(
+                        self.job_index.record, job_id, JobStatus.CANCELLED.value
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to index job {job_id}: {e!s}")
 
             # Return updated job status
             return IngestionJob(  # type: ignore[call-arg]
@@ -442,14 +448,24 @@ job_id=job_id,
             ) from e
 
     async def list_jobs(
-        self, status: list[JobStatus] | None = None, limit: int = 10, offset: int = 0
+        self,
+        status: list[JobStatus] | None = None,
+        limit: int = 10,
+        offset: int = 0,
+        repository: str | None = None,
+        descending: bool = True,
     ) -> list[IngestionJob]:
         """List ingestion jobs with optional filtering by status.
 
+        Jobs are read from the job index, newest first unless descending is
+        False.
+
         Args:
             status: List of job statuses to filter by
             limit: Maximum number of jobs to return
             offset: Number of jobs to skip
+            repository: Only list jobs for this repository
+            descending: Newest jobs first if True
 
         Returns:
             List of IngestionJob objects
@@ -458,16 +474,15 @@ job_id=job_id,
             HTTPException: If listing jobs fails
         """
         try:
-            # This implementation is a placeholder since Celery doesn't provide
-            # a direct way to list all tasks. In a production environment, we would
-            # need to store job information in a database for proper querying.
-
-            # Simulate job listing for demo purposes
-            # In a real implementation, we would query a database
-            # where we've stored task metadata
-
-            # This is a stub implementation
-            return []
+            records = await asyncio.to_thread(
+                self.job_index.list_jobs,
+                _index_statuses(status),
+                repository,
+                limit,
+                offset,
+                descending,
+            )
+            return [_job_from_index(record) for record in records]
 
         except Exception as e:
             logger.error(f"Failed to list jobs: {e!s}")
@@ -476,6 +491,61 @@ job_id=job_id,
                 detail=f"Failed to list jobs: {e!s}",
             ) from e
 
+    async def count_jobs(
+        self, status: list[JobStatus] | None = None, repository: str | None = None
+    ) -> int:
+        """Count ingestion jobs with optional filtering by status.
+
+        Args:
+            status: List of job statuses to filter by
+            repository: Only count jobs for this repository
+
+        Returns:
+            Number of matching jobs
+        """
+        return await asyncio.to_thread(
+            self.job_index.count_jobs, _index_statuses(status), repository
+        )
+
+
+# Statuses recorded in the job index that are reported as another status
+_INDEX_STATUS_ALIASES = {"waiting": JobStatus.PENDING}
+
+
+def _index_statuses(status: list[JobStatus] | None) -> list[str] | None:
+    """Translate a status filter into the statuses recorded in the job index."""
+    if not status:
+        return None
+    statuses = {s.value for s in status}
+    statuses.update(
+        alias for alias, reported in _INDEX_STATUS_ALIASES.items() if reported in status
+    )
+    return sorted(statuses)
+
+
+def _job_from_index(record: dict[str, Any]) -> IngestionJob:
+    """Build an IngestionJob from a job index record."""
+    try:
+        job_status = _INDEX_STATUS_ALIASES.get(record["status"]) or JobStatus(record["status"])
+    except ValueError:
+        job_status = JobStatus.UNKNOWN
+
+    message = None
+    if record["status"] == "waiting":
+        message = "Job is waiting for dependencies"
+
+    return IngestionJob(  # type: ignore[call-arg]
+        job_id=record["job_id"],
+        status=job_status,
+        source=record.get("repository") or None,
+        created_at=int(record["created_at"]),
+        updated_at=int(record["updated_at"]),
+        progress=100.0 if job_status == JobStatus.COMPLETED else 0.0,
+        duration=record.get("duration"),
+        message=message,
+        error=record.get("error"),
+    )
+
 
 # DummyCeleryAdapter has been removed as Celery is now a required component
 # The service will fail if Celery is not available
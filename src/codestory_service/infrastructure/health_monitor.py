@@ -0,0 +1,202 @@
+"""Background health monitoring for service dependencies.
+
+Component checks can be slow or costly (the OpenAI check calls the model), so
+they run in background tasks on their own intervals and health probes are
+served from the cached results.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# A component check returns {"status": ..., "details": {...}}
+ComponentCheck = Callable[[], Awaitable[dict[str, Any]]]
+
+
+class _Component:
+    """Registration and latest result of a monitored component."""
+
+    __slots__ = (
+        "check",
+        "checked_at",
+        "duration",
+        "in_flight",
+        "interval",
+        "name",
+        "result",
+        "timeout",
+    )
+
+    def __init__(self, name: str, check: ComponentCheck, interval: float, timeout: float):
+        self.name = name
+        self.check = check
+        self.interval = interval
+        self.timeout = timeout
+        self.result: dict[str, Any] | None = None
+        self.checked_at: float | None = None
+        self.duration: float | None = None
+        self.in_flight: asyncio.Task[None] | None = None
+
+
+class HealthMonitor:
+    """Runs component health checks in the background and caches their results."""
+
+    def __init__(
+        self,
+        default_interval: float = 30.0,
+        default_timeout: float = 5.0,
+        stale_after_intervals: float = 3.0,
+    ):
+        """Initialize the monitor.
+
+        Args:
+            default_interval: Seconds between checks of a component
+            default_timeout: Seconds a single check may take
+            stale_after_intervals: Number of missed intervals after which a
+                cached result is reported as stale (degraded)
+        """
+        self.default_interval = default_interval
+        self.default_timeout = default_timeout
+        self.stale_after_intervals = stale_after_intervals
+        self._components: dict[str, _Component] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def register(
+        self,
+        name: str,
+        check: ComponentCheck,
+        interval: float | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Register a component check.
+
+        Args:
+            name: Component name used in health reports
+            check: Coroutine function returning the component's health
+            interval: Seconds between background checks
+            timeout: Seconds a single check may take
+        """
+        self._components[name] = _Component(
+            name,
+            check,
+            interval or self.default_interval,
+            timeout or self.default_timeout,
+        )
+
+    @property
+    def running(self) -> bool:
+        """Whether the background refresh tasks are running."""
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self) -> None:
+        """Start refreshing every component in the background."""
+        if self.running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._refresh_loop(component), name=f"health:{component.name}")
+            for component in self._components.values()
+        ]
+        logger.info(f"Health monitor started for {', '.join(self._components)}")
+
+    async def stop(self) -> None:
+        """Stop the background refresh tasks."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def refresh(self, names: list[str] | None = None) -> dict[str, dict[str, Any]]:
+        """Check components now and return the updated snapshot.
+
+        Concurrent refreshes of the same component share one check.
+
+        Args:
+            names: Components to check, or None for all of them
+
+        Returns:
+            Snapshot of all components with results
+        """
+        selected = [self._components[name] for name in names or self._components]
+        await asyncio.gather(*(self._refresh_component(c) for c in selected))
+        return self.snapshot()
+
+    async def current(self) -> dict[str, dict[str, Any]]:
+        """Return the cached snapshot, checking components that have no result yet.
+
+        Returns:
+            Snapshot of all components
+        """
+        missing = [name for name, c in self._components.items() if c.result is None]
+        if missing:
+            return await self.refresh(missing)
+        return self.snapshot()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Get the cached results of all checked components.
+
+        Returns:
+            Component name -> {"status", "details"}. Details include when the
+            check ran and how long it took.
+        """
+        now = time.time()
+        snapshot: dict[str, dict[str, Any]] = {}
+        for name, component in self._components.items():
+            if component.result is None or component.checked_at is None:
+                continue
+
+            status = component.result.get("status", "unhealthy")
+            details = dict(component.result.get("details") or {})
+            details["checked_at"] = component.checked_at
+            details["check_duration_ms"] = round((component.duration or 0.0) * 1000, 1)
+
+            age = now - component.checked_at
+            if age > component.interval * self.stale_after_intervals:
+                details["stale"] = True
+                details["age_seconds"] = round(age, 1)
+                if status == "healthy":
+                    status = "degraded"
+
+            snapshot[name] = {"status": status, "details": details}
+        return snapshot
+
+    async def _refresh_loop(self, component: _Component) -> None:
+        while True:
+            await self._refresh_component(component)
+            await asyncio.sleep(component.interval)
+
+    async def _refresh_component(self, component: _Component) -> None:
+        if component.in_flight is None or component.in_flight.done():
+            component.in_flight = asyncio.create_task(self._run_check(component))
+        # Shield the shared check so one cancelled caller doesn't cancel it for all
+        await asyncio.shield(component.in_flight)
+
+    async def _run_check(self, component: _Component) -> None:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(component.check(), timeout=component.timeout)
+        except TimeoutError:
+            logger.error(
+                f"{component.name} health check timed out after {component.timeout} seconds"
+            )
+            result = {
+                "status": "unhealthy",
+                "details": {
+                    "error": f"Health check timed out after {component.timeout} seconds",
+                    "type": "TimeoutError",
+                },
+            }
+        except Exception as e:
+            logger.error(f"{component.name} health check failed with exception: {e}")
+            result = {
+                "status": "unhealthy",
+                "details": {"error": str(e), "type": type(e).__name__},
+            }
+
+        component.result = result
+        component.checked_at = time.time()
+        component.duration = time.perf_counter() - start
@@ -5,7 +5,9 @@ building on the core Neo4jConnector with additional functionality required
 by the service layer.
 """
 
+import asyncio
 import logging
+import re
 import time
 from typing import Any
 
@@ -34,6 +36,78 @@ from ..domain.graph import (
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Full-text indexes searched (see codestory.graphdb.schema), with their labels
+FULLTEXT_SEARCH_INDEXES: dict[str, tuple[str, ...]] = {
+    "code_name": ("Class", "Function", "Module"),
+    "file_content": ("File",),
+    "documentation_content": ("Documentation",),
+}
+
+# Vector indexes searched (see codestory.graphdb.schema), with the labels of
+# the nodes their hits are mapped to. Only Summary nodes are embedded, by the
+# summarizer step; hits are followed back to the summarized nodes.
+VECTOR_SEARCH_INDEXES: dict[str, tuple[str, ...]] = {
+    "summary_embedding_vector_idx": ("Repository", "Directory", "File", "Class", "Function"),
+}
+
+# Characters of the Lucene query syntax, escaped so that queries are matched
+# as plain text
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+_LUCENE_OPERATORS = re.compile(r"\b(AND|OR|NOT)\b")
+
+# Columns returned for search candidates; embeddings and content stay in the
+# database, apart from a snippet of the content
+_SEARCH_RETURN = """
+RETURN elementId(node) AS id,
+       labels(node) AS labels,
+       node {.*, embedding: null, content: null} AS properties,
+       left(coalesce(node.content, node.code, node.text, ""), 300) AS snippet,
+       score
+"""
+
+_FULLTEXT_SEARCH_QUERY = (
+    """
+CALL db.index.fulltext.queryNodes($index, $query, {limit: $k}) YIELD node, score
+WITH node, score
+WHERE $labels IS NULL OR any(label IN labels(node) WHERE label IN $labels)
+"""
+    + _SEARCH_RETURN
+    + "ORDER BY score DESC"
+)
+
+# A node with several matching summaries is ranked by its best one
+_VECTOR_SEARCH_QUERY = (
+    """
+UNWIND $indexes AS index_name
+CALL db.index.vector.queryNodes(index_name, $k, $embedding) YIELD node AS summary, score
+MATCH (node)-[:HAS_SUMMARY]->(summary)
+WHERE $labels IS NULL OR any(label IN labels(node) WHERE label IN $labels)
+WITH node, max(score) AS score
+"""
+    + _SEARCH_RETURN
+    + "ORDER BY score DESC LIMIT $k"
+)
+
+
+def escape_lucene(text: str) -> str:
+    """Escape a text for use as a Lucene full-text query.
+
+    Args:
+        text: Search text
+
+    Returns:
+        Query matching the terms of the text, without operators or wildcards
+    """
+    escaped = _LUCENE_SPECIAL.sub(r"\\\1", text)
+    return _LUCENE_OPERATORS.sub(lambda m: m.group(1).lower(), escaped).strip()
+
+
+def _indexes_for(indexes: dict[str, tuple[str, ...]], labels: list[str] | None) -> list[str]:
+    """Get the indexes covering at least one of the labels, or all of them."""
+    if labels is None:
+        return list(indexes)
+    return [name for name, covered in indexes.items() if set(covered) & set(labels)]
+
 
 class Neo4jAdapter:
     """Adapter for Neo4j operations specific to the service layer.
@@ -43,6 +117,10 @@ class Neo4jAdapter:
     domain models and Neo4j data structures.
     """
 
+    # Indexes queried by the graph search, with the labels they cover
+    fulltext_indexes: dict[str, tuple[str, ...]] = FULLTEXT_SEARCH_INDEXES
+    vector_indexes: dict[str, tuple[str, ...]] = VECTOR_SEARCH_INDEXES
+
     def __init__(self, connector: Neo4jConnector | None = None) -> None:
         """Initialize the Neo4j adapter.
 
@@ -280,6 +358,100 @@ class Neo4jAdapter:
                 detail=f"Unexpected error: {e!s}",
             ) from e
 
+    async def fulltext_search(
+        self, text: str, labels: list[str] | None, k: int
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Query the full-text indexes.
+
+        The indexes are queried concurrently. Lucene scores of different
+        indexes are not comparable, so each index yields its own ranking.
+
+        Args:
+            text: Search text, matched as plain terms
+            labels: Node labels to restrict the results to, or None
+            k: Maximum number of candidates per index
+
+        Returns:
+            Index name -> candidates (id, labels, properties, snippet,
+            score), best first
+
+        Raises:
+            HTTPException: If the search fails
+        """
+        query = escape_lucene(text)
+        indexes = _indexes_for(self.fulltext_indexes, labels)
+        if not query or not indexes:
+            return {}
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self.connector.execute_query,
+                        _FULLTEXT_SEARCH_QUERY,
+                        params={"index": index, "query": query, "k": k, "labels": labels},
+                    )
+                    for index in indexes
+                )
+            )
+            return dict(zip(indexes, results, strict=True))
+        except QueryError as e:
+            logger.error(f"Full-text search failed: {e!s}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Full-text search failed: {e!s}",
+            ) from e
+        except Exception as e:
+            logger.error(f"Unexpected error in full-text search: {e!s}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Unexpected error: {e!s}",
+            ) from e
+
+    async def vector_index_search(
+        self, embedding: list[float], labels: list[str] | None, k: int
+    ) -> list[dict[str, Any]]:
+        """Query the vector indexes with an embedding.
+
+        Unlike execute_vector_search, which compares the embedding with every
+        node, this uses the approximate nearest neighbour indexes. Their hits
+        are summaries, which are returned as the nodes they summarize.
+
+        Args:
+            embedding: Query embedding
+            labels: Node labels to restrict the results to, or None
+            k: Maximum number of candidates
+
+        Returns:
+            Candidates (id, labels, properties, snippet, score), most
+            similar first
+
+        Raises:
+            HTTPException: If the search fails
+        """
+        indexes = _indexes_for(self.vector_indexes, labels)
+        if not indexes:
+            return []
+
+        try:
+            return await asyncio.to_thread(  # type: ignore[no-any-return]
+                self.connector.execute_query,
+                _VECTOR_SEARCH_QUERY,
+                params={"indexes": indexes, "k": k, "embedding": embedding, "labels": labels},
+            )
+        except QueryError as e:
+            logger.error(f"Vector index search failed: {e!s}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Vector index search failed: {e!s}",
+            ) from e
+        except Exception as e:
+            logger.error(f"Unexpected error in vector index search: {e!s}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Unexpected error: {e!s}",
+            ) from e
+
     async def find_path(self, path_request: PathRequest) -> PathResult:
         """Find paths between nodes.
 
@@ -0,0 +1,246 @@
+"""Fan-out of job progress streams to WebSocket and HTTP subscribers.
+
+Workers append progress events to one Redis Stream per job. The hub reads all
+streams that have subscribers with a single blocking XREAD on one connection
+and fans each event out to the in-process subscriptions of its job, so the
+number of Redis connections does not grow with the number of subscribers.
+
+A new subscription first replays the job's stream, which covers subscribers
+joining after the job started or even finished, and then receives live
+events. Entries delivered both by the replay and by the reader are
+de-duplicated by their stream ID.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import redis.asyncio as redis
+
+from codestory.ingestion_pipeline.progress import (
+    PROGRESS_KEY_PREFIX,
+    STREAM_MAXLEN,
+    STREAM_TTL,
+    TERMINAL_JOB_STATUSES,
+    decode_event,
+    encode_event,
+    progress_key,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _parse_id(entry_id: str) -> tuple[int, int]:
+    """Parse a stream entry ID into comparable integers."""
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class ProgressSubscription:
+    """Events of one job delivered to one subscriber.
+
+    Live events are buffered up to ``max_pending`` entries; a subscriber that
+    falls further behind loses the oldest events, which is harmless as every
+    event carries the full progress state.
+    """
+
+    def __init__(self, job_id: str, max_pending: int = 256):
+        """Initialize the subscription.
+
+        Args:
+            job_id: External ID of the job
+            max_pending: Maximum number of buffered live events
+        """
+        self.job_id = job_id
+        self.finished = False
+        self._replay: deque[tuple[str, dict[str, Any]]] = deque()
+        self._live: deque[tuple[str, dict[str, Any]]] = deque(maxlen=max_pending)
+        self._ready = asyncio.Event()
+        self._last_id = (0, 0)
+
+    def _deliver(self, entry_id: str, event: dict[str, Any]) -> None:
+        """Buffer a live event (called by the hub)."""
+        self._live.append((entry_id, event))
+        self._ready.set()
+
+    def _next(self) -> dict[str, Any] | None:
+        """Take the next buffered event that was not delivered yet."""
+        while self._replay or self._live:
+            entry_id, event = (self._replay or self._live).popleft()
+            parsed = _parse_id(entry_id)
+            if parsed <= self._last_id:
+                continue
+            self._last_id = parsed
+            return event
+        return None
+
+    async def get(self) -> dict[str, Any] | None:
+        """Wait for the next event of the job.
+
+        Returns:
+            The next event, or None once the job has finished
+        """
+        while not self.finished:
+            event = self._next()
+            if event is not None:
+                if event.get("job_status") in TERMINAL_JOB_STATUSES:
+                    self.finished = True
+                return event
+            self._ready.clear()
+            await self._ready.wait()
+        return None
+
+
+class ProgressHub:
+    """Multiplexes the progress streams of jobs to in-process subscribers."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = PROGRESS_KEY_PREFIX,
+        block_ms: int = 1000,
+        max_pending: int = 256,
+    ):
+        """Initialize the hub.
+
+        Args:
+            redis_url: Redis connection URL
+            key_prefix: Prefix of the stream keys
+            block_ms: Milliseconds a read blocks waiting for new events; new
+                subscriptions are included in the next read
+            max_pending: Maximum number of buffered events per subscriber
+        """
+        self.redis = redis.from_url(redis_url, decode_responses=True)
+        self.key_prefix = key_prefix
+        self.block_ms = block_ms
+        self.max_pending = max_pending
+        self._subscriptions: dict[str, set[ProgressSubscription]] = {}
+        self._cursors: dict[str, str] = {}
+        self._reader: asyncio.Task[None] | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Get the number of active subscriptions."""
+        return sum(len(subs) for subs in self._subscriptions.values())
+
+    async def publish(self, job_id: str, event: dict[str, Any]) -> str:
+        """Append an event to a job's stream.
+
+        Args:
+            job_id: External ID of the job
+            event: Event to append
+
+        Returns:
+            ID of the stream entry
+        """
+        key = progress_key(job_id, self.key_prefix)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(key, encode_event(event), maxlen=STREAM_MAXLEN, approximate=True)
+            pipe.expire(key, STREAM_TTL)
+            entry_id, _ = await pipe.execute()
+        return entry_id  # type: ignore[no-any-return]
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[ProgressSubscription]:
+        """Subscribe to the events of a job, starting with its history.
+
+        Args:
+            job_id: External ID of the job
+
+        Yields:
+            Subscription delivering the job's events
+        """
+        subscription = ProgressSubscription(job_id, self.max_pending)
+        key = progress_key(job_id, self.key_prefix)
+
+        # Track the stream before replaying it, so no event falls in between
+        if job_id not in self._subscriptions:
+            latest = await self.redis.xrevrange(key, count=1)
+            self._cursors.setdefault(key, latest[0][0] if latest else "0-0")
+            self._subscriptions[job_id] = set()
+        self._subscriptions[job_id].add(subscription)
+        self._ensure_reader()
+
+        try:
+            for entry_id, fields in await self.redis.xrange(key):
+                event = decode_event(fields)
+                if event is not None:
+                    subscription._replay.append((entry_id, event))
+            subscription._ready.set()
+            yield subscription
+        finally:
+            subscribers = self._subscriptions.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[job_id]
+                    self._cursors.pop(key, None)
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_streams())
+
+    async def _read_streams(self) -> None:
+        """Read new events of all subscribed jobs and fan them out."""
+        while self._subscriptions:
+            streams = dict(self._cursors)
+            try:
+                response = await self.redis.xread(streams, block=self.block_ms, count=100)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Error reading progress streams: {e}")
+                await asyncio.sleep(self.block_ms / 1000)
+                continue
+
+            for key, entries in response or []:
+                job_id = key[len(self.key_prefix) + 1 :]
+                if key in self._cursors and entries:
+                    self._cursors[key] = entries[-1][0]
+                for entry_id, fields in entries:
+                    event = decode_event(fields)
+                    if event is None:
+                        continue
+                    for subscription in list(self._subscriptions.get(job_id, ())):
+                        subscription._deliver(entry_id, event)
+
+    async def stop(self) -> None:
+        """Stop reading and close the Redis connection."""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+        await self.redis.aclose()
+
+
+# Process-wide hub, created on first use
+_progress_hub: ProgressHub | None = None
+
+
+def get_progress_hub() -> ProgressHub:
+    """Get the process-wide progress hub.
+
+    Returns:
+        ProgressHub connected to the configured Redis
+    """
+    global _progress_hub
+    if _progress_hub is None:
+        from codestory.config.settings import get_settings
+
+        _progress_hub = ProgressHub(get_settings().redis.uri)
+    return _progress_hub
+
+
+async def stop_progress_hub() -> None:
+    """Stop the process-wide progress hub, if it was started."""
+    global _progress_hub
+    if _progress_hub is not None:
+        await _progress_hub.stop()
+        _progress_hub = None
@@ -15,6 +15,7 @@ from .api import auth, config, graph, health, ingest, service, websocket
 from .application.graph_service import GraphService, get_graph_service
 from .infrastructure.msal_validator import get_optional_user
 from .infrastructure.neo4j_adapter import Neo4jConnector
+from .infrastructure.progress_hub import stop_progress_hub
 from .settings import get_service_settings
 
 # Import and apply real adapter overrides
@@ -76,11 +77,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             f"Neo4j connection check failed: {e}. Service may have limited functionality."
         )
 
+    # Refresh component health in the background so /health serves cached results
+    health_monitor = health.get_health_monitor()
+    await health_monitor.start()
+
     yield
 
     # Clean up resources
     logger.info("Cleaning up application resources")
 
+    await health_monitor.stop()
+    await stop_progress_hub()
+
     # Close Neo4j connection
     if hasattr(app.state, "db"):
         try:
@@ -64,6 +64,14 @@ class ServiceSettings(BaseSettings):
     # WebSocket Settings
     websocket_heartbeat: int = Field(30, description="WebSocket heartbeat interval in seconds")
 
+    # Health monitoring
+    health_check_interval: int = Field(
+        30, description="Seconds between background health checks of each component"
+    )
+    health_check_openai_interval: int = Field(
+        300, description="Seconds between background OpenAI health checks, which call the model"
+    )
+
     # Rate Limiting
     rate_limit_enabled: bool = Field(True, description="Enable rate limiting")
     rate_limit_requests: int = Field(100, description="Number of requests allowed per time window")
@@ -0,0 +1,136 @@
+"""Batch execution of summarization tasks.
+
+This module summarizes the nodes of a dependency graph through the Azure
+OpenAI Batch API instead of one online request per node. A node can only be
+summarized after the nodes it depends on, so the graph is processed in waves:
+every node that is ready is submitted in one batch run, and the nodes that
+become ready once it completes form the next wave.
+"""
+
+import logging
+from collections.abc import Callable
+
+from codestory.llm.batch import BatchClient
+from codestory.llm.models import ChatCompletionResponse, ChatMessage
+
+from .models import DependencyGraph, NodeData, ProcessingStatus
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class BatchExecutor:
+    """Executor for summarizing a dependency graph through the Batch API.
+
+    A batch takes minutes to hours, so this is meant for non-interactive
+    jobs where the lower price and separate quota matter more than latency.
+    """
+
+    def __init__(
+        self,
+        batch_client: BatchClient,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ):
+        """Initialize the batch executor.
+
+        Args:
+            batch_client: Client submitting the batches
+            max_tokens: Maximum number of tokens per summary
+            temperature: Sampling temperature
+        """
+        self.batch_client = batch_client
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    def process_graph(
+        self,
+        graph: DependencyGraph,
+        prepare_func: Callable[[str, NodeData], list[ChatMessage]],
+        finish_func: Callable[[str, NodeData, ChatCompletionResponse], bool],
+        on_completion: Callable[[str, NodeData], None] | None = None,
+        on_wave: Callable[[], None] | None = None,
+    ) -> DependencyGraph:
+        """Process all nodes in the dependency graph.
+
+        Args:
+            graph: Dependency graph to process
+            prepare_func: Function building the chat messages of a node
+            finish_func: Function storing the response for a node, returning
+                whether it succeeded
+            on_completion: Optional callback to call when a node is completed
+            on_wave: Optional callback to call once a wave's responses have
+                been stored
+
+        Returns:
+            DependencyGraph: Updated graph with processing status
+
+        Raises:
+            BatchError: If a batch fails as a whole
+        """
+        wave = 0
+        while True:
+            ready_nodes = graph.get_ready_nodes()
+            if not ready_nodes:
+                break
+            wave += 1
+
+            requests: dict[str, list[ChatMessage]] = {}
+            for node_id in ready_nodes:
+                graph.update_node_status(node_id, ProcessingStatus.PROCESSING)
+                try:
+                    requests[node_id] = prepare_func(node_id, graph.nodes[node_id])
+                except Exception as e:
+                    logger.exception(f"Error preparing node {node_id}: {e}")
+                    graph.update_node_status(node_id, ProcessingStatus.FAILED)
+
+            logger.info(f"Submitting wave {wave} with {len(requests)} nodes")
+            result = self.batch_client.chat_batch(
+                requests, max_tokens=self.max_tokens, temperature=self.temperature
+            )
+
+            for node_id in requests:
+                node_data = graph.nodes[node_id]
+                success = False
+                response = result.responses.get(node_id)
+                if response is None:
+                    logger.error(f"Error processing node {node_id}: {result.errors.get(node_id)}")
+                else:
+                    try:
+                        success = finish_func(node_id, node_data, response)
+                    except Exception as e:
+                        logger.exception(f"Error processing node {node_id}: {e}")
+
+                if not success:
+                    graph.update_node_status(node_id, ProcessingStatus.FAILED)
+                    continue
+
+                graph.update_node_status(node_id, ProcessingStatus.COMPLETED)
+                if on_completion:
+                    try:
+                        on_completion(node_id, node_data)
+                    except Exception as e:
+                        logger.exception(f"Error in completion callback for node {node_id}: {e}")
+
+            if on_wave:
+                on_wave()
+
+        # Nodes depending on failed nodes, or in a cycle, never become ready
+        remaining = [
+            node_id
+            for node_id, node in graph.nodes.items()
+            if node.status == ProcessingStatus.PENDING
+        ]
+        if remaining:
+            logger.warning(
+                f"{len(remaining)} nodes cannot be processed because a dependency failed "
+                "or there might be a cycle."
+            )
+            for node_id in remaining:
+                graph.update_node_status(node_id, ProcessingStatus.FAILED)
+
+        logger.info(
+            f"Processing complete in {wave} waves. {graph.completed_count}/{graph.total_count} "
+            f"nodes processed successfully."
+        )
+        return graph
@@ -5,6 +5,7 @@ of code dependencies by querying the Neo4j database for AST and filesystem nodes
 """
 
 import logging
+from typing import Any
 
 from codestory.graphdb.neo4j_connector import Neo4jConnector
 
@@ -14,6 +15,15 @@ from .models import DependencyGraph, NodeData, NodeType
 logger = logging.getLogger(__name__)
 
 
+def _line_range(record: dict[str, Any]) -> dict[str, int]:
+    """Get the line range properties of a code node, if the graph has them."""
+    return {
+        key: int(record[key])
+        for key in ("start_line", "end_line")
+        if record.get(key) is not None
+    }
+
+
 class DependencyAnalyzer:
     """Builds and analyzes the DAG of code dependencies.
 
@@ -153,7 +163,8 @@ class DependencyAnalyzer:
         file_query = """
         MATCH (d:Directory)-[:CONTAINS]->(f:File)
         RETURN ID(f) as id, f.name as name, f.path as path,
-               f.extension as extension, ID(d) as parent_id
+               f.extension as extension, f.is_binary as is_binary,
+               f.content_hash as content_hash, ID(d) as parent_id
         """
 
         files = self.connector.execute_query(file_query)
@@ -171,6 +182,10 @@ class DependencyAnalyzer:
                     "extension": file_data["extension"],
                 },
             )
+            # Written by the filesystem step if it read the file's content
+            for key in ("is_binary", "content_hash"):
+                if file_data.get(key) is not None:
+                    file_node.properties[key] = file_data[key]
 
             # Set up dependency relationship with parent directory
             if file_data["parent_id"] is not None:
@@ -193,7 +208,8 @@ class DependencyAnalyzer:
         # Get class nodes
         class_query = """
         MATCH (f:File)-[:CONTAINS]->(c:Class)
-        RETURN ID(c) as id, c.name as name, c.qualified_name as qualified_name, ID(f) as file_id
+        RETURN ID(c) as id, c.name as name, c.qualified_name as qualified_name, ID(f) as file_id,
+               c.start_line as start_line, c.end_line as end_line
         """
 
         classes = self.connector.execute_query(class_query)
@@ -207,6 +223,7 @@ class DependencyAnalyzer:
                 properties={
                     "name": class_data["name"],
                     "qualified_name": class_data["qualified_name"],
+                    **_line_range(class_data),
                 },
             )
 
@@ -225,7 +242,8 @@ class DependencyAnalyzer:
         func_query = """
         MATCH (parent)-[:CONTAINS]->(f:Function)
         RETURN ID(f) as id, f.name as name, f.qualified_name as qualified_name,
-               labels(parent) as parent_labels, ID(parent) as parent_id
+               labels(parent) as parent_labels, ID(parent) as parent_id,
+               f.start_line as start_line, f.end_line as end_line
         """
 
         funcs = self.connector.execute_query(func_query)
@@ -243,6 +261,7 @@ class DependencyAnalyzer:
                 properties={
                     "name": func_data["name"],
                     "qualified_name": func_data["qualified_name"],
+                    **_line_range(func_data),
                 },
             )
 
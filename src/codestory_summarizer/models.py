@@ -126,6 +126,32 @@ class DependencyGraph(BaseModel):
         elif status == ProcessingStatus.SKIPPED:
             self.skipped_count += 1
 
+    def count_levels(self) -> int:
+        """Count the dependency levels of the graph.
+
+        Nodes of a level only depend on nodes of lower levels, so this is the
+        number of rounds it takes to process the graph when every ready node
+        is processed at once. Nodes in a dependency cycle never become ready
+        and are not counted.
+
+        Returns:
+            Number of levels
+        """
+        remaining = {
+            node_id: {dep_id for dep_id in node.dependencies if dep_id in self.nodes}
+            for node_id, node in self.nodes.items()
+        }
+        levels = 0
+        while True:
+            ready = {node_id for node_id, deps in remaining.items() if not deps}
+            if not ready:
+                return levels
+            levels += 1
+            for node_id in ready:
+                del remaining[node_id]
+            for deps in remaining.values():
+                deps -= ready
+
     def get_ready_nodes(self) -> list[str]:
         """Get nodes that are ready to be processed.
 
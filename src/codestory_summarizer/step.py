@@ -8,6 +8,7 @@ import asyncio
 import json
 import logging
 import os
+import threading
 import time
 from typing import Any
 from uuid import uuid4
@@ -16,19 +17,29 @@ from celery import shared_task
 
 from codestory.config.settings import get_settings
 from codestory.graphdb.neo4j_connector import Neo4jConnector
+from codestory.ingestion_pipeline.progress import create_reporter
 from codestory.ingestion_pipeline.step import PipelineStep, StepStatus
+from codestory.llm.batch import BatchClient, completion_window_seconds, create_batch_client
 from codestory.llm.client import create_client
-from codestory.llm.models import ChatMessage, ChatRole
+from codestory.llm.models import ChatCompletionResponse, ChatMessage, ChatRole
 
+from .batch_executor import BatchExecutor
 from .dependency_analyzer import DependencyAnalyzer
-from .models import NodeData, SummaryData
+from .models import DependencyGraph, NodeData, SummaryData
 from .parallel_executor import ParallelExecutor
 from .prompts import get_summary_prompt
-from .utils import ContentExtractor, ProgressTracker
+from .utils import ContentExtractor, ProgressTracker, content_hash
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Seconds before the task's soft time limit at which batches are cancelled, to
+# leave time for cancelling them
+BATCH_CANCEL_MARGIN = 120.0
+
+# Number of summaries embedded per online embedding request
+EMBED_BATCH_SIZE = 256
+
 
 class SummarizerStep(PipelineStep):
     """Workflow step that generates summaries for code elements.
@@ -51,6 +62,10 @@ class SummarizerStep(PipelineStep):
             **config: Additional configuration parameters
                 - max_concurrency: Maximum number of concurrent tasks
                 - max_tokens_per_file: Maximum tokens per file for summarization
+                - batch_mode: Summarize through the Batch API, at a lower price
+                  but with hours of latency, for non-interactive jobs; the
+                  step's timeout must cover the completion window of every
+                  batch round
 
         Returns:
             str: Job ID that can be used to check the status
@@ -304,15 +319,12 @@ def run_summarizer(
     # Create LLM client
     llm_client = create_client()
 
+    # Progress is published to the job's stream as well as the task state
+    reporter = create_reporter(job_id, "summarizer", task=self)
+
     try:
         # Notify of progress
-        self.update_state(
-            state="PROGRESS",
-            meta={
-                "progress": 0.0,
-                "message": "Building dependency graph...",
-            },
-        )
+        reporter.report(0.0, "Building dependency graph...")
 
         # Build dependency graph
         analyzer = DependencyAnalyzer(connector)
@@ -331,120 +343,207 @@ def run_summarizer(
         # Initialize summary store
         summary_store: dict[str, SummaryData] = {}
 
-        # Define node processor function
-        def process_node(node_id: str, node_data: NodeData) -> bool:
+        # Hashes of the content each node is summarized from
+        content_hashes: dict[str, str] = {}
+
+        # Define prompt builder function
+        def prepare_messages(node_id: str, node_data: NodeData) -> list[ChatMessage]:
+            # Extract content
+            content_info = extractor.extract_content(node_data)
+            content = content_info.get("content", "")
+            context = content_info.get("context", [])
+
+            # Get child summaries for higher-level nodes
+            child_summaries: list[Any] = []
+
+            for dep_id in node_data.dependents:
+                if dep_id in summary_store:
+                    child_summary = summary_store[dep_id].summary
+                    node_type = summary_store[dep_id].node_type
+
+                    prefix = f"[{node_type}] "
+                    if not child_summary.startswith(prefix):
+                        child_summary = prefix + child_summary
+
+                    child_summaries.append(child_summary)
+
+            # Generate prompt
+            # Ensure content and context are the right types
+            content_str = content if isinstance(content, str) else str(content)
+            context_list = context if isinstance(context, list) else [str(context)]
+
+            prompt = get_summary_prompt(
+                node=node_data,
+                content=content_str,
+                context=context_list,
+                child_summaries=child_summaries,
+                max_tokens=max_tokens_per_file,
+            )
+
+            content_hashes[node_id] = content_hash(content_str)
+
+            # Build chat messages for the LLM
+            return [
+                ChatMessage(
+                    role=ChatRole.SYSTEM,
+                    content="You are an expert code summarizer.",
+                ),
+                ChatMessage(role=ChatRole.USER, content=prompt),
+            ]
+
+        # Summaries waiting to be embedded for the Summary vector index, which
+        # semantic search follows back to the summarized nodes, as (summary
+        # ID, text). They are embedded many at a time rather than one request
+        # per summary.
+        pending_embeddings: list[tuple[str, str]] = []
+        pending_lock = threading.Lock()
+
+        def take_pending_embeddings(min_count: int = 1) -> list[tuple[str, str]]:
+            with pending_lock:
+                if len(pending_embeddings) < min_count:
+                    return []
+                taken = pending_embeddings[:]
+                pending_embeddings.clear()
+                return taken
+
+        def embed_summaries(
+            summaries: list[tuple[str, str]], batch_client: BatchClient | None = None
+        ) -> None:
+            if not summaries:
+                return
             try:
-                # Extract content
-                content_info = extractor.extract_content(node_data)
-                content = content_info.get("content", "")
-                context = content_info.get("context", [])
-
-                # Get child summaries for higher-level nodes
-                child_summaries: list[Any] = []
-
-                for dep_id in node_data.dependents:
-                    if dep_id in summary_store:
-                        child_summary = summary_store[dep_id].summary
-                        node_type = summary_store[dep_id].node_type
-
-                        prefix = f"[{node_type}] "
-                        if not child_summary.startswith(prefix):
-                            child_summary = prefix + child_summary
-
-                        child_summaries.append(child_summary)
-
-                # Generate prompt
-                # Ensure content and context are the right types
-                content_str = content if isinstance(content, str) else str(content)
-                context_list = context if isinstance(context, list) else [str(context)]
-
-                prompt = get_summary_prompt(
-                    node=node_data,
-                    content=content_str,
-                    context=context_list,
-                    child_summaries=child_summaries,
-                    max_tokens=max_tokens_per_file,
+                if batch_client is not None:
+                    result = batch_client.embed_batch(dict(summaries))
+                    for summary_id, error in result.errors.items():
+                        logger.warning(f"Failed to embed summary {summary_id}: {error}")
+                    embeddings = {
+                        summary_id: list(response.data[0].embedding)
+                        for summary_id, response in result.responses.items()
+                    }
+                else:
+                    vectors = llm_client.embed_vectors([text for _, text in summaries]).tolist()
+                    embeddings = {
+                        summary_id: vector
+                        for (summary_id, _), vector in zip(summaries, vectors, strict=True)
+                    }
+                store_summary_embeddings(connector, embeddings)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to embed {len(summaries)} summaries, "
+                    f"storing them without embeddings: {e}"
                 )
 
-                # Call LLM to generate summary
-                messages = [
-                    ChatMessage(
-                        role=ChatRole.SYSTEM,
-                        content="You are an expert code summarizer.",
-                    ),
-                    ChatMessage(role=ChatRole.USER, content=prompt),
-                ]
+        # Define summary storage function
+        def save_summary(
+            node_id: str, node_data: NodeData, response: ChatCompletionResponse
+        ) -> bool:
+            # Get summary text from response, handle empty response case
+            have_choices = response.choices and len(response.choices) > 0
+            summary_text = response.choices[0].message.content if have_choices else ""
+
+            # Calculate token count safely
+            token_count = 0
+            if response.usage:
+                prompt_tokens = response.usage.prompt_tokens or 0
+                completion_tokens = response.usage.completion_tokens or 0
+                token_count = prompt_tokens + completion_tokens
+
+            # Create summary data
+            # Ensure summary_text is not None
+            safe_summary_text = summary_text if summary_text is not None else ""
+
+            summary = SummaryData(
+                node_id=node_id,
+                node_type=node_data.type,
+                summary=safe_summary_text,
+                token_count=token_count,
+            )
 
-                response = llm_client.chat(messages=messages, max_tokens=500, temperature=0.1)
+            # Store summary
+            summary_store[node_id] = summary
+
+            # Write summary to Neo4j - ensure we have a valid summary text
+            safe_summary = safe_summary_text if safe_summary_text else ""
+            summary_id = store_summary(
+                connector,
+                node_id,
+                safe_summary,
+                node_data.type.value,
+                content_hash=content_hashes.get(node_id),
+            )
+            if safe_summary:
+                with pending_lock:
+                    pending_embeddings.append((summary_id, safe_summary))
 
-                # Get summary text from response, handle empty response case
-                have_choices = response.choices and len(response.choices) > 0
-                summary_text = response.choices[0].message.content if have_choices else ""
-
-                # Calculate token count safely
-                token_count = 0
-                if response.usage:
-                    prompt_tokens = response.usage.prompt_tokens or 0
-                    completion_tokens = response.usage.completion_tokens or 0
-                    token_count = prompt_tokens + completion_tokens
-
-                # Create summary data
-                # Ensure summary_text is not None
-                safe_summary_text = summary_text if summary_text is not None else ""
-
-                summary = SummaryData(
-                    node_id=node_id,
-                    node_type=node_data.type,
-                    summary=safe_summary_text,
-                    token_count=token_count,
-                )
+            # Write summary to file for easy inspection
+            summary_file = os.path.join(summary_dir, f"{node_id}.json")
+            with open(summary_file, "w") as f:
+                json.dump(summary.model_dump(), f, indent=2)
 
-                # Store summary
-                summary_store[node_id] = summary
+            return True
 
-                # Write summary to Neo4j - ensure we have a valid summary text
-                safe_summary = safe_summary_text if safe_summary_text else ""
-                store_summary(connector, node_id, safe_summary, node_data.type.value)
+        # Define node processor function
+        def process_node(node_id: str, node_data: NodeData) -> bool:
+            try:
+                messages = prepare_messages(node_id, node_data)
 
-                # Write summary to file for easy inspection
-                summary_file = os.path.join(summary_dir, f"{node_id}.json")
-                with open(summary_file, "w") as f:
-                    json.dump(summary.model_dump(), f, indent=2)
+                # Call LLM to generate summary
+                response = llm_client.chat(messages=messages, max_tokens=500, temperature=0.1)
 
-                return True
+                saved = save_summary(node_id, node_data, response)
+                embed_summaries(take_pending_embeddings(EMBED_BATCH_SIZE))
+                return saved
             except Exception as e:
                 logger.exception(f"Error processing node {node_id}: {e}")
                 return False
 
-        # Process nodes in parallel
-        executor = ParallelExecutor(max_concurrency=max_concurrency)
-
         # Define completion callback for progress updates
         def on_node_completed(node_id: str, node_data: NodeData) -> None:
             if tracker.should_update():
                 progress_message = tracker.update_progress()
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "progress": tracker.get_progress(),
-                        "message": progress_message,
-                    },
-                )
+                reporter.report(tracker.get_progress(), progress_message)
+
+        if config.get("batch_mode", False):
+            # Process nodes in waves of Batch API jobs. The service may take
+            # the whole completion window for each of them, so batch mode is
+            # refused unless the step's soft time limit covers every wave;
+            # batches still running at the limit are cancelled.
+            deadline = None
+            soft_time_limit = (getattr(self.request, "timelimit", None) or (None, None))[1]
+            if soft_time_limit:
+                elapsed = time.time() - start_time
+                time_left = soft_time_limit - elapsed - BATCH_CANCEL_MARGIN
+                check_batch_time_limit(graph, settings.openai.batch_completion_window, time_left)
+                deadline = time.monotonic() + time_left
+            batch_client = create_batch_client(llm_client, deadline=deadline)
+            batch_executor = BatchExecutor(batch_client, max_tokens=500, temperature=0.1)
+            graph = batch_executor.process_graph(
+                graph=graph,
+                prepare_func=prepare_messages,
+                finish_func=save_summary,
+                on_completion=on_node_completed,
+                on_wave=lambda: embed_summaries(take_pending_embeddings(), batch_client),
+            )
+        else:
+            # Process nodes in parallel
+            executor = ParallelExecutor(max_concurrency=max_concurrency)
 
-        # Run the async executor in a new event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+            # Run the async executor in a new event loop
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
 
-        try:
-            graph = loop.run_until_complete(
-                executor.process_graph(
-                    graph=graph,
-                    process_func=process_node,
-                    on_completion=on_node_completed,
+            try:
+                graph = loop.run_until_complete(
+                    executor.process_graph(
+                        graph=graph,
+                        process_func=process_node,
+                        on_completion=on_node_completed,
+                    )
                 )
-            )
-        finally:
-            loop.close()
+            finally:
+                loop.close()
+
+            embed_summaries(take_pending_embeddings())
 
         # Calculate final stats
         end_time = time.time()
@@ -467,10 +566,12 @@ def run_summarizer(
         }
 
         logger.info(f"Summarizer task completed: {result['message']}")
+        reporter.report(100.0, result["message"], StepStatus.COMPLETED)
 
         return result
     except Exception as e:
         logger.exception(f"Error in summarizer task: {e}")
+        reporter.report(None, str(e), StepStatus.FAILED)
 
         # Return error result
         end_time = time.time()
@@ -491,7 +592,41 @@ def run_summarizer(
         connector.close()
 
 
-def store_summary(connector: Neo4jConnector, node_id: str, summary: str, node_type: str) -> None:
+def check_batch_time_limit(
+    graph: DependencyGraph, completion_window: str, time_left: float
+) -> None:
+    """Check that a step can wait for every batch it submits in batch mode.
+
+    Each dependency level of the graph is one chat batch followed by one
+    embedding batch, and the service may take the whole completion window to
+    complete each of them.
+
+    Args:
+        graph: Dependency graph to summarize
+        completion_window: Completion window of the batches, e.g. "24h"
+        time_left: Seconds until the step has to cancel its batches
+
+    Raises:
+        ValueError: If the batches may not complete in the time left
+    """
+    rounds = 2 * graph.count_levels()
+    required = rounds * completion_window_seconds(completion_window)
+    if required > time_left:
+        raise ValueError(
+            f"batch_mode needs {required:.0f}s for {rounds} batch rounds with a "
+            f"{completion_window} completion window, but the step times out in "
+            f"{time_left:.0f}s; raise the summarizer's timeout or turn batch_mode off"
+        )
+
+
+def store_summary(
+    connector: Neo4jConnector,
+    node_id: str,
+    summary: str,
+    node_type: str,
+    content_hash: str | None = None,
+    embedding: list[float] | None = None,
+) -> str:
     """Store a summary in Neo4j.
 
     Args:
@@ -499,6 +634,12 @@ def store_summary(connector: Neo4jConnector, node_id: str, summary: str, node_ty
         node_id: ID of the node
         summary: Summary text
         node_type: Type of the node
+        content_hash: Hash of the summarized content, used to detect stale
+            summaries
+        embedding: Embedding of the summary text for the Summary vector index
+
+    Returns:
+        ID of the Summary node
     """
     # Create summary node
     summary_id = str(uuid4())
@@ -509,7 +650,9 @@ def store_summary(connector: Neo4jConnector, node_id: str, summary: str, node_ty
         id: $summary_id,
         text: $summary,
         timestamp: $timestamp,
-        source_type: $source_type
+        source_type: $source_type,
+        content_hash: $content_hash,
+        embedding: $embedding
     })
     """
 
@@ -520,14 +663,45 @@ def store_summary(connector: Neo4jConnector, node_id: str, summary: str, node_ty
             "summary": summary,
             "timestamp": time.time(),
             "source_type": node_type,
+            "content_hash": content_hash,
+            "embedding": embedding,
         },
     )
 
-    # Link the summary to the original node
+    # Link the summary to the original node, recording the content hash of the
+    # file the node is in; content_hash covers only the extracted content, which
+    # readers of the graph cannot reproduce
     link_query = """
     MATCH (s:Summary {id: $summary_id})
     MATCH (n) WHERE ID(n) = $node_id
     CREATE (n)-[:HAS_SUMMARY]->(s)
+    WITH n, s
+    OPTIONAL MATCH (f:File)-[:CONTAINS*0..]->(n)
+    WITH s, head(collect(f.content_hash)) AS source_hash
+    SET s.source_hash = source_hash
+    """
+
+    connector.execute_query(link_query, params={"summary_id": summary_id, "node_id": int(node_id)})
+    return summary_id
+
+
+def store_summary_embeddings(connector: Neo4jConnector, embeddings: dict[str, list[float]]) -> None:
+    """Set the embeddings of stored summaries in one query.
+
+    Args:
+        connector: Neo4j connector
+        embeddings: Embedding of each summary's text, by Summary node ID
     """
+    if not embeddings:
+        return
 
-    connector.execute_query(link_query, params={"summary_id": summary_id, "node_id": int(node_id)})
\ No newline at end of file
+    query = """
+    UNWIND $rows AS row
+    MATCH (s:Summary {id: row.id})
+    SET s.embedding = row.embedding
+    """
+    connector.execute_query(
+        query,
+        params={"rows": [{"id": k, "embedding": v} for k, v in embeddings.items()]},
+        write=True,
+    )
@@ -1,6 +1,6 @@
 """Utilities for the Summarizer workflow step."""
 
-from .content_extractor import ContentExtractor
+from .content_extractor import ContentExtractor, content_hash
 from .progress_tracker import ProgressTracker, get_progress_message
 
-__all__ = ["ContentExtractor", "ProgressTracker", "get_progress_message"]
+__all__ = ["ContentExtractor", "ProgressTracker", "content_hash", "get_progress_message"]
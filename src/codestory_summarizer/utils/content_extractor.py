@@ -4,6 +4,7 @@ This module provides functionality for extracting code content and context
 for summarization from the Neo4j database.
 """
 
+import hashlib
 import logging
 import os
 
@@ -15,6 +16,22 @@ from ..models import NodeData, NodeType
 logger = logging.getLogger(__name__)
 
 
+def content_hash(content: str) -> str:
+    """Hash the content a summary was generated from.
+
+    Trailing whitespace and surrounding blank lines are ignored, so the same
+    code read from a file or from a node property hashes the same.
+
+    Args:
+        content: Summarized content
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = "\n".join(line.rstrip() for line in content.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
 class ContentExtractor:
     """Extracts code content and context for summarization.
 
@@ -214,7 +231,13 @@ class ContentExtractor:
             "pyd",
         }
 
-        if file_extension in binary_extensions:
+        # The filesystem step sniffs files for binary content; the extension
+        # list is the fallback for nodes written without content
+        is_binary = node.properties.get("is_binary")
+        if is_binary is None:
+            is_binary = file_extension in binary_extensions
+
+        if is_binary:
             return {
                 "content": f"Binary file: {file_path}",
                 "context": [f"Binary file of type: {file_extension}"],
@@ -311,40 +334,45 @@ class ContentExtractor:
                         file_content = f.read()
                     self.cache[absolute_path] = file_content
 
-                # Extract class definition (simple approach - may need refinement for complex cases)
+                # Use the line range stored by the AST step when available,
+                # otherwise fall back to a simple text search
                 lines = file_content.split("\n")
-                class_start = -1
-                class_end = -1
-                brace_level = 0
-
-                for i, line in enumerate(lines):
-                    if f"class {class_name}" in line and class_start == -1:
-                        class_start = i
+                line_range = self._line_range(node)
+                if line_range:
+                    class_content = "\n".join(lines[line_range[0] : line_range[1]])
+                else:
+                    class_start = -1
+                    class_end = -1
+                    brace_level = 0
+
+                    for i, line in enumerate(lines):
+                        if f"class {class_name}" in line and class_start == -1:
+                            class_start = i
+
+                        if class_start != -1:
+                            # Count braces for languages like Java, C++
+                            brace_level += line.count("{") - line.count("}")
+
+                            # For Python, look for lower indentation level
+                            if "}" in line and brace_level == 0:
+                                class_end = i
+                                break
+
+                            # For Python, empty line followed by no indentation might mean end of class
+                            if (
+                                i > class_start
+                                and line.strip() == ""
+                                and i + 1 < len(lines)
+                                and not lines[i + 1].startswith(" ")
+                            ):
+                                class_end = i
+                                break
 
                     if class_start != -1:
-                        # Count braces for languages like Java, C++
-                        brace_level += line.count("{") - line.count("}")
-
-                        # For Python, look for lower indentation level
-                        if "}" in line and brace_level == 0:
-                            class_end = i
-                            break
-
-                        # For Python, empty line followed by no indentation might mean end of class
-                        if (
-                            i > class_start
-                            and line.strip() == ""
-                            and i + 1 < len(lines)
-                            and not lines[i + 1].startswith(" ")
-                        ):
-                            class_end = i
-                            break
+                        if class_end == -1:
+                            class_end = len(lines)
 
-                if class_start != -1:
-                    if class_end == -1:
-                        class_end = len(lines)
-
-                    class_content = "\n".join(lines[class_start : class_end + 1])
+                        class_content = "\n".join(lines[class_start : class_end + 1])
 
             except Exception as e:
                 logger.warning(
@@ -466,45 +494,50 @@ class ContentExtractor:
                         file_content = f.read()
                     self.cache[absolute_path] = file_content
 
-                # Extract function/method definition (simple approach)
+                # Use the line range stored by the AST step when available,
+                # otherwise fall back to a simple text search
                 lines = file_content.split("\n")
-                func_start = -1
-                func_end = -1
-                brace_level = 0
-
-                for i, line in enumerate(lines):
-                    if (
-                        f"def {func_name}" in line
-                        or f"function {func_name}" in line
-                        or f"{func_name} = function" in line
-                        or f"{func_name}(" in line
-                    ) and func_start == -1:
-                        func_start = i
-
-                    if func_start != -1:
-                        # Count braces for languages like Java, C++
-                        brace_level += line.count("{") - line.count("}")
-
-                        # For Python, look for lower indentation level
-                        if "}" in line and brace_level == 0:
-                            func_end = i
-                            break
+                line_range = self._line_range(node)
+                if line_range:
+                    func_content = "\n".join(lines[line_range[0] : line_range[1]])
+                else:
+                    func_start = -1
+                    func_end = -1
+                    brace_level = 0
 
-                        # For Python, empty line followed by no indentation might end function
+                    for i, line in enumerate(lines):
                         if (
-                            i > func_start
-                            and line.strip() == ""
-                            and i + 1 < len(lines)
-                            and not lines[i + 1].startswith(" ")
-                        ):
-                            func_end = i
-                            break
+                            f"def {func_name}" in line
+                            or f"function {func_name}" in line
+                            or f"{func_name} = function" in line
+                            or f"{func_name}(" in line
+                        ) and func_start == -1:
+                            func_start = i
+
+                        if func_start != -1:
+                            # Count braces for languages like Java, C++
+                            brace_level += line.count("{") - line.count("}")
+
+                            # For Python, look for lower indentation level
+                            if "}" in line and brace_level == 0:
+                                func_end = i
+                                break
+
+                            # For Python, empty line followed by no indentation might end function
+                            if (
+                                i > func_start
+                                and line.strip() == ""
+                                and i + 1 < len(lines)
+                                and not lines[i + 1].startswith(" ")
+                            ):
+                                func_end = i
+                                break
 
-                if func_start != -1:
-                    if func_end == -1:
-                        func_end = len(lines)
+                    if func_start != -1:
+                        if func_end == -1:
+                            func_end = len(lines)
 
-                    func_content = "\n".join(lines[func_start : func_end + 1])
+                        func_content = "\n".join(lines[func_start : func_end + 1])
 
             except Exception as e:
                 logger.warning(
@@ -522,6 +555,23 @@ class ContentExtractor:
             "context": context,
         }
 
+    @staticmethod
+    def _line_range(node: NodeData) -> tuple[int, int] | None:
+        """Get the 0-based, end-exclusive line range of a class or function node.
+
+        Args:
+            node: Node with ``start_line``/``end_line`` properties (1-based,
+                inclusive) if they were stored with it
+
+        Returns:
+            (start, end) slice bounds, or None if the node has no line range
+        """
+        start = node.properties.get("start_line")
+        end = node.properties.get("end_line")
+        if not isinstance(start, int) or not isinstance(end, int) or end < start:
+            return None
+        return start - 1, end
+
     def _get_readme_content(self, repo_path: str | None = None) -> str:
         """Get README content from the repository.
 
@@ -0,0 +1,125 @@
+"""Integration tests for the Redis-backed JobIndex."""
+
+import os
+
+import pytest
+
+from codestory.ingestion_pipeline.job_index import DependencyFailedError, JobIndex
+
+
+@pytest.fixture
+def index(redis_client):
+    """Create a job index on the test Redis."""
+    redis_uri = (
+        os.environ.get("REDIS__URI") or os.environ.get("REDIS_URI") or "redis://localhost:6380/0"
+    )
+    return JobIndex.from_url(redis_uri, key_prefix="codestory:test:jobs")
+
+
+@pytest.mark.integration
+def test_list_jobs_by_status_and_repository(index):
+    """Jobs are listed newest first, filtered by status and repository."""
+    for i in range(6):
+        index.record(f"job-{i}", "pending", f"/repo/{i % 2}", created_at=1000 + i)
+    index.record("job-4", "running")
+    index.record("job-5", "completed", duration=12.5)
+
+    assert [j["job_id"] for j in index.list_jobs(limit=3)] == ["job-5", "job-4", "job-3"]
+    assert [j["job_id"] for j in index.list_jobs(limit=3, offset=3)] == [
+        "job-2",
+        "job-1",
+        "job-0",
+    ]
+    assert [j["job_id"] for j in index.list_jobs(limit=2, descending=False)] == [
+        "job-0",
+        "job-1",
+    ]
+
+    pending = index.list_jobs(status=["pending"], limit=10)
+    assert [j["job_id"] for j in pending] == ["job-3", "job-2", "job-1", "job-0"]
+    assert index.count_jobs(status=["pending"]) == 4
+
+    assert [j["job_id"] for j in index.list_jobs(status=["completed", "running"])] == [
+        "job-5",
+        "job-4",
+    ]
+    assert [j["job_id"] for j in index.list_jobs(repository="/repo/1")] == [
+        "job-5",
+        "job-3",
+        "job-1",
+    ]
+    assert [
+        j["job_id"] for j in index.list_jobs(status=["pending"], repository="/repo/1")
+    ] == ["job-3", "job-1"]
+    assert index.count_jobs() == 6
+
+    job = index.get_job("job-5")
+    assert job is not None
+    assert job["status"] == "completed"
+    assert job["repository"] == "/repo/1"
+    assert job["created_at"] == 1005
+    assert job["duration"] == 12.5
+
+
+@pytest.mark.integration
+def test_status_only_moves_forward(index):
+    """Late updates cannot move a job backwards or out of a finished status."""
+    index.record("job", "running", "/repo")
+    assert index.record("job", "pending") == "running"
+    assert index.get_job("job")["status"] == "running"
+
+    index.record("job", "completed")
+    index.record("job", "running")
+    assert index.get_job("job")["status"] == "completed"
+    assert index.count_jobs(status=["running"]) == 0
+    assert index.count_jobs(status=["completed"], repository="/repo") == 1
+
+
+@pytest.mark.integration
+def test_completing_a_job_releases_only_its_dependents(index):
+    """A dependent is released once, after its last dependency completes."""
+    index.record("a", "running")
+    index.record("b", "running")
+    index.record("done", "completed")
+
+    assert index.add_waiting("both", ["a", "b", "done"], {"source": "/repo"}) == ["a", "b"]
+    assert index.add_waiting("only-a", ["a"], {"source": "/repo"}) == ["a"]
+    assert index.add_waiting("ready", ["done"], {"source": "/repo"}) == []
+    assert index.get_job("ready")["status"] == "pending"
+    assert index.get_job("both")["request"] == {"source": "/repo"}
+
+    assert index.complete("a") == ["only-a"]
+    assert index.waiting_on("both") == {"b"}
+    assert index.get_job("both")["status"] == "waiting"
+
+    assert index.complete("b") == ["both"]
+    assert index.get_job("both")["status"] == "pending"
+
+    # Completing again does not hand the dependents out twice
+    assert index.complete("b") == []
+
+
+@pytest.mark.integration
+def test_failing_a_job_finishes_its_dependents(index):
+    """Dependents of a failed or cancelled job fail or are cancelled with it."""
+    index.record("a", "running")
+    index.record("b", "running")
+    assert index.add_waiting("c", ["a", "b"], {"source": "/repo"}) == ["a", "b"]
+    assert index.add_waiting("d", ["c"], {"source": "/repo"}) == ["c"]
+    assert index.add_waiting("e", ["b"], {"source": "/repo"}) == ["b"]
+
+    index.record("a", "failed", error="boom")
+    assert index.get_job("c")["status"] == "failed"
+    assert index.get_job("c")["error"] == "Dependency a is failed"
+    assert index.get_job("d")["status"] == "failed"
+    assert index.get_job("e")["status"] == "waiting"
+    assert index.waiting_on("c") == set()
+
+    index.record("b", "cancelled")
+    assert index.get_job("e")["status"] == "cancelled"
+    assert index.complete("b") == []
+
+    with pytest.raises(DependencyFailedError) as exc_info:
+        index.add_waiting("f", ["a"], {"source": "/repo"})
+    assert (exc_info.value.dependency, exc_info.value.status) == ("a", "failed")
+    assert index.get_job("f") is None
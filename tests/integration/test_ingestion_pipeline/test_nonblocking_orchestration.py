@@ -0,0 +1,102 @@
+"""Integration tests for non-blocking pipeline orchestration.
+
+The orchestrator and run_step hand off to step continuations instead of
+waiting, so a worker pool of size N must be able to drive N pipelines at once
+without any of them starving for a free worker.
+"""
+
+import os
+import time
+from typing import Any
+
+import pytest
+from celery.contrib.testing.worker import start_worker
+
+from codestory.ingestion_pipeline import tasks
+from codestory.ingestion_pipeline.celery_app import app
+from codestory.ingestion_pipeline.job_state import PipelineJobStore
+from codestory.ingestion_pipeline.resource_manager import ResourceScheduler
+from codestory.ingestion_pipeline.step import StepStatus
+
+POOL_SIZE = 3
+
+# a -> (b, c) -> d
+STEP_CONFIGS = [
+    {"name": "fake_a", "depends_on": []},
+    {"name": "fake_b", "depends_on": ["fake_a"]},
+    {"name": "fake_c", "depends_on": ["fake_a"]},
+    {"name": "fake_d", "depends_on": ["fake_b", "fake_c"]},
+]
+
+
+def _make_fake_step(name: str) -> Any:
+    @app.task(name=f"{name}.run")  # type: ignore[misc]
+    def fake_step(repository_path: str, **kwargs: Any) -> dict[str, Any]:
+        time.sleep(0.2)
+        return {"status": StepStatus.COMPLETED, "processed": name}
+
+    return fake_step
+
+
+for _step in STEP_CONFIGS:
+    _make_fake_step(_step["name"])
+
+
+@pytest.fixture
+def pipeline_worker(redis_client, monkeypatch):
+    """Run a thread-pool worker of size POOL_SIZE against the test Redis."""
+    redis_uri = (
+        os.environ.get("REDIS__URI") or os.environ.get("REDIS_URI") or "redis://localhost:6380/0"
+    )
+    store = PipelineJobStore.from_url(redis_uri)
+    monkeypatch.setattr(tasks, "_job_store", store)
+    monkeypatch.setattr(
+        tasks,
+        "_get_scheduler",
+        lambda: ResourceScheduler(redis_url=redis_uri, capacity=POOL_SIZE),
+    )
+
+    always_eager = app.conf.task_always_eager
+    app.conf.task_always_eager = False
+    try:
+        # The fake step tasks are unrouted, so they land on the "celery" queue
+        with start_worker(
+            app,
+            pool="threads",
+            concurrency=POOL_SIZE,
+            perform_ping_check=False,
+            queues=["high", "default", "low", "celery"],
+        ):
+            yield store
+    finally:
+        app.conf.task_always_eager = always_eager
+
+
+@pytest.mark.integration
+@pytest.mark.celery
+def test_concurrent_pipelines_complete_on_pool_of_same_size(pipeline_worker):
+    """N pipelines on a pool of N workers all complete without deadlocking."""
+    store = pipeline_worker
+    job_ids = [f"nonblocking-{i}" for i in range(POOL_SIZE)]
+    results = [
+        tasks.orchestrate_pipeline.apply_async(args=["/tmp/repo", STEP_CONFIGS, job_id])
+        for job_id in job_ids
+    ]
+
+    finished = [r.get(timeout=120) for r in results]
+
+    for job_id, result in zip(job_ids, finished, strict=True):
+        assert result["job_id"] == job_id
+        assert result["status"] == StepStatus.COMPLETED.value
+        assert [s["step"] for s in result["steps"]] == [s["name"] for s in STEP_CONFIGS]
+        assert all(s["status"] == StepStatus.COMPLETED.value for s in result["steps"])
+        assert result["levels"] == [["fake_a"], ["fake_b", "fake_c"], ["fake_d"]]
+
+        job = store.get_job(job_id)
+        assert job is not None
+        assert job["status"] == StepStatus.COMPLETED.value
+
+    # Every resource lease was handed back
+    status = tasks._get_scheduler().get_status()
+    assert status["available_tokens"] == POOL_SIZE
+    assert status["active_leases"] == 0
@@ -0,0 +1,111 @@
+"""Integration tests for the Redis-backed ResourceScheduler."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from codestory.ingestion_pipeline.resource_manager import ResourceScheduler, step_weight
+
+
+@pytest.fixture
+def scheduler(redis_client):
+    """Create a scheduler with a capacity of 3 on the test Redis."""
+    redis_uri = (
+        os.environ.get("REDIS__URI") or os.environ.get("REDIS_URI") or "redis://localhost:6380/0"
+    )
+    return ResourceScheduler(
+        redis_url=redis_uri,
+        key_prefix="codestory:test:resources",
+        capacity=3,
+        lease_ttl=30,
+        waiter_ttl=30,
+        wake_interval=1,
+    )
+
+
+@pytest.mark.integration
+def test_weighted_leases_respect_capacity(scheduler):
+    """Leases are granted until their combined weight reaches the capacity."""
+    blarify = scheduler.try_acquire(weight=2, waiter_id="blarify")
+    filesystem = scheduler.try_acquire(weight=1, waiter_id="filesystem")
+
+    assert blarify == "blarify"
+    assert filesystem == "filesystem"
+    assert scheduler.try_acquire(weight=1, waiter_id="extra") is None
+
+    status = scheduler.get_status()
+    assert status["available_tokens"] == 0
+    assert status["active_leases"] == 2
+    assert status["waiting"] == 1
+
+    assert scheduler.release(blarify)
+    assert not scheduler.release(blarify)
+    assert scheduler.try_acquire(weight=1, waiter_id="extra") == "extra"
+
+
+@pytest.mark.integration
+def test_waiters_are_served_in_fifo_order(scheduler):
+    """A light waiter cannot overtake a heavier waiter queued before it."""
+    holder = scheduler.try_acquire(weight=2, waiter_id="holder")
+    assert scheduler.try_acquire(weight=2, waiter_id="first") is None
+    # One unit is free, but "first" is at the head of the queue
+    assert scheduler.try_acquire(weight=1, waiter_id="second") is None
+
+    scheduler.release(holder)
+
+    assert scheduler.try_acquire(weight=1, waiter_id="second") is None
+    assert scheduler.try_acquire(weight=2, waiter_id="first") == "first"
+    assert scheduler.try_acquire(weight=1, waiter_id="second") == "second"
+
+
+@pytest.mark.integration
+def test_blocked_waiter_is_woken_on_release(scheduler):
+    """A waiter blocked in acquire gets the lease as soon as capacity is released."""
+    holder = scheduler.try_acquire(weight=3, waiter_id="holder")
+    acquired: list[str | None] = []
+
+    waiter = threading.Thread(
+        target=lambda: acquired.append(scheduler.acquire(weight=2, timeout=10, waiter_id="w"))
+    )
+    waiter.start()
+    time.sleep(0.5)
+    assert not acquired
+
+    scheduler.release(holder)
+    waiter.join(timeout=10)
+
+    assert acquired == ["w"]
+
+
+@pytest.mark.integration
+def test_expired_lease_capacity_is_recovered(scheduler):
+    """Capacity held by a lease that is no longer heartbeated is reclaimed."""
+    leaked = scheduler.try_acquire(weight=3, waiter_id="crashed", lease_ttl=1)
+    assert leaked == "crashed"
+    assert scheduler.heartbeat(leaked, lease_ttl=1)
+
+    assert scheduler.acquire(weight=1, timeout=5, waiter_id="next") == "next"
+    assert not scheduler.heartbeat(leaked)
+
+
+@pytest.mark.integration
+def test_acquire_timeout_leaves_queue(scheduler):
+    """A waiter that times out gives up its place unless asked to keep it."""
+    scheduler.try_acquire(weight=3, waiter_id="holder")
+
+    assert scheduler.acquire(weight=1, timeout=1, waiter_id="gone") is None
+    assert scheduler.get_status()["waiting"] == 0
+
+    assert scheduler.acquire(weight=1, timeout=1, waiter_id="kept", keep_place=True) is None
+    assert scheduler.get_status()["waiting"] == 1
+
+
+def test_step_weight():
+    """Step weights come from the step config, then the weight table."""
+    assert step_weight("blarify") == 2
+    assert step_weight("filesystem") == 1
+    assert step_weight("summarizer") == 1
+    assert step_weight("blarify", {"resource_weight": 3}) == 3
+    assert step_weight("summarizer", weights={"summarizer": 2}) == 2
@@ -1,8 +1,6 @@
 """Unit tests for the ProgressClient class."""
 
 import json
-import threading
-import time
 from unittest.mock import MagicMock, patch
 
 import redis
@@ -121,17 +119,28 @@ class TestProgressClient:
                 mock_thread.join.assert_called_once()
 
     def test_subscribe_redis(self) -> None:
-        """Test Redis subscription."""
-        # Create mock Redis and PubSub
+        """Test reading the job's progress stream from Redis."""
         mock_redis = MagicMock()
-        mock_pubsub = MagicMock()
-        mock_redis.pubsub.return_value = mock_pubsub
 
-        # Configure pubsub.listen to yield two messages then exit
-        message1 = {"type": "message", "data": json.dumps({"progress": 50})}
-        message2 = {"type": "message", "data": "invalid json"}
-        message3 = {"type": "other", "data": "ignore"}
-        mock_pubsub.listen.return_value = [message1, message2, message3]
+        # First read replays two entries (one invalid), the second one ends the job
+        mock_redis.xread.side_effect = [
+            [
+                (
+                    b"codestory:ingestion:progress:test-123",
+                    [
+                        (b"1-0", {b"event": json.dumps({"progress": 50, "job_status": "running"})}),
+                        (b"2-0", {b"event": b"invalid json"}),
+                    ],
+                )
+            ],
+            [],
+            [
+                (
+                    b"codestory:ingestion:progress:test-123",
+                    [(b"3-0", {b"event": json.dumps({"progress": 100, "job_status": "completed"})})],
+                )
+            ],
+        ]
 
         with patch(
             "codestory.cli.client.progress_client.redis.from_url",
@@ -149,28 +158,50 @@ class TestProgressClient:
                 settings=mock_settings,
             )
 
-            # Set stop event after processing messages
-            original_set = client._stop_event.set
+            # Run subscribe method; it returns once the job has finished
+            client._subscribe_redis()
 
-            def stop_after_messages():
-                # Stop after processing all messages
-                time.sleep(0.1)
-                original_set()
+            # The stream is read from its start, then after the last entry seen
+            streams = [call[0][0] for call in mock_redis.xread.call_args_list]
+            assert streams == [
+                {"codestory:ingestion:progress:test-123": "0-0"},
+                {"codestory:ingestion:progress:test-123": b"2-0"},
+                {"codestory:ingestion:progress:test-123": b"2-0"},
+            ]
 
-            stop_thread = threading.Thread(target=stop_after_messages)
-            stop_thread.daemon = True
-            stop_thread.start()
+            # Check callback invocation
+            assert [call[0][0]["progress"] for call in mock_callback.call_args_list] == [50, 100]
 
-            # Run subscribe method
-            client._subscribe_redis()
+    def test_poll_http_follows_event_stream(self) -> None:
+        """Test that the service's event stream is preferred over polling."""
+        with patch("codestory.cli.client.service_client.ServiceClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_client_class.return_value = mock_client
+            mock_client.stream_ingestion_events.return_value = iter(
+                [
+                    {"progress": 10, "job_status": "running"},
+                    {"type": "heartbeat"},
+                    {"progress": 100, "job_status": "completed"},
+                ]
+            )
 
-            # Check pubsub usage
-            mock_pubsub.subscribe.assert_called_once_with("codestory:ingestion:progress:test-123")
-            mock_pubsub.unsubscribe.assert_called_once()
-            mock_pubsub.close.assert_called_once()
+            mock_settings = MagicMock()
+            mock_settings.redis.uri = "redis://localhost:6379"
+            mock_callback = MagicMock()
 
-            # Check callback invocation
-            mock_callback.assert_called_once_with({"progress": 50})
+            with patch(
+                "codestory.cli.client.progress_client.redis.from_url",
+                side_effect=redis.RedisError("Connection failed"),
+            ):
+                client = ProgressClient(
+                    job_id="test-123", callback=mock_callback, settings=mock_settings
+                )
+
+            client._poll_http()
+
+            mock_client.stream_ingestion_events.assert_called_once_with("test-123")
+            mock_client.get_ingestion_status.assert_not_called()
+            assert [call[0][0]["progress"] for call in mock_callback.call_args_list] == [10, 100]
 
     def test_poll_http(self) -> None:
         """Test HTTP polling."""
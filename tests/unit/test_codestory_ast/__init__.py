@@ -0,0 +1 @@
+"""Tests for the AST extraction step."""
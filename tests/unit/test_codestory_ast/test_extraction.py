@@ -0,0 +1,201 @@
+"""Tests for the in-process AST extraction step."""
+
+import textwrap
+from unittest import mock
+
+from codestory.ingestion_pipeline.progress import ProgressReporter
+from codestory.ingestion_pipeline.step import StepStatus
+from codestory_ast.graph import CodeGraph, GraphWriter, node_key
+from codestory_ast.languages import PythonExtractor, get_extractor
+from codestory_ast.step import (
+    extract_file,
+    find_source_files,
+    parallel_map,
+    run_ast_extraction,
+)
+
+BASE_SOURCE = textwrap.dedent(
+    '''\
+    """Base classes."""
+
+
+    class Base:
+        """A base class."""
+
+        def run(self):
+            return self.helper()
+
+        def helper(self):
+            return 1
+
+
+    def make():
+        return Base()
+    '''
+)
+
+IMPL_SOURCE = textwrap.dedent(
+    """\
+    import os
+    from .base import Base, make as build
+
+
+    class Impl(Base):
+        def run(self):
+            def inner():
+                return os.getcwd()
+
+            return build().run() + inner()
+    """
+)
+
+
+def _extract(path: str, source: str) -> dict:
+    extractor = get_extractor(path)
+    assert extractor is not None
+    return extractor.extract(path, source)
+
+
+def test_python_extractor():
+    """Classes, methods and nested functions are extracted with their line ranges."""
+    result = _extract("pkg/impl.py", IMPL_SOURCE)
+
+    assert result["module"] == "pkg.impl"
+    assert result["imports"] == ["os", "pkg.base", "pkg.base.Base", "pkg.base.make"]
+    assert result["aliases"] == {"os": "os", "Base": "pkg.base.Base", "build": "pkg.base.make"}
+
+    [cls] = result["classes"]
+    assert (cls["qualified_name"], cls["start_line"], cls["end_line"]) == ("pkg.impl.Impl", 5, 10)
+    assert cls["bases"] == ["Base"]
+
+    run, inner = result["functions"]
+    assert run["qualified_name"] == "pkg.impl.Impl.run"
+    assert (run["name"], run["module"], run["is_method"]) == ("run", "pkg.impl.Impl", True)
+    assert (run["start_line"], run["end_line"]) == (6, 10)
+    assert run["calls"] == ["build", "inner"]
+
+    assert inner["qualified_name"] == "pkg.impl.Impl.run.inner"
+    assert (inner["parent_type"], inner["is_method"]) == ("function", False)
+    assert inner["calls"] == ["os.getcwd"]
+
+    assert PythonExtractor().module_name("pkg/__init__.py") == "pkg"
+    assert get_extractor("README.md") is None
+
+
+def test_code_graph_resolves_relationships():
+    """Imports, base classes and calls are resolved to repository definitions."""
+    graph = CodeGraph(
+        [
+            _extract("pkg/__init__.py", ""),
+            _extract("pkg/base.py", BASE_SOURCE),
+            _extract("pkg/impl.py", IMPL_SOURCE),
+        ]
+    )
+
+    assert graph.imports() == [{"source": "pkg/impl.py", "target": "pkg/base.py"}]
+    assert graph.inherits() == [{"source": "pkg.impl.Impl", "target": "pkg.base.Base"}]
+
+    calls = {(row["source"], row["target"]) for row in graph.calls()}
+    assert calls == {
+        ("pkg.base.Base.run", "pkg.base.Base.helper"),
+        ("pkg.impl.Impl.run", "pkg.base.make"),
+        ("pkg.impl.Impl.run", "pkg.impl.Impl.run.inner"),
+    }
+
+    contains = graph.contains()
+    assert {"source": "pkg/base.py", "target": "pkg.base.Base"} in contains[("File", "Class")]
+    assert {"source": "pkg.base.Base", "target": "pkg.base.Base.run"} in contains[
+        ("Class", "Function")
+    ]
+    assert {"source": "pkg.impl.Impl.run", "target": "pkg.impl.Impl.run.inner"} in contains[
+        ("Function", "Function")
+    ]
+
+    methods = graph.node_rows()["methods"]
+    assert {"name": "helper", "module": "pkg.base.Base"} in methods
+    assert node_key("pkg.base.Base.run") == {"name": "run", "module": "pkg.base.Base"}
+
+
+def test_graph_writer_batches_rows():
+    """Nodes and relationships are written with batched UNWIND queries."""
+    files = [_extract(f"mod{i}.py", BASE_SOURCE) for i in range(3)]
+    connector = mock.MagicMock()
+
+    counts = GraphWriter(connector, batch_size=2).write(CodeGraph(files))
+
+    assert counts["files"] == 3
+    assert counts["classes"] == 3
+    assert counts["functions"] == 9
+    queries = [call.args[0] for call in connector.execute_query.call_args_list]
+    assert all(query.lstrip().startswith("UNWIND $rows") for query in queries)
+    batches = [call.kwargs["params"]["rows"] for call in connector.execute_query.call_args_list]
+    assert all(0 < len(rows) <= 2 for rows in batches)
+
+    # Class and function ends are matched on their (name, module) key
+    calls_batches = [
+        rows for query, rows in zip(queries, batches, strict=True) if "[:CALLS]" in query
+    ]
+    assert {
+        "source": {"name": "run", "module": "mod0.Base"},
+        "target": {"name": "helper", "module": "mod0.Base"},
+    } in [row for rows in calls_batches for row in rows]
+
+
+def test_find_and_extract_files_in_parallel(tmp_path):
+    """Ignored files are skipped and files are parsed by a process pool."""
+    (tmp_path / ".gitignore").write_text("generated/\n")
+    (tmp_path / "generated").mkdir()
+    (tmp_path / "generated" / "skip.py").write_text("x = 1\n")
+    (tmp_path / "broken.py").write_text("def broken(:\n")
+    (tmp_path / "notes.txt").write_text("not code\n")
+    for i in range(80):
+        (tmp_path / f"mod{i}.py").write_text(f"def f{i}():\n    return {i}\n")
+
+    files = find_source_files(str(tmp_path))
+    assert len(files) == 81
+    assert "generated/skip.py" not in files and "notes.txt" not in files
+
+    tasks = [(str(tmp_path), path) for path in files]
+    results = {
+        path: (result, error)
+        for path, result, error in parallel_map(extract_file, tasks, max_workers=2, chunksize=8)
+    }
+
+    assert len(results) == 81
+    assert results["broken.py"][0] is None
+    assert results["broken.py"][1].startswith("SyntaxError")
+    assert results["mod7.py"][0]["functions"][0]["qualified_name"] == "mod7.f7"
+
+
+def test_graph_writer_counts_created_relationships():
+    """Relationships are counted as created by the queries, once per distinct row."""
+    connector = mock.MagicMock()
+    connector.execute_query.return_value = [{"created": 1}]
+    rows = [{"source": "a.py", "target": "b.py"}] * 3 + [{"source": "a.py", "target": "c.py"}]
+
+    created = GraphWriter(connector, batch_size=1).write_relationships(
+        "File", "IMPORTS", "File", rows
+    )
+
+    assert created == 2
+    assert connector.execute_query.call_count == 2
+
+
+def test_extraction_task_publishes_progress_to_the_job(tmp_path):
+    """Test that the task reports its progress through the job's reporter."""
+    (tmp_path / "base.py").write_text(BASE_SOURCE)
+    stream = mock.MagicMock()
+    reporter = ProgressReporter("orchestrator-1", "ast", stream=stream, min_interval=0)
+
+    with (
+        mock.patch("codestory_ast.step.create_reporter", return_value=reporter) as create,
+        mock.patch("codestory_ast.step.Neo4jConnector"),
+        mock.patch("codestory_ast.step.GraphWriter"),
+    ):
+        result = run_ast_extraction.run(str(tmp_path), job_id="job-1", max_workers=1)
+
+    assert result["files_processed"] == 1
+    assert create.call_args.args == ("job-1", "ast")
+    events = [call.args[1] for call in stream.publish.call_args_list]
+    assert [event["progress"] for event in events] == [5.0, 80.0, 80.0, 100.0]
+    assert events[-1]["status"] == StepStatus.COMPLETED.value
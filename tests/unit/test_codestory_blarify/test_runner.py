@@ -0,0 +1,144 @@
+"""Tests for the Blarify runners."""
+
+import os
+import stat
+import threading
+import time
+from unittest import mock
+
+import pytest
+from docker.errors import ImageNotFound
+
+from codestory_blarify.runner import (
+    WORK_DIR,
+    BlarifyEvent,
+    ContainerPoolRunner,
+    ImageChecker,
+    SubprocessRunner,
+    blarify_command,
+    parse_event,
+)
+
+
+def test_parse_event():
+    """JSON lines are used as is; plain progress and error lines are translated."""
+    assert parse_event('{"event": "progress", "progress": 42, "message": "parsing"}') == (
+        BlarifyEvent(type="progress", progress=42.0, message="parsing")
+    )
+    assert parse_event("Progress: 37.5% (120/320 files)") == BlarifyEvent(
+        type="progress", progress=37.5, message="Progress: 37.5% (120/320 files)"
+    )
+    assert parse_event("Error: could not parse foo.py").type == "error"
+    assert parse_event("Progress: unknown").type == "log"
+    assert parse_event("{not json").type == "log"
+
+
+@pytest.fixture
+def client():
+    """Create a mock Docker client with a local, up-to-date image."""
+    client = mock.MagicMock()
+    image = mock.MagicMock(id="sha256:local", attrs={"RepoDigests": ["blarify@sha256:remote"]})
+    client.images.get.return_value = image
+    client.images.get_registry_data.return_value = mock.MagicMock(id="sha256:remote")
+
+    container = mock.MagicMock(id="container1", status="running")
+    client.containers.run.return_value = container
+    client.api.exec_create.return_value = {"Id": "exec1"}
+    client.api.exec_start.side_effect = lambda *args, **kwargs: iter(
+        [b"Progress: 50", b"%\nindexing\n", b"Progress: 100%"]
+    )
+    client.api.exec_inspect.return_value = {"ExitCode": 0}
+    return client
+
+
+def test_image_checker_only_pulls_changed_images(client):
+    """The registry digest is checked once per TTL and the image pulled only if it changed."""
+    checker = ImageChecker(client, ttl=3600)
+
+    assert checker.ensure("blarify") == "sha256:local"
+    assert checker.ensure("blarify") == "sha256:local"
+    client.images.get_registry_data.assert_called_once_with("blarify")
+    client.images.pull.assert_not_called()
+
+    client.images.get.side_effect = ImageNotFound("missing")
+    client.images.pull.return_value = mock.MagicMock(id="sha256:pulled")
+    assert ImageChecker(client).ensure("blarify") == "sha256:pulled"
+
+
+def test_container_pool_reuses_warm_container(client, tmp_path):
+    """Jobs run as execs in one warm container; the image is not re-checked."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    pool = ContainerPoolRunner(client, "blarify", str(tmp_path), ImageChecker(client))
+
+    command = blarify_command(pool.container_path(str(repo)), "neo4j://db", [], False)
+    assert command[:3] == ["blarify", "parse", f"{WORK_DIR}/repo"]
+
+    first = list(pool.run(command, timeout=60, name="codestory-blarify-job1"))
+    second = list(pool.run(command, timeout=60, name="codestory-blarify-job2"))
+
+    assert [e.progress for e in first if e.type == "progress"] == [50.0, 100.0]
+    assert first[-1] == BlarifyEvent(
+        type="exit", exit_code=0, message="Blarify exited with code 0"
+    )
+    assert second == first
+    client.containers.run.assert_called_once()
+    assert client.api.exec_create.call_count == 2
+    client.images.get_registry_data.assert_called_once()
+
+    container = client.containers.run.return_value
+    container.rename.assert_any_call("codestory-blarify-job1")
+    container.remove.assert_not_called()
+
+
+def test_container_pool_discards_failed_container(client, tmp_path):
+    """A container whose job failed is not reused."""
+    client.api.exec_inspect.return_value = {"ExitCode": 2}
+    pool = ContainerPoolRunner(client, "blarify", str(tmp_path), ImageChecker(client))
+
+    events = list(pool.run(["blarify", "parse", WORK_DIR], timeout=60))
+
+    assert events[-1].exit_code == 2
+    client.containers.run.return_value.remove.assert_called_once_with(force=True)
+
+    with pytest.raises(ValueError):
+        pool.container_path(os.path.dirname(str(tmp_path)))
+
+
+def test_subprocess_runner(tmp_path):
+    """The subprocess runner reports the CLI's output as events."""
+    script = tmp_path / "blarify"
+    script.write_text("#!/bin/sh\necho 'Progress: 25%'\necho \"args: $*\"\nexit 3\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+
+    events = list(SubprocessRunner(str(script)).run(["blarify", "parse", "/repo"], timeout=10))
+
+    assert events == [
+        BlarifyEvent(type="progress", progress=25.0, message="Progress: 25%"),
+        BlarifyEvent(type="log", message="args: parse /repo"),
+        BlarifyEvent(type="exit", exit_code=3, message="Blarify exited with code 3"),
+    ]
+
+
+def test_subprocess_runner_timeout(tmp_path):
+    """A subprocess that runs past its timeout is killed."""
+    script = tmp_path / "blarify"
+    script.write_text("#!/bin/sh\nexec sleep 30\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+
+    with pytest.raises(TimeoutError):
+        list(SubprocessRunner(str(script)).run(["blarify"], timeout=0.5))
+
+
+def test_subprocess_runner_cancel(tmp_path):
+    """A subprocess is killed once its run is cancelled."""
+    script = tmp_path / "blarify"
+    script.write_text("#!/bin/sh\nexec sleep 30\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="cancelled"):
+        list(SubprocessRunner(str(script)).run(["blarify"], timeout=60, cancel=cancel))
+    assert time.monotonic() - start < 5
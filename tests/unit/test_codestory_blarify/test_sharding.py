@@ -0,0 +1,194 @@
+"""Tests for sharded Blarify runs."""
+
+import threading
+import time
+from unittest import mock
+
+from codestory_blarify.runner import BlarifyEvent
+from codestory_blarify.sharding import (
+    Shard,
+    _loose_file_patterns,
+    plan_shards,
+    run_shards,
+    shard_lookup,
+    stitch_cross_shard_edges,
+)
+from codestory_filesystem.ignore import IgnoreMatcher
+
+
+def _write(root, files):
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+def test_plan_shards(tmp_path):
+    """Directories over the budget are split and units packed into shards."""
+    _write(
+        tmp_path,
+        {
+            "setup.py": "",
+            "a/one.py": "",
+            "a/two.py": "",
+            "a/three.py": "",
+            "b/x/one.py": "",
+            "b/x/two.py": "",
+            "b/y/one.py": "",
+            "b/loose.py": "",
+            "build/ignored.py": "",
+        },
+    )
+
+    assert plan_shards(str(tmp_path), max_files=100) == [
+        Shard(name="shard-0", roots=[""], file_count=8)
+    ]
+
+    shards = plan_shards(str(tmp_path), max_files=3)
+    assert all(shard.file_count <= 3 for shard in shards)
+    assert sum(shard.file_count for shard in shards) == 8
+
+    lookup = shard_lookup(shards)
+    files = ["setup.py", "a/one.py", "b/x/two.py", "b/y/one.py", "b/loose.py"]
+    assert all(lookup(path) is not None for path in files)
+    assert lookup("a/one.py") == lookup("a/three.py")
+    assert lookup("b/x/one.py") == lookup("b/x/two.py")
+
+    # Each shard ignores exactly the units of the other shards
+    for index, shard in enumerate(shards):
+        matcher = IgnoreMatcher(None, shard.exclude, builtin=False)
+        for path in files:
+            assert matcher.is_ignored(path) == (lookup(path) != index)
+
+
+def test_loose_files_are_excluded_by_extension():
+    """Loose files are excluded by extension unless a subdirectory shares it."""
+    files = [f"mod{i}.py" for i in range(1000)] + ["Makefile", "a.cfg", "b.txt", "c.txt"]
+
+    patterns = _loose_file_patterns("src/", files, ["lib", "vendor.txt"])
+
+    assert sorted(patterns) == [
+        "/src/*.py",
+        "/src/Makefile",
+        "/src/a.cfg",
+        "/src/b.txt",
+        "/src/c.txt",
+    ]
+
+
+class FakeRunner:
+    """Runner that reports progress and tracks concurrent runs."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.timeouts = []
+        self.lock = threading.Lock()
+
+    def run(self, command, timeout, name=None, cancel=None):
+        self.timeouts.append(timeout)
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if command == ["fail"]:
+                raise TimeoutError("Blarify did not finish within 1 seconds")
+            time.sleep(0.05)
+            yield BlarifyEvent(type="progress", progress=50.0)
+            yield BlarifyEvent(type="exit", exit_code=0, message=name)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_run_shards_bounds_concurrency():
+    """Shards run with bounded concurrency and a failing shard reports exit code -1."""
+    runner = FakeRunner()
+    commands = [["ok"]] * 5 + [["fail"]]
+
+    events = list(run_shards(runner, commands, timeout=1, max_concurrency=2, name_prefix="job"))
+
+    assert runner.max_running == 2
+    exits = {index: event for index, event in events if event.type == "exit"}
+    assert {i: e.exit_code for i, e in exits.items()} == {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: -1}
+    assert exits[3].message == "job-3"
+    assert (
+        5,
+        BlarifyEvent(type="error", message="TimeoutError: Blarify did not finish within 1 seconds"),
+    ) in events
+
+
+def test_run_shards_share_the_time_budget():
+    """Shards get the time left of the shared budget, not the full timeout each."""
+    runner = FakeRunner()
+
+    list(run_shards(runner, [["ok"]] * 4, timeout=10, max_concurrency=1))
+
+    assert all(timeout <= 10 for timeout in runner.timeouts)
+    assert runner.timeouts == sorted(runner.timeouts, reverse=True)
+    assert runner.timeouts[-1] < 10 - 0.1
+
+
+class BlockingRunner:
+    """Runner whose shards block until they are cancelled."""
+
+    def __init__(self):
+        self.killed = []
+        self.started = threading.Semaphore(0)
+
+    def run(self, command, timeout, name=None, cancel=None):
+        self.started.release()
+        yield BlarifyEvent(type="progress", progress=1.0)
+        cancel.wait(5)
+        self.killed.append(cancel.is_set())
+        yield BlarifyEvent(type="exit", exit_code=-1)
+
+
+def test_run_shards_kills_running_shards_on_abort():
+    """Shards still running are killed before an aborted run returns."""
+    runner = BlockingRunner()
+    events = run_shards(runner, [["a"], ["b"], ["c"]], timeout=60, max_concurrency=2)
+
+    next(events)
+    assert runner.started.acquire(timeout=2) and runner.started.acquire(timeout=2)
+    events.close()
+
+    # Both running shards saw the cancellation; the queued one never started
+    assert runner.killed == [True, True]
+    assert not runner.started.acquire(timeout=0.2)
+
+
+def test_stitch_cross_shard_edges(tmp_path):
+    """Only edges whose ends lie in different shards are written."""
+    _write(
+        tmp_path,
+        {
+            "a/__init__.py": "",
+            "a/main.py": (
+                "from b.lib import helper\n"
+                "from a.util import local\n\n\n"
+                "def main():\n    helper()\n    local()\n"
+            ),
+            "a/util.py": "def local():\n    return 1\n",
+            "b/__init__.py": "",
+            "b/lib.py": "def helper():\n    return 2\n",
+        },
+    )
+    shards = [Shard(name="shard-0", roots=["a"]), Shard(name="shard-1", roots=["b"])]
+    connector = mock.MagicMock()
+    connector.execute_query.return_value = [{"created": 1}]
+
+    counts = stitch_cross_shard_edges(connector, str(tmp_path), shards, max_workers=1)
+
+    assert counts == {"imports": 1, "calls": 1}
+    written = {
+        call.args[0].split("MERGE (a)-[:")[1].split("]")[0]: call.kwargs["params"]["rows"]
+        for call in connector.execute_query.call_args_list
+    }
+    assert written["IMPORTS"] == [{"source": "a/main.py", "target": "b/lib.py"}]
+    assert written["CALLS"] == [
+        {
+            "source": {"name": "main", "module": "a.main"},
+            "target": {"name": "helper", "module": "b.lib"},
+        }
+    ]
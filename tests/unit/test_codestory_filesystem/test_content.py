@@ -0,0 +1,154 @@
+"""Tests for file content hashing, binary sniffing and capped content."""
+
+from unittest import mock
+
+import pytest
+
+from codestory_filesystem import content
+from codestory_filesystem.content import (
+    HASH_ALGORITHM,
+    is_binary,
+    read_file_content,
+    trim_partial_utf8,
+)
+from codestory_filesystem.graph import FilesystemWriter
+from codestory_filesystem.scanner import FilesystemScanner, ScanBatch
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+
+@pytest.mark.parametrize(
+    ("sample", "expected"),
+    [
+        (b"def main():\n    return 1\n", False),
+        ("naïve café — ünïcode\n".encode(), False),
+        ("latin-1 caf\xe9\n".encode("latin-1"), False),
+        (b"", False),
+        (PNG_HEADER, True),
+        (bytes(range(1, 32)) * 4, True),
+    ],
+)
+def test_binary_files_are_sniffed(sample, expected):
+    """Test that binary content is detected from the bytes, not the name."""
+    assert is_binary(sample) is expected
+
+
+def test_read_file_content(tmp_path):
+    """Test that files are hashed whole and their content capped."""
+    path = tmp_path / "notes.txt"
+    path.write_text("a" * 100)
+    copy = tmp_path / "copy.dat"
+    copy.write_text("a" * 100)
+
+    result = read_file_content(str(path), max_bytes=10)
+
+    assert result.content_hash.startswith(f"{HASH_ALGORITHM}:")
+    assert result.content_hash == read_file_content(str(copy)).content_hash
+    assert result.text == "a" * 10
+    assert result.truncated
+    assert not read_file_content(str(path)).truncated
+
+    path.write_text("a" * 99 + "b")
+    assert read_file_content(str(path)).content_hash != result.content_hash
+
+
+@pytest.mark.parametrize("cut", range(1, 12))
+def test_truncation_keeps_whole_characters(tmp_path, cut):
+    """Test that content cut inside a multi-byte character drops that character."""
+    path = tmp_path / "unicode.txt"
+    text = "aé€😀b"  # Characters of 1, 2, 3, 4 and 1 bytes
+    path.write_text(text, encoding="utf-8")
+    encoded = text.encode()
+
+    result = read_file_content(str(path), max_bytes=cut)
+
+    assert "\ufffd" not in result.text
+    assert encoded.startswith(result.text.encode())
+    assert len(encoded[:cut]) - len(result.text.encode()) < 4
+    assert result.text_bytes == len(result.text.encode())
+
+
+def test_trim_partial_utf8():
+    """Test that only an incomplete trailing sequence is dropped."""
+    assert trim_partial_utf8("€".encode()[:2]) == b""
+    assert trim_partial_utf8(b"ab" + "😀".encode()[:3]) == b"ab"
+    assert trim_partial_utf8("a€".encode()) == "a€".encode()
+    # Invalid bytes that are not a cut sequence are left to the decoder
+    assert trim_partial_utf8(b"a\x80\x80\x80\x80") == b"a\x80\x80\x80\x80"
+
+
+def test_binary_files_have_no_content(tmp_path):
+    """Test that binary files are hashed but keep no text."""
+    path = tmp_path / "image.txt"
+    path.write_bytes(PNG_HEADER * 10)
+
+    result = read_file_content(str(path))
+
+    assert result.binary
+    assert result.text is None
+    assert result.content_hash is not None
+
+
+def test_content_is_read_without_hashing(tmp_path):
+    """Test that only the needed bytes are read when hashing is off."""
+    path = tmp_path / "big.txt"
+    path.write_text("x" * 1000)
+
+    with mock.patch.object(content, "READ_BLOCK_SIZE", 100):
+        result = read_file_content(str(path), hash_content=False, max_bytes=150)
+
+    assert result.content_hash is None
+    assert result.text == "x" * 150
+    assert result.truncated
+
+
+def test_scanner_reads_content_in_the_scan(tmp_path):
+    """Test that file rows carry the content fields when requested."""
+    (tmp_path / "main.py").write_text("print('hi')\n")
+    (tmp_path / "logo.bin").write_bytes(PNG_HEADER)
+
+    batches = list(FilesystemScanner(str(tmp_path), hash_content=True, content_max_bytes=64).scan())
+    rows = {row["name"]: row for batch in batches for row in batch.files}
+
+    assert rows["main.py"]["content"] == "print('hi')\n"
+    assert rows["main.py"]["is_binary"] is False
+    assert rows["main.py"]["content_truncated"] is False
+    assert rows["logo.bin"]["is_binary"] is True
+    assert rows["logo.bin"]["content"] is None
+    assert rows["logo.bin"]["content_hash"] != rows["main.py"]["content_hash"]
+
+    # Without content options the rows keep their plain shape
+    plain = list(FilesystemScanner(str(tmp_path)).scan())
+    assert "content_hash" not in plain[0].files[0]
+
+
+def test_scanner_caps_batch_content_bytes(tmp_path):
+    """Test that batches are split by the bytes of content they carry."""
+    for i in range(5):
+        (tmp_path / f"f{i}.txt").write_text("x" * 100)
+
+    scanner = FilesystemScanner(str(tmp_path), content_max_bytes=100, batch_max_bytes=250)
+    batches = list(scanner.scan())
+
+    assert [len(batch.files) for batch in batches] == [2, 2, 1]
+
+
+def test_writer_returns_changed_files():
+    """Test that the content query is used and reports new or changed files."""
+    connector = mock.MagicMock()
+    connector.execute_query.return_value = [{"path": "main.py"}]
+    batch = ScanBatch(
+        files=[
+            {"path": "main.py", "name": "main.py", "parent": "", "content_hash": "h1"},
+        ]
+    )
+
+    changed = FilesystemWriter(connector, "/repo", with_content=True).write_nodes(batch)
+
+    assert changed == ["main.py"]
+    query = connector.execute_query.call_args.args[0]
+    assert "f.content = row.content" in query
+    assert "previous_hash <> row.content_hash" in query
+    # Files that were not hashed keep their stored hash and are not reported
+    assert "coalesce(row.content_hash, f.content_hash)" in query
+    assert "row.content_hash IS NOT NULL" in query
@@ -0,0 +1,169 @@
+"""Tests for the compiled, hierarchical ignore matcher."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from codestory_filesystem.ignore import IgnoreMatcher, IgnoreRules, anchor_pattern
+from codestory_filesystem.scanner import FilesystemScanner
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository with nested .gitignore files."""
+    files = {
+        ".gitignore": "*.log\n!keep.log\n/generated/\n",
+        "app.log": "",
+        "keep.log": "",
+        "generated/out.py": "",
+        "src/generated/model.py": "",
+        "src/.gitignore": "# Local rules\n*.tmpl\n!important.log\nfixtures/data/\n",
+        "src/main.py": "",
+        "src/page.tmpl": "",
+        "src/important.log": "",
+        "src/debug.log": "",
+        "src/fixtures/data/big.bin": "",
+        "src/fixtures/small.txt": "",
+        "docs/page.tmpl": "",
+    }
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def test_last_matching_pattern_decides():
+    """Test that a later negated pattern re-includes a path."""
+    rules = IgnoreRules(["*.log", "!keep.log", "build/", "# comment", ""])
+
+    assert rules.patterns == ["*.log", "!keep.log", "build/"]
+    assert rules.match("debug.log") is True
+    assert rules.match("logs/keep.log") is False
+    assert rules.match("build/") is True
+    assert rules.match("build") is None
+    assert rules.match("main.py") is None
+
+
+def test_nested_gitignore_files_apply_below_their_directory(repo):
+    """Test that nested rules take precedence and only apply to their subtree."""
+    matcher = IgnoreMatcher(str(repo))
+
+    assert matcher.is_ignored("app.log")
+    assert not matcher.is_ignored("keep.log")
+    assert matcher.is_ignored("generated/out.py")
+    # Anchored to the root, so a deeper directory of the same name is kept
+    assert not matcher.is_ignored("src/generated/model.py")
+    assert matcher.is_ignored("src/page.tmpl")
+    assert not matcher.is_ignored("docs/page.tmpl")
+    assert not matcher.is_ignored("src/important.log")
+    assert matcher.is_ignored("src/debug.log")
+    assert matcher.is_ignored("src/fixtures/data/big.bin")
+    assert not matcher.is_ignored("src/fixtures/small.txt")
+    assert matcher.is_ignored(str(repo / "src" / "page.tmpl"))
+    assert matcher.match_file("generated/")
+    assert not matcher.match_file("src/")
+
+
+def test_ignored_directories_decide_their_subtree(repo):
+    """Test that a path below an ignored directory is ignored without re-matching."""
+    matcher = IgnoreMatcher(str(repo), ["vendor/", "!vendor/keep.py"], builtin=False)
+
+    assert matcher.is_ignored("vendor/keep.py")
+    assert matcher.is_ignored("vendor/lib/deep/file.py")
+    # The directory decisions are cached
+    assert matcher._ignored_dirs["vendor"] is True
+    assert "vendor/lib" in matcher._ignored_dirs
+
+
+def test_scanner_honours_nested_gitignore(repo):
+    """Test that the scanner prunes with the nested rules."""
+    scanner = FilesystemScanner(str(repo), IgnoreMatcher(str(repo)))
+
+    files = {row["path"] for batch in scanner.scan() for row in batch.files}
+
+    assert files == {
+        ".gitignore",
+        "keep.log",
+        "src/.gitignore",
+        "src/generated/model.py",
+        "src/main.py",
+        "src/important.log",
+        "src/fixtures/small.txt",
+        "docs/page.tmpl",
+    }
+
+
+def test_patterns_are_anchored_for_the_root(repo):
+    """Test that nested rules are exported relative to the repository root."""
+    matcher = IgnoreMatcher(str(repo), builtin=False)
+    list(FilesystemScanner(str(repo), matcher).scan())
+
+    assert matcher.patterns() == [
+        "*.log",
+        "!keep.log",
+        "/generated/",
+        "/src/**/*.tmpl",
+        "!/src/**/important.log",
+        "/src/fixtures/data/",
+    ]
+    assert anchor_pattern("/build", "a/b/") == "/a/b/build"
+
+    # The exported patterns ignore the same paths as the nested rules
+    flat = IgnoreMatcher(None, matcher.patterns(), builtin=False)
+    for path in ["src/page.tmpl", "src/important.log", "src/fixtures/data/big.bin", "src/x/a.tmpl"]:
+        assert flat.is_ignored(path) == matcher.is_ignored(path), path
+
+
+def git_ignored(repo, paths):
+    """Get the paths git ignores in a repository."""
+    result = subprocess.run(
+        ["git", "-C", str(repo), "check-ignore", "--stdin"],
+        input="\n".join(paths),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode in (0, 1), result.stderr
+    return set(result.stdout.split())
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+@pytest.mark.parametrize(
+    "files",
+    [
+        # A negated directory pattern re-includes the directory, not the
+        # files below it that other patterns ignore
+        {".gitignore": "*.txt\n!b/\n", "b/x.txt": "", "b/y.py": "", "x.txt": ""},
+        {".gitignore": "*.txt\n!b\n", "b/x.txt": "", "b/c/y.txt": "", "b/z.py": ""},
+        # A nested negated directory pattern does not reach the directories
+        # below the one it names
+        {
+            ".gitignore": "a/**/c/\n",
+            "a/.gitignore": "!b/\n",
+            "a/b/c/f.py": "",
+            "a/b/g.py": "",
+            "a/c/h.py": "",
+        },
+        # Files below an ignored directory cannot be re-included
+        {".gitignore": "vendor/\n!vendor/keep.py\n", "vendor/keep.py": "", "vendor/x/y.py": ""},
+        {
+            ".gitignore": "build\n!build/\nbuild/*.o\n",
+            "build/a.o": "",
+            "build/a.c": "",
+            "src/build/b.o": "",
+        },
+    ],
+)
+def test_matches_git_check_ignore(tmp_path, files):
+    """Test that the matcher ignores the same files as git."""
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    paths = [rel_path for rel_path in files if not rel_path.endswith(".gitignore")]
+
+    matcher = IgnoreMatcher(str(tmp_path), builtin=False)
+
+    assert {path for path in paths if matcher.is_ignored(path)} == git_ignored(tmp_path, paths)
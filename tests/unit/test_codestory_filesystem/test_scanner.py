@@ -0,0 +1,121 @@
+"""Tests for the parallel filesystem scanner and its graph writer."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from codestory_filesystem.graph import FilesystemWriter
+from codestory_filesystem.ignore import IgnoreMatcher
+from codestory_filesystem.scanner import FilesystemScanner, ScanBatch
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a small repository tree."""
+    for rel_path in [
+        "README.md",
+        "src/pkg/__init__.py",
+        "src/pkg/core.py",
+        "src/pkg/deep/leaf.py",
+        "src/pkg/core.pyc",
+        "docs/index.md",
+        "node_modules/lib/index.js",
+        "build/out.txt",
+    ]:
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel_path)
+    return tmp_path
+
+
+def scan_all(scanner: FilesystemScanner) -> list[ScanBatch]:
+    return list(scanner.scan())
+
+
+def test_scan_prunes_ignored_directories(repo):
+    """Test that ignored directories are not descended and files carry their stat."""
+    matcher = IgnoreMatcher(str(repo), ["node_modules/", "build/", "*.pyc"], builtin=False)
+    scanner = FilesystemScanner(str(repo), matcher, workers=4)
+
+    with mock.patch("codestory_filesystem.scanner.os.scandir", wraps=os.scandir) as scandir:
+        batches = scan_all(scanner)
+
+    directories = {row["path"]: row for batch in batches for row in batch.directories}
+    files = {row["path"]: row for batch in batches for row in batch.files}
+    assert set(directories) == {"src", "src/pkg", "src/pkg/deep", "docs"}
+    assert set(files) == {
+        "README.md",
+        "src/pkg/__init__.py",
+        "src/pkg/core.py",
+        "src/pkg/deep/leaf.py",
+        "docs/index.md",
+    }
+    assert sum(batch.skipped for batch in batches) == 3
+
+    # One listing per included directory and the root; ignored ones are never listed
+    listed = {os.path.relpath(call.args[0], repo) for call in scandir.call_args_list}
+    assert listed == {".", "src", "src/pkg", "src/pkg/deep", "docs"}
+
+    core = files["src/pkg/core.py"]
+    assert core["parent"] == "src/pkg"
+    assert core["extension"] == "py"
+    assert core["size"] == len("src/pkg/core.py")
+    assert core["modified"] == pytest.approx(os.path.getmtime(repo / "src/pkg/core.py"))
+    assert directories["src"]["parent"] == ""
+    assert scanner.progress == 100.0
+
+
+def test_scan_yields_parents_first(repo):
+    """Test that every entry's parent directory is yielded before or with it."""
+    scanner = FilesystemScanner(str(repo), batch_size=1, workers=4)
+
+    seen = {""}
+    for batch in scanner.scan():
+        seen.update(row["path"] for row in batch.directories)
+        for row in batch.directories + batch.files:
+            assert row["parent"] in seen
+
+
+def test_scan_filters_extensions_and_depth(repo):
+    """Test that extension and depth limits are applied while scanning."""
+    scanner = FilesystemScanner(str(repo), include_extensions=[".py"], max_depth=2, workers=2)
+
+    batches = scan_all(scanner)
+
+    directories = {row["path"] for batch in batches for row in batch.directories}
+    files = {row["path"] for batch in batches for row in batch.files}
+    assert "src/pkg" in directories
+    assert "src/pkg/deep" not in directories
+    assert files == {"src/pkg/__init__.py", "src/pkg/core.py"}
+
+
+def test_writer_merges_nodes_before_linking():
+    """Test that a batch is written with one UNWIND query per kind."""
+    connector = mock.MagicMock()
+    batch = ScanBatch(
+        directories=[
+            {"path": "src", "name": "src", "parent": ""},
+            {"path": "src/pkg", "name": "pkg", "parent": "src"},
+        ],
+        files=[
+            {"path": "README.md", "name": "README.md", "parent": "", "extension": "md"},
+            {"path": "src/pkg/a.py", "name": "a.py", "parent": "src/pkg", "extension": "py"},
+        ],
+    )
+
+    FilesystemWriter(connector, "/repo").write(batch)
+
+    calls = connector.execute_query.call_args_list
+    queries = [call.args[0] for call in calls]
+    assert len(queries) == 6
+    assert "MERGE (d:Directory" in queries[0]
+    assert "MERGE (f:File" in queries[1]
+    # Relationships follow the nodes, top-level entries link to the repository
+    assert all("MERGE (r)-[:CONTAINS]" in q or "MERGE (p)-[:CONTAINS]" in q for q in queries[2:])
+    assert calls[2].kwargs["params"] == {
+        "rows": [batch.directories[0]],
+        "repo_path": "/repo",
+    }
+    assert calls[5].kwargs["params"]["rows"] == [batch.files[1]]
+    assert all(call.kwargs["write"] for call in calls)
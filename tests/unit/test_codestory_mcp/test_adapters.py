@@ -126,10 +126,10 @@ class TestGraphServiceAdapter:
     def mock_client(self):
         """Create a mock HTTP client."""
         with mock.patch(
-            "codestory_mcp.adapters.graph_service.httpx.AsyncClient"
-        ) as mock_client_cls:
+            "codestory_mcp.adapters.graph_service.get_service_client"
+        ) as mock_get_client:
             client = mock.Mock()
-            mock_client_cls.return_value = client
+            mock_get_client.return_value = client
             yield client
 
     @pytest.fixture
@@ -193,6 +193,7 @@ class TestGraphServiceAdapter:
         mock_client.post.assert_called_once_with(
             "/v1/query/search",
             json={"query": "test", "node_types": ["Class", "Function"], "limit": 10},
+            coalesce=True,
         )
 
         # Verify results
@@ -320,6 +321,54 @@ class TestGraphServiceAdapter:
         assert mock_metrics.record_service_api_call.call_args[0][0] == "/v1/query/node/nonexistent"
         assert mock_metrics.record_service_api_call.call_args[0][1] == "error"
 
+    @pytest.mark.asyncio
+    async def test_find_node_summaries(self, adapter, mock_client):
+        """Test fetching a node with its stored summaries in one query."""
+        response = mock.Mock()
+        response.status_code = 200
+        response.json.return_value = {
+            "columns": ["id", "labels", "properties", "source_hash", "summaries"],
+            "rows": [
+                [
+                    "4:abc:7",
+                    ["Function"],
+                    {"name": "f", "content": "def f(): pass", "embedding": None},
+                    "xxh3_128:ff",
+                    [{"id": "s1", "text": "Does f.", "content_hash": "abc"}],
+                ]
+            ],
+        }
+        mock_client.post = mock.AsyncMock(return_value=response)
+
+        node, summaries, source_hash = await adapter.find_node_summaries("42")
+
+        payload = mock_client.post.call_args[1]["json"]
+        assert "id(n) = toInteger($node_id)" in payload["query"]
+        assert payload["parameters"] == {"node_id": "42"}
+        assert node.labels == ["Function"]
+        assert node.properties == {"name": "f", "content": "def f(): pass"}
+        assert summaries == [{"id": "s1", "text": "Does f.", "content_hash": "abc"}]
+        assert source_hash == "xxh3_128:ff"
+
+    @pytest.mark.asyncio
+    async def test_store_summary_is_write_query(self, adapter, mock_client):
+        """Test that storing a summary is sent as a write query."""
+        response = mock.Mock()
+        response.status_code = 200
+        response.json.return_value = {"columns": ["id"], "rows": [["summary-1"]]}
+        mock_client.post = mock.AsyncMock(return_value=response)
+
+        summary_id = await adapter.store_summary(
+            "4:abc:7", "Does f.", "Function", "abc", source_hash="xxh3_128:ff"
+        )
+
+        payload = mock_client.post.call_args[1]["json"]
+        assert summary_id == "summary-1"
+        assert payload["query_type"] == "write"
+        assert "elementId(n) = $node_id" in payload["query"]
+        assert payload["parameters"]["content_hash"] == "abc"
+        assert payload["parameters"]["source_hash"] == "xxh3_128:ff"
+
     @pytest.mark.asyncio
     async def test_find_paths_success(self, adapter, mock_client):
         """Test successful path finding."""
@@ -367,6 +416,7 @@ class TestGraphServiceAdapter:
         mock_client.post.assert_called_once_with(
             "/v1/query/paths",
             json={"from_id": "node-123", "to_id": "node-456", "max_paths": 3},
+            coalesce=True,
         )
 
         # Verify results
@@ -558,25 +608,67 @@ class TestOpenAIServiceAdapter:
         assert mock_metrics.record_service_api_call.call_args[0][0] == "openai_path_explanation"
         assert mock_metrics.record_service_api_call.call_args[0][1] == "success"
 
+    @pytest.fixture
+    def graph_service(self, adapter):
+        """Attach a mock graph service returning vector search rows."""
+        graph_service = mock.Mock()
+        graph_service.execute_cypher = mock.AsyncMock(
+            return_value={
+                "columns": [
+                    "id",
+                    "labels",
+                    "name",
+                    "qualified_name",
+                    "path",
+                    "content",
+                    "start_line",
+                    "end_line",
+                    "score",
+                ],
+                "rows": [
+                    ["4:a:1", ["Function"], "render", "ui.render", "ui.py", "def render(): ...",
+                     1, 2, 0.91],
+                    ["4:a:2", ["Function", "Method"], "parse_config", "cfg.Loader.parse_config",
+                     "cfg.py", "def parse_config(self): ...", 10, 20, 0.88],
+                    ["4:a:3", ["File"], "cfg.py", "cfg.py", "cfg.py", "import os", None, None,
+                     0.5],
+                ],
+            }
+        )  # fmt: skip
+        adapter._graph_service = graph_service
+        return graph_service
+
     @pytest.mark.asyncio
-    async def test_find_similar_code_success(self, adapter, mock_client, mock_metrics):
+    async def test_find_similar_code_success(
+        self, adapter, mock_client, mock_metrics, graph_service
+    ):
         """Test successful similar code search."""
         # Mock embedding creation
-        embed_future = asyncio.Future()
-        embed_future.set_result([0.1, 0.2, 0.3])
-        mock_client.create_embedding.return_value = embed_future
+        mock_client.embed_async = mock.AsyncMock(
+            return_value=mock.Mock(data=[mock.Mock(embedding=[0.1, 0.2, 0.3])])
+        )
 
         # Execute similar code search
-        results = await adapter.find_similar_code(code="def test(): pass", limit=5)
+        results = await adapter.find_similar_code(code="def parseConfig(): pass", limit=2)
 
         # Verify client call
-        mock_client.create_embedding.assert_called_once_with("def test(): pass")
-
-        # Verify results (placeholder implementation)
-        assert len(results) == 5
+        mock_client.embed_async.assert_awaited_once_with(["def parseConfig(): pass"])
+
+        # Verify vector search
+        query, parameters = graph_service.execute_cypher.call_args[0]
+        assert "db.index.vector.queryNodes" in query
+        assert parameters["embedding"] == [0.1, 0.2, 0.3]
+        assert parameters["k"] == 2 * adapter.candidate_factor
+        assert parameters["index"] == "summary_embedding_vector_idx"
+        assert parameters["labels"] == ["Function", "Class", "File"]
+
+        # Verify results: the lexical match is reranked above the closer vector
+        assert [r["id"] for r in results] == ["4:a:2", "4:a:1"]
         assert results[0]["type"] == "Function"
-        assert "similarFunction0" in results[0]["name"]
-        assert results[0]["score"] == 1.0
+        assert results[0]["path"] == "cfg.py"
+        assert results[0]["lexical_score"] > 0
+        assert results[1]["lexical_score"] == 0
+        assert results[0]["score"] > results[1]["score"]
 
         # Verify metrics
         assert mock_metrics.record_service_api_call.call_count == 2
@@ -584,6 +676,33 @@ class TestOpenAIServiceAdapter:
         assert mock_metrics.record_service_api_call.call_args_list[1][0][0] == "similar_code"
         assert mock_metrics.record_graph_operation.called
 
+    @pytest.mark.asyncio
+    async def test_find_similar_code_caches_embeddings(
+        self, adapter, mock_client, mock_metrics, graph_service
+    ):
+        """Test that repeated snippets are embedded once."""
+        mock_client.embed_async = mock.AsyncMock(
+            return_value=mock.Mock(data=[mock.Mock(embedding=[0.1, 0.2, 0.3])])
+        )
+
+        await adapter.find_similar_code(code="def f(): pass", limit=2)
+        await adapter.find_similar_code(code="def f(): pass  \n", limit=2)
+
+        mock_client.embed_async.assert_awaited_once()
+        assert graph_service.execute_cypher.await_count == 2
+        assert adapter.embedding_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_find_similar_code_error(self, adapter, mock_client, mock_metrics):
+        """Test similar code search when embedding fails."""
+        mock_client.embed_async = mock.AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(ToolError) as excinfo:
+            await adapter.find_similar_code(code="def f(): pass")
+
+        assert excinfo.value.status_code == 502
+        assert mock_metrics.record_service_api_call.call_args[0][:2] == ("similar_code", "error")
+
     def test_get_openai_service_singleton(self):
         """Test that get_openai_service returns a singleton."""
         service1 = get_openai_service()
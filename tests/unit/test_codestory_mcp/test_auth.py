@@ -114,7 +114,7 @@ class TestEntraValidator:
         """Test successful token validation."""
         # Mock the key from JWKS client
         mock_key = mock.Mock()
-        validator.jwks_client.get_signing_key_from_jwt.return_value = mock_key
+        validator.jwks_cache.get_signing_key = mock.AsyncMock(return_value=mock_key)
 
         # Mock JWT decode
         mock_jwt.decode.return_value = {
@@ -128,7 +128,7 @@ class TestEntraValidator:
             claims = await validator.validate_token("test-token")
 
             # Verify key retrieval
-            validator.jwks_client.get_signing_key_from_jwt.assert_called_once_with("test-token")
+            validator.jwks_cache.get_signing_key.assert_awaited_once_with("test-token")
 
             # Verify JWT decode
             mock_jwt.decode.assert_called_once_with(
@@ -150,8 +150,8 @@ class TestEntraValidator:
         """Test token validation with JWT error."""
         # Make JWT decode raise an error
         mock_jwt.PyJWTError = Exception
-        validator.jwks_client.get_signing_key_from_jwt.side_effect = mock_jwt.PyJWTError(
-            "Invalid token"
+        validator.jwks_cache.get_signing_key = mock.AsyncMock(
+            side_effect=mock_jwt.PyJWTError("Invalid token")
         )
 
         # Verify error handling
@@ -0,0 +1,152 @@
+"""Unit tests for the token validation caches."""
+
+import asyncio
+import json
+import time
+from unittest import mock
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWK
+from jwt.algorithms import RSAAlgorithm
+
+from codestory_mcp.auth.cache import JWKSCache, TokenCache
+from codestory_mcp.auth.entra_validator import AuthenticationError, EntraValidator
+
+
+class FakeJWKSClient:
+    """JWKS client serving locally generated keys and counting fetches."""
+
+    def __init__(self, *kids: str) -> None:
+        self.private_keys = {kid: rsa.generate_private_key(65537, 2048) for kid in kids}
+        self.fetches = 0
+
+    def get_signing_keys(self, refresh: bool = False) -> list[PyJWK]:
+        self.fetches += 1
+        keys = []
+        for kid, private_key in self.private_keys.items():
+            jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+            keys.append(PyJWK({**jwk, "kid": kid, "alg": "RS256", "use": "sig"}))
+        return keys
+
+    def token(self, kid: str, **claims: object) -> str:
+        payload = {"aud": "test-audience", "exp": int(time.time()) + 600, **claims}
+        return jwt.encode(payload, self.private_keys[kid], algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture(scope="module")
+def jwks_client():
+    """Create a JWKS client with one key."""
+    return FakeJWKSClient("key-1")
+
+
+def test_token_cache_honours_expiry():
+    """Test that cached claims expire with the token and the cache TTL."""
+    cache = TokenCache(max_size=10, max_ttl=300.0)
+    now = time.time()
+
+    cache.put("valid", {"sub": "a", "exp": now + 60})
+    cache.put("expired", {"sub": "b", "exp": now - 1})
+    cache.put("no-exp", {"sub": "c"})
+
+    assert cache.get("valid") == {"sub": "a", "exp": now + 60}
+    assert cache.get("expired") is None
+    assert cache.get("no-exp") is None
+    assert len(cache) == 1
+
+    # The TTL bounds tokens that live longer
+    cache.put("long", {"sub": "d", "exp": now + 3600})
+    with mock.patch("codestory_mcp.auth.cache.time.time", return_value=now + 301):
+        assert cache.get("long") is None
+
+
+def test_token_cache_evicts_least_recently_used():
+    """Test that the cache is bounded and keyed by token hash."""
+    cache = TokenCache(max_size=2)
+    exp = time.time() + 60
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    cache.get("a")
+    cache.put("c", {"exp": exp})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert "a" not in cache._entries
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_refreshes_once_on_unknown_key_id():
+    """Test that concurrent lookups of a new key ID share one fetch."""
+    client = FakeJWKSClient("key-1")
+    cache = JWKSCache(client, min_refresh_interval=0.0)
+
+    await cache.get_signing_key(client.token("key-1"))
+    assert client.fetches == 1
+
+    # Rotate in a new key
+    client.private_keys["key-2"] = rsa.generate_private_key(65537, 2048)
+    token = client.token("key-2")
+    keys = await asyncio.gather(*(cache.get_signing_key(token) for _ in range(20)))
+
+    assert client.fetches == 2
+    assert {key.key_id for key in keys} == {"key-2"}
+    await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_rate_limits_unknown_key_ids(jwks_client):
+    """Test that unknown key IDs do not trigger a fetch per request."""
+    cache = JWKSCache(jwks_client, min_refresh_interval=60.0)
+    await cache.refresh()
+    fetches = jwks_client.fetches
+
+    unknown = jwt.encode({"sub": "x"}, "secret", algorithm="HS256", headers={"kid": "unknown"})
+    for _ in range(5):
+        with pytest.raises(jwt.PyJWKClientError):
+            await cache.get_signing_key(unknown)
+
+    assert jwks_client.fetches == fetches
+    await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_validator_reuses_validated_claims(jwks_client):
+    """Test that a token is verified once and its claims reused."""
+    validator = EntraValidator(
+        "test-tenant",
+        "test-audience",
+        scope_manager=mock.Mock(has_required_scope=mock.Mock(return_value=True)),
+        jwks_client=jwks_client,
+    )
+    token = jwks_client.token("key-1", sub="user", scp="code-story.read")
+
+    with mock.patch(
+        "codestory_mcp.auth.entra_validator.jwt.decode", wraps=jwt.decode
+    ) as mock_decode:
+        first = await validator.validate_token(token)
+        second = await validator.validate_token(token)
+
+    assert first["sub"] == "user"
+    assert second == first
+    assert mock_decode.call_count == 1
+    await validator.jwks_cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_validator_does_not_cache_rejected_tokens(jwks_client):
+    """Test that tokens failing validation are not cached."""
+    validator = EntraValidator(
+        "test-tenant",
+        "test-audience",
+        scope_manager=mock.Mock(has_required_scope=mock.Mock(return_value=False)),
+        jwks_client=jwks_client,
+    )
+    token = jwks_client.token("key-1", sub="user")
+
+    for _ in range(2):
+        with pytest.raises(AuthenticationError):
+            await validator.validate_token(token)
+
+    assert len(validator.token_cache) == 0
+    await validator.jwks_cache.stop()
@@ -0,0 +1,125 @@
+"""Unit tests for the shared service HTTP client."""
+
+import asyncio
+from unittest import mock
+
+import httpx
+import pytest
+
+from codestory_mcp.adapters.graph_service import GraphServiceAdapter
+from codestory_mcp.adapters.http_client import (
+    ServiceClient,
+    close_service_clients,
+    get_service_client,
+)
+
+
+class CountingHandler:
+    """Mock transport handler counting requests and holding them until released."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await self.release.wait()
+        return httpx.Response(200, json={"path": request.url.path})
+
+
+def make_client(handler: CountingHandler) -> ServiceClient:
+    """Create a client on a mock transport."""
+    return ServiceClient(
+        "http://service",
+        http2=False,
+        timeout=30.0,
+        endpoint_timeouts={"/v1/query": 20.0, "/v1/query/search": 5.0},
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_are_coalesced():
+    """Test that identical concurrent GETs share one request."""
+    handler = CountingHandler()
+    client = make_client(handler)
+
+    calls = [asyncio.create_task(client.get("/v1/query/node/1")) for _ in range(10)]
+    other = asyncio.create_task(client.get("/v1/query/node/2"))
+    await asyncio.sleep(0.01)
+    handler.release.set()
+    responses = await asyncio.gather(*calls, other)
+
+    assert len(handler.requests) == 2
+    assert all(r.json() == {"path": "/v1/query/node/1"} for r in responses[:10])
+    assert not client._inflight
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_posts_are_coalesced_only_on_request():
+    """Test that POSTs share a request only when asked to."""
+    handler = CountingHandler()
+    handler.release.set()
+    client = make_client(handler)
+
+    await asyncio.gather(*(client.post("/v1/query/cypher", json={"q": 1}) for _ in range(3)))
+    assert len(handler.requests) == 3
+
+    await asyncio.gather(
+        *(client.post("/v1/query/cypher", json={"q": 1}, coalesce=True) for _ in range(3))
+    )
+    assert len(handler.requests) == 4
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_endpoint_timeouts():
+    """Test that the most specific endpoint timeout is applied."""
+    handler = CountingHandler()
+    handler.release.set()
+    client = make_client(handler)
+
+    assert client.timeout_for("/v1/query/search") == 5.0
+    assert client.timeout_for("/v1/query/cypher") == 20.0
+    assert client.timeout_for("/v1/ingest") == 30.0
+
+    await client.post("/v1/query/search", json={})
+    assert handler.requests[0].extensions["timeout"]["read"] == 5.0
+    await client.aclose()
+
+
+def test_http2_falls_back_without_h2():
+    """Test that HTTP/2 is disabled when the h2 package is missing."""
+    with mock.patch("codestory_mcp.adapters.http_client._http2_available", return_value=False):
+        client = ServiceClient("http://service", http2=True)
+
+    assert client.http2 is False
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_replaced_after_close():
+    """Test that the shared client is reused, and recreated once closed."""
+    client = get_service_client("http://shared")
+    assert get_service_client("http://shared") is client
+
+    await close_service_clients()
+
+    assert client.is_closed
+    replacement = get_service_client("http://shared")
+    assert replacement is not client
+    await close_service_clients()
+
+
+@pytest.mark.asyncio
+async def test_adapter_close_leaves_shared_client_open():
+    """Test that closing an adapter does not close the client other adapters share."""
+    shared = get_service_client("http://shared")
+    adapter = GraphServiceAdapter(base_url="http://shared")
+    assert adapter.client is shared
+
+    await adapter.close()
+
+    assert not shared.is_closed
+    assert GraphServiceAdapter(base_url="http://shared").client is shared
+    await close_service_clients()
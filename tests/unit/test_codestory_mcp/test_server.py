@@ -1,10 +1,12 @@
 """Unit tests for the MCP Adapter server."""
 
 import asyncio
+import json
 from unittest import mock
 
 import pytest
 from fastapi import FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
 
 from codestory_mcp.server import create_app, get_current_user, tool_executor
 from codestory_mcp.tools.base import BaseTool, ToolError
@@ -39,9 +41,9 @@ def mock_metrics():
 @pytest.fixture
 def mock_entra_validator():
     """Create a mock EntraValidator."""
-    with mock.patch("codestory_mcp.server.EntraValidator") as mock_validator_cls:
+    with mock.patch("codestory_mcp.server.get_entra_validator") as mock_get_validator:
         validator = mock.Mock()
-        mock_validator_cls.return_value = validator
+        mock_get_validator.return_value = validator
         yield validator
 
 
@@ -293,3 +295,101 @@ def test_create_app(mock_settings):
         assert "/v1/tools/{tool_name}" in route_paths
         assert "/v1/tools" in route_paths
         assert "/v1/health" in route_paths
+        assert "/v1/tools/batch" in route_paths
+
+
+class BatchTool(BaseTool):
+    """Tool echoing its parameters after an optional delay."""
+
+    name = "batchTest"
+    description = "Echo parameters"
+    parameters = {"type": "object", "properties": {"value": {}}, "required": ["value"]}
+    running = 0
+    max_running = 0
+
+    def __init__(self) -> None:
+        """Initialize the tool."""
+
+    async def __call__(self, params):
+        """Echo the parameters."""
+        BatchTool.running += 1
+        BatchTool.max_running = max(BatchTool.max_running, BatchTool.running)
+        try:
+            await asyncio.sleep(params.get("delay", 0))
+            if params["value"] == "fail":
+                raise ToolError("Failed on purpose", status_code=status.HTTP_400_BAD_REQUEST)
+            return {"value": params["value"]}
+        finally:
+            BatchTool.running -= 1
+
+
+@pytest.fixture
+def batch_client(mock_metrics):
+    """Create a test client for an app with authentication disabled."""
+    with (
+        mock.patch("codestory_mcp.server.get_mcp_settings") as mock_get_settings,
+        mock.patch("codestory_mcp.server.get_tool") as mock_get_tool,
+        mock.patch("codestory_mcp.server.get_service_client"),
+    ):
+        settings = mock.Mock()
+        settings.auth_enabled = False
+        settings.cors_origins = ["*"]
+        settings.prometheus_metrics_path = "/metrics"
+        settings.openapi_url = "/openapi.json"
+        settings.docs_url = "/docs"
+        settings.redoc_url = "/redoc"
+        settings.batch_max_calls = 10
+        settings.batch_max_concurrency = 2
+        mock_get_settings.return_value = settings
+
+        def get_tool(name):
+            if name != BatchTool.name:
+                raise KeyError(name)
+            return BatchTool
+
+        mock_get_tool.side_effect = get_tool
+        BatchTool.max_running = 0
+        yield TestClient(create_app())
+
+
+def test_tool_batch_streams_results_and_errors(batch_client):
+    """Test that batch results stream as NDJSON, with per-call errors."""
+    calls = [
+        {"id": "slow", "tool": "batchTest", "params": {"value": "a", "delay": 0.2}},
+        {"id": "fast", "tool": "batchTest", "params": {"value": "b"}},
+        {"id": "bad", "tool": "batchTest", "params": {"value": "fail"}},
+        {"id": "missing", "tool": "noSuchTool", "params": {}},
+        {"id": "invalid", "tool": "batchTest", "params": {}},
+    ]
+
+    response = batch_client.post("/v1/tools/batch", json={"calls": calls, "max_concurrency": 8})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    by_id = {r["id"]: r for r in results}
+
+    assert len(results) == 5
+    assert results[-1]["id"] == "slow"
+    assert by_id["slow"] == {
+        "index": 0,
+        "id": "slow",
+        "tool": "batchTest",
+        "result": {"value": "a"},
+        "status": 200,
+    }
+    assert by_id["bad"]["status"] == 400
+    assert by_id["bad"]["error"]["message"] == "Failed on purpose"
+    assert by_id["missing"]["status"] == 404
+    assert by_id["invalid"]["status"] == 400
+
+    # The requested concurrency is capped by the server setting
+    assert BatchTool.max_running == 2
+
+
+def test_tool_batch_limits(batch_client):
+    """Test that oversized and empty batches are rejected."""
+    call = {"tool": "batchTest", "params": {"value": "a"}}
+
+    assert batch_client.post("/v1/tools/batch", json={"calls": [call] * 11}).status_code == 400
+    assert batch_client.post("/v1/tools/batch", json={"calls": []}).status_code == 422
@@ -0,0 +1,53 @@
+"""Unit tests for the similar code search helpers."""
+
+from codestory_mcp.utils.similarity import (
+    EmbeddingCache,
+    identifier_tokens,
+    lexical_score,
+    rerank,
+)
+
+
+def test_identifier_tokens_split_camel_and_snake_case():
+    """Test that camelCase and snake_case identifiers yield the same tokens."""
+    assert identifier_tokens("def parseHTTPResponse(self): pass") == {"parse", "http", "response"}
+    assert identifier_tokens("parse_http_response") == {"parse", "http", "response"}
+
+
+def test_lexical_score():
+    """Test the identifier overlap score."""
+    tokens = identifier_tokens("load_user_session")
+    assert lexical_score(tokens, "loadUserSession") == 1.0
+    assert lexical_score(tokens, "render_page") == 0.0
+    assert 0.0 < lexical_score(tokens, "load_page") < 1.0
+    assert lexical_score(set(), "anything") == 0.0
+
+
+def test_rerank_combines_scores():
+    """Test that reranking blends vector and lexical scores and truncates."""
+    candidates = [
+        {"id": "a", "qualified_name": "render_page", "vector_score": 0.9},
+        {"id": "b", "qualified_name": "load_user_session", "vector_score": 0.8},
+        {"id": "c", "qualified_name": "other", "vector_score": 0.1},
+    ]
+
+    results = rerank(candidates, identifier_tokens("loadUserSession"), limit=2)
+
+    assert [c["id"] for c in results] == ["b", "a"]
+    assert results[0]["score"] == 0.7 * 0.8 + 0.3 * 1.0
+    assert rerank(candidates, set(), limit=1, lexical_weight=0.0)[0]["id"] == "a"
+
+
+def test_embedding_cache_lru():
+    """Test that the cache normalizes snippets and evicts the oldest entry."""
+    cache = EmbeddingCache(max_size=2)
+    cache.put("a = 1", [1.0])
+    cache.put("b = 2", [2.0])
+
+    assert cache.get("  a = 1   \n") == [1.0]
+    cache.put("c = 3", [3.0])
+
+    assert cache.get("b = 2") is None
+    assert cache.get("a = 1") == [1.0]
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 1)
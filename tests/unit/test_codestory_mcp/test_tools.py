@@ -6,12 +6,14 @@ from unittest import mock
 import pytest
 from fastapi import status
 
+from codestory_mcp.adapters.graph_service import MockNode
 from codestory_mcp.tools import get_all_tools, get_tool, register_tool
 from codestory_mcp.tools.base import BaseTool, ToolError
 from codestory_mcp.tools.path_to import PathToTool
 from codestory_mcp.tools.search_graph import SearchGraphTool
 from codestory_mcp.tools.similar_code import SimilarCodeTool
-from codestory_mcp.tools.summarize_node import SummarizeNodeTool
+from codestory_mcp.tools.summarize_node import SummarizeNodeTool, select_summary
+from codestory_summarizer.utils import content_hash
 
 
 class TestToolsRegistry:
@@ -244,10 +246,8 @@ class TestSummarizeNodeTool:
         mock_node.labels = ["Class"]
         mock_node.get = mock.Mock(return_value="")
 
-        # Create future to mock async function return value
-        future = asyncio.Future()
-        future.set_result(mock_node)
-        graph_service.find_node.return_value = future
+        # Node without stored summaries
+        graph_service.find_node_summaries = mock.AsyncMock(return_value=(mock_node, [], None))
 
         # Call the tool and expect error
         with pytest.raises(ToolError) as excinfo:
@@ -272,21 +272,24 @@ class TestSummarizeNodeTool:
             }.get(k, d)
         )
 
-        # Create futures to mock async function return values
-        find_node_future = asyncio.Future()
-        find_node_future.set_result(mock_node)
-        graph_service.find_node.return_value = find_node_future
-
-        summary_future = asyncio.Future()
-        summary_future.set_result("A simple test class.")
-        openai_service.generate_code_summary.return_value = summary_future
+        # Node without stored summaries
+        graph_service.find_node_summaries = mock.AsyncMock(return_value=(mock_node, [], None))
+        graph_service.store_summary = mock.AsyncMock(return_value="summary-1")
+        openai_service.generate_code_summary = mock.AsyncMock(return_value="A simple test class.")
 
         # Call the tool
         result = await tool({"node_id": "node-123", "include_context": True})
 
         # Verify service calls
-        graph_service.find_node.assert_called_once_with("node-123")
-        openai_service.generate_code_summary.assert_called_once()
+        graph_service.find_node_summaries.assert_awaited_once_with("node-123")
+        openai_service.generate_code_summary.assert_awaited_once()
+        graph_service.store_summary.assert_awaited_once_with(
+            "node-123",
+            "A simple test class.",
+            source_type="Class",
+            content_hash=content_hash("class TestClass:\n    pass"),
+            source_hash=None,
+        )
 
         # Verify result
         assert result["summary"] == "A simple test class."
@@ -295,6 +298,114 @@ class TestSummarizeNodeTool:
         assert result["node"]["name"] == "TestClass"
         assert result["metadata"]["node_id"] == "node-123"
         assert result["metadata"]["include_context"] is True
+        assert result["metadata"]["source"] == "generated"
+
+    @pytest.fixture
+    def class_node(self):
+        """Create a node with code content."""
+        return MockNode(
+            id="4:abc:1",
+            labels=["Class"],
+            properties={"name": "TestClass", "content": "class TestClass:\n    pass"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_call_serves_stored_summary(
+        self, tool, graph_service, openai_service, class_node
+    ):
+        """Test that a summary of the current content is served without generation."""
+        summaries = [
+            {"id": "s2", "text": "Outdated.", "content_hash": "0" * 64},
+            {
+                "id": "s1",
+                "text": "Stored.",
+                "content_hash": content_hash("class TestClass:\n    pass  \n"),
+            },
+        ]
+        graph_service.find_node_summaries = mock.AsyncMock(
+            return_value=(class_node, summaries, None)
+        )
+        openai_service.generate_code_summary = mock.AsyncMock()
+
+        result = await tool({"node_id": "4:abc:1"})
+
+        assert result["summary"] == "Stored."
+        assert result["metadata"]["source"] == "stored"
+        openai_service.generate_code_summary.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_call_regenerates_stale_summary(
+        self, tool, graph_service, openai_service, class_node
+    ):
+        """Test that a summary of different content is regenerated and stored."""
+        summaries = [{"id": "s1", "text": "Stale.", "content_hash": "0" * 64}]
+        graph_service.find_node_summaries = mock.AsyncMock(
+            return_value=(class_node, summaries, None)
+        )
+        graph_service.store_summary = mock.AsyncMock(side_effect=ToolError("Forbidden"))
+        openai_service.generate_code_summary = mock.AsyncMock(return_value="Fresh.")
+
+        result = await tool({"node_id": "4:abc:1"})
+
+        # Failing to store the summary does not fail the request
+        assert result["summary"] == "Fresh."
+        assert result["metadata"]["source"] == "generated"
+        graph_service.store_summary.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_generation(
+        self, tool, graph_service, openai_service, class_node
+    ):
+        """Test that concurrent requests for a node generate its summary once."""
+        release = asyncio.Event()
+
+        async def generate(**kwargs):
+            await release.wait()
+            return "Shared."
+
+        graph_service.find_node_summaries = mock.AsyncMock(return_value=(class_node, [], None))
+        graph_service.store_summary = mock.AsyncMock(return_value="summary-1")
+        openai_service.generate_code_summary = mock.AsyncMock(side_effect=generate)
+
+        calls = [asyncio.create_task(tool({"node_id": "4:abc:1"})) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        assert [r["summary"] for r in results] == ["Shared."] * 5
+        openai_service.generate_code_summary.assert_awaited_once()
+        graph_service.store_summary.assert_awaited_once()
+        assert not SummarizeNodeTool._inflight
+
+
+def test_select_summary():
+    """Test choosing between stored summaries by content hash."""
+    current = content_hash("def f(): pass")
+    fresh = {"text": "fresh", "content_hash": current}
+    legacy = {"text": "legacy"}
+    stale = {"text": "stale", "content_hash": "0" * 64}
+
+    assert select_summary([stale, legacy, fresh], None, current) is fresh
+    assert select_summary([stale, legacy], None, current) is legacy
+    assert select_summary([stale], None, current) is None
+    assert select_summary([stale, fresh], None, None) is stale
+    assert select_summary([], None) is None
+
+
+def test_select_summary_by_file_hash():
+    """Test that summaries are checked against the hash of their file first."""
+    fresh = {"text": "fresh", "source_hash": "xxh3_128:new", "content_hash": "0" * 64}
+    stale = {"text": "stale", "source_hash": "xxh3_128:old"}
+    unhashed = {"text": "unhashed", "content_hash": "1" * 64}
+
+    # Functions have no content property, only the file hash tells
+    assert select_summary([stale, fresh], "xxh3_128:new") is fresh
+    assert select_summary([stale], "xxh3_128:new") is None
+    assert select_summary([stale, unhashed], "xxh3_128:new") is unhashed
+    # The file hash wins over the hash of the content property
+    assert select_summary([fresh], "xxh3_128:new", "1" * 64) is fresh
+    # Without a file hash, the content hash is compared
+    assert select_summary([fresh, unhashed], None, "1" * 64) is unhashed
 
 
 class TestPathToTool:
@@ -14,6 +14,7 @@ from codestory_service.domain.auth import LoginRequest
 from codestory_service.domain.graph import (
     CypherQuery,
     QueryType,
+    SearchQuery,
     VectorQuery,
 )
 from codestory_service.domain.ingestion import (
@@ -170,6 +171,18 @@ class TestGraphAPI:
         # Check the result
         assert result.total_count == 1
 
+    @pytest.mark.asyncio
+    async def test_search(self, mock_service):
+        """Test executing a hybrid search."""
+        mock_service.search.return_value = mock.MagicMock(data=[], total_count=0)
+        query = SearchQuery(query="parse config", node_types=["Function"])
+        user = {"roles": ["user"]}
+
+        result = await graph.search(query, mock_service, user)
+
+        mock_service.search.assert_called_once_with(query)
+        assert result.total_count == 0
+
 
 class TestConfigAPI:
     """Tests for configuration API endpoints."""
@@ -468,10 +481,9 @@ class TestHealthAPI:
 
         return neo4j, celery, openai
 
-    @pytest.mark.asyncio
-    async def test_health_check_all_healthy(self, mock_adapters, monkeypatch):
-        """Test health check when all components are healthy."""
-        neo4j, celery, openai = mock_adapters
+    @pytest.fixture
+    def monitor(self, mock_adapters, monkeypatch):
+        """Create a health monitor over the mock adapters and a mock Redis."""
 
         # Create a custom class to mock Redis more accurately
         class MockRedisClient:
@@ -487,14 +499,15 @@ class TestHealthAPI:
         # Replace the Redis class with our mock
         monkeypatch.setattr(health.redis, "Redis", lambda **kwargs: MockRedisClient())
 
-        # Mock asyncio.wait_for to avoid timeout issues
-        async def mock_wait_for(coro, timeout):
-            return await coro
+        return health.build_health_monitor(*mock_adapters)
 
-        monkeypatch.setattr(asyncio, "wait_for", mock_wait_for)
+    @pytest.mark.asyncio
+    async def test_health_check_all_healthy(self, mock_adapters, monitor):
+        """Test health check when all components are healthy."""
+        neo4j, celery, openai = mock_adapters
 
         # Call the endpoint
-        result = await health.health_check(neo4j, celery, openai)
+        result = await health.health_check(auto_fix=False, deep=False, monitor=monitor)
 
         # Check that adapters were called
         neo4j.check_health.assert_called_once()
@@ -510,29 +523,34 @@ class TestHealthAPI:
         assert result.components["redis"].status == "healthy"
 
     @pytest.mark.asyncio
-    async def test_health_check_one_unhealthy(self, mock_adapters, monkeypatch):
-        """Test health check when one component is unhealthy."""
+    async def test_health_check_serves_cached_results(self, mock_adapters, monitor):
+        """Test that probes reuse cached results and deep=true checks again."""
         neo4j, celery, openai = mock_adapters
 
-        # Create a custom class to mock Redis more accurately
-        class MockRedisClient:
-            async def ping(self):
-                return True
-
-            async def info(self, section=None):
-                return {"redis_version": "6.0.0", "used_memory_human": "1M"}
+        await health.health_check(auto_fix=False, deep=False, monitor=monitor)
+        result = await health.health_check(auto_fix=False, deep=False, monitor=monitor)
 
-            async def close(self):
-                pass
+        assert result.status == "healthy"
+        for adapter in (neo4j, celery, openai):
+            adapter.check_health.assert_called_once()
+        assert "checked_at" in result.components["openai"].details
 
-        # Replace the Redis class with our mock
-        monkeypatch.setattr(health.redis, "Redis", lambda **kwargs: MockRedisClient())
+        # A deep check runs every component again
+        openai.check_health.return_value = {
+            "status": "unhealthy",
+            "details": {"error": "Model unavailable"},
+        }
+        result = await health.health_check(auto_fix=False, deep=True, monitor=monitor)
 
-        # Mock asyncio.wait_for to avoid timeout issues
-        async def mock_wait_for(coro, timeout):
-            return await coro
+        assert result.status == "degraded"
+        assert result.components["openai"].status == "unhealthy"
+        for adapter in (neo4j, celery, openai):
+            assert adapter.check_health.call_count == 2
 
-        monkeypatch.setattr(asyncio, "wait_for", mock_wait_for)
+    @pytest.mark.asyncio
+    async def test_health_check_one_unhealthy(self, mock_adapters, monitor):
+        """Test health check when one component is unhealthy."""
+        neo4j, _celery, _openai = mock_adapters
 
         # Make one component unhealthy
         neo4j.check_health.return_value = {
@@ -541,7 +559,7 @@ class TestHealthAPI:
         }
 
         # Call the endpoint
-        result = await health.health_check(neo4j, celery, openai)
+        result = await health.health_check(auto_fix=False, deep=False, monitor=monitor)
 
         # Check the result
         assert result.status == "degraded"  # Updated expectation to match implementation
@@ -551,29 +569,9 @@ class TestHealthAPI:
         assert result.components["redis"].status == "healthy"
 
     @pytest.mark.asyncio
-    async def test_health_check_one_degraded(self, mock_adapters, monkeypatch):
+    async def test_health_check_one_degraded(self, mock_adapters, monitor):
         """Test health check when one component is degraded."""
-        neo4j, celery, openai = mock_adapters
-
-        # Create a custom class to mock Redis more accurately
-        class MockRedisClient:
-            async def ping(self):
-                return True
-
-            async def info(self, section=None):
-                return {"redis_version": "6.0.0", "used_memory_human": "1M"}
-
-            async def close(self):
-                pass
-
-        # Replace the Redis class with our mock
-        monkeypatch.setattr(health.redis, "Redis", lambda **kwargs: MockRedisClient())
-
-        # Mock asyncio.wait_for to avoid timeout issues
-        async def mock_wait_for(coro, timeout):
-            return await coro
-
-        monkeypatch.setattr(asyncio, "wait_for", mock_wait_for)
+        _neo4j, celery, _openai = mock_adapters
 
         # Make one component degraded
         celery.check_health.return_value = {
@@ -582,7 +580,7 @@ class TestHealthAPI:
         }
 
         # Call the endpoint
-        result = await health.health_check(neo4j, celery, openai)
+        result = await health.health_check(auto_fix=False, deep=False, monitor=monitor)
 
         # Check the result
         assert result.status == "degraded"
@@ -592,29 +590,9 @@ class TestHealthAPI:
         assert result.components["redis"].status == "healthy"
 
     @pytest.mark.asyncio
-    async def test_health_check_with_auto_fix(self, mock_adapters, monkeypatch):
+    async def test_health_check_with_auto_fix(self, mock_adapters, monitor):
         """Test health check with auto_fix parameter when there's an Azure auth issue."""
-        neo4j, celery, openai = mock_adapters
-
-        # Create a custom class to mock Redis more accurately
-        class MockRedisClient:
-            async def ping(self):
-                return True
-
-            async def info(self, section=None):
-                return {"redis_version": "6.0.0", "used_memory_human": "1M"}
-
-            async def close(self):
-                pass
-
-        # Replace the Redis class with our mock
-        monkeypatch.setattr(health.redis, "Redis", lambda **kwargs: MockRedisClient())
-
-        # Mock asyncio.wait_for to avoid timeout issues
-        async def mock_wait_for(coro, timeout):
-            return await coro
-
-        monkeypatch.setattr(asyncio, "wait_for", mock_wait_for)
+        _neo4j, _celery, openai = mock_adapters
 
         # Set up OpenAI component to first have an auth issue, then be fixed on second call
         openai.check_health.side_effect = [
@@ -638,7 +616,7 @@ class TestHealthAPI:
         ]
 
         # Call the endpoint with auto_fix=True
-        result = await health.health_check(neo4j, celery, openai, auto_fix=True)
+        result = await health.health_check(auto_fix=True, deep=False, monitor=monitor)
 
         # Check the result
         assert result.status == "healthy"
@@ -648,29 +626,9 @@ class TestHealthAPI:
         assert openai.check_health.call_count == 2
 
     @pytest.mark.asyncio
-    async def test_health_check_with_auto_fix_failure(self, mock_adapters, monkeypatch):
+    async def test_health_check_with_auto_fix_failure(self, mock_adapters, monitor):
         """Test health check when auto_fix attempt fails."""
-        neo4j, celery, openai = mock_adapters
-
-        # Create a custom class to mock Redis more accurately
-        class MockRedisClient:
-            async def ping(self):
-                return True
-
-            async def info(self, section=None):
-                return {"redis_version": "6.0.0", "used_memory_human": "1M"}
-
-            async def close(self):
-                pass
-
-        # Replace the Redis class with our mock
-        monkeypatch.setattr(health.redis, "Redis", lambda **kwargs: MockRedisClient())
-
-        # Mock asyncio.wait_for to avoid timeout issues
-        async def mock_wait_for(coro, timeout):
-            return await coro
-
-        monkeypatch.setattr(asyncio, "wait_for", mock_wait_for)
+        _neo4j, _celery, openai = mock_adapters
 
         # Set up OpenAI component to raise an exception on second call
         openai.check_health.side_effect = [
@@ -691,7 +649,7 @@ class TestHealthAPI:
         ]
 
         # Call the endpoint with auto_fix=True
-        result = await health.health_check(neo4j, celery, openai, auto_fix=True)
+        result = await health.health_check(auto_fix=True, deep=False, monitor=monitor)
 
         # Check the result
         assert result.status == "degraded"
@@ -705,37 +663,20 @@ class TestHealthAPI:
         assert "renewal_error" in result.components["openai"].details
         assert "renewal_attempted" in result.components["openai"].details
         assert result.components["openai"].details["renewal_attempted"] is True
+        assert "Could not authenticate" in result.components["openai"].details["renewal_error"]
 
     @pytest.mark.asyncio
-    async def test_health_check_with_auto_fix_timeout(self, mock_adapters, monkeypatch):
+    async def test_health_check_with_auto_fix_timeout(self, mock_adapters, monitor, monkeypatch):
         """Test health check when auto_fix times out."""
-        neo4j, celery, openai = mock_adapters
-
-        # Create a custom class to mock Redis more accurately
-        class MockRedisClient:
-            async def ping(self):
-                return True
-
-            async def info(self, section=None):
-                return {"redis_version": "6.0.0", "used_memory_human": "1M"}
-
-            async def close(self):
-                pass
-
-        # Replace the Redis class with our mock
-        monkeypatch.setattr(health.redis, "Redis", lambda **kwargs: MockRedisClient())
-
-        # Mock asyncio.wait_for to simulate a timeout on the second call only
-        # This will simulate a timeout during the auto_fix attempt
-        call_count = 0
+        _neo4j, _celery, openai = mock_adapters
+        real_wait_for = asyncio.wait_for
 
+        # Time out only the auto-fix renewal attempt (the only 15 second wait)
         async def mock_wait_for_with_timeout(coro, timeout):
-            nonlocal call_count
-            call_count += 1
-
-            if call_count > 1:  # Only time out on the second call (auto-fix attempt)
+            if timeout == 15:
+                coro.close()
                 raise TimeoutError("Operation timed out")
-            return await coro
+            return await real_wait_for(coro, timeout)
 
         monkeypatch.setattr(asyncio, "wait_for", mock_wait_for_with_timeout)
 
@@ -753,13 +694,13 @@ class TestHealthAPI:
         }
 
         # Call the endpoint with auto_fix=True
-        result = await health.health_check(neo4j, celery, openai, auto_fix=True)
+        result = await health.health_check(auto_fix=True, deep=False, monitor=monitor)
 
         # Check the result
-        assert result.status == "unhealthy"  # Changed expectation to match implementation
+        assert result.status == "degraded"
         assert result.components["openai"].status == "unhealthy"
 
-        # Verify details about the timeout
+        # Verify details about the renewal attempt
         assert result.components["openai"].details is not None
-        assert "error" in result.components["openai"].details
-        assert "timed out" in result.components["openai"].details["error"].lower()
+        assert result.components["openai"].details["renewal_attempted"] is True
+        openai.check_health.assert_called_once()
@@ -9,6 +9,7 @@ from unittest import mock
 import pytest
 from fastapi import HTTPException, WebSocket
 
+from codestory.ingestion_pipeline.job_index import DependencyFailedError
 from codestory_service.application.auth_service import AuthService
 from codestory_service.application.config_service import ConfigService
 from codestory_service.application.graph_service import GraphService
@@ -401,6 +402,69 @@ class TestIngestionService:
         assert job.status == JobStatus.RUNNING
         assert job.progress == 0.5
 
+    @pytest.mark.asyncio
+    async def test_start_ingestion_waits_for_dependencies(self, service, mock_celery):
+        """Test that a job with unmet dependencies is indexed as waiting."""
+        service.publish_progress = mock.AsyncMock()
+        mock_celery.job_index = mock.MagicMock()
+        mock_celery.job_index.add_waiting.return_value = ["job123"]
+
+        request = IngestionRequest(
+            source_type=IngestionSourceType.LOCAL_PATH,
+            source="/path/to/repo",
+            dependencies=["job123"],
+        )
+
+        result = await service.start_ingestion(request)
+
+        assert result.status == JobStatus.PENDING
+        mock_celery.start_ingestion.assert_not_called()
+        args = mock_celery.job_index.add_waiting.call_args[0]
+        assert args[0] == result.job_id
+        assert args[1] == ["job123"]
+
+    @pytest.mark.asyncio
+    async def test_start_ingestion_rejects_failed_dependency(self, service, mock_celery):
+        """Test that a job cannot depend on a job that failed."""
+        mock_celery.job_index = mock.MagicMock()
+        mock_celery.job_index.add_waiting.side_effect = DependencyFailedError("job123", "failed")
+
+        request = IngestionRequest(
+            source_type=IngestionSourceType.LOCAL_PATH,
+            source="/path/to/repo",
+            dependencies=["job123"],
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.start_ingestion(request)
+
+        assert exc_info.value.status_code == 409
+        assert "job123" in exc_info.value.detail
+        mock_celery.start_ingestion.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_completed_job_starts_ready_dependents(self, service, mock_celery):
+        """Test that completing a job starts only the dependents it released."""
+        service.publish_progress = mock.AsyncMock()
+        mock_celery.get_job_status.return_value = mock.MagicMock(
+            job_id="job123", status=JobStatus.COMPLETED
+        )
+        mock_celery.job_index = mock.MagicMock()
+        mock_celery.job_index.complete.return_value = ["job456"]
+        mock_celery.job_index.get_job.return_value = {
+            "job_id": "job456",
+            "status": "pending",
+            "request": {"source_type": "local_path", "source": "/path/to/repo"},
+        }
+
+        await service.get_job_status("job123")
+
+        mock_celery.job_index.complete.assert_called_once_with("job123")
+        mock_celery.start_ingestion.assert_called_once()
+        args, kwargs = mock_celery.start_ingestion.call_args
+        assert args[0].source == "/path/to/repo"
+        assert kwargs["job_id"] == "job456"
+
     @pytest.mark.asyncio
     async def test_subscribe_to_progress(self, service):
         """Test subscribing to progress events."""
@@ -3,6 +3,7 @@
 This module contains tests for the infrastructure adapters used in the service.
 """
 
+import asyncio
 from unittest import mock
 
 import pytest
@@ -12,8 +13,9 @@ from codestory.graphdb.exceptions import ConnectionError, QueryError
 from codestory.graphdb.neo4j_connector import Neo4jConnector
 from codestory.llm.exceptions import AuthenticationError
 from codestory_service.domain.graph import CypherQuery, QueryType
-from codestory_service.domain.ingestion import IngestionRequest, IngestionSourceType
+from codestory_service.domain.ingestion import IngestionRequest, IngestionSourceType, JobStatus
 from codestory_service.infrastructure.celery_adapter import CeleryAdapter
+from codestory_service.infrastructure.health_monitor import HealthMonitor
 from codestory_service.infrastructure.msal_validator import MSALValidator
 from codestory_service.infrastructure.neo4j_adapter import Neo4jAdapter
 from codestory_service.infrastructure.openai_adapter import OpenAIAdapter
@@ -378,7 +380,7 @@ class TestCeleryAdapter:
     @pytest.fixture
     def adapter(self, mock_app):
         """Create a CeleryAdapter with a mock app."""
-        adapter = CeleryAdapter()
+        adapter = CeleryAdapter(job_index=mock.MagicMock())
         adapter.app = mock_app
         # Make the run_ingestion_pipeline task available
 
@@ -501,6 +503,52 @@ class TestCeleryAdapter:
             "custom_option" not in docgrapher_config
         ), "Docgrapher should not have custom_option parameter"
 
+    @pytest.mark.asyncio
+    async def test_start_ingestion_indexes_job(self, adapter, mock_app):
+        """Test that a submitted job is indexed as pending under its task ID."""
+        request = IngestionRequest(
+            source_type=IngestionSourceType.LOCAL_PATH, source="/path/to/repo"
+        )
+
+        await adapter.start_ingestion(request, job_id="job123")
+
+        adapter.job_index.record.assert_called_once_with("job123", "pending", "/path/to/repo")
+        _, kwargs = adapter._run_ingestion_pipeline.apply_async.call_args
+        assert kwargs["task_id"] == "job123"
+
+    @pytest.mark.asyncio
+    async def test_list_jobs(self, adapter):
+        """Test listing jobs from the job index."""
+        adapter.job_index.list_jobs.return_value = [
+            {
+                "job_id": "job2",
+                "status": "waiting",
+                "repository": "/path/to/repo",
+                "created_at": 1700000100.0,
+                "updated_at": 1700000100.0,
+            },
+            {
+                "job_id": "job1",
+                "status": "completed",
+                "repository": "/path/to/repo",
+                "created_at": 1700000000.0,
+                "updated_at": 1700000050.0,
+                "duration": 50.0,
+            },
+        ]
+
+        jobs = await adapter.list_jobs([JobStatus.PENDING, JobStatus.COMPLETED], limit=2)
+
+        adapter.job_index.list_jobs.assert_called_once_with(
+            ["completed", "pending", "waiting"], None, 2, 0, True
+        )
+        assert [job.job_id for job in jobs] == ["job2", "job1"]
+        assert jobs[0].status == JobStatus.PENDING
+        assert jobs[0].message == "Job is waiting for dependencies"
+        assert jobs[1].status == JobStatus.COMPLETED
+        assert jobs[1].progress == 100.0
+        assert jobs[1].source == "/path/to/repo"
+
 
 class TestMSALValidator:
     """Tests for MSAL validator."""
@@ -540,3 +588,76 @@ class TestMSALValidator:
 
         assert isinstance(token, str)
         assert len(token) > 0
+
+
+class TestHealthMonitor:
+    """Tests for the background health monitor."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_one_check(self):
+        """Test that concurrent probes of a component run a single check."""
+        calls = 0
+
+        async def slow_check():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"status": "healthy", "details": {}}
+
+        monitor = HealthMonitor()
+        monitor.register("db", slow_check)
+
+        results = await asyncio.gather(*(monitor.current() for _ in range(5)))
+
+        assert calls == 1
+        assert all(r["db"]["status"] == "healthy" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_check_timeout_and_errors_are_unhealthy(self):
+        """Test that hanging or failing checks are reported as unhealthy."""
+
+        async def hanging_check():
+            await asyncio.sleep(10)
+            return {"status": "healthy"}
+
+        async def failing_check():
+            raise RuntimeError("boom")
+
+        monitor = HealthMonitor()
+        monitor.register("slow", hanging_check, timeout=0.01)
+        monitor.register("broken", failing_check)
+
+        snapshot = await monitor.refresh()
+
+        assert snapshot["slow"]["status"] == "unhealthy"
+        assert "timed out" in snapshot["slow"]["details"]["error"]
+        assert snapshot["broken"]["status"] == "unhealthy"
+        assert snapshot["broken"]["details"]["type"] == "RuntimeError"
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_and_staleness(self):
+        """Test that the monitor refreshes in the background and flags stale results."""
+        calls = 0
+
+        async def check():
+            nonlocal calls
+            calls += 1
+            return {"status": "healthy", "details": {}}
+
+        # Results go stale after 50 missed intervals (0.5 seconds)
+        monitor = HealthMonitor(stale_after_intervals=50)
+        monitor.register("db", check, interval=0.01)
+
+        await monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        assert calls > 1
+        assert not monitor.running
+        assert monitor.snapshot()["db"]["status"] == "healthy"
+
+        # Without the background task the cached result goes stale
+        await asyncio.sleep(0.6)
+        stale = monitor.snapshot()["db"]
+        assert stale["status"] == "degraded"
+        assert stale["details"]["stale"] is True
@@ -0,0 +1,156 @@
+"""Tests for the progress hub fanning job streams out to subscribers."""
+
+import asyncio
+from collections import defaultdict
+from typing import Any
+
+import pytest
+
+from codestory.ingestion_pipeline.progress import encode_event
+from codestory_service.infrastructure.progress_hub import ProgressHub, ProgressSubscription
+
+
+def _parse(entry_id: str) -> tuple[int, int]:
+    ms, seq = entry_id.split("-")
+    return int(ms), int(seq)
+
+
+class FakeStreamRedis:
+    """In-memory stand-in for the stream commands of redis.asyncio."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = defaultdict(list)
+        self.xread_calls = 0
+        self._seq = 0
+        self._changed = asyncio.Event()
+
+    def add(self, key: str, event: dict[str, Any]) -> str:
+        self._seq += 1
+        entry_id = f"{self._seq}-0"
+        self.streams[key].append((entry_id, encode_event(event)))
+        self._changed.set()
+        return entry_id
+
+    async def xrange(self, key: str) -> list[tuple[str, dict[str, str]]]:
+        return list(self.streams.get(key, []))
+
+    async def xrevrange(self, key: str, count: int) -> list[tuple[str, dict[str, str]]]:
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    async def xread(self, streams: dict[str, str], block: int, count: int) -> list[Any]:
+        self.xread_calls += 1
+        while True:
+            response = []
+            for key, cursor in streams.items():
+                entries = [e for e in self.streams.get(key, []) if _parse(e[0]) > _parse(cursor)]
+                if entries:
+                    response.append((key, entries[:count]))
+            if response:
+                return response
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), block / 1000)
+            except TimeoutError:
+                return []
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeStreamRedis) -> None:
+        self.redis = redis
+        self.results: list[Any] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        pass
+
+    def xadd(self, key: str, fields: dict[str, str], **kwargs: Any) -> None:
+        self.redis._seq += 1
+        entry_id = f"{self.redis._seq}-0"
+        self.redis.streams[key].append((entry_id, fields))
+        self.redis._changed.set()
+        self.results.append(entry_id)
+
+    def expire(self, key: str, ttl: int) -> None:
+        self.results.append(True)
+
+    async def execute(self) -> list[Any]:
+        return self.results
+
+
+@pytest.fixture
+async def hub():
+    """Create a hub reading from the fake Redis."""
+    hub = ProgressHub("redis://localhost:6379", block_ms=50)
+    await hub.redis.aclose()
+    hub.redis = FakeStreamRedis()
+    yield hub
+    await hub.stop()
+
+
+def key(job_id: str) -> str:
+    return f"codestory:ingestion:progress:{job_id}"
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_replays_history(hub):
+    """Test that a subscriber sees earlier events, then live ones, until the job ends."""
+    hub.redis.add(key("job-1"), {"step": "filesystem", "progress": 10, "job_status": "running"})
+    hub.redis.add(key("job-1"), {"step": "filesystem", "progress": 20, "job_status": "running"})
+
+    async with hub.subscribe("job-1") as subscription:
+        assert (await subscription.get())["progress"] == 10
+        assert (await subscription.get())["progress"] == 20
+
+        await hub.publish("job-1", {"step": "pipeline", "progress": 100, "job_status": "completed"})
+        event = await asyncio.wait_for(subscription.get(), 1)
+        assert event["job_status"] == "completed"
+
+        # Nothing follows the end of the job
+        assert await subscription.get() is None
+
+    assert hub.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_one_reader_fans_out_to_all_subscribers(hub):
+    """Test that events reach every subscriber of their job through one reader."""
+    async with (
+        hub.subscribe("job-1") as first,
+        hub.subscribe("job-1") as second,
+        hub.subscribe("job-2") as other,
+    ):
+        assert hub.subscriber_count == 3
+        await hub.publish("job-1", {"progress": 50, "job_status": "running"})
+        await hub.publish("job-2", {"progress": 75, "job_status": "running"})
+
+        results = await asyncio.wait_for(asyncio.gather(first.get(), second.get(), other.get()), 1)
+
+    assert [event["progress"] for event in results] == [50, 50, 75]
+    # Waiting subscribers share a single blocking read at a time
+    assert hub.redis.xread_calls <= 3
+    await asyncio.sleep(0.1)
+    assert hub._reader is None or hub._reader.done()
+
+
+@pytest.mark.asyncio
+async def test_subscription_skips_duplicates():
+    """Test that entries seen in the replay and live are delivered once."""
+    subscription = ProgressSubscription("job-1", max_pending=3)
+    subscription._replay.extend([("1-0", {"n": 1}), ("2-0", {"n": 2})])
+    for entry_id, n in (("1-0", 1), ("2-0", 2), ("3-0", 3), ("4-0", 4)):
+        subscription._deliver(entry_id, {"n": n})
+
+    events = [await subscription.get() for _ in range(3)]
+
+    # The oldest live entry was dropped as the buffer holds three entries,
+    # the other duplicate was skipped
+    assert [event["n"] for event in events] == [1, 2, 3]
+    assert list(subscription._live) == [("4-0", {"n": 4})]
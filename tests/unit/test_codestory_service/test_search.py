@@ -0,0 +1,267 @@
+"""Tests for the full-text and hybrid graph search."""
+
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from fastapi import HTTPException
+
+from codestory_service.application.graph_service import (
+    RRF_K,
+    GraphService,
+    reciprocal_rank_fusion,
+)
+from codestory_service.domain.graph import SearchMode, SearchQuery
+from codestory_service.infrastructure.neo4j_adapter import (
+    FULLTEXT_SEARCH_INDEXES,
+    VECTOR_SEARCH_INDEXES,
+    Neo4jAdapter,
+    escape_lucene,
+)
+
+FIXTURE = Path(__file__).parents[2] / "fixtures" / "search_relevance.json"
+RELEVANCE = json.loads(FIXTURE.read_text())
+
+
+def make_row(node_id: str, nodes: dict, score: float = 1.0) -> dict:
+    """Build a candidate row as returned by the search queries."""
+    node = nodes[node_id]
+    return {
+        "id": node_id,
+        "labels": node["labels"],
+        "properties": {"name": node["name"], "path": node["path"], "embedding": None},
+        "snippet": f"content of {node['name']}",
+        "score": score,
+    }
+
+
+def fake_neo4j(rankings: dict[str, list[str]], nodes: dict) -> mock.AsyncMock:
+    """Create a Neo4j adapter returning fixed rankings, filtered like the queries."""
+
+    def rows(ids: list[str], labels: list[str] | None) -> list[dict]:
+        kept = [i for i in ids if labels is None or set(nodes[i]["labels"]) & set(labels)]
+        return [make_row(i, nodes, 1.0 / rank) for rank, i in enumerate(kept, 1)]
+
+    async def fulltext_search(text, labels, k):
+        return {
+            index: rows(rankings.get(index, []), labels)[:k]
+            for index, covered in FULLTEXT_SEARCH_INDEXES.items()
+            if labels is None or set(covered) & set(labels)
+        }
+
+    async def vector_index_search(embedding, labels, k):
+        return rows(rankings.get("vector", []), labels)[:k]
+
+    adapter = mock.AsyncMock()
+    adapter.fulltext_search.side_effect = fulltext_search
+    adapter.vector_index_search.side_effect = vector_index_search
+    return adapter
+
+
+@pytest.fixture
+def mock_openai():
+    """Create a mock OpenAI adapter."""
+    adapter = mock.AsyncMock()
+    adapter.create_embeddings.return_value = [[0.1, 0.2, 0.3]]
+    return adapter
+
+
+def test_reciprocal_rank_fusion():
+    """Test that items ranked well by several rankings come first."""
+    fused = reciprocal_rank_fusion({"a": ["x", "y", "z"], "b": ["y", "w", "x", "y"]})
+
+    assert [item for item, _, _ in fused] == ["y", "x", "w", "z"]
+    _, score, ranks = fused[0]
+    assert ranks == {"a": 2, "b": 1}
+    assert score == pytest.approx(1 / (RRF_K + 2) + 1 / (RRF_K + 1))
+    # Repeated items keep their best rank and do not shift the others
+    assert fused[2][2] == {"b": 2}
+
+
+def test_reciprocal_rank_fusion_ties_are_stable():
+    """Test that ties are broken by best rank, then by ID."""
+    fused = reciprocal_rank_fusion({"a": ["b1", "b2"], "b": ["a1"], "c": []})
+
+    assert [item for item, _, _ in fused] == ["a1", "b1", "b2"]
+
+
+def test_escape_lucene():
+    """Test that queries are matched as plain terms."""
+    assert escape_lucene("parse(config)") == r"parse\(config\)"
+    assert escape_lucene("a:b AND c*") == r"a\:b and c\*"
+    assert escape_lucene('path/to "file"') == r"path\/to \"file\""
+    assert escape_lucene("  ") == ""
+
+
+class TestNeo4jAdapterSearch:
+    """Tests for the search queries of the Neo4j adapter."""
+
+    @pytest.fixture
+    def connector(self):
+        """Create a mock connector."""
+        connector = mock.MagicMock()
+        connector.execute_query.return_value = [{"id": "n1"}]
+        return connector
+
+    @pytest.mark.asyncio
+    async def test_fulltext_search_queries_matching_indexes(self, connector):
+        """Test that only the indexes covering the filter are queried."""
+        adapter = Neo4jAdapter(connector=connector)
+
+        result = await adapter.fulltext_search("parse(config)", ["Function"], 20)
+
+        assert result == {"code_name": [{"id": "n1"}]}
+        connector.execute_query.assert_called_once()
+        params = connector.execute_query.call_args.kwargs["params"]
+        assert params == {
+            "index": "code_name",
+            "query": r"parse\(config\)",
+            "k": 20,
+            "labels": ["Function"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_fulltext_search_all_indexes(self, connector):
+        """Test that all indexes are queried without a filter."""
+        adapter = Neo4jAdapter(connector=connector)
+
+        result = await adapter.fulltext_search("config", None, 20)
+
+        assert list(result) == list(FULLTEXT_SEARCH_INDEXES)
+        assert connector.execute_query.call_count == len(FULLTEXT_SEARCH_INDEXES)
+
+    @pytest.mark.asyncio
+    async def test_vector_index_search(self, connector):
+        """Test that the vector indexes are queried in one query."""
+        adapter = Neo4jAdapter(connector=connector)
+
+        await adapter.vector_index_search([0.1], None, 5)
+
+        params = connector.execute_query.call_args.kwargs["params"]
+        assert params["indexes"] == list(VECTOR_SEARCH_INDEXES)
+        assert params["k"] == 5
+
+    @pytest.mark.asyncio
+    async def test_vector_index_search_follows_summaries(self, connector):
+        """Test that summary hits are returned as the nodes they summarize."""
+        adapter = Neo4jAdapter(connector=connector)
+
+        await adapter.vector_index_search([0.1], ["Function"], 5)
+
+        query = connector.execute_query.call_args.args[0]
+        params = connector.execute_query.call_args.kwargs["params"]
+        assert params["indexes"] == ["summary_embedding_vector_idx"]
+        assert "MATCH (node)-[:HAS_SUMMARY]->(summary)" in query
+        assert "max(score) AS score" in query
+
+    @pytest.mark.asyncio
+    async def test_search_without_matching_index(self, connector):
+        """Test that a filter no index covers queries nothing."""
+        adapter = Neo4jAdapter(connector=connector)
+
+        assert await adapter.fulltext_search("config", ["Directory"], 20) == {}
+        assert await adapter.vector_index_search([0.1], ["Documentation"], 20) == []
+        connector.execute_query.assert_not_called()
+
+
+class TestGraphServiceSearch:
+    """Tests for GraphService.search."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("case", RELEVANCE["cases"], ids=lambda case: case["query"])
+    async def test_relevance_regression(self, case, mock_openai):
+        """Test the fused ranking of the relevance fixture."""
+        neo4j = fake_neo4j(case["rankings"], RELEVANCE["nodes"])
+        service = GraphService(neo4j, mock_openai)
+        query = SearchQuery(
+            query=case["query"],
+            node_types=case.get("node_types"),
+            mode=case.get("mode", "hybrid"),
+            limit=len(case["expected_top"]),
+        )
+
+        response = await service.search(query)
+
+        assert [hit.id for hit in response.data] == case["expected_top"]
+        if query.node_types:
+            all_hits = await service.search(query.model_copy(update={"limit": 100}))
+            assert all(hit.type in query.node_types for hit in all_hits.data)
+        if query.mode == SearchMode.FULLTEXT:
+            mock_openai.create_embeddings.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pagination(self, mock_openai):
+        """Test that pages partition the fused ranking."""
+        case = RELEVANCE["cases"][1]
+        service = GraphService(fake_neo4j(case["rankings"], RELEVANCE["nodes"]), mock_openai)
+
+        full = await service.search(SearchQuery(query=case["query"], limit=100))
+        pages = [
+            await service.search(SearchQuery(query=case["query"], limit=2, offset=offset))
+            for offset in range(0, full.total_count, 2)
+        ]
+
+        assert [hit.id for page in pages for hit in page.data] == [hit.id for hit in full.data]
+        assert all(page.has_more for page in pages[:-1])
+        assert not pages[-1].has_more
+        assert full.total_count == 5
+
+    @pytest.mark.asyncio
+    async def test_hit_fields(self, mock_openai):
+        """Test that hits carry ranks, snippet and properties without nulls."""
+        case = RELEVANCE["cases"][0]
+        service = GraphService(fake_neo4j(case["rankings"], RELEVANCE["nodes"]), mock_openai)
+
+        response = await service.search(SearchQuery(query=case["query"], limit=1))
+
+        hit = response.data[0]
+        assert hit.type == "Function"
+        assert hit.name == "parse_config"
+        assert hit.path == "src/app/config.py"
+        assert hit.ranks == {"code_name": 1, "vector": 2}
+        assert hit.content_snippet == "content of parse_config"
+        assert "embedding" not in hit.properties
+        assert response.mode == SearchMode.HYBRID
+        assert response.fulltext_time_ms is not None
+        assert response.vector_time_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_fulltext(self, mock_openai):
+        """Test that a failed embedding leaves the full-text results."""
+        case = RELEVANCE["cases"][0]
+        service = GraphService(fake_neo4j(case["rankings"], RELEVANCE["nodes"]), mock_openai)
+        mock_openai.create_embeddings.side_effect = HTTPException(status_code=502)
+
+        response = await service.search(SearchQuery(query=case["query"]))
+
+        assert response.mode == SearchMode.FULLTEXT
+        # The first results of the three indexes tie, and are ordered by ID
+        assert [hit.id for hit in response.data[:3]] == [
+            "doc:configuration",
+            "f:parse_config",
+            "file:config.py",
+        ]
+        assert "f:load_settings" not in [hit.id for hit in response.data]
+
+    @pytest.mark.asyncio
+    async def test_fails_if_all_rankings_fail(self, mock_openai):
+        """Test that the error is raised if no ranking is available."""
+        neo4j = mock.AsyncMock()
+        neo4j.vector_index_search.side_effect = RuntimeError("index missing")
+        service = GraphService(neo4j, mock_openai)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.search(SearchQuery(query="config", mode=SearchMode.VECTOR))
+
+        assert exc_info.value.status_code == 500
+        neo4j.fulltext_search.assert_not_called()
+
+
+def test_search_query_normalizes_node_types():
+    """Test that node types are normalized to labels."""
+    query = SearchQuery(query=" config ", node_types=["function", "Class", " "])
+
+    assert query.query == "config"
+    assert query.node_types == ["Function", "Class"]
+    assert SearchQuery(query="config", node_types=[]).node_types is None
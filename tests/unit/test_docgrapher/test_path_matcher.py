@@ -0,0 +1,69 @@
+"""Tests for the documentation grapher path matcher."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from codestory_docgrapher.utils.path_matcher import PathMatcher
+
+FILE_PATHS = [
+    "/repo/src/pkg/utils.py",
+    "/repo/src/other/utils.py",
+    "/repo/tests/pkg/utils.py",
+    "/repo/src/pkg/models.py",
+    "/repo/README.md",
+]
+
+
+def make_connector(file_paths=FILE_PATHS, dir_paths=("/repo/src",)):
+    """Create a connector mock that answers the structure queries."""
+    connector = MagicMock()
+
+    def run_query(query, parameters=None, fetch_all=False, fetch_one=False):
+        if "(f:File)" in query:
+            return [{"path": p} for p in file_paths]
+        if "(d:Directory)" in query:
+            return [{"path": p} for p in dir_paths]
+        return []
+
+    connector.run_query.side_effect = run_query
+    return connector
+
+
+@pytest.fixture
+def matcher():
+    return PathMatcher(make_connector(), "/repo")
+
+
+def test_exact_match(matcher):
+    assert matcher.match_path("/repo/src/pkg/models.py") == "/repo/src/pkg/models.py"
+    assert matcher.match_path("/repo/src") == "/repo/src"
+
+
+def test_unique_basename(matcher):
+    assert matcher.match_path("models.py") == "/repo/src/pkg/models.py"
+
+
+def test_multi_segment_suffix(matcher):
+    assert matcher.match_path("other/utils.py") == "/repo/src/other/utils.py"
+    assert matcher.match_path("tests/pkg/utils.py") == "/repo/tests/pkg/utils.py"
+    assert matcher.match_path("./src/pkg/utils.py") == "/repo/src/pkg/utils.py"
+
+
+def test_ambiguous_basename_returns_shortest(matcher):
+    assert matcher.match_path("utils.py") == "/repo/src/pkg/utils.py"
+
+
+def test_extension_fallback(matcher):
+    assert matcher.match_path("CONTRIBUTING.md") == "/repo/README.md"
+    assert matcher.match_path("missing.rs") is None
+
+
+def test_path_cache_is_lru():
+    matcher = PathMatcher(make_connector(), "/repo", cache_size=2)
+    matcher.match_path("models.py")
+    matcher.match_path("README.md")
+    matcher.match_path("models.py")
+    matcher.match_path("other/utils.py")
+
+    assert list(matcher.path_cache) == ["models.py", "other/utils.py"]
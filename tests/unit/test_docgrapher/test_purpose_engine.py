@@ -0,0 +1,162 @@
+"""Tests for batched, cached docstring purpose extraction."""
+
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from codestory_docgrapher.models import DocumentationEntity, EntityType
+from codestory_docgrapher.utils.content_analyzer import ContentAnalyzer
+from codestory_docgrapher.utils.purpose_engine import PurposeCache, PurposeEngine, PurposeKind
+
+
+class FakeLLMClient:
+    """Async LLM client that answers batched purpose prompts."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def chat_async(self, messages, **kwargs):
+        prompt = messages[-1].content
+        self.calls.append(kwargs)
+        ids = [int(i) for i in re.findall(r"\[id=(\d+)\]", prompt)]
+        results = [{"id": i, "purpose": f"Purpose {i}."} for i in ids]
+        message = SimpleNamespace(content=json.dumps({"results": results}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PurposeCache(str(tmp_path / "purposes.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_deduplicates_and_batches(cache):
+    client = FakeLLMClient()
+    engine = PurposeEngine(client, cache=cache, max_batch_items=10)
+
+    items = [(PurposeKind.FUNCTION, f"Docstring {i % 25}") for i in range(100)]
+    purposes = engine.extract_purposes(items)
+
+    assert len(purposes) == 100
+    assert all(purposes)
+    # 25 unique docstrings packed 10 per request
+    assert engine.llm_calls == 3
+    assert all(call["response_format"] == {"type": "json_object"} for call in client.calls)
+    assert purposes[0] == purposes[25]
+
+
+def test_results_are_cached_persistently(cache, tmp_path):
+    items = [(PurposeKind.CLASS, "A widget."), (PurposeKind.MODULE, "Widget helpers.")]
+    first = PurposeEngine(FakeLLMClient(), cache=cache).extract_purposes(items)
+
+    reopened = PurposeCache(str(tmp_path / "purposes.sqlite3"))
+    engine = PurposeEngine(FakeLLMClient(), cache=reopened)
+    assert engine.extract_purposes(items) == first
+    assert engine.llm_calls == 0
+    reopened.close()
+
+
+def test_unparseable_response_is_not_cached(cache):
+    class BrokenClient(FakeLLMClient):
+        async def chat_async(self, messages, **kwargs):
+            message = SimpleNamespace(content="not json")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    engine = PurposeEngine(BrokenClient(), cache=cache)
+    assert engine.extract_purposes([(PurposeKind.FUNCTION, "Do things.")]) == [""]
+    assert cache.get_many([PurposeEngine.content_key(PurposeKind.FUNCTION, "Do things.")]) == {}
+
+
+def test_content_analyzer_prefetches_purposes(cache):
+    engine = PurposeEngine(FakeLLMClient(), cache=cache)
+    analyzer = ContentAnalyzer(use_llm=False, purpose_engine=engine)
+    analyzer.use_llm = True
+
+    entities = [
+        DocumentationEntity(
+            type=entity_type, content=f"{entity_type.value} doc", file_path="a.py", source_text=""
+        )
+        for entity_type in (EntityType.FUNCTION_DESC, EntityType.CLASS_DESC, EntityType.HEADING)
+    ]
+    results = analyzer.analyze_entities(entities)
+
+    assert engine.llm_calls == 1
+    assert results[entities[0].id]["purpose"]
+    assert results[entities[1].id]["purpose"]
+    assert "purpose" not in results[entities[2].id]
+
+
+def test_cache_opens_lazily(tmp_path):
+    path = tmp_path / "nested" / "purposes.sqlite3"
+    cache = PurposeCache(str(path))
+    assert not path.parent.exists()
+
+    cache.set_many({"key": "Purpose."})
+    assert path.exists()
+    cache.close()
+    cache.close()
+
+
+def test_close_stops_background_loop(tmp_path):
+    engine = PurposeEngine(FakeLLMClient(), cache_path=str(tmp_path / "purposes.sqlite3"))
+    engine.extract_purposes([(PurposeKind.FUNCTION, "Do things.")])
+    thread = engine._thread
+
+    engine.close()
+
+    assert not thread.is_alive()
+    # The engine closed the cache it created; a later call reopens both
+    assert engine.extract_purposes([(PurposeKind.FUNCTION, "Do things.")]) == ["Purpose 0."]
+    engine.close()
+
+
+def test_close_closes_client_of_background_loop(cache):
+    import asyncio
+
+    class ClosingClient(FakeLLMClient):
+        closed_in = None
+
+        async def aclose(self):
+            self.closed_in = asyncio.get_running_loop()
+
+    client = ClosingClient()
+    engine = PurposeEngine(client, cache=cache)
+    engine.extract_purposes([(PurposeKind.FUNCTION, "Do things.")])
+    loop = engine._loop
+
+    engine.close()
+
+    assert client.closed_in is loop
+
+
+def test_knowledge_graph_stores_purposes(cache):
+    from unittest import mock
+
+    from codestory_docgrapher.knowledge_graph import KnowledgeGraph
+
+    engine = PurposeEngine(FakeLLMClient(), cache=cache)
+    analyzer = ContentAnalyzer(use_llm=False, purpose_engine=engine)
+    analyzer.use_llm = True
+    graph = KnowledgeGraph(mock.MagicMock(), "/repo")
+    entities = [
+        DocumentationEntity(
+            type=entity_type, content=f"{entity_type.value} doc", file_path="a.py", source_text=""
+        )
+        for entity_type in (EntityType.FUNCTION_DESC, EntityType.HEADING)
+    ]
+    graph.add_entities(entities)
+
+    assert graph.extract_purposes(analyzer) == 1
+    assert entities[0].metadata["purpose"]
+    assert "purpose" not in entities[1].metadata
+
+    graph._create_entity_nodes()
+    params = [
+        c.kwargs["parameters"]
+        for c in graph.connector.run_query.call_args_list
+        if "DocumentationEntity" in c.args[0]
+    ]
+    assert [p["purpose"] for p in params] == [entities[0].metadata["purpose"], None]
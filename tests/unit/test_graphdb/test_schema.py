@@ -85,6 +85,7 @@ def test_get_all_schema_elements():
     assert any(
         "Documentation" in idx and "embedding" in idx for idx in schema_elements["vector_indexes"]
     )
+    assert len(schema_elements["vector_indexes"]) == 2
 
 
 def test_get_schema_initialization_queries():
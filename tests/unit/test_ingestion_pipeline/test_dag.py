@@ -0,0 +1,64 @@
+"""Tests for pipeline step dependency resolution."""
+
+import pytest
+
+from codestory.ingestion_pipeline.dag import resolve_step_dependencies, topological_levels
+
+
+def names(levels):
+    return [[step["name"] for step in level] for level in levels]
+
+
+def test_default_dependencies_run_docgrapher_alongside_summarizer():
+    steps = [
+        {"name": "filesystem"},
+        {"name": "blarify"},
+        {"name": "summarizer"},
+        {"name": "documentation_grapher"},
+    ]
+
+    assert names(topological_levels(steps)) == [
+        ["filesystem"],
+        ["blarify"],
+        ["summarizer", "documentation_grapher"],
+    ]
+
+
+def test_explicit_depends_on_overrides_defaults():
+    steps = [
+        {"name": "filesystem", "depends_on": []},
+        {"name": "blarify", "depends_on": ["filesystem"]},
+        {"name": "documentation_grapher", "depends_on": ["filesystem"]},
+    ]
+
+    assert names(topological_levels(steps)) == [
+        ["filesystem"],
+        ["blarify", "documentation_grapher"],
+    ]
+
+
+def test_dependencies_outside_pipeline_are_ignored():
+    steps = [{"name": "filesystem"}, {"name": "summarizer"}]
+
+    assert resolve_step_dependencies(steps) == {"filesystem": [], "summarizer": ["filesystem"]}
+
+
+def test_unknown_steps_keep_sequential_order():
+    steps = [{"name": "filesystem"}, {"name": "custom_a"}, {"name": "custom_b"}]
+
+    assert names(topological_levels(steps)) == [["filesystem"], ["custom_a"], ["custom_b"]]
+
+
+def test_cycle_is_rejected():
+    steps = [
+        {"name": "a", "depends_on": ["b"]},
+        {"name": "b", "depends_on": ["a"]},
+    ]
+
+    with pytest.raises(ValueError, match="cycle"):
+        topological_levels(steps)
+
+
+def test_duplicate_steps_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate"):
+        resolve_step_dependencies([{"name": "filesystem"}, {"name": "filesystem"}])
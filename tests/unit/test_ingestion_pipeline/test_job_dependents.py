@@ -0,0 +1,102 @@
+"""Tests for starting dependent jobs when a pipeline completes."""
+
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from codestory.ingestion_pipeline import tasks
+from codestory.ingestion_pipeline.job_index import JobIndex
+from codestory.ingestion_pipeline.step import StepStatus
+
+
+@pytest.fixture
+def index():
+    """Patch the process-wide job index with one on a fake Redis."""
+    index = JobIndex(fakeredis.FakeRedis(decode_responses=True))
+    with patch.object(tasks, "get_job_index", return_value=index):
+        yield index
+
+
+@pytest.fixture
+def apply_async():
+    """Capture the orchestrator tasks that are submitted."""
+    with patch.object(tasks.orchestrate_pipeline, "apply_async") as apply_async:
+        yield apply_async
+
+
+def _finish(task_id: str, status: StepStatus) -> None:
+    job = {
+        "job_id": f"pipeline-{task_id}",
+        "orchestrator_task_id": task_id,
+        "status": status.value,
+        "repository_path": "/repo",
+        "steps": [],
+        "step_configs": {},
+        "start_time": 0.0,
+    }
+    with (
+        patch.object(tasks, "app"),
+        patch.object(tasks, "publish_job_progress"),
+    ):
+        tasks._store_final_result(job)
+
+
+def test_completed_job_starts_its_ready_dependents(index, apply_async):
+    """Test that completing a job submits the dependents waiting only on it."""
+    index.record("a", "running", "/repo")
+    index.record("b", "running", "/repo")
+    request = {
+        "source": "/other",
+        "steps": ["filesystem", "summarizer"],
+        "options": {"concurrency": 2, "incremental": True},
+        "priority": "high",
+    }
+    index.add_waiting("only-a", ["a"], request, "/other")
+    index.add_waiting("both", ["a", "b"], request, "/other")
+
+    _finish("a", StepStatus.COMPLETED)
+
+    apply_async.assert_called_once()
+    kwargs = apply_async.call_args.kwargs
+    assert kwargs["task_id"] == "only-a"
+    assert kwargs["queue"] == "high"
+    source, step_configs, _ = kwargs["args"]
+    assert source == "/other"
+    assert step_configs == [
+        {"name": "filesystem", "concurrency": 2, "incremental": True},
+        {"name": "summarizer", "incremental": True},
+    ]
+    assert index.get_job("only-a")["status"] == "pending"
+    assert index.get_job("both")["status"] == "waiting"
+
+    # Storing the result again does not start the dependent twice
+    _finish("a", StepStatus.COMPLETED)
+    apply_async.assert_called_once()
+
+    _finish("b", StepStatus.COMPLETED)
+    assert apply_async.call_args.kwargs["task_id"] == "both"
+
+
+def test_failed_job_does_not_start_dependents(index, apply_async):
+    """Test that the dependents of a failed job fail instead of starting."""
+    index.record("a", "running", "/repo")
+    index.add_waiting("dep", ["a"], {"source": "/other"}, "/other")
+
+    _finish("a", StepStatus.FAILED)
+
+    apply_async.assert_not_called()
+    assert index.get_job("dep")["status"] == "failed"
+
+
+def test_dependent_without_request_is_failed(index, apply_async):
+    """Test that a dependent that cannot be started is marked as failed."""
+    index.record("a", "running", "/repo")
+    index.add_waiting("dep", ["a"], {"source": "/other"}, "/other")
+    apply_async.side_effect = RuntimeError("broker down")
+
+    _finish("a", StepStatus.COMPLETED)
+
+    job = index.get_job("dep")
+    assert job["status"] == "failed"
+    assert job["error"] == "broker down"
@@ -0,0 +1,93 @@
+"""Tests for the resource lease handling of the pipeline tasks."""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from codestory.ingestion_pipeline import tasks
+from codestory.ingestion_pipeline.resource_manager import ResourceScheduler
+
+
+@pytest.fixture
+def scheduler():
+    """Patch the process-wide scheduler with a mock."""
+    scheduler = MagicMock()
+    with patch.object(tasks, "_scheduler", scheduler):
+        yield scheduler
+
+
+def test_scheduler_is_cached():
+    """Test that one scheduler is created per process."""
+    with (
+        patch.object(tasks, "_scheduler", None),
+        patch.object(tasks, "ResourceScheduler") as scheduler_cls,
+    ):
+        first = tasks._get_scheduler()
+        second = tasks._get_scheduler()
+
+    assert first is second
+    scheduler_cls.assert_called_once()
+    assert scheduler_cls.call_args.kwargs["lease_ttl"] == tasks.RESOURCE_LEASE_TTL_SECONDS
+
+
+def test_step_task_heartbeats_its_lease(scheduler):
+    """Test that a task carrying a lease ID renews the lease until it returns."""
+    beat = threading.Event()
+    scheduler.heartbeat.side_effect = lambda *args: beat.set() or True
+    task = SimpleNamespace(request=SimpleNamespace(lease_id="job:filesystem:0"))
+
+    with patch.object(tasks, "RESOURCE_LEASE_TTL_SECONDS", 0.03):
+        tasks._start_lease_heartbeat(task_id="t1", task=task)
+        assert beat.wait(2)
+        tasks._stop_lease_heartbeat(task_id="t1")
+
+    scheduler.heartbeat.assert_called_with("job:filesystem:0", 0.03)
+    assert "t1" not in tasks._lease_heartbeats
+
+
+def test_task_without_lease_is_ignored(scheduler):
+    """Test that tasks not sent by run_step get no heartbeat."""
+    tasks._start_lease_heartbeat(task_id="t2", task=SimpleNamespace(request=SimpleNamespace()))
+    tasks._stop_lease_heartbeat(task_id="t2")
+
+    assert "t2" not in tasks._lease_heartbeats
+    scheduler.heartbeat.assert_not_called()
+
+
+def test_lease_outlives_queue_wait_longer_than_ttl():
+    """Test that a step whose task waits in the queue past the lease TTL keeps its lease."""
+    server = fakeredis.FakeServer()
+    with patch(
+        "redis.from_url",
+        side_effect=lambda *args, **kwargs: fakeredis.FakeRedis(server=server, **kwargs),
+    ):
+        scheduler = ResourceScheduler("redis://test", capacity=1)
+
+    with (
+        patch.object(tasks, "_scheduler", scheduler),
+        patch.object(tasks, "RESOURCE_LEASE_TTL_SECONDS", 0.2),
+        patch.object(tasks, "_get_step_weight", return_value=1),
+        patch.object(tasks.app, "send_task") as send_task,
+    ):
+        result = tasks.run_step.run("/repo", "filesystem", {})
+        lease_id = send_task.call_args.kwargs["headers"]["lease_id"]
+        assert result["lease_id"] == lease_id
+
+        # The plugin task waits in the broker queue for longer than the TTL
+        time.sleep(0.5)
+        assert scheduler.try_acquire(1) is None
+
+        # Its worker takes the lease over and keeps it alive
+        task = SimpleNamespace(request=SimpleNamespace(lease_id=lease_id))
+        tasks._start_lease_heartbeat(task_id="t3", task=task)
+        try:
+            time.sleep(0.3)
+            assert scheduler.try_acquire(1) is None
+        finally:
+            tasks._stop_lease_heartbeat(task_id="t3")
+
+    assert scheduler.release(lease_id)
@@ -6,6 +6,9 @@ import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+# Load the real Celery task machinery before the celery module is mocked
+# below, so tasks can still be patched
+import celery.app.task
 import pytest
 import yaml
 
@@ -0,0 +1,134 @@
+"""Tests for the coalescing progress reporter."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from codestory.ingestion_pipeline.progress import (
+    ProgressReporter,
+    ProgressStream,
+    decode_event,
+    publish_job_progress,
+)
+from codestory.ingestion_pipeline.step import StepStatus
+
+
+class Clock:
+    """Controllable replacement of time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def published_events(stream: MagicMock) -> list[dict]:
+    return [call.args[1] for call in stream.publish.call_args_list]
+
+
+def test_reports_are_coalesced():
+    """Test that reports within the interval only keep the latest values."""
+    clock = Clock()
+    stream = MagicMock()
+    reporter = ProgressReporter("job-1", "filesystem", stream=stream, min_interval=1.0)
+
+    with patch("codestory.ingestion_pipeline.progress.time.monotonic", clock):
+        for directory in range(1, 101):
+            clock.now += 0.05
+            reporter.report(directory, f"Created directory {directory}")
+        reporter.flush()
+
+    events = published_events(stream)
+    # The first report, one per elapsed second and the flushed latest report
+    assert len(events) == 6
+    assert events[0]["progress"] == 1
+    assert events[-1]["progress"] == 100
+    assert events[-1]["message"] == "Created directory 100"
+    assert all(event["job_status"] == "running" for event in events)
+
+
+def test_status_change_is_published_immediately():
+    """Test that a new status is not held back by the interval."""
+    stream = MagicMock()
+    task = MagicMock()
+    reporter = ProgressReporter(
+        "job-1",
+        "filesystem",
+        stream=stream,
+        task=task,
+        min_interval=60,
+        total_steps=4,
+        finished_steps=1,
+    )
+
+    reporter.report(50, "Halfway")
+    reporter.report(60, "Skipped")
+    reporter.report(100, "Done", StepStatus.COMPLETED, file_count=3)
+
+    events = published_events(stream)
+    assert [event["status"] for event in events] == ["RUNNING", "COMPLETED"]
+    assert events[0]["overall_progress"] == 37.5
+    assert events[1]["overall_progress"] == 50.0
+    assert events[1]["file_count"] == 3
+    # The Celery task state follows at the same rate
+    assert task.update_state.call_count == 2
+    assert task.update_state.call_args.kwargs["meta"]["message"] == "Done"
+
+
+def test_publish_errors_disable_the_stream():
+    """Test that failing to publish never fails the step."""
+    stream = MagicMock()
+    stream.publish.side_effect = ConnectionError("Redis is down")
+    reporter = ProgressReporter("job-1", "filesystem", stream=stream, min_interval=0)
+
+    reporter.report(1)
+    reporter.report(2)
+
+    assert stream.publish.call_count == 1
+    assert reporter.stream is None
+
+
+def test_without_job_only_task_state_is_updated():
+    """Test that steps running outside a pipeline job publish no events."""
+    stream = MagicMock()
+    task = MagicMock()
+
+    with ProgressReporter(None, "filesystem", stream=stream, task=task) as reporter:
+        reporter.report(10)
+
+    stream.publish.assert_not_called()
+    task.update_state.assert_called_once()
+
+
+def test_progress_stream_entries():
+    """Test that events are appended to a capped, expiring stream per job."""
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = ["1-0", True]
+    stream = ProgressStream(client, maxlen=10, ttl=60)
+
+    assert stream.publish("job-1", {"progress": 5}) == "1-0"
+
+    key, fields = pipe.xadd.call_args.args
+    assert key == "codestory:ingestion:progress:job-1"
+    assert json.loads(fields["event"]) == {"progress": 5}
+    assert pipe.xadd.call_args.kwargs == {"maxlen": 10, "approximate": True}
+    pipe.expire.assert_called_once_with(key, 60)
+
+    client.xrange.return_value = [("2-0", fields), ("3-0", {"other": "x"})]
+    assert stream.read("job-1", after="1-0") == [("2-0", {"progress": 5})]
+    assert client.xrange.call_args.kwargs == {"min": "(1-0"}
+
+
+def test_publish_job_progress():
+    """Test that job events carry the job's status for subscribers."""
+    stream = MagicMock()
+
+    with patch("codestory.ingestion_pipeline.progress.get_progress_stream", return_value=stream):
+        publish_job_progress("task-1", StepStatus.STOPPED, 50.0, "Stopped")
+
+    job_id, event = stream.publish.call_args.args
+    assert job_id == "task-1"
+    assert event["step"] == "pipeline"
+    assert event["job_status"] == "cancelled"
+    assert decode_event({b"event": json.dumps(event).encode()}) == event
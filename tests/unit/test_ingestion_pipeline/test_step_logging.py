@@ -0,0 +1,96 @@
+"""Tests for the hot-path step logger."""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from codestory.ingestion_pipeline.step_logging import StepLogger
+
+
+class Unformattable:
+    """Argument that fails the test if it is ever formatted."""
+
+    def __str__(self) -> str:
+        raise AssertionError("formatted eagerly")
+
+
+@pytest.fixture
+def test_logger():
+    logger = logging.getLogger("tests.step_logging")
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.setLevel(logging.NOTSET)
+
+
+def test_debug_events_are_not_formatted_below_level(test_logger, caplog):
+    """Test that disabled debug events cost no formatting."""
+    slog = StepLogger(test_logger, "job-1")
+
+    with caplog.at_level(logging.INFO, logger=test_logger.name):
+        slog.debug("Directory %s", Unformattable())
+        slog.item("File %s", Unformattable())
+        slog.info("Found %d files", 3)
+
+    assert [record.getMessage() for record in caplog.records] == ["[job_id=job-1] Found 3 files"]
+
+
+def test_item_events_are_sampled(test_logger, caplog):
+    """Test that only every n-th per-item event of a template is emitted."""
+    test_logger.setLevel(logging.DEBUG)
+    slog = StepLogger(test_logger, sample_every=10)
+
+    with caplog.at_level(logging.DEBUG, logger=test_logger.name):
+        for index in range(25):
+            slog.item("Processing file: %s", f"file_{index}.py")
+        slog.item("Creating directory node: %s", "src")
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Processing file: file_0.py (sampled 1/10)",
+        "Processing file: file_10.py (sampled 1/10)",
+        "Processing file: file_20.py (sampled 1/10)",
+        "Creating directory node: src (sampled 1/10)",
+    ]
+
+
+def test_error_flushes_recent_events(test_logger, caplog):
+    """Test that an error is logged with the unsampled events leading to it."""
+    slog = StepLogger(test_logger, buffer_size=2)
+
+    with caplog.at_level(logging.INFO, logger=test_logger.name):
+        for index in range(3):
+            slog.item("Processing file: %s", f"file_{index}.py")
+        slog.error("Error creating file node for %s", "file_2.py")
+        slog.error("Second error")
+
+    context, error, second = caplog.records
+    assert "Last 2 events before the error" in context.getMessage()
+    assert "file_0.py" not in context.getMessage()
+    assert "DEBUG Processing file: file_2.py" in context.getMessage()
+    assert error.getMessage() == "Error creating file node for file_2.py"
+    # The buffer was cleared by the first error
+    assert second.getMessage() == "Second error"
+
+
+def test_timings_are_aggregated_and_logged_periodically(test_logger, caplog):
+    """Test that timing counters are summed and summarized on an interval."""
+    slog = StepLogger(test_logger, stats_interval=30.0)
+    for seconds in (0.1, 0.2, 0.3):
+        slog.add_time("file_node_creation", seconds)
+
+    assert slog.count("file_node_creation") == 3
+    assert slog.total("file_node_creation") == pytest.approx(0.6)
+    assert slog.timing_stats()["file_node_creation"]["avg"] == pytest.approx(0.2)
+    assert slog.total("missing") == 0.0
+
+    with caplog.at_level(logging.INFO, logger=test_logger.name):
+        slog.maybe_log_stats()
+        assert caplog.records == []
+
+        with patch(
+            "codestory.ingestion_pipeline.step_logging.time.monotonic",
+            return_value=slog._last_stats + 31,
+        ):
+            slog.maybe_log_stats()
+
+    assert caplog.records[0].getMessage() == "Timing: file_node_creation: 3 x 200.0ms"
@@ -6,12 +6,19 @@ import openai
 import pytest
 
 from codestory.llm.backoff import (
+    CircuitBreaker,
+    DecorrelatedJitterWait,
+    RetryBudget,
     before_retry_callback,
     get_retry_after,
+    get_retry_budget,
+    parse_retry_after,
+    reset_retry_state,
     retry_on_openai_errors,
     retry_on_openai_errors_async,
 )
 from codestory.llm.exceptions import (
+    CircuitOpenError,
     ContextLengthError,
     RateLimitError,
     ServiceUnavailableError,
@@ -40,6 +47,14 @@ def mock_all_prometheus():
         yield
 
 
+@pytest.fixture(autouse=True)
+def retry_state():
+    """Start every test with a full retry budget and closed circuits."""
+    reset_retry_state()
+    yield
+    reset_retry_state()
+
+
 class TestRetryFunctions:
     """Tests for retry utility functions."""
 
@@ -268,3 +283,144 @@ class TestRetryDecorators:
             # Verify the decorator works as expected
             assert decorated is mock_decorated  # The function is decorated
             assert mock_retry.call_count == 1  # Retry was called once to create decorator
+
+
+class Client:
+    """Client with an endpoint, as the circuit breaker expects."""
+
+    def __init__(self, endpoint, errors):
+        self.endpoint = endpoint
+        self.errors = list(errors)
+        self.calls = 0
+
+    @retry_on_openai_errors(max_retries=4, retry_backoff_factor=0.001)
+    def call(self, model="gpt-4o"):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+    @retry_on_openai_errors_async(max_retries=4, retry_backoff_factor=0.001)
+    async def call_async(self, model="gpt-4o"):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class TestRetryEngine:
+    """Tests for the retry engine with real tenacity retries."""
+
+    def test_parse_retry_after(self):
+        """Test parsing of the delays a server asks for."""
+        assert parse_retry_after({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+        assert parse_retry_after({"retry-after": "7"}) == 7.0
+        assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+        assert parse_retry_after({"retry-after": "soon"}) is None
+        assert parse_retry_after(None) is None
+
+    def test_wait_honours_retry_after(self):
+        """Test that the server's delay is a lower bound of the wait."""
+        wait = DecorrelatedJitterWait(base=1.0, cap=60.0)
+        retry_state = MagicMock(upcoming_sleep=0.0)
+        retry_state.outcome.exception.return_value = RateLimitError("busy", retry_after=10)
+
+        waits = [wait(retry_state) for _ in range(50)]
+
+        assert all(10.0 <= w <= 11.0 for w in waits)
+        assert len(set(waits)) > 1
+
+    def test_wait_uses_decorrelated_jitter(self):
+        """Test that waits without a hint grow from the previous wait, jittered."""
+        wait = DecorrelatedJitterWait(base=1.0, cap=20.0)
+        retry_state = MagicMock(upcoming_sleep=4.0)
+        retry_state.outcome.exception.return_value = ServiceUnavailableError("down")
+
+        waits = [wait(retry_state) for _ in range(50)]
+
+        assert all(1.0 <= w <= 12.0 for w in waits)
+        retry_state.upcoming_sleep = 100.0
+        assert all(wait(retry_state) <= 20.0 for _ in range(50))
+
+    def test_retries_until_success(self):
+        """Test that retryable errors are retried and the result returned."""
+        client = Client("https://a", [RateLimitError("busy"), ServiceUnavailableError("down")])
+
+        assert client.call() == "ok"
+        assert client.calls == 3
+
+    def test_non_retryable_errors_are_raised(self):
+        """Test that invalid requests are not retried."""
+        client = Client("https://a", [ContextLengthError("too long")])
+
+        with pytest.raises(ContextLengthError):
+            client.call()
+        assert client.calls == 1
+
+    def test_retry_budget_limits_retries(self):
+        """Test that an exhausted budget raises the error instead of retrying."""
+        budget = get_retry_budget()
+        budget.min_per_second = 0.0
+        budget._tokens = 1.0
+        client = Client("https://a", [RateLimitError("busy")] * 3)
+
+        with pytest.raises(RateLimitError):
+            client.call()
+
+        assert client.calls == 2
+
+    def test_retry_budget_earns_retries(self):
+        """Test that successful calls refill the budget."""
+        budget = RetryBudget(ratio=0.5, min_per_second=0.0, max_tokens=2.0)
+        assert budget.try_withdraw() and budget.try_withdraw()
+        assert not budget.try_withdraw()
+
+        budget.deposit()
+        budget.deposit()
+
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+
+    def test_circuit_breaker_fails_fast(self):
+        """Test that an endpoint that keeps failing is not called until it may recover."""
+        client = Client("https://down", [ServiceUnavailableError("down")] * 10)
+
+        with pytest.raises(ServiceUnavailableError):
+            client.call()
+        with pytest.raises(CircuitOpenError):
+            client.call()
+
+        # Five consecutive failures opened the circuit; the last call never ran
+        assert client.calls == 5
+
+        # Other endpoints are unaffected
+        assert Client("https://up", []).call() == "ok"
+
+    def test_circuit_breaker_recovers(self):
+        """Test that a successful trial call closes the circuit."""
+        breaker = CircuitBreaker("https://a", failure_threshold=2, recovery_timeout=0.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        breaker.before_call()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_circuit_breaker_rejects_while_open(self):
+        """Test that calls are rejected until the recovery timeout."""
+        breaker = CircuitBreaker("https://a", failure_threshold=1, recovery_timeout=60.0)
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    @pytest.mark.asyncio
+    async def test_async_retries_until_success(self):
+        """Test that the async decorator retries too."""
+        client = Client("https://a", [TimeoutError("slow")])
+
+        assert await client.call_async() == "ok"
+        assert client.calls == 2
+
@@ -0,0 +1,384 @@
+"""Tests for the Batch API client, against a local fake batch server."""
+
+import json
+import threading
+import time
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from codestory.llm.backoff import reset_retry_state
+from codestory.llm.batch import BatchClient, completion_window_seconds
+from codestory.llm.client import OpenAIClient
+from codestory.llm.exceptions import BatchError
+from codestory.llm.models import ChatMessage, ChatRole
+from codestory_summarizer.batch_executor import BatchExecutor
+from codestory_summarizer.models import DependencyGraph, NodeData, NodeType, ProcessingStatus
+from codestory_summarizer.step import check_batch_time_limit
+
+
+class FakeBatchService:
+    """In-memory state of the fake Azure OpenAI files and batches APIs."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.polls_until_done = 1
+        self.fail_batches = False
+        self.lock = threading.Lock()
+
+    def add_file(self, content: bytes, purpose: str) -> dict[str, Any]:
+        with self.lock:
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = content
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": "batch.jsonl",
+            "purpose": purpose,
+            "status": "processed",
+        }
+
+    def create_batch(self, request: dict[str, Any]) -> dict[str, Any]:
+        with self.lock:
+            batch_id = f"batch-{len(self.batches) + 1}"
+            batch = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": request["endpoint"],
+                "input_file_id": request["input_file_id"],
+                "completion_window": request["completion_window"],
+                "created_at": int(time.time()),
+                "status": "validating",
+                "polls": 0,
+            }
+            self.batches[batch_id] = batch
+        return batch
+
+    def retrieve_batch(self, batch_id: str) -> dict[str, Any]:
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        if batch["status"] not in ("validating", "in_progress"):
+            return batch
+        if batch["polls"] <= self.polls_until_done:
+            batch["status"] = "in_progress"
+        elif self.fail_batches:
+            batch["status"] = "failed"
+            batch["errors"] = {"object": "list", "data": [{"message": "invalid deployment"}]}
+        else:
+            self._complete(batch)
+        return batch
+
+    def _complete(self, batch: dict[str, Any]) -> None:
+        """Answer the requests of a batch and write the output and error files."""
+        output, errors = [], []
+        for line in self.files[batch["input_file_id"]].decode().splitlines():
+            request = json.loads(line)
+            custom_id, body = request["custom_id"], request["body"]
+            if custom_id.startswith("bad"):
+                errors.append(
+                    {
+                        "custom_id": custom_id,
+                        "response": {
+                            "status_code": 400,
+                            "body": {"error": {"message": "content filtered"}},
+                        },
+                        "error": None,
+                    }
+                )
+                continue
+            output.append(
+                {
+                    "custom_id": custom_id,
+                    "response": {"status_code": 200, "body": self._answer(request["url"], body)},
+                    "error": None,
+                }
+            )
+
+        batch["status"] = "completed"
+        batch["output_file_id"] = self.add_file(self._jsonl(output), "batch_output")["id"]
+        if errors:
+            batch["error_file_id"] = self.add_file(self._jsonl(errors), "batch_output")["id"]
+
+    @staticmethod
+    def _answer(url: str, body: dict[str, Any]) -> dict[str, Any]:
+        if url == "/embeddings":
+            text = body["input"][0]
+            return {
+                "object": "list",
+                "model": body["model"],
+                "data": [{"object": "embedding", "index": 0, "embedding": [float(len(text))]}],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        return {
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": f"Summary of {body['messages'][-1]['content']}",
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        }
+
+    @staticmethod
+    def _jsonl(records: list[dict[str, Any]]) -> bytes:
+        return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+def make_handler(service: FakeBatchService) -> type[BaseHTTPRequestHandler]:
+    """Create a request handler serving the fake service."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send(self, payload: Any, status: int = 200) -> None:
+            data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        def do_POST(self) -> None:
+            path = self.path.split("?")[0]
+            if path == "/openai/files":
+                # Parse the multipart upload with the email parser
+                message = BytesParser().parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + self._body()
+                )
+                fields = {
+                    part.get_param("name", header="content-disposition"): part.get_payload(
+                        decode=True
+                    )
+                    for part in message.get_payload()
+                }
+                self._send(service.add_file(fields["file"], fields["purpose"].decode()))
+            elif path == "/openai/batches":
+                self._send(service.create_batch(json.loads(self._body())))
+            elif path.startswith("/openai/batches/") and path.endswith("/cancel"):
+                batch = service.batches[path.split("/")[3]]
+                batch["status"] = "cancelled"
+                self._send(batch)
+            else:
+                self._send({"error": {"message": "not found"}}, status=404)
+
+        def do_GET(self) -> None:
+            path = self.path.split("?")[0]
+            parts = path.split("/")
+            if path.startswith("/openai/batches/"):
+                self._send(service.retrieve_batch(parts[3]))
+            elif path.startswith("/openai/files/") and path.endswith("/content"):
+                self._send(service.files[parts[3]])
+            else:
+                self._send({"error": {"message": "not found"}}, status=404)
+
+    return Handler
+
+
+@pytest.fixture
+def service():
+    """Run a fake batch server on a local port."""
+    service = FakeBatchService()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    service.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield service
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def batch_client(service):
+    """Create a batch client talking to the fake server."""
+    reset_retry_state()
+    with patch("codestory.llm.client.get_token_provider", return_value=lambda: "test-token"):
+        client = OpenAIClient(endpoint=service.url, chat_model="gpt-4o-batch", max_retries=1)
+    yield BatchClient(client, poll_interval=0.01)
+    reset_retry_state()
+
+
+def user_message(content: str) -> list[ChatMessage]:
+    return [ChatMessage(role=ChatRole.USER, content=content)]
+
+
+def test_chat_batch_maps_results_by_custom_id(service, batch_client):
+    """Test that completions are submitted as a batch and matched to their IDs."""
+    result = batch_client.chat_batch(
+        {"node-1": user_message("a.py"), "node-2": user_message("b.py")},
+        max_tokens=500,
+        temperature=0.1,
+    )
+
+    assert result.errors == {}
+    assert result.responses["node-1"].choices[0].message.content == "Summary of a.py"
+    assert result.responses["node-2"].choices[0].message.content == "Summary of b.py"
+    assert result.responses["node-1"].usage.total_tokens == 15
+
+    # One batch with one request line per conversation
+    (batch,) = service.batches.values()
+    assert batch["endpoint"] == "/chat/completions"
+    lines = [json.loads(line) for line in service.files[batch["input_file_id"]].splitlines()]
+    assert [line["custom_id"] for line in lines] == ["node-1", "node-2"]
+    assert lines[0]["method"] == "POST"
+    assert lines[0]["body"]["model"] == "gpt-4o-batch"
+    assert lines[0]["body"]["max_tokens"] == 500
+
+
+def test_embed_batch(service, batch_client):
+    """Test that embeddings are requested in batches of limited size."""
+    batch_client.max_requests_per_batch = 2
+    texts = {f"chunk-{i}": "x" * i for i in range(1, 6)}
+
+    result = batch_client.embed_batch(texts)
+
+    assert len(result.batch_ids) == 3
+    assert {key: value.data[0].embedding for key, value in result.responses.items()} == {
+        f"chunk-{i}": [float(i)] for i in range(1, 6)
+    }
+    assert all(batch["endpoint"] == "/embeddings" for batch in service.batches.values())
+
+
+def test_failed_requests_are_reported(batch_client):
+    """Test that requests failing individually are reported as errors."""
+    result = batch_client.chat_batch({"good": user_message("a"), "bad": user_message("b")})
+
+    assert list(result.responses) == ["good"]
+    assert result.errors == {"bad": "content filtered"}
+
+
+def test_failed_batch_raises(service, batch_client):
+    """Test that a batch failing as a whole raises BatchError."""
+    service.fail_batches = True
+
+    with pytest.raises(BatchError, match="invalid deployment") as exc_info:
+        batch_client.chat_batch({"node-1": user_message("a")})
+
+    assert exc_info.value.status == "failed"
+
+
+def test_timeout_cancels_batches(service, batch_client):
+    """Test that all batches not done within the timeout are cancelled."""
+    service.polls_until_done = 1000
+    batch_client.timeout = 0.05
+    batch_client.max_requests_per_batch = 1
+
+    with pytest.raises(BatchError, match="did not finish"):
+        batch_client.chat_batch({"node-1": user_message("a"), "node-2": user_message("b")})
+
+    assert [batch["status"] for batch in service.batches.values()] == ["cancelled"] * 2
+
+
+def test_deadline_is_shared_by_runs(service, batch_client):
+    """Test that a run started after the deadline cancels its batch at once."""
+    service.polls_until_done = 1000
+    batch_client.deadline = time.monotonic()
+    batch_client.poll_interval = 60.0
+
+    start = time.monotonic()
+    with pytest.raises(BatchError):
+        batch_client.chat_batch({"node-1": user_message("a")})
+
+    assert time.monotonic() - start < 5.0
+    assert service.batches["batch-1"]["status"] == "cancelled"
+
+
+def test_soft_time_limit_cancels_batches(service, batch_client):
+    """Test that batches are cancelled when the task's soft time limit interrupts the wait."""
+    service.polls_until_done = 1000
+    retrieve = batch_client._retrieve
+
+    def interrupted(batch_id):
+        if service.batches[batch_id]["polls"] >= 2:
+            raise SoftTimeLimitExceeded()
+        return retrieve(batch_id)
+
+    with (
+        patch.object(batch_client, "_retrieve", side_effect=interrupted),
+        pytest.raises(SoftTimeLimitExceeded),
+    ):
+        batch_client.chat_batch({"node-1": user_message("a")})
+
+    assert service.batches["batch-1"]["status"] == "cancelled"
+
+
+def test_empty_batch_submits_nothing(service, batch_client):
+    """Test that no batch is created without requests."""
+    result = batch_client.embed_batch({})
+
+    assert result.responses == {} and result.batch_ids == []
+    assert service.batches == {}
+
+
+def test_batch_executor_summarizes_graph_in_waves(service, batch_client):
+    """Test that each wave of ready nodes is one batch, leaves first."""
+    graph = DependencyGraph()
+    graph.add_node(NodeData(id="file", name="a.py", type=NodeType.FILE))
+    graph.add_node(NodeData(id="bad-file", name="b.py", type=NodeType.FILE))
+    graph.add_node(NodeData(id="dir", name="src", type=NodeType.DIRECTORY, dependencies={"file"}))
+    graph.add_node(
+        NodeData(id="repo", name="repo", type=NodeType.REPOSITORY, dependencies={"bad-file"})
+    )
+    summaries = {}
+
+    def finish(node_id, node_data, response):
+        summaries[node_id] = response.choices[0].message.content
+        return True
+
+    waves = []
+    graph = BatchExecutor(batch_client).process_graph(
+        graph,
+        prepare_func=lambda node_id, node_data: user_message(node_data.name),
+        finish_func=finish,
+        on_wave=lambda: waves.append(sorted(summaries)),
+    )
+
+    assert summaries == {"file": "Summary of a.py", "dir": "Summary of src"}
+    assert len(service.batches) == 2
+    # Each wave's responses are stored before its callback runs
+    assert waves == [["file"], ["dir", "file"]]
+    assert graph.nodes["bad-file"].status == ProcessingStatus.FAILED
+    # A node whose dependency failed is never submitted
+    assert graph.nodes["repo"].status == ProcessingStatus.FAILED
+    assert (graph.completed_count, graph.failed_count) == (2, 2)
+
+
+def test_completion_window_seconds():
+    """Test parsing batch completion windows."""
+    assert completion_window_seconds("24h") == 86400
+    assert completion_window_seconds("30m") == 1800
+    with pytest.raises(ValueError):
+        completion_window_seconds("soon")
+
+
+def test_batch_mode_is_refused_unless_time_limit_covers_every_wave():
+    """Test that batch mode needs a chat and an embedding window per dependency level."""
+    graph = DependencyGraph()
+    graph.add_node(NodeData(id="file", name="a.py", type=NodeType.FILE))
+    graph.add_node(NodeData(id="dir", name="src", type=NodeType.DIRECTORY, dependencies={"file"}))
+    graph.add_node(
+        NodeData(id="repo", name="repo", type=NodeType.REPOSITORY, dependencies={"dir", "file"})
+    )
+    assert graph.count_levels() == 3
+
+    check_batch_time_limit(graph, "1h", 6 * 3600)
+    with pytest.raises(ValueError, match="6 batch rounds"):
+        check_batch_time_limit(graph, "24h", 1800 - 120)
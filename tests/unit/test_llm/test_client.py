@@ -1,12 +1,16 @@
 """Tests for OpenAI client implementation."""
 
 import asyncio
+import base64
+from array import array
 from unittest.mock import MagicMock, patch
 
 import openai
 import pytest
+from openai.types import CreateEmbeddingResponse
 
-from codestory.llm.client import OpenAIClient, create_client
+from codestory.llm.backoff import reset_retry_state
+from codestory.llm.client import OpenAIClient, clear_clients, create_client
 from codestory.llm.exceptions import (
     AuthenticationError,
     InvalidRequestError,
@@ -18,6 +22,12 @@ from codestory.llm.models import (
     CompletionResponse,
     EmbeddingResponse,
 )
+from codestory.llm.views import EmbeddingVectors
+
+
+def encode_floats(values: list[float]) -> str:
+    """Encode floats as the API does for base64 embeddings."""
+    return base64.b64encode(array("f", values).tobytes()).decode()
 
 
 # Patch prometheus metrics to avoid registration conflicts during tests
@@ -32,6 +42,16 @@ def patch_prometheus_metrics():
         yield
 
 
+@pytest.fixture(autouse=True)
+def shared_clients():
+    """Start every test without shared clients or retry state from other tests."""
+    clear_clients()
+    reset_retry_state()
+    yield
+    clear_clients()
+    reset_retry_state()
+
+
 @pytest.fixture
 def mock_settings():
     """Create mock settings for testing."""
@@ -57,12 +77,11 @@ def mock_settings():
 def client():
     """Create an OpenAI client for testing."""
     # Patch the internal OpenAI client to avoid needing real credentials
-    # Also patch the DefaultAzureCredential and token provider
+    # Also patch the Azure AD token provider
     with (
         patch("openai.AzureOpenAI"),
         patch("openai.AsyncAzureOpenAI"),
-        patch("codestory.llm.client.DefaultAzureCredential"),
-        patch("codestory.llm.client.get_bearer_token_provider"),
+        patch("codestory.llm.client.get_token_provider"),
         # Also patch the metric decorators to avoid registration conflicts
         patch("codestory.llm.client.instrument_request", lambda op: lambda f: f),
         patch("codestory.llm.client.instrument_async_request", lambda op: lambda f: f),
@@ -322,8 +341,7 @@ class TestOpenAIClient:
         with (
             patch("openai.AzureOpenAI"),
             patch("openai.AsyncAzureOpenAI"),
-            patch("codestory.llm.client.DefaultAzureCredential"),
-            patch("codestory.llm.client.get_bearer_token_provider"),
+            patch("codestory.llm.client.get_token_provider"),
         ):
             client = OpenAIClient(endpoint="https://test-endpoint.openai.azure.com")
 
@@ -351,8 +369,7 @@ class TestOpenAIClient:
                 "codestory.llm.client.get_settings",
                 side_effect=Exception("No settings"),
             ),
-            patch("codestory.llm.client.DefaultAzureCredential"),
-            patch("codestory.llm.client.get_bearer_token_provider"),
+            patch("codestory.llm.client.get_token_provider"),
             pytest.raises(AuthenticationError),
         ):
             OpenAIClient()  # No endpoint provided
@@ -458,15 +475,22 @@ class TestOpenAIClient:
     def test_embed(self, client):
         """Test embedding generation."""
         with patch.object(client._sync_client.embeddings, "create") as mock_create:
-            # Configure the mock response
-            mock_response = MagicMock()
-            mock_response.model_dump.return_value = {
-                "object": "list",
-                "data": [{"object": "embedding", "embedding": [0.1, 0.2, 0.3], "index": 0}],
-                "model": "text-embedding-3-small",
-                "usage": {"prompt_tokens": 8, "total_tokens": 8},
-            }
-            mock_create.return_value = mock_response
+            # Configure the response, base64 encoded as requested (which the SDK
+            # leaves undecoded, so it is built without validation)
+            mock_create.return_value = CreateEmbeddingResponse.construct(
+                **{
+                    "object": "list",
+                    "data": [
+                        {
+                            "object": "embedding",
+                            "embedding": encode_floats([0.5, 0.25, -1.0]),
+                            "index": 0,
+                        }
+                    ],
+                    "model": "text-embedding-3-small",
+                    "usage": {"prompt_tokens": 8, "total_tokens": 8},
+                }
+            )
 
             # Call the method
             result = client.embed("Test text")
@@ -475,7 +499,7 @@ class TestOpenAIClient:
             assert isinstance(result, EmbeddingResponse)
             assert result.model == "text-embedding-3-small"
             assert len(result.data) == 1
-            assert result.data[0].embedding == [0.1, 0.2, 0.3]
+            assert result.data[0].embedding == [0.5, 0.25, -1.0]
             assert result.usage.prompt_tokens == 8
             assert result.usage.total_tokens == 8
 
@@ -484,6 +508,31 @@ class TestOpenAIClient:
             call_args = mock_create.call_args[1]
             assert call_args["model"] == "text-embedding-3-small"
             assert call_args["input"] == ["Test text"]
+            assert call_args["encoding_format"] == "base64"
+
+    def test_embed_vectors(self, client):
+        """Test that embeddings are decoded into one float32 buffer."""
+        with patch.object(client._sync_client.embeddings, "create") as mock_create:
+            mock_create.return_value = CreateEmbeddingResponse.construct(
+                **{
+                    "object": "list",
+                    # Items may arrive out of order
+                    "data": [
+                        {"object": "embedding", "embedding": encode_floats([3.0, 4.0]), "index": 1},
+                        {"object": "embedding", "embedding": encode_floats([1.0, 2.0]), "index": 0},
+                    ],
+                    "model": "text-embedding-3-small",
+                    "usage": {"prompt_tokens": 4, "total_tokens": 4},
+                }
+            )
+
+            vectors = client.embed_vectors(["a", "b"])
+
+            assert isinstance(vectors, EmbeddingVectors)
+            assert vectors.buffer == array("f", [1.0, 2.0, 3.0, 4.0])
+            assert len(vectors) == 2 and vectors.dimensions == 2
+            assert vectors.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+            assert vectors.usage.total_tokens == 4
 
     def test_error_handling_complete(self):
         """Test error handling in completion."""
@@ -493,8 +542,7 @@ class TestOpenAIClient:
             patch("openai.AzureOpenAI") as mock_azure_openai,
             patch("openai.AsyncAzureOpenAI"),
             patch("codestory.llm.backoff.retry_on_openai_errors"),
-            patch("codestory.llm.client.DefaultAzureCredential"),
-            patch("codestory.llm.client.get_bearer_token_provider"),
+            patch("codestory.llm.client.get_token_provider"),
             patch("codestory.llm.client.instrument_request", lambda op: lambda f: f),
         ):
             # Configure the mock OpenAI client
@@ -565,8 +613,7 @@ class TestCreateClient:
         with (
             patch("openai.AzureOpenAI"),
             patch("openai.AsyncAzureOpenAI"),
-            patch("codestory.llm.client.DefaultAzureCredential"),
-            patch("codestory.llm.client.get_bearer_token_provider"),
+            patch("codestory.llm.client.get_token_provider"),
             # Also patch metric decorators to avoid conflicts
             patch("codestory.llm.client.instrument_request", lambda op: lambda f: f),
             patch("codestory.llm.client.instrument_async_request", lambda op: lambda f: f),
@@ -624,3 +671,62 @@ class TestCreateClient:
                     max_retries=3,
                     retry_backoff_factor=2.0,
                 )
+
+    def test_create_client_is_shared(self, mock_settings):
+        """Test that clients are shared per configuration without subprocesses."""
+        with (
+            patch("codestory.llm.client.get_token_provider") as mock_get_provider,
+            patch("subprocess.run", side_effect=AssertionError("subprocess started")),
+        ):
+            client = create_client()
+
+            assert create_client() is client
+            assert create_client(chat_model="gpt-4o-mini") is not client
+            assert mock_get_provider.call_count == 2
+
+    def test_create_client_per_api_key(self, mock_settings):
+        """Test that a changed API key gets a client of its own."""
+        with patch("codestory.llm.client.get_token_provider"):
+            mock_settings.return_value.openai.api_key = "key-1"
+            client = create_client()
+            assert create_client() is client
+
+            mock_settings.return_value.openai.api_key = "key-2"
+            assert create_client() is not client
+
+    @pytest.mark.asyncio
+    async def test_async_client_per_event_loop(self, client):
+        """Test that each event loop gets its own async SDK client."""
+        async_client = client._async_client
+        assert client._async_client is async_client
+
+        other = await asyncio.to_thread(lambda: asyncio.run(_get_async_client(client)))
+
+        assert other is not async_client
+
+    @pytest.mark.asyncio
+    async def test_async_client_closed_with_its_loop(self, client):
+        """Test that async SDK clients are closed by aclose() or dropped with their loop."""
+
+        def use_and_close_loop():
+            loop = asyncio.new_event_loop()
+            try:
+                return loop, loop.run_until_complete(_get_async_client(client))
+            finally:
+                loop.close()
+
+        loop, discarded = await asyncio.to_thread(use_and_close_loop)
+        assert loop in client._async_clients
+
+        async_client = client._async_client
+
+        assert list(client._async_clients) == [asyncio.get_running_loop()]
+        assert not discarded.is_closed()
+        await client.aclose()
+        assert async_client.is_closed()
+        assert client._async_clients == {}
+
+
+async def _get_async_client(client):
+    """Get the async SDK client of the running event loop."""
+    return client._async_client
@@ -0,0 +1,82 @@
+"""Tests for the cached Azure AD credentials."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from azure.core.credentials import AccessToken
+
+from codestory.llm.credentials import (
+    COGNITIVE_SERVICES_SCOPE,
+    CachedTokenProvider,
+    clear_token_providers,
+    get_token_provider,
+)
+
+
+def make_credential(lifetime: float) -> MagicMock:
+    """Create a credential issuing numbered tokens valid for a lifetime."""
+    credential = MagicMock()
+    count = iter(range(1, 1000))
+    credential.get_token.side_effect = lambda *args, **kwargs: AccessToken(
+        f"token-{next(count)}", int(time.time() + lifetime)
+    )
+    return credential
+
+
+def test_token_is_cached():
+    """Test that a valid token is reused."""
+    credential = make_credential(3600)
+    provider = CachedTokenProvider(credential, tenant_id="tenant")
+
+    assert provider() == "token-1"
+    assert provider() == "token-1"
+    credential.get_token.assert_called_once_with(COGNITIVE_SERVICES_SCOPE, tenant_id="tenant")
+
+
+def test_expired_token_is_fetched_again():
+    """Test that an almost expired token is replaced before use."""
+    credential = make_credential(10)
+    provider = CachedTokenProvider(credential)
+
+    assert provider() == "token-1"
+    assert provider() == "token-2"
+
+
+def test_token_is_refreshed_in_background_before_expiry():
+    """Test that a token close to expiry is refreshed without waiting."""
+    credential = make_credential(120)
+    provider = CachedTokenProvider(credential, refresh_margin=300)
+    assert provider() == "token-1"
+
+    refreshed = threading.Event()
+    fetch = provider._fetch
+
+    def fetch_and_signal():
+        token = fetch()
+        refreshed.set()
+        return token
+
+    with patch.object(provider, "_fetch", side_effect=fetch_and_signal):
+        # Served from the cache while the next token is fetched
+        assert provider() == "token-1"
+        assert refreshed.wait(5)
+
+    # Let the refresh thread store the token
+    deadline = time.time() + 5
+    while provider._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    assert provider() == "token-2"
+
+
+def test_token_providers_are_shared_per_tenant():
+    """Test that one provider is created per tenant and process."""
+    clear_token_providers()
+    with patch("codestory.llm.credentials.DefaultAzureCredential") as mock_credential_cls:
+        provider = get_token_provider("tenant")
+
+        assert get_token_provider("tenant") is provider
+        assert get_token_provider(None) is not provider
+        mock_credential_cls.assert_any_call(additionally_allowed_tenants=["tenant"])
+        assert mock_credential_cls.call_count == 2
+    clear_token_providers()
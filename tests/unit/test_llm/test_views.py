@@ -0,0 +1,73 @@
+"""Tests for the embedding response views."""
+
+import base64
+from array import array
+from types import SimpleNamespace
+
+import pytest
+
+from codestory.llm.models import EmbeddingResponse
+from codestory.llm.views import NUMPY_AVAILABLE, EmbeddingVectors
+
+
+def sdk_response(*embeddings: object) -> SimpleNamespace:
+    """Create an object shaped like an SDK embedding response."""
+    return SimpleNamespace(
+        data=[
+            SimpleNamespace(embedding=embedding, index=index)
+            for index, embedding in enumerate(embeddings)
+        ],
+        model="text-embedding-3-small",
+        usage=SimpleNamespace(prompt_tokens=3, total_tokens=3),
+    )
+
+
+def encode(values: list[float]) -> str:
+    return base64.b64encode(array("f", values).tobytes()).decode()
+
+
+def test_decodes_base64_and_float_lists():
+    """Test that both encodings end up in one contiguous buffer."""
+    vectors = EmbeddingVectors.from_response(sdk_response(encode([1.0, 2.0]), [3.0, 4.0]))
+
+    assert vectors.buffer == array("f", [1.0, 2.0, 3.0, 4.0])
+    assert vectors.dimensions == 2
+    assert vectors.model == "text-embedding-3-small"
+    assert vectors.usage.prompt_tokens == 3
+
+
+def test_rows_are_views_of_the_buffer():
+    """Test that indexing does not copy the vector."""
+    vectors = EmbeddingVectors(array("f", [1.0, 2.0, 3.0, 4.0]), 2, "model")
+
+    row = vectors[-1]
+    vectors.buffer[2] = 5.0
+
+    assert row.tolist() == [5.0, 4.0]
+    assert [view.tolist() for view in vectors] == [[1.0, 2.0], [5.0, 4.0]]
+    with pytest.raises(IndexError):
+        vectors[2]
+
+
+def test_to_response():
+    """Test conversion to the pydantic response model."""
+    response = EmbeddingVectors.from_response(sdk_response([0.5], [0.25])).to_response()
+
+    assert isinstance(response, EmbeddingResponse)
+    assert [item.embedding for item in response.data] == [[0.5], [0.25]]
+    assert [item.index for item in response.data] == [0, 1]
+    assert response.usage.total_tokens == 3
+    assert response.model_dump()["data"][1]["embedding"] == [0.25]
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy is not installed")
+def test_to_numpy_shares_buffer():
+    """Test that the NumPy matrix is a view of the buffer."""
+    vectors = EmbeddingVectors(array("f", [1.0, 2.0, 3.0, 4.0]), 2, "model")
+
+    matrix = vectors.to_numpy()
+
+    assert matrix.shape == (2, 2)
+    assert str(matrix.dtype) == "float32"
+    vectors.buffer[0] = 9.0
+    assert matrix[0, 0] == 9.0